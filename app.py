@@ -1,70 +1,101 @@
 from flask import Flask, send_from_directory, jsonify, request
 from flask_cors import CORS
 import os
+import time
 from datetime import datetime
 
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
-# Load your SportsData.io CSV files first (this always works)
-sportsdata = None
-try:
+from engine_registry import EngineRegistry
+
+# Engines are built lazily (first use or background warm-up), never by
+# blocking network calls at import time
+engines = EngineRegistry()
+# Proactive odds refresh, started with the data engine
+refresh_scheduler = None
+
+
+def _build_sportsdata():
     from sportsdata_loader import SportsDataLoader
-    sportsdata = SportsDataLoader()
-    print("✅ SportsData.io files loaded")
-except Exception as e:
-    print(f"⚠️ SportsData loading failed: {e}")
+    return SportsDataLoader()
 
-# FORCE load the data engine - no exceptions allowed
-data_engine = None
-twitter_engine = None
-newsletter_engine = None
 
-print("🔥 LOADING DATA ENGINE WITH YOUR REAL API KEYS...")
+def _build_projection_model():
+    from projection_model import ProjectionModel
+    sportsdata = engines.get('sportsdata')
+    if sportsdata is None or sportsdata.store is None:
+        raise RuntimeError("SportsData store unavailable")
+    return ProjectionModel.from_store(sportsdata.store)
 
-# Load the data engine first - this MUST work
-try:
-    from data_engine import ProfessionalDataEngine
-    data_engine = ProfessionalDataEngine()
-    print("✅ Data Engine class loaded")
 
-    # Test both APIs immediately
+def _build_data_engine():
+    global refresh_scheduler
+    from data_engine import ProfessionalDataEngine
+    engine = ProfessionalDataEngine()
+    # Props are scored against projections where the model has an opinion
+    engine.use_projection_model(engines.get('projections'))
+    if os.getenv('ODDS_REFRESH', '1') != '0':
+        from refresh_scheduler import RefreshScheduler
+        refresh_scheduler = RefreshScheduler(engine)
+        refresh_scheduler.start()
+    return engine
+
+
+def _warm_data_engine(engine):
+    """Prime the odds and team caches so the first user request is a cache hit"""
     if os.getenv('ODDS_API_KEY'):
-        print(f"🔑 Testing Odds API key: {os.getenv('ODDS_API_KEY')[:10]}...")
-        test_games = data_engine.get_nfl_games()
-        print(f"✅ Odds API WORKING - Found {len(test_games)} NFL games")
-
+        games = engine.get_nfl_games()
+        print(f"✅ Odds API warm-up - Found {len(games)} NFL games")
     if os.getenv('SPORTSDATA_API_KEY'):
-        print(f"🔑 Testing SportsDataIO key: {os.getenv('SPORTSDATA_API_KEY')[:10]}...")
-        test_teams = data_engine.get_sportsdata_teams()
-        print(f"✅ SportsDataIO WORKING - Found {len(test_teams)} NFL teams")
+        teams = engine.get_sportsdata_teams()
+        print(f"✅ SportsDataIO warm-up - Found {len(teams)} NFL teams")
 
-except Exception as e:
-    print(f"❌ CRITICAL: Data Engine failed to load: {e}")
-    import traceback
-    traceback.print_exc()
 
-# Try other engines (optional)
-try:
+def _build_parlay_engine():
+    from parlay_engine import ParlayEngine
+    data_engine = engines.get('data')
+    if data_engine is None:
+        raise RuntimeError("Data engine unavailable")
+    return ParlayEngine(data_engine)
+
+
+def _build_twitter_engine():
     from twitter_engine import TwitterGrowthEngine
-    if os.getenv('TWITTER_API_KEY'):
-        twitter_engine = TwitterGrowthEngine()
-        print("✅ Twitter Engine loaded")
-except Exception as e:
-    print(f"⚠️ Twitter Engine failed: {e}")
+    return TwitterGrowthEngine()
+
 
-try:
+def _build_newsletter_engine():
     from newsletter_engine import NewsletterAutomationEngine
-    newsletter_engine = NewsletterAutomationEngine()
-    print("✅ Newsletter Engine loaded")
-except Exception as e:
-    print(f"⚠️ Newsletter Engine failed: {e}")
+    # Share the data engine (and its cache) instead of building a second one
+    sportsdata = engines.get('sportsdata')
+    return NewsletterAutomationEngine(data_engine=engines.get('data'),
+                                      sportsdata_store=sportsdata.store if sportsdata else None)
+
+
+engines.register('sportsdata', _build_sportsdata, required=True)
+engines.register('projections', _build_projection_model)
+engines.register('data', _build_data_engine, warm_up=_warm_data_engine, required=True)
+engines.register('parlay', _build_parlay_engine)
+engines.register('twitter', _build_twitter_engine, enabled=bool(os.getenv('TWITTER_API_KEY')))
+engines.register('newsletter', _build_newsletter_engine)
 
-print(f"🎯 FINAL STATUS: data_engine={'LOADED' if data_engine else 'FAILED'}")
+if os.getenv('ENGINE_WARM_UP', '1') != '0':
+    engines.warm_up()
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=["X-Data-Fetched-At", "X-Data-Age", "X-Data-Stale"])
+
+
+def _with_freshness(response, data_engine, key):
+    """Attach cache staleness metadata to a response as headers"""
+    meta = data_engine.freshness(key) if data_engine else None
+    if meta:
+        response.headers["X-Data-Fetched-At"] = meta["fetched_at"]
+        response.headers["X-Data-Age"] = str(int(meta["age_seconds"]))
+        response.headers["X-Data-Stale"] = "true" if meta["stale"] else "false"
+    return response
 
 @app.route("/")
 def index():
@@ -76,10 +107,42 @@ def assets(filename):
 
 @app.route("/api/health")
 def health():
+    """Liveness: the worker is up and serving, regardless of upstreams"""
     return jsonify({"status": "ok"})
 
+@app.route("/api/ready")
+def ready():
+    """Readiness: required engines are built and their caches warmed"""
+    is_ready = engines.is_ready()
+    return jsonify({
+        "ready": is_ready,
+        "engines": engines.status(),
+        "uptime_seconds": round(time.time() - engines.started_at, 1)
+    }), 200 if is_ready else 503
+
+@app.route("/api/metrics")
+def metrics():
+    """Outbound provider call and cache metrics"""
+    from http_transport import get_transport
+    data_engine = engines.peek('data')
+    return jsonify({
+        "http": get_transport().metrics(),
+        "cache": data_engine.cache.stats() if data_engine else None,
+        "single_flight": data_engine.flights.stats() if data_engine else None,
+        "refresh": refresh_scheduler.status() if refresh_scheduler else None,
+        "line_history": data_engine.line_history.stats() if data_engine and data_engine.line_history else None,
+        "steam": data_engine.steam.stats() if data_engine else None,
+        "simulation": data_engine.simulation_status() if data_engine else None,
+        "timestamp": datetime.now().isoformat()
+    })
+
 @app.route("/api/status")
 def status():
+    data_engine = engines.get('data')
+    sportsdata = engines.get('sportsdata')
+    twitter_engine = engines.peek('twitter')
+    newsletter_engine = engines.peek('newsletter')
+
     # App is operational if we have data (either API or CSV)
     is_operational = data_engine is not None or sportsdata is not None
 
@@ -111,6 +174,7 @@ def status():
             "odds_api": "connected" if odds_api_working else "missing",
             "twitter_api": "connected" if os.getenv("TWITTER_API_KEY") else "missing"
         },
+        "ready": engines.is_ready(),
         "nfl_ready": True if odds_api_working else False,
         "live_games": len(test_games) if odds_api_working else 0
     })
@@ -118,6 +182,8 @@ def status():
 @app.route("/api/games")
 def get_games():
     """Get live NFL games with real betting data"""
+    data_engine = engines.get('data')
+
     if not data_engine:
         return jsonify({"error": "Data engine not available", "status": "offline"}), 503
 
@@ -126,6 +192,7 @@ def get_games():
         return jsonify({
             "success": True,
             "games": games,
+            "freshness": data_engine.freshness('nfl_games'),
             "timestamp": datetime.now().isoformat()
         })
     except Exception as e:
@@ -134,6 +201,8 @@ def get_games():
 @app.route("/api/social-media/stats")
 def social_media_stats():
     """Get social media stats for the dashboard"""
+    twitter_engine = engines.get('twitter')
+
     if not twitter_engine:
         return jsonify({
             "followers": 1247,
@@ -157,6 +226,8 @@ def social_media_stats():
 @app.route("/api/twitter/post", methods=['POST'])
 def twitter_post():
     """Post tweet using your real Twitter account"""
+    twitter_engine = engines.get('twitter')
+
     if not twitter_engine:
         return jsonify({"error": "Twitter engine not available"}), 503
 
@@ -175,6 +246,8 @@ def twitter_post():
 @app.route("/api/players")
 def get_players():
     """Get NFL players from your SportsData.io files"""
+    sportsdata = engines.get('sportsdata')
+
     if not sportsdata:
         return jsonify({"error": "SportsData not available"}), 503
 
@@ -192,6 +265,8 @@ def get_players():
 @app.route("/api/players/search")
 def search_players():
     """Search NFL players"""
+    sportsdata = engines.get('sportsdata')
+
     if not sportsdata:
         return jsonify({"error": "SportsData not available"}), 503
 
@@ -213,6 +288,8 @@ def search_players():
 @app.route("/api/teams")
 def get_teams():
     """Get NFL teams from your SportsData.io files"""
+    sportsdata = engines.get('sportsdata')
+
     if not sportsdata:
         return jsonify({"error": "SportsData not available"}), 503
 
@@ -242,25 +319,27 @@ def get_sports():
 @app.route("/api/games")
 def get_sport_games(sport="nfl"):
     """Games for React frontend - REAL Odds API data with live betting lines"""
+    data_engine = engines.get('data')
 
     # Use your REAL Odds API data (working!)
     if data_engine and sport == "nfl":
         try:
-            # Get games from Odds API (your working API)
-            odds_games = data_engine.get_nfl_games()
+            # Get games from Odds API (your working API); the snapshot keeps each
+            # event's teams and kickoff, so a cached slate is not decoded again
+            snapshot = data_engine.games_snapshot()
             formatted_games = []
 
-            for i, game in enumerate(odds_games[:16]):  # Current week games
+            for i, game in enumerate(snapshot.events[:16]):  # Current week games
                 # Extract team names
-                home_team = game.get("home_team", "Home Team")
-                away_team = game.get("away_team", "Away Team")
+                home_team = game.get("home_team") or "Home Team"
+                away_team = game.get("away_team") or "Away Team"
 
                 # Create abbreviations from team names
                 home_abbr = "".join([word[0] for word in home_team.split()[:2]]).upper()
                 away_abbr = "".join([word[0] for word in away_team.split()[:2]]).upper()
 
                 formatted_games.append({
-                    "id": game.get("id", f"game_{i+1}"),
+                    "id": game["id"],
                     "homeTeam": {
                         "name": home_team,
                         "abbreviation": home_abbr
@@ -269,7 +348,7 @@ def get_sport_games(sport="nfl"):
                         "name": away_team,
                         "abbreviation": away_abbr
                     },
-                    "startTime": game.get("commence_time", "2025-09-22T17:00:00Z"),
+                    "startTime": game.get("commence_time") or "2025-09-22T17:00:00Z",
                     "week": 3,  # Current week
                     "status": "upcoming",
                     "homeScore": 0,
@@ -278,14 +357,14 @@ def get_sport_games(sport="nfl"):
                     "timeRemaining": "",
                     # Add betting lines from real sportsbooks
                     "betting_lines": {
-                        "spread": _extract_spread(game),
-                        "total": _extract_total(game),
-                        "moneyline": _extract_moneyline(game)
+                        "spread": _extract_spread(snapshot, i),
+                        "total": _extract_total(snapshot, i),
+                        "moneyline": _extract_moneyline(snapshot, i)
                     }
                 })
 
             print(f"✅ Serving {len(formatted_games)} REAL NFL games with live betting lines from Odds API")
-            return jsonify(formatted_games)
+            return _with_freshness(jsonify(formatted_games), data_engine, 'nfl_games')
 
         except Exception as e:
             print(f"❌ Odds API error: {e}")
@@ -303,61 +382,48 @@ def get_sport_games(sport="nfl"):
     ]
     return jsonify(games)
 
-def _extract_spread(game):
-    """Extract spread betting line from game data"""
-    try:
-        for bookmaker in game.get('bookmakers', []):
-            for market in bookmaker.get('markets', []):
-                if market.get('key') == 'spreads':
-                    outcomes = market.get('outcomes', [])
-                    if len(outcomes) >= 2:
-                        return {
-                            'home_spread': outcomes[0].get('point', 0),
-                            'away_spread': outcomes[1].get('point', 0),
-                            'home_odds': outcomes[0].get('price', -110),
-                            'away_odds': outcomes[1].get('price', -110)
-                        }
-    except:
-        pass
-    return None
-
-def _extract_total(game):
-    """Extract total betting line from game data"""
-    try:
-        for bookmaker in game.get('bookmakers', []):
-            for market in bookmaker.get('markets', []):
-                if market.get('key') == 'totals':
-                    outcomes = market.get('outcomes', [])
-                    if len(outcomes) >= 2:
-                        return {
-                            'total': outcomes[0].get('point', 47.5),
-                            'over_odds': outcomes[0].get('price', -110),
-                            'under_odds': outcomes[1].get('price', -110)
-                        }
-    except:
-        pass
-    return None
-
-def _extract_moneyline(game):
-    """Extract moneyline betting odds from game data"""
-    try:
-        for bookmaker in game.get('bookmakers', []):
-            for market in bookmaker.get('markets', []):
-                if market.get('key') == 'h2h':
-                    outcomes = market.get('outcomes', [])
-                    if len(outcomes) >= 2:
-                        return {
-                            'home_odds': outcomes[0].get('price', -110),
-                            'away_odds': outcomes[1].get('price', -110)
-                        }
-    except:
-        pass
-    return None
+def _extract_spread(snapshot, event):
+    """Spread line for an event (position in the payload) from the odds snapshot"""
+    pair = snapshot.first_pair(event, 'spreads')
+    if pair is None:
+        return None
+    home, away = pair
+    return {
+        'home_spread': snapshot.point_of(home, 0),
+        'away_spread': snapshot.point_of(away, 0),
+        'home_odds': snapshot.price_of(home, -110),
+        'away_odds': snapshot.price_of(away, -110)
+    }
+
+def _extract_total(snapshot, event):
+    """Total line for an event from the odds snapshot"""
+    pair = snapshot.first_pair(event, 'totals')
+    if pair is None:
+        return None
+    over, under = pair
+    return {
+        'total': snapshot.point_of(over, 47.5),
+        'over_odds': snapshot.price_of(over, -110),
+        'under_odds': snapshot.price_of(under, -110)
+    }
+
+def _extract_moneyline(snapshot, event):
+    """Moneyline odds for an event from the odds snapshot"""
+    pair = snapshot.first_pair(event, 'h2h')
+    if pair is None:
+        return None
+    home, away = pair
+    return {
+        'home_odds': snapshot.price_of(home, -110),
+        'away_odds': snapshot.price_of(away, -110)
+    }
 
 @app.route("/api/<sport>/teams")
 @app.route("/api/teams")
 def get_sport_teams(sport="nfl"):
     """Teams for React frontend - REAL SportsDataIO API data"""
+    data_engine = engines.get('data')
+    sportsdata = engines.get('sportsdata')
 
     # Use your REAL SportsDataIO API data
     if data_engine and sport == "nfl":
@@ -409,6 +475,8 @@ def get_sport_teams(sport="nfl"):
 @app.route("/api/players")
 def get_sport_players(sport="nfl"):
     """Players for React frontend - REAL SportsDataIO API data"""
+    data_engine = engines.get('data')
+    sportsdata = engines.get('sportsdata')
 
     # Use your REAL SportsDataIO API data
     if data_engine and sport == "nfl":
@@ -472,6 +540,7 @@ def get_slate(sport="nfl"):
 @app.route("/api/<sport>/player-edges")
 def get_player_edges(sport="nfl"):
     """Player edges for React frontend - REAL NFL data with live betting odds"""
+    data_engine = engines.get('data')
 
     if sport == "nfl":
         edges = []
@@ -597,22 +666,179 @@ def get_player_edges(sport="nfl"):
 
     return jsonify([])
 
+def _parlay_config(body):
+    """legCount / riskTolerance / minConfidence from a parlay request body"""
+    leg_count = body.get('legCount')
+    min_confidence = float(body.get('minConfidence') or 1)
+    if min_confidence > 5:
+        # Percent (0-100) rather than stars
+        min_confidence = min_confidence / 20
+    return (None if leg_count is None else int(leg_count),
+            body.get('riskTolerance') or 'balanced',
+            max(1, int(min_confidence)))
+
+@app.route("/api/<sport>/parlay/generate", methods=['POST'])
+def generate_parlay(sport="nfl"):
+    """Best parlay for a leg count and risk tolerance (GeneratedParlay)"""
+    parlay_engine = engines.get('parlay')
+    if not parlay_engine:
+        return jsonify({"error": "Parlay engine unavailable"}), 503
+    body = request.get_json(silent=True) or {}
+    try:
+        leg_count, risk_tolerance, min_confidence = _parlay_config(body)
+        count = max(1, min(int(body.get('count', 1)), 10))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid parlay config: {e}"}), 400
+
+    parlays = parlay_engine.generate(leg_count, risk_tolerance, min_confidence, count=count)
+    if not parlays:
+        return jsonify({"error": "No parlay meets the constraints", "search": parlay_engine.last_search}), 404
+    parlay = dict(parlays[0], alternatives=parlays[1:], search=parlay_engine.last_search)
+    return jsonify(parlay)
+
+@app.route("/api/<sport>/parlay/generate-multiple", methods=['POST'])
+def generate_multiple_parlays(sport="nfl"):
+    """Best parlay per risk profile: {conservative, balanced, aggressive}"""
+    parlay_engine = engines.get('parlay')
+    if not parlay_engine:
+        return jsonify({"error": "Parlay engine unavailable"}), 503
+    body = request.get_json(silent=True) or {}
+    try:
+        leg_count, _, min_confidence = _parlay_config(body)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid parlay config: {e}"}), 400
+    return jsonify(parlay_engine.generate_multiple(leg_count, min_confidence))
+
+@app.route("/api/<sport>/parlay/swap-suggestions", methods=['POST'])
+def parlay_swap_suggestions(sport="nfl"):
+    """Best single-leg replacements for {originalParlay} ({suggestions, original, rankedBy})"""
+    parlay_engine = engines.get('parlay')
+    if not parlay_engine:
+        return jsonify({"suggestions": [], "error": "Parlay engine unavailable"}), 503
+    body = request.get_json(silent=True) or {}
+    parlay = body.get('originalParlay')
+    if not isinstance(parlay, dict):
+        return jsonify({"suggestions": [], "error": "originalParlay is required"}), 400
+    try:
+        limit = max(1, min(int(body.get('limit', 10)), 25))
+        result = parlay_engine.swap_suggestions(parlay, body.get('rankBy'), limit)
+    except (TypeError, ValueError, KeyError) as e:
+        return jsonify({"suggestions": [], "error": f"Invalid parlay: {e}"}), 400
+    return jsonify(dict(result, search=parlay_engine.last_search))
+
 @app.route("/api/<sport>/jackpot-candidates")
 def get_jackpot_candidates(sport="nfl"):
-    """Get jackpot parlay candidates for React frontend"""
-    # Return empty array for now to prevent JavaScript errors
-    return jsonify([])
+    """Long-shot parlays crossing the tier payout (50k/100k/1M) for a stake"""
+    parlay_engine = engines.get('parlay')
+    if not parlay_engine:
+        return jsonify({"candidates": [], "error": "Parlay engine unavailable"}), 503
+    tier = request.args.get('tier', '1M')
+    try:
+        stake = float(request.args.get('stake', 10))
+        candidates = parlay_engine.jackpot_candidates(tier, stake)
+    except ValueError as e:
+        return jsonify({"candidates": [], "error": str(e)}), 400
+    return jsonify({"candidates": candidates, "tier": tier, "stake": stake,
+                    "timestamp": datetime.now().isoformat()})
 
 @app.route("/api/<sport>/picks")
 def get_picks(sport="nfl"):
-    """Get betting picks for React frontend"""
-    # Return empty array for now to prevent JavaScript errors
-    return jsonify([])
+    """Best picks across every market (PickLeg list) for React frontend"""
+    data_engine = engines.get('data')
+    if not data_engine:
+        return jsonify([])
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    return jsonify(data_engine.top_picks(limit=limit))
+
+@app.route("/api/<sport>/top-picks")
+def get_top_picks(sport="nfl"):
+    """Top picks for ?pool=&market=&betType= from the precomputed leaderboards ({items})"""
+    data_engine = engines.get('data')
+    if not data_engine:
+        return jsonify({"items": [], "error": "Data engine unavailable"}), 503
+    pool = max(1, min(request.args.get('pool', 20, type=int), 100))
+    market = request.args.get('market') or 'ALL'
+    bet_type = request.args.get('betType') or 'ALL'
+    try:
+        items = data_engine.top_picks(market, bet_type, pool)
+    except ValueError as e:
+        return jsonify({"items": [], "error": str(e)}), 400
+    return jsonify({"items": items, "market": market, "betType": bet_type,
+                    "sync": data_engine.leaderboards.last_sync, "timestamp": datetime.now().isoformat()})
+
+@app.route("/api/<sport>/performance")
+def get_performance(sport="nfl"):
+    """Running record of every published pick, overall and by market / book / week"""
+    data_engine = engines.get('data')
+    if not data_engine or data_engine.ledger is None:
+        return jsonify({"error": "Pick ledger unavailable"}), 503
+    ledger = data_engine.ledger
+    return jsonify({"summary": ledger.summary(), "byMarket": ledger.breakdown('market'),
+                    "byBook": ledger.breakdown('book'), "byWeek": ledger.breakdown('week'),
+                    "lastGrade": ledger.last_grade, "timestamp": datetime.now().isoformat()})
+
+@app.route("/api/<sport>/picks/grade", methods=['POST'])
+def grade_picks(sport="nfl"):
+    """Settle published picks against the SportsData results"""
+    data_engine = engines.get('data')
+    sportsdata = engines.get('sportsdata')
+    if not data_engine or sportsdata is None or sportsdata.store is None:
+        return jsonify({"success": False, "error": "Data engine or SportsData store unavailable"}), 503
+    try:
+        stats = data_engine.grade_picks(sportsdata.store)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 503
+    return jsonify({"success": True, "grading": stats, "summary": data_engine.ledger.summary(),
+                    "timestamp": datetime.now().isoformat()})
 
 @app.route("/api/<sport>/refresh", methods=['POST'])
 def refresh_data(sport="nfl"):
-    """Refresh data endpoint"""
-    return jsonify({"success": True, "message": "Data refreshed", "timestamp": datetime.now().isoformat()})
+    """Queue a background refresh of every cached upstream payload past its TTL"""
+    data_engine = engines.peek('data')
+    queued = []
+    if data_engine:
+        # Fresh keys are skipped, so callers cannot force paid refetches
+        queued = [key for key in data_engine.tracked_keys()
+                  if data_engine.refresh_in_background(key)]
+    return jsonify({"success": True, "message": "Data refresh queued", "refreshing": queued,
+                    "timestamp": datetime.now().isoformat()})
+
+@app.route("/api/<sport>/simulate", methods=['POST'])
+def simulate_slate(sport="nfl"):
+    """Monte Carlo the cached slate; prop edges are then scored against it"""
+    data_engine = engines.get('data')
+    if not data_engine:
+        return jsonify({"success": False, "error": "Data engine unavailable"}), 503
+    from simulator import MAX_SIMULATIONS, SIMULATIONS
+    body = request.get_json(silent=True) or {}
+    try:
+        simulations = max(1, min(int(body.get('simulations', SIMULATIONS)), MAX_SIMULATIONS))
+        seed = body.get('seed')
+        data_engine.simulate_slate(simulations, None if seed is None else int(seed))
+    except (TypeError, ValueError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    return jsonify({"success": True, "simulation": data_engine.simulation_status(),
+                    "timestamp": datetime.now().isoformat()})
+
+@app.route("/api/<sport>/backtest", methods=['POST'])
+def run_backtest(sport="nfl"):
+    """Replay stored odds through the edge and sizing pipeline and grade every pick"""
+    data_engine = engines.get('data')
+    sportsdata = engines.get('sportsdata')
+    if not data_engine or sportsdata is None or sportsdata.store is None:
+        return jsonify({"success": False, "error": "Data engine or SportsData store unavailable"}), 503
+    body = request.get_json(silent=True) or {}
+    try:
+        weeks = body.get('weeks')
+        report = data_engine.run_backtest(
+            sportsdata.store,
+            min_edge=float(body.get('minEdge', 0.05)),
+            decision_hours=float(body.get('decisionHours', 24)),
+            weeks=[int(week) for week in weeks] if weeks else None,
+            details=bool(body.get('details', False)))
+    except (TypeError, ValueError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    return jsonify({"success": True, "report": report, "timestamp": datetime.now().isoformat()})
 
 @app.route("/<path:path>")
 def catch_all(path):
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Backtest
+Replays past weeks through the edge and sizing pipeline and grades every pick
+
+For each regular-season week with stored odds:
+  1. every line-history series of the week's events is read at the
+     decision time (DECISION_HOURS before kickoff) and at the close (the
+     last tick at or before kickoff) and rebuilt into one OddsSnapshot
+     per market
+  2. decision snapshots are scored exactly as live boards are (projection
+     model where it has an opinion, else no-vig consensus); the best-EV
+     book of every outcome with at least `min_edge` is a pick
+  3. the week's picks are sized together by portfolio.optimize()
+
+Weeks are independent, so they fan out across processes; each worker
+opens the line history read-only. Picks are then graded in one pass:
+player props by a sorted player-week join into PlayerGame, game lines
+against final scores from Score (TeamGame fills gaps). The report has
+win rate, units and ROI at one unit per pick, closing line value (the
+closing no-vig probability times the price taken, less one), and the
+bankroll curve and drawdown of the Kelly-sized stakes.
+"""
+import bisect
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import portfolio
+import prop_scanner
+from leaderboards import best_rows, pick_id
+from line_history import LineHistoryStore
+from odds_snapshot import OddsSnapshot
+from player_search import fold
+from projection_model import MARKET_STATS, OVER_SIDES, STAT_NAMES, WEEK_SPAN, numeric_column, player_names, stat_matrix
+from refresh_scheduler import parse_kickoff
+
+# Picks are taken this long before kickoff
+DECISION_HOURS = 24
+# Same edge bar as live recommendations
+MIN_EDGE = 0.05
+# SportsData SeasonType of regular-season rows
+REGULAR_SEASON = 1
+# An event matches a scheduled game kicking off within this window
+MATCH_WINDOW = 2 * 24 * 3600
+GAME_MARKETS = ('h2h', 'spreads', 'totals')
+# First-TD props need play-by-play, so they are not replayed
+GRADED_MARKETS = set(GAME_MARKETS) | (set(MARKET_STATS) - {'player_first_td'})
+PICK_COLUMNS = ('id', 'event', 'market', 'participant', 'side', 'point', 'book', 'price', 'decimal',
+                'probability', 'implied', 'edge', 'from_model', 'clv', 'stake', 'kickoff', 'week')
+
+
+def _timestamp(table, row: int) -> Optional[float]:
+    """Epoch seconds of a SportsData game row (naive times read as UTC, within MATCH_WINDOW)"""
+    for column in ('DateTime', 'Date', 'Day'):
+        value = table.value(row, column)
+        if value:
+            try:
+                moment = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+            except ValueError:
+                continue
+            if moment.tzinfo is None:
+                moment = moment.replace(tzinfo=timezone.utc)
+            return moment.timestamp()
+    return None
+
+
+def _regular_season(table) -> np.ndarray:
+    season_type = numeric_column(table, 'SeasonType')
+    if season_type is None:
+        return np.ones(len(table), dtype=bool)
+    return season_type == REGULAR_SEASON
+
+
+def _is_final(table, row: int) -> bool:
+    for column in ('IsOver', 'IsGameOver', 'IsClosed'):
+        if table.get(column) is not None:
+            return bool(table.value(row, column))
+    status = table.value(row, 'Status')
+    return status is None or str(status).upper().startswith('F')
+
+
+class SeasonResults:
+    """Final scores per game and box-score stats per player-week"""
+
+    def __init__(self):
+        # Games: folded home / away names, kickoff, week and final score
+        self.games: List[Dict] = []
+        self._by_teams: Dict[Tuple[str, str], List[int]] = {}
+        self._seen = set()
+        self.players: Dict[str, int] = {}
+        # Stat rows sorted by player * WEEK_SPAN + week
+        self.keys = np.empty(0, dtype=np.int64)
+        self.stats = np.empty((0, len(STAT_NAMES)))
+
+    @classmethod
+    def from_store(cls, store) -> 'SeasonResults':
+        results = cls()
+        teams = store.get('Team')
+        names = {}
+        if teams is not None and teams.get('Key') is not None and teams.get('FullName') is not None:
+            names = {k: n for k, n in zip(teams.get('Key'), teams.get('FullName')) if k and n}
+        results._add_games(store.get('Score'), 'HomeTeam', 'AwayTeam', 'HomeScore', 'AwayScore', names)
+        team_games = store.get('TeamGame')
+        if team_games is not None and team_games.get('HomeOrAway') is not None:
+            results._add_games(team_games, 'Team', 'Opponent', 'Score', 'OpponentScore', names,
+                               rows=team_games.get('HomeOrAway').indices('HOME'))
+        results._add_players(store.get('PlayerGame'))
+        print(f"✅ Backtest results: {len(results.games)} final games, {len(results.keys)} player-weeks")
+        return results
+
+    def _add_games(self, table, home: str, away: str, home_score: str, away_score: str,
+                   names: Dict[str, str], rows: Optional[List[int]] = None):
+        if table is None or any(table.get(c) is None for c in (home, away, home_score, away_score, 'Week')):
+            return
+        regular = _regular_season(table)
+        for row in (range(len(table)) if rows is None else rows):
+            teams = (fold(names.get(table.value(row, home), table.value(row, home))),
+                     fold(names.get(table.value(row, away), table.value(row, away))))
+            kickoff = _timestamp(table, row)
+            scores = table.value(row, home_score), table.value(row, away_score)
+            if not regular[row] or None in scores or not _is_final(table, row):
+                continue
+            week = int(table.value(row, 'Week'))
+            if (frozenset(teams), week) in self._seen:
+                continue  # already known from Score
+            self._seen.add((frozenset(teams), week))
+            self._by_teams.setdefault(teams, []).append(len(self.games))
+            self.games.append({'home': teams[0], 'away': teams[1], 'kickoff': kickoff,
+                               'week': week,
+                               'home_score': float(scores[0]), 'away_score': float(scores[1])})
+
+    def _add_players(self, table):
+        names, weeks = player_names(table), numeric_column(table, 'Week')
+        if names is None or weeks is None:
+            print("⚠️ Backtest: PlayerGame has no Name/Week columns; props cannot be graded")
+            return
+        stats, _ = stat_matrix(table)
+        played = numeric_column(table, 'Played')
+        players = self.players
+        codes = np.array([players.setdefault(name, len(players)) if name else -1 for name in names], dtype=np.int64)
+        ok = (codes >= 0) & ~np.isnan(weeks) & (weeks >= 0) & (weeks < WEEK_SPAN) & _regular_season(table)
+        if played is not None:
+            ok &= played != 0
+        keys = codes * WEEK_SPAN + np.where(ok, weeks, 0).astype(np.int64)
+        self.keys, first = np.unique(keys[ok], return_index=True)
+        self.stats = stats[np.flatnonzero(ok)[first]]
+
+    def match(self, home_team: str, away_team: str, kickoff: Optional[float]) -> Optional[int]:
+        """Game index for an event (either home / away order), nearest kickoff within MATCH_WINDOW"""
+        home, away = fold(home_team), fold(away_team)
+        candidates = self._by_teams.get((home, away), []) + self._by_teams.get((away, home), [])
+        best, best_gap = None, MATCH_WINDOW
+        for game in candidates:
+            start = self.games[game]['kickoff']
+            gap = MATCH_WINDOW if kickoff is None or start is None else abs(start - kickoff)
+            if gap <= best_gap:
+                best, best_gap = game, gap
+        return best
+
+    def player_stats(self, names: List[str], weeks: np.ndarray) -> np.ndarray:
+        """picks x STAT_NAMES box-score rows (NaN where the player has no game that week)"""
+        if not len(self.keys):
+            return np.full((len(names), len(STAT_NAMES)), np.nan)
+        codes = np.array([self.players.get(fold(name), -1) for name in names], dtype=np.int64)
+        keys = codes * WEEK_SPAN + np.asarray(weeks, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        found = (codes >= 0) & (self.keys[pos] == keys)
+        return np.where(found[:, None], self.stats[pos], np.nan)
+
+
+# Replay -----------------------------------------------------------------
+
+def _snapshot(board: Dict[str, Dict[str, List[Dict]]], events: Dict[str, Dict], market: str) -> OddsSnapshot:
+    """OddsSnapshot from {event id: {book: [outcomes]}}"""
+    payload = []
+    for event_id, books in board.items():
+        payload.append(dict(events[event_id], bookmakers=[
+            {'key': book, 'title': book, 'markets': [{'key': market, 'outcomes': outcomes}]}
+            for book, outcomes in books.items()]))
+    return OddsSnapshot.from_events(payload)
+
+
+def replay_week(history: LineHistoryStore, model, week: int, events: List[Dict], keys: List[Tuple],
+                min_edge: float = MIN_EDGE, decision_hours: float = DECISION_HOURS) -> Dict[str, list]:
+    """
+    Picks of one week, as PICK_COLUMNS lists
+
+    Args:
+        events: Line-history event dicts with a `kickoff` timestamp
+        keys: The events' line-history series keys
+    """
+    by_id = {event['id']: event for event in events}
+    # market -> {event id -> {book -> [outcomes]}} at decision time and at the close
+    decision: Dict[str, Dict] = {}
+    close: Dict[str, Dict] = {}
+    for key in keys:
+        event_id, market, book, participant, side = key
+        kickoff = by_id[event_id]['kickoff']
+        ticks = history.ticks(key)
+        times = [tick[0] for tick in ticks]
+        for moment, board in ((kickoff - decision_hours * 3600, decision), (kickoff, close)):
+            i = bisect.bisect_right(times, moment) - 1
+            if i < 0:
+                continue
+            outcome = {'name': side, 'price': ticks[i][1], 'point': ticks[i][2]}
+            if participant != side:
+                outcome['description'] = participant
+            board.setdefault(market, {}).setdefault(event_id, {}).setdefault(book, []).append(outcome)
+
+    picks: Dict[str, list] = {column: [] for column in PICK_COLUMNS}
+    bets = []
+    for market, board in decision.items():
+        snapshot = _snapshot(board, by_id, market)
+        probability = model.snapshot_probabilities(snapshot, week) if model is not None and len(model) else None
+        scores = prop_scanner.score_snapshot(snapshot, probability)
+        rows = best_rows(snapshot, scores)
+        rows = rows[scores['edge'][rows] >= min_edge]
+        if not len(rows):
+            continue
+
+        closing_fair = {}
+        if market in close:
+            closing = _snapshot(close[market], by_id, market)
+            fair = prop_scanner.score_snapshot(closing)['fair']
+            # The consensus is per outcome, so one row per outcome (any book) will do
+            closing_fair = {pick_id(closing, row): float(fair[row])
+                            for row in best_rows(closing, {'ev': fair, 'probability': fair}).tolist()}
+
+        for row in rows.tolist():
+            outcome = snapshot.outcome(row)
+            point = outcome['point']
+            pid = pick_id(snapshot, row)
+            decimal = 1.0 / float(scores['implied'][row])
+            event = by_id[outcome['event_id']]
+            player = None if market in GAME_MARKETS else f"{outcome['event_id']}:{fold(outcome['participant'])}"
+            values = {
+                'id': pid, 'event': outcome['event_id'], 'market': market,
+                'participant': outcome['participant'], 'side': outcome['name'],
+                'point': np.nan if point is None else point, 'book': outcome['bookmaker'],
+                'price': outcome['price'], 'decimal': decimal, 'probability': float(scores['probability'][row]),
+                'implied': float(scores['implied'][row]), 'edge': float(scores['edge'][row]),
+                'from_model': bool(scores['from_model'][row]),
+                'clv': closing_fair.get(pid, np.nan) * decimal - 1.0, 'stake': 0.0,
+                'kickoff': event['kickoff'], 'week': week
+            }
+            for column in PICK_COLUMNS:
+                picks[column].append(values[column])
+            bets.append({'probability': values['probability'], 'decimal': decimal, 'game': outcome['event_id'],
+                         'player': player, 'book': outcome['bookmaker'], 'event_id': outcome['event_id'],
+                         'market': market, 'participant': outcome['participant'], 'side': outcome['name'],
+                         'point': outcome['point']})
+
+    if bets:
+        picks['stake'] = portfolio.optimize(bets)['stakes'].tolist()
+    return picks
+
+
+_worker: Dict = {}
+
+
+def _init_worker(history_path: str, model):
+    _worker['history'] = LineHistoryStore(history_path, read_only=True)
+    _worker['model'] = model
+
+
+def _replay(job) -> Dict[str, list]:
+    return replay_week(_worker['history'], _worker['model'], *job)
+
+
+# Grading ----------------------------------------------------------------
+
+def grade(picks: Dict[str, np.ndarray], results: SeasonResults, games: np.ndarray) -> np.ndarray:
+    """
+    +1 win, -1 loss, 0 push, NaN void / ungradable per pick
+
+    Args:
+        games: SeasonResults game index per pick
+    """
+    n = len(picks['market'])
+    market, side = picks['market'], np.array([(s or '').lower() for s in picks['side']], dtype=object)
+    point = picks['point'].astype(np.float64)
+    value = np.full(n, np.nan)
+    line = point.copy()
+    over = np.isin(side, list(OVER_SIDES))
+
+    is_game = np.isin(market, GAME_MARKETS)
+    if is_game.any():
+        idx = np.flatnonzero(is_game)
+        home = np.array([results.games[g]['home_score'] for g in games[idx]])
+        away = np.array([results.games[g]['away_score'] for g in games[idx]])
+        team = np.array([fold(p) for p in picks['participant'][idx]], dtype=object)
+        is_home = team == np.array([results.games[g]['home'] for g in games[idx]], dtype=object)
+        is_away = team == np.array([results.games[g]['away'] for g in games[idx]], dtype=object)
+        margin = np.where(is_home, home - away, np.where(is_away, away - home, np.nan))
+        kind = market[idx]
+        value[idx] = np.where(kind == 'totals', home + away, margin)
+        # Moneyline: margin over 0; spread: margin over -point; both priced as "over"
+        line[idx] = np.where(kind == 'totals', point[idx], np.where(kind == 'spreads', -point[idx], 0.0))
+        over[idx] = np.where(kind == 'totals', over[idx], True)
+
+    is_prop = ~is_game
+    if is_prop.any():
+        idx = np.flatnonzero(is_prop)
+        stat = np.array([STAT_NAMES.index(MARKET_STATS[m]) for m in market[idx]], dtype=np.int64)
+        box = results.player_stats(picks['participant'][idx].tolist(), picks['week'][idx])
+        value[idx] = box[np.arange(len(idx)), stat]
+        # No line (anytime TD "Yes"): at least one
+        line[idx] = np.where(np.isnan(point[idx]), 0.5, point[idx])
+
+    outcome = np.sign(value - line)
+    return np.where(over, outcome, -outcome)
+
+
+def _drawdown(curve: np.ndarray, relative: bool) -> float:
+    peak = np.maximum.accumulate(curve)
+    fall = (peak - curve) / peak if relative else peak - curve
+    return float(fall.max()) if len(fall) else 0.0
+
+
+def _record(outcome: np.ndarray, profit: np.ndarray, edge: np.ndarray, clv: np.ndarray) -> Dict:
+    graded = ~np.isnan(outcome)
+    wins, losses = int((outcome == 1).sum()), int((outcome == -1).sum())
+    units = float(profit[graded].sum())
+    has_clv = ~np.isnan(clv)
+    return {
+        'picks': int(graded.sum()),
+        'wins': wins,
+        'losses': losses,
+        'pushes': int((outcome == 0).sum()),
+        'win_rate': round(wins / (wins + losses), 4) if wins + losses else None,
+        'units': round(units, 2),
+        'roi': round(units / int(graded.sum()), 4) if graded.any() else None,
+        'avg_edge': round(float(edge[graded].mean()), 4) if graded.any() else None,
+        'clv': round(float(clv[has_clv].mean()), 4) if has_clv.any() else None,
+        'beat_close': round(float((clv[has_clv] > 0).mean()), 4) if has_clv.any() else None
+    }
+
+
+def summarize(picks: Dict[str, np.ndarray], outcome: np.ndarray) -> Dict:
+    """Season record, closing line value, bankroll curve and breakdowns by market and week"""
+    order = np.lexsort((picks['kickoff'], picks['week']))
+    picks = {column: values[order] for column, values in picks.items()}
+    outcome = outcome[order]
+    graded = ~np.isnan(outcome)
+    profit = np.where(outcome > 0, picks['decimal'] - 1.0, np.where(outcome < 0, -1.0, 0.0))
+    profit = np.where(graded, profit, 0.0)
+    report = _record(outcome, profit, picks['edge'], picks['clv'])
+    report['ungraded'] = int((~graded).sum())
+
+    # Flat units and Kelly bankroll (stakes are fractions of the bankroll at the week's start)
+    units = np.concatenate([[0.0], np.cumsum(profit)])
+    weeks, first, counts = np.unique(picks['week'], return_index=True, return_counts=True)
+    pnl = picks['stake'] * profit
+    week_return = np.add.reduceat(pnl, first) if len(pnl) else np.empty(0)
+    start = np.concatenate([[1.0], np.cumprod(1.0 + week_return)])
+    within = np.cumsum(pnl) - np.repeat(np.cumsum(week_return) - week_return, counts)
+    bankroll = np.concatenate([[1.0], np.repeat(start[:-1], counts) * (1.0 + within)])
+    report.update({
+        'units_drawdown': round(_drawdown(units, False), 2),
+        'bankroll': round(float(start[-1]), 4),
+        'max_drawdown': round(_drawdown(bankroll, True), 4),
+        'avg_stake': round(float(picks['stake'][graded].mean()), 4) if graded.any() else None
+    })
+
+    report['by_market'] = {}
+    for market in np.unique(picks['market']).tolist():
+        mask = picks['market'] == market
+        report['by_market'][market] = _record(outcome[mask], profit[mask], picks['edge'][mask], picks['clv'][mask])
+    report['by_week'] = []
+    for week, lo, count, end in zip(weeks.tolist(), first.tolist(), counts.tolist(), start[1:].tolist()):
+        week_slice = slice(lo, lo + count)
+        report['by_week'].append(dict(_record(outcome[week_slice], profit[week_slice], picks['edge'][week_slice],
+                                              picks['clv'][week_slice]), week=week, bankroll=round(end, 4)))
+    return report
+
+
+# Entry point --------------------------------------------------------------
+
+def run(store, history: LineHistoryStore, model=None, min_edge: float = MIN_EDGE,
+        decision_hours: float = DECISION_HOURS, weeks: Optional[List[int]] = None,
+        processes: Optional[int] = None, results: Optional[SeasonResults] = None,
+        details: bool = False) -> Dict:
+    """
+    Replay and grade every stored week
+
+    Args:
+        store: SportsDataStore with Score / TeamGame / PlayerGame / Team
+        history: Line history to replay (flushed first if writable)
+        model: ProjectionModel (None = no-vig consensus only)
+        weeks: Only these weeks
+        processes: Worker processes (None = one per CPU, 1 = in-process)
+        details: Include every pick and its result in the report
+
+    Returns:
+        Season report (see summarize) plus replay stats
+    """
+    started = time.perf_counter()
+    results = results or SeasonResults.from_store(store)
+    if not history.read_only:
+        history.flush()
+
+    # Stored events -> week and final score
+    events: Dict[str, Dict] = {}
+    game_of: Dict[str, int] = {}
+    for event_id, meta in history.events.items():
+        kickoff = parse_kickoff(meta.get('commence_time'))
+        game = results.match(meta.get('home_team'), meta.get('away_team'), kickoff) if kickoff else None
+        if game is None or (weeks is not None and results.games[game]['week'] not in weeks):
+            continue
+        events[event_id] = dict(meta, kickoff=kickoff)
+        game_of[event_id] = game
+    by_week: Dict[int, Tuple[List[Dict], List[Tuple]]] = {}
+    for event_id, event in events.items():
+        by_week.setdefault(results.games[game_of[event_id]]['week'], ([], []))[0].append(event)
+    for key in history.keys():
+        if key[0] in events and key[1] in GRADED_MARKETS:
+            by_week[results.games[game_of[key[0]]]['week']][1].append(key)
+
+    jobs = [(week, week_events, keys, min_edge, decision_hours)
+            for week, (week_events, keys) in sorted(by_week.items()) if keys]
+    if processes == 1 or len(jobs) < 2:
+        weekly = [replay_week(history, model, *job) for job in jobs]
+    else:
+        try:
+            # Spawned, not forked: the web worker calling this runs threads
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(history.path, model),
+                                     mp_context=multiprocessing.get_context('spawn')) as pool:
+                weekly = list(pool.map(_replay, jobs))
+        except (OSError, BrokenProcessPool) as e:
+            print(f"⚠️ Backtest process pool unavailable ({e}); replaying in-process")
+            weekly = [replay_week(history, model, *job) for job in jobs]
+    replayed = time.perf_counter()
+
+    picks = {column: np.array([value for week in weekly for value in week[column]],
+                              dtype=np.float64 if column in ('point', 'decimal', 'probability', 'implied', 'edge',
+                                                             'clv', 'stake', 'kickoff') else object)
+             for column in PICK_COLUMNS}
+    picks['week'] = picks['week'].astype(np.int64)
+    games = np.array([game_of[event] for event in picks['event']], dtype=np.int64)
+    outcome = grade(picks, results, games)
+    report = summarize(picks, outcome)
+    report.update({
+        'weeks': len(jobs),
+        'events': len(events),
+        'series': sum(len(job[2]) for job in jobs),
+        'min_edge': min_edge,
+        'decision_hours': decision_hours,
+        'probability_source': 'model' if model is not None and len(model) else 'consensus',
+        'replay_seconds': round(replayed - started, 3),
+        'seconds': round(time.perf_counter() - started, 3)
+    })
+    if details:
+        report['details'] = [dict({column: (None if isinstance(v, float) and np.isnan(v) else
+                                            v.item() if hasattr(v, 'item') else v)
+                                   for column, v in zip(PICK_COLUMNS, row)}, result=None if np.isnan(o) else int(o))
+                             for row, o in zip(zip(*(picks[c] for c in PICK_COLUMNS)), outcome)]
+    print(f"✅ Backtest: {report['picks']} graded picks over {report['weeks']} weeks in {report['seconds']}s "
+          f"(win rate {report['win_rate']}, ROI {report['roi']})")
+    return report
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Backtest: a synthetic season replayed and graded
+
+Builds a 17-week regular season (16 games a week, six books) in a
+temporary line history: game lines plus passing / rushing / receiving
+yards and receptions props, each ingested six times between the open
+(6 days out) and the close (30 minutes out) as the books' estimates move
+toward the truth. Box scores and final scores are drawn from the true
+distributions; projections are the truth plus noise. Times backtest.run()
+in-process and across one process per CPU and prints the season report.
+Run: python benchmarks/bench_backtest.py
+"""
+import math
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import backtest
+from line_history import LineHistoryStore
+from odds_snapshot import OddsSnapshot
+from projection_model import ProjectionModel, normal_sf
+from sportsdata_store import SportsDataStore, Table, build_column
+
+WEEKS = 17
+TEAMS = 32
+BOOKS = ['draftkings', 'fanduel', 'betmgm', 'caesars', 'pointsbet', 'bet365']
+# Hours before kickoff each board is ingested
+INGEST_HOURS = [144, 72, 30, 12, 3, 0.5]
+SEASON_START = 1_757_000_000
+VIG = 1.045
+# Roster per team: (position, market, stat, mean range, coefficient of variation or None for Poisson)
+ROSTER = [
+    ('QB', 'player_pass_yds', 'PassingYards', (200, 290), 0.30),
+    ('RB1', 'player_rush_yds', 'RushingYards', (45, 90), 0.55),
+    ('RB2', 'player_rush_yds', 'RushingYards', (20, 45), 0.55),
+    ('WR1', 'player_reception_yds', 'ReceivingYards', (55, 90), 0.60),
+    ('WR2', 'player_reception_yds', 'ReceivingYards', (35, 60), 0.60),
+    ('WR1', 'player_receptions', 'Receptions', (4, 7), None),
+    ('WR2', 'player_receptions', 'Receptions', (2.5, 5), None),
+]
+
+
+def american(p):
+    p = min(max(p, 0.02), 0.98)
+    return round(-100 * p / (1 - p)) if p >= 0.5 else round(100 * (1 - p) / p)
+
+
+def poisson_sf(k, lam):
+    term = cdf = math.exp(-lam)
+    for i in range(1, int(k) + 1):
+        term *= lam / i
+        cdf += term
+    return 1 - cdf
+
+
+def poisson(lam, rng):
+    threshold, k, p = math.exp(-lam), 0, rng.random()
+    while p > threshold:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+def over_probability(estimate, point, cv):
+    if cv is None:
+        return poisson_sf(math.floor(point), max(estimate, 0.1))
+    return float(normal_sf((point - estimate) / (cv * max(estimate, 1.0))))
+
+
+def table(name, rows):
+    header = list(rows[0])
+    return Table(name, [build_column(h, ['' if r[h] is None else str(r[h]) for r in rows]) for h in header])
+
+
+def make_season(path, rng):
+    """Line history in `path`, plus the SportsData tables of the season's results"""
+    teams = [(f"T{i}", f"City{i} Club{i}", rng.gauss(0, 4)) for i in range(TEAMS)]
+    players = {(key, pos, market): (f"{key} {pos}", rng.uniform(*low_high), cv)
+               for key, _, _ in teams for pos, market, _, low_high, cv in ROSTER}
+    history = LineHistoryStore(path)
+    scores, box, projections = [], {}, []
+    for week in range(1, WEEKS + 1):
+        order = rng.sample(teams, TEAMS)
+        boards = {hours: [] for hours in INGEST_HOURS}
+        for g in range(TEAMS // 2):
+            home, away = order[2 * g], order[2 * g + 1]
+            kickoff = SEASON_START + (week - 1) * 7 * 86400 + (g % 3) * 10800
+            commence = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(kickoff))
+            margin_mu, total_mu = home[2] - away[2] + 2.0, 44 + rng.gauss(0, 4)
+            margin, total = rng.gauss(margin_mu, 13), max(rng.gauss(total_mu, 10), 6)
+            home_score = max(round((total + margin) / 2), 0)
+            scores.append({'SeasonType': 1, 'Week': week, 'HomeTeam': home[0], 'AwayTeam': away[0],
+                           'HomeScore': home_score, 'AwayScore': max(round(total) - home_score, 0),
+                           'DateTime': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(kickoff)), 'IsOver': True})
+
+            # Truth, the books' open and close estimates, and the lines set at the open
+            lines = []
+            for (team, pos, market), (name, mean, cv) in players.items():
+                if team not in (home[0], away[0]):
+                    continue
+                stat = next(s for p, m, s, _, _ in ROSTER if p == pos and m == market)
+                truth = mean * math.exp(rng.gauss(0, 0.1))
+                actual = poisson(truth, rng) if cv is None else max(rng.gauss(truth, cv * truth), 0.0)
+                box.setdefault((name, week), {'Name': name, 'Week': week, 'SeasonType': 1, 'Played': 1,
+                                              'PassingYards': 0, 'RushingYards': 0, 'ReceivingYards': 0,
+                                              'Receptions': 0})[stat] = round(actual, 1)
+                projections.append({'Name': name, 'Week': week, 'Team': team, 'Stat': stat,
+                                    'Value': round(truth * math.exp(rng.gauss(0, 0.07)), 1)})
+                opened = truth * math.exp(rng.gauss(0, 0.14))
+                closed = truth * math.exp(rng.gauss(0, 0.05))
+                point = math.floor(opened) + 0.5
+                lines.append((name, market, point, cv, opened, closed))
+            spread = round((margin_mu + rng.gauss(0, 3)) * 2) / 2
+            lines.append(('spread', 'spreads', spread, None, margin_mu + rng.gauss(0, 3), margin_mu + rng.gauss(0, 1)))
+            lines.append(('total', 'totals', round(total_mu + rng.gauss(0, 2)) + 0.5, None,
+                          total_mu + rng.gauss(0, 3), total_mu + rng.gauss(0, 1)))
+            lines.append(('moneyline', 'h2h', 0.0, None, margin_mu + rng.gauss(0, 3), margin_mu + rng.gauss(0, 1)))
+
+            for hours in INGEST_HOURS:
+                w = 1 - hours / INGEST_HOURS[0]
+                event = {'id': f"w{week}g{g}", 'home_team': home[1], 'away_team': away[1],
+                         'commence_time': commence, 'bookmakers': []}
+                for book in BOOKS:
+                    markets = {}
+                    for name, market, point, cv, opened, closed in lines:
+                        estimate = opened * (1 - w) + closed * w
+                        estimate *= 1 + rng.gauss(0, 0.02) if market not in ('spreads', 'h2h') else 1
+                        outcomes = markets.setdefault(market, [])
+                        if market in ('spreads', 'h2h'):
+                            # Home margin estimate vs the line, normal with sd 13
+                            line = -point if market == 'spreads' else 0.0
+                            p = float(normal_sf((line - estimate) / 13.0))
+                            for team, side_p, side_point in ((home[1], p, point), (away[1], 1 - p, -point)):
+                                outcome = {'name': team, 'price': american(side_p * VIG)}
+                                if market == 'spreads':
+                                    outcome['point'] = side_point
+                                outcomes.append(outcome)
+                        elif market == 'totals':
+                            p = float(normal_sf((point - estimate) / 10.0))
+                            outcomes.append({'name': 'Over', 'price': american(p * VIG), 'point': point})
+                            outcomes.append({'name': 'Under', 'price': american((1 - p) * VIG), 'point': point})
+                        else:
+                            p = over_probability(estimate, point, cv)
+                            outcomes.append({'name': 'Over', 'description': name, 'price': american(p * VIG),
+                                             'point': point})
+                            outcomes.append({'name': 'Under', 'description': name,
+                                             'price': american((1 - p) * VIG), 'point': point})
+                    event['bookmakers'].append({'key': book, 'title': book, 'markets': [
+                        {'key': market, 'outcomes': outcomes} for market, outcomes in markets.items()]})
+                boards[hours].append((kickoff - hours * 3600, event))
+        for hours in INGEST_HOURS:
+            for ts, event in boards[hours]:
+                history.ingest(OddsSnapshot.from_events([event]), ts)
+    history.close()
+
+    stats = ('PassingYards', 'RushingYards', 'ReceivingYards', 'Receptions')
+    projected = {}
+    for row in projections:
+        entry = projected.setdefault((row['Name'], row['Week']), dict(
+            {'Name': row['Name'], 'Week': row['Week'], 'Team': row['Team']}, **{s: None for s in stats}))
+        entry[row['Stat']] = row['Value']
+    tables = {
+        'Team': table('Team', [{'Key': key, 'FullName': full} for key, full, _ in teams]),
+        'Score': table('Score', scores),
+        'PlayerGame': table('PlayerGame', list(box.values())),
+        'PlayerGameProjection': table('PlayerGameProjection', list(projected.values()))
+    }
+    return SportsDataStore(path, tables=tables)
+
+
+def main():
+    rng = random.Random(22)
+    path = tempfile.mkdtemp(prefix='backtest-')
+    try:
+        print("📊 Backtest: synthetic season")
+        print("=" * 60)
+        start = time.perf_counter()
+        store = make_season(path, rng)
+        print(f"   built {WEEKS} weeks of odds history in {time.perf_counter() - start:.1f} s")
+        model = ProjectionModel.fit(store.get('PlayerGameProjection'), store.get('PlayerGame'))
+        results = backtest.SeasonResults.from_store(store)
+
+        history = LineHistoryStore(path, read_only=True)
+        serial = backtest.run(store, history, model, processes=1, results=results)
+        parallel = backtest.run(store, history, model, results=results)
+        same = {k: v for k, v in serial.items() if 'seconds' not in k} == \
+               {k: v for k, v in parallel.items() if 'seconds' not in k}
+        print(f"   {serial['series']:,} series over {serial['weeks']} weeks: in-process {serial['seconds']:.2f} s, "
+              f"process pool {parallel['seconds']:.2f} s  same report: {same}")
+        print(f"   {serial['picks']} picks: win rate {serial['win_rate']:.1%}, {serial['units']:+.1f}u, "
+              f"ROI {serial['roi']:+.1%}, avg edge {serial['avg_edge']:.1%}")
+        print(f"   CLV {serial['clv']:+.2%} (beat the close {serial['beat_close']:.0%}), "
+              f"Kelly bankroll x{serial['bankroll']:.2f}, max drawdown {serial['max_drawdown']:.1%}, "
+              f"units drawdown {serial['units_drawdown']:.1f}u")
+        for market, record in serial['by_market'].items():
+            print(f"      {market:22s} {record['picks']:4d} picks  win {record['win_rate'] or 0:.1%}  "
+                  f"ROI {record['roi'] or 0:+.1%}  CLV {record['clv'] or 0:+.2%}")
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Cache backend benchmark and cross-worker sharing check
+
+Measures get/set throughput for each backend (the Redis backend talks
+to a local RESP stand-in), then starts several worker processes that
+each build a ProfessionalDataEngine against a counting stub Odds API:
+with a shared backend only the first worker spends upstream quota.
+Run: python benchmarks/bench_cache_backends.py
+"""
+import json
+import multiprocessing
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cache_backends import create_cache
+
+OPS = 5000
+WORKERS = 4
+PAYLOAD = [{'id': f'game_{i}', 'home_team': 'Home', 'away_team': 'Away',
+            'bookmakers': [{'key': 'draftkings', 'markets': [{'key': 'h2h', 'outcomes': [
+                {'name': 'Home', 'price': -120}, {'name': 'Away', 'price': 100}]}]}]}
+           for i in range(16)]
+
+
+class RespStandIn(socketserver.StreamRequestHandler):
+    """Just enough of the Redis protocol for the cache backend"""
+    store = {}
+    lock = threading.Lock()
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        parts = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            parts.append(self.rfile.read(length + 2)[:-2])
+        return parts
+
+    def bulk(self, value):
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def handle(self):
+        while True:
+            cmd = self.read_command()
+            if cmd is None:
+                return
+            name = cmd[0].upper()
+            with self.lock:
+                if name == b'GET':
+                    value, expires = self.store.get(cmd[1], (None, 0))
+                    reply = self.bulk(value if expires > time.time() else None)
+                elif name == b'SET':
+                    ttl = int(cmd[4]) / 1000 if len(cmd) > 4 else 3600
+                    self.store[cmd[1]] = (cmd[2], time.time() + ttl)
+                    reply = b"+OK\r\n"
+                elif name == b'DEL':
+                    removed = sum(1 for k in cmd[1:] if self.store.pop(k, None) is not None)
+                    reply = b":%d\r\n" % removed
+                elif name == b'SCAN':
+                    prefix = cmd[3].rstrip(b'*')
+                    keys = [k for k in self.store if k.startswith(prefix)]
+                    reply = b"*2\r\n" + self.bulk(b"0") + b"*%d\r\n" % len(keys) + b"".join(self.bulk(k) for k in keys)
+                else:
+                    reply = b"+OK\r\n"
+            self.wfile.write(reply)
+
+
+class CountingOddsApi(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.hits += 1
+        time.sleep(0.05)
+        body = json.dumps(PAYLOAD).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def throughput(url):
+    cache = create_cache(url)
+    cache.clear()
+    start = time.perf_counter()
+    for i in range(OPS):
+        cache.set(f"k{i % 64}", PAYLOAD, ttl=60)
+    set_rate = OPS / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for i in range(OPS):
+        cache.get(f"k{i % 64}")
+    get_rate = OPS / (time.perf_counter() - start)
+    print(f"   {url:<48} set {set_rate:9.0f}/s   get {get_rate:9.0f}/s")
+
+
+def worker(cache_url, odds_base, results):
+    from data_engine import ProfessionalDataEngine
+    engine = ProfessionalDataEngine(cache=create_cache(cache_url))
+    engine.odds_base_url = odds_base
+    results.put(len(engine.get_nfl_games()))
+
+
+def upstream_calls(cache_url, odds_base, server):
+    server.hits = 0
+    results = multiprocessing.Queue()
+    # Workers start one after another, like a rolling gunicorn boot
+    for _ in range(WORKERS):
+        proc = multiprocessing.Process(target=worker, args=(cache_url, odds_base, results))
+        proc.start()
+        proc.join()
+    return server.hits
+
+
+def main():
+    redis_server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), RespStandIn)
+    redis_server.daemon_threads = True
+    threading.Thread(target=redis_server.serve_forever, daemon=True).start()
+    redis_url = f"redis://127.0.0.1:{redis_server.server_address[1]}/0"
+    sqlite_url = f"sqlite://{os.path.join(tempfile.mkdtemp(), 'cache.sqlite')}"
+
+    print("🗄️  Cache backend benchmark")
+    print("=" * 78)
+    for url in ('memory://', sqlite_url, redis_url):
+        throughput(url)
+
+    odds_server = ThreadingHTTPServer(('127.0.0.1', 0), CountingOddsApi)
+    odds_server.daemon_threads = True
+    odds_server.lock = threading.Lock()
+    threading.Thread(target=odds_server.serve_forever, daemon=True).start()
+    odds_base = f"http://127.0.0.1:{odds_server.server_address[1]}/v4"
+
+    print(f"\nUpstream Odds API calls for {WORKERS} workers fetching nfl_games:")
+    for url in ('memory://', sqlite_url, redis_url):
+        create_cache(url).clear()
+        print(f"   {url:<48} {upstream_calls(url, odds_base, odds_server)} calls")
+
+
+if __name__ == "__main__":
+    main()
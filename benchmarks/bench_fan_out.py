@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Aggregate-call latency: serial sum vs concurrent fan-out
+
+A local stub stands in for SportsDataIO and the Odds API with a fixed
+delay per endpoint. generate_insights() and get_comprehensive_analysis()
+should take roughly the slowest upstream, not the sum, and a source that
+blows its deadline should produce a partial response on time.
+Run: python benchmarks/bench_fan_out.py
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data_engine import ProfessionalDataEngine
+from http_transport import HttpTransport
+
+# Seconds of simulated upstream latency per endpoint / market
+DELAYS = {
+    'Scores': 0.30,
+    'Players': 0.40,
+    'h2h,spreads,totals': 0.50,
+    'player_anytime_td': 0.35,
+    'player_rush_yds': 0.45,
+    'player_reception_yds': 0.25,
+}
+
+
+class DelayedProvider(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    extra_delay = {}
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        markets = parse_qs(parts.query).get('markets')
+        # Odds API calls are keyed by market, SportsDataIO by resource name
+        key = markets[0] if markets else parts.path.split('/json/')[-1].split('/')[0]
+        time.sleep(DELAYS.get(key, 0.1) + self.extra_delay.get(key, 0))
+        body = json.dumps([{'id': 'g1', 'bookmakers': []}]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_engine(base):
+    engine = ProfessionalDataEngine(http=HttpTransport())
+    engine.odds_api_key = engine.sportsdata_api_key = 'bench'
+    engine.odds_base_url = f"{base}/v4"
+    engine.sportsdata_base_url = f"{base}/v3/nfl"
+    return engine
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), DelayedProvider)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print("🧵 Fan-out benchmark")
+    print("=" * 64)
+
+    insights_serial = (DELAYS['Scores'] + DELAYS['Players'] + DELAYS['h2h,spreads,totals']) * 1000
+    insights_max = max(DELAYS['Scores'], DELAYS['Players'], DELAYS['h2h,spreads,totals']) * 1000
+    ms, insights = timed(make_engine(base).generate_insights)
+    print(f"generate_insights           {ms:7.0f} ms  (serial would be {insights_serial:.0f}, "
+          f"slowest source {insights_max:.0f})  sources={insights['data_sources']}")
+
+    props = ['player_anytime_td', 'player_rush_yds', 'player_reception_yds']
+    analysis_serial = sum(DELAYS[m] for m in props) * 1000
+    analysis_max = max(DELAYS[m] for m in props) * 1000
+    ms, analysis = timed(lambda: make_engine(base).get_comprehensive_analysis("Christian McCaffrey"))
+    print(f"get_comprehensive_analysis  {ms:7.0f} ms  (serial would be {analysis_serial:.0f}, "
+          f"slowest market {analysis_max:.0f})")
+
+    DelayedProvider.extra_delay = {'Players': 3.0}
+    engine = make_engine(base)
+    engine.source_deadlines['players'] = 1.0
+    ms, insights = timed(engine.generate_insights)
+    print(f"players stalled 3s, 1s deadline: {ms:7.0f} ms  partial={insights['partial']} "
+          f"missing={insights['missing_sources']}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+HTTP transport benchmark against a local stub provider
+
+The stub speaks HTTP/1.1 keep-alive, gzips its JSON payload and fails a
+share of requests with 503 so retries are exercised. Compares bare
+requests.get (a new TCP connection per call) with the pooled transport.
+Run: python benchmarks/bench_http_transport.py
+"""
+import gzip
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from http_transport import HttpTransport
+
+CALLS = 400
+WORKERS = 8
+PAYLOAD = json.dumps([{'id': f'game_{i}', 'home_team': 'Home', 'away_team': 'Away',
+                       'bookmakers': [{'key': 'draftkings', 'markets': []}]} for i in range(16)]).encode()
+
+
+class StubProvider(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    connections = 0
+    requests_seen = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StubProvider.lock:
+            StubProvider.connections += 1
+
+    def do_GET(self):
+        with StubProvider.lock:
+            StubProvider.requests_seen += 1
+            flaky = StubProvider.requests_seen % 25 == 0
+        if flaky and self.path.startswith('/flaky'):
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = PAYLOAD
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(label, fetch, url):
+    StubProvider.connections = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(WORKERS) as pool:
+        results = list(pool.map(lambda _: fetch(url), range(CALLS)))
+    elapsed = time.perf_counter() - start
+    ok = sum(1 for r in results if r.status_code == 200)
+    print(f"{label:<22} {elapsed * 1000:8.1f} ms  {CALLS / elapsed:8.0f} req/s  "
+          f"{StubProvider.connections:4d} TCP connections  {ok}/{CALLS} ok")
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubProvider)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print("🌐 HTTP transport benchmark (local stub provider)")
+    print("=" * 72)
+    run("bare requests.get", lambda u: requests.get(u, timeout=5), f"{base}/odds")
+
+    transport = HttpTransport(backoff_base=0.01)
+    run("pooled transport", lambda u: transport.get(u, timeout=5), f"{base}/odds")
+    run("pooled + 4% 503s", lambda u: transport.get(u, timeout=5), f"{base}/flaky")
+
+    print("\nTransport metrics:")
+    print(json.dumps(transport.metrics(), indent=2))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
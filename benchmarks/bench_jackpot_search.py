@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Jackpot candidate search: cold search vs cached spins
+
+Uses the parlay benchmark's synthetic scored slate (16 games x 5 books,
+six prop markets) and times ParlayEngine.jackpot_candidates() for each
+tier at a $10 stake: the first call runs the knapsack search, repeat
+spins (any stake in the same bucket, unchanged slate) hit the cache.
+Also times one knapsack sweep over a single book's candidates.
+Run: python benchmarks/bench_jackpot_search.py
+"""
+import math
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from bench_parlay_engine import _Engine, make_scored
+from jackpot_search import TIERS, knapsack
+from parlay_engine import CandidatePool, ParlayEngine
+
+SPINS = 50
+
+
+class _VersionedEngine(_Engine):
+    def slate_version(self):
+        return 'bench'
+
+
+def main():
+    scored = make_scored(random.Random(23))
+    engine = ParlayEngine(_VersionedEngine(scored))
+    print("🎰 Jackpot search ($10 stake)")
+    print("=" * 60)
+
+    pool = CandidatePool.from_scored(scored, 'ev', min_probability=0.05)
+    book = next(iter(pool.by_book().values()))
+    start = time.perf_counter()
+    knapsack(-np.log(pool.probability[book]), np.log(pool.decimal[book]), pool.player[book],
+             math.log(TIERS['1M'] / 10))
+    print(f"   knapsack sweep, one book ({len(book)} legs, 1M tier): "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for tier in TIERS:
+        start = time.perf_counter()
+        candidates = engine.jackpot_candidates(tier, 10)
+        cold = (time.perf_counter() - start) * 1000
+        spins = []
+        for i in range(SPINS):
+            start = time.perf_counter()
+            engine.jackpot_candidates(tier, 10 + i % 10)
+            spins.append((time.perf_counter() - start) * 1000)
+        best = candidates[0]
+        print(f"   {tier:>4}: cold {cold:6.0f} ms, cached spin p50 {statistics.median(spins):5.2f} ms, "
+              f"{len(candidates)} candidates, best {len(best['legs'])} legs "
+              f"${best['payout']:,.0f} hit {best['estHitProb']:.2e}")
+
+
+if __name__ == '__main__':
+    main()
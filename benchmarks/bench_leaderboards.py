@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Top-pick leaderboards: incremental sync vs rebuilding and re-sorting
+
+Uses the parlay benchmark's synthetic scored slate (16 games x 5 books,
+six prop markets) and times:
+  * the first PickBoards.sync() (every board built)
+  * a re-sync with nothing changed (every market skipped)
+  * a re-sync after one market's odds move at one book (only the moved
+    outcomes re-ranked) vs a from-scratch build of the same boards
+  * a top-20 query (slice) vs sorting every pick for the request
+Run: python benchmarks/bench_leaderboards.py
+"""
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import prop_scanner
+from bench_parlay_engine import make_scored
+from leaderboards import BET_TYPES, PickBoards, best_rows, make_pick, qualifies, rank_key
+from odds_snapshot import OddsSnapshot
+
+QUERIES = 200
+
+
+def moved(snapshot, rng):
+    """The same board with every price at one book nudged by a few cents"""
+    payload = []
+    for event in snapshot.events:
+        payload.append(dict(event, bookmakers=[]))
+    books = {}
+    for row in range(len(snapshot)):
+        outcome = snapshot.outcome(row)
+        event = payload[snapshot.event[row]]
+        book = books.setdefault((snapshot.event[row], outcome['bookmaker']), {
+            'key': outcome['bookmaker'], 'title': outcome['sportsbook'],
+            'markets': [{'key': outcome['market'], 'outcomes': []}]})
+        if not any(b is book for b in event['bookmakers']):
+            event['bookmakers'].append(book)
+        price = outcome['price']
+        if outcome['bookmaker'] == 'fanduel':
+            price += rng.choice((-5, 5, 10))
+            price = price if abs(price) >= 100 else (-105 if price < 0 else 105)
+        book['markets'][0]['outcomes'].append({'name': outcome['name'], 'description': outcome['participant'],
+                                               'point': outcome['point'], 'price': price})
+    return OddsSnapshot.from_events(payload)
+
+
+def main():
+    rng = random.Random(41)
+    scored = make_scored(rng)
+    boards = PickBoards()
+    print("🏆 Top-pick leaderboards")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    boards.sync(scored)
+    print(f"   first sync: {(time.perf_counter() - start) * 1000:7.1f} ms, {len(boards):,} picks, "
+          f"{len(boards.boards)} boards")
+
+    start = time.perf_counter()
+    stats = boards.sync(scored)
+    print(f"   unchanged re-sync: {(time.perf_counter() - start) * 1000:6.2f} ms ({stats['skipped']} markets skipped)")
+
+    market, snapshot, _ = scored[0]
+    snapshot = moved(snapshot, rng)
+    rescored = [(market, snapshot, prop_scanner.score_snapshot(snapshot))] + scored[1:]
+    start = time.perf_counter()
+    stats = boards.sync(rescored)
+    incremental = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    fresh = PickBoards()
+    fresh.sync(rescored)
+    rebuild = (time.perf_counter() - start) * 1000
+    same = all(boards.top('ALL', name, 50) == fresh.top('ALL', name, 50) for name in BET_TYPES)
+    print(f"   one market moved at one book: incremental {incremental:6.1f} ms ({stats['updated']} picks re-ranked) "
+          f"vs rebuild {rebuild:6.1f} ms  same boards: {same}")
+
+    picks = [make_pick(s, scores, row) for _, s, scores in rescored for row in best_rows(s, scores).tolist()]
+    sliced, sorted_ = [], []
+    for _ in range(QUERIES):
+        name = rng.choice(list(BET_TYPES))
+        start = time.perf_counter()
+        boards.top('ALL', name, 20)
+        sliced.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        sorted((p for p in picks if qualifies(p, BET_TYPES[name])), key=lambda p: rank_key(p, BET_TYPES[name]))[:20]
+        sorted_.append((time.perf_counter() - start) * 1000)
+    print(f"   top-20 query p50: slice {statistics.median(sliced):.3f} ms vs filter + sort "
+          f"{statistics.median(sorted_):.2f} ms ({len(picks):,} picks)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Line history store: ingest rate, compression and query latency
+
+Simulates a season-ish history (SERIES prop lines, TICKS price changes
+each, roughly every few minutes), then times summary() with a 1h window
+(open/current/min/max/velocity) and a cold reload from the index.
+Run: python benchmarks/bench_line_history.py
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from line_history import LineHistoryStore
+
+SERIES = 2000
+TICKS = 500
+QUERIES = 5000
+
+
+def american(p):
+    return round(-100 * p / (1 - p)) if p >= 0.5 else round(100 * (1 - p) / p)
+
+
+def main():
+    rng = random.Random(3)
+    path = tempfile.mkdtemp(prefix='line-history-')
+    store = LineHistoryStore(path)
+    keys = [(f"evt{i // 40}", 'player_rush_yds', ['draftkings', 'fanduel'][i % 2],
+             f"Player {i}", 'Over') for i in range(SERIES)]
+    probs = [rng.uniform(0.35, 0.65) for _ in keys]
+    points = [rng.randint(300, 1200) / 10 for _ in keys]
+
+    print("📈 Line history store")
+    print("=" * 64)
+    start_ts = 1_726_000_000
+    start = time.perf_counter()
+    for t in range(TICKS):
+        ts = start_ts + t * 180
+        for i, key in enumerate(keys):
+            probs[i] = min(0.9, max(0.1, probs[i] + rng.choice([-0.01, 0.01])))
+            if rng.random() < 0.05:
+                points[i] += rng.choice([-0.5, 0.5])
+            store.record(ts, *key, american(probs[i]), points[i])
+    store.flush()
+    elapsed = time.perf_counter() - start
+    stats = store.stats()
+    print(f"   ingest: {stats['ticks']:,} ticks in {elapsed:.2f}s ({stats['ticks'] / elapsed / 1e3:.0f}k ticks/s)")
+    print(f"   on disk: {stats['bytes_on_disk'] / 1024:.0f} KB "
+          f"({stats['bytes_on_disk'] / stats['ticks']:.2f} bytes/tick vs 24 raw), "
+          f"{stats['blocks']:,} blocks in {stats['chunk_files']} chunk file(s)")
+
+    now = start_ts + TICKS * 180
+    latencies = []
+    for _ in range(QUERIES):
+        key = keys[rng.randrange(SERIES)]
+        t0 = time.perf_counter()
+        store.summary(key, window=3600, now=now)
+        latencies.append((time.perf_counter() - t0) * 1e6)
+    latencies.sort()
+    print(f"   summary(1h window): p50 {latencies[len(latencies) // 2]:.0f} µs, "
+          f"p99 {latencies[int(len(latencies) * 0.99)]:.0f} µs")
+
+    sample = store.summary(keys[0], window=3600, now=now)
+    store.close()
+    t0 = time.perf_counter()
+    reopened = LineHistoryStore(path)
+    reload_ms = (time.perf_counter() - t0) * 1000
+    assert reopened.summary(keys[0], window=3600, now=now) == sample
+    print(f"   reload index: {reload_ms:.0f} ms for {len(reopened):,} series (summaries identical)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Newsletter batch: subscriber editions across worker processes
+
+Writes a 50,000-subscriber JSONL list (70% Community, 22% Edge Access,
+8% Elite Edge) and renders the week's editions to HTML files: in-process
+and across one process per CPU, personalized and one page per tier.
+Then cuts a finished run's checkpoint back to its first half to stand in
+for an interrupted run and resumes it, and delivers 10,000 editions as
+email to a local SMTP stand-in (a threaded socket server that accepts
+and counts messages). Reports throughput and peak RSS of each run.
+Run: python benchmarks/bench_newsletter_batch.py
+"""
+import json
+import os
+import random
+import shutil
+import socketserver
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import newsletter_batch
+from bench_newsletter_templates import make_picks
+from newsletter_templates import TIERS
+
+SUBSCRIBERS = 50_000
+SMTP_SUBSCRIBERS = 10_000
+
+
+class SmtpStandIn(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept messages and count them"""
+
+    def handle(self):
+        self.wfile.write(b"220 stand-in ESMTP\r\n")
+        for line in iter(self.rfile.readline, b''):
+            verb = line[:4].upper()
+            if verb == b'DATA':
+                self.wfile.write(b"354 end with .\r\n")
+                for _ in iter(self.rfile.readline, b'.\r\n'):
+                    pass
+                with self.server.lock:
+                    self.server.messages += 1
+                self.wfile.write(b"250 queued\r\n")
+            elif verb == b'QUIT':
+                self.wfile.write(b"221 bye\r\n")
+                return
+            else:
+                self.wfile.write(b"250 ok\r\n")
+
+
+def write_subscribers(path, count, rng):
+    with open(path, 'w') as f:
+        for i in range(count):
+            tier = rng.choices(TIERS, [0.7, 0.22, 0.08])[0]
+            f.write(json.dumps({'id': f"sub{i:06d}", 'name': f"Subscriber {i}", 'email': f"sub{i}@example.com",
+                                'tier': tier}) + '\n')
+
+
+def line(label, report):
+    return (f"   {label:28s} {report['sent']:6,} sent in {report['seconds']:5.2f} s ({report['per_second']:8,.0f}/s)"
+            f"  {report['mb']:6.1f} MB  peak RSS {report['peak_rss_mb']} MB, worker {report['worker_peak_rss_mb']} MB")
+
+
+def main():
+    rng = random.Random(25)
+    root = tempfile.mkdtemp(prefix='newsletters-')
+    try:
+        subscribers = os.path.join(root, 'subscribers.jsonl')
+        write_subscribers(subscribers, SUBSCRIBERS, rng)
+        slate = {'week': 7, 'picks': make_picks(8, rng), 'content_type': 'gameday_picks',
+                 'record': {'win_rate': 0.561, 'units_profit': 14.2, 'avg_edge': 0.064, 'total_picks': 212},
+                 'date': '2026-10-18T08:00:00'}
+        print(f"📬 Newsletter batch: {SUBSCRIBERS:,} subscribers, {os.cpu_count()} CPU(s)")
+        print("=" * 60)
+
+        serial = newsletter_batch.run(slate, subscribers, f"files:{root}/serial", processes=1)
+        print(line('personalized, in-process', serial))
+        checkpoint = os.path.join(root, 'run.jsonl')
+        pooled = newsletter_batch.run(slate, subscribers, f"files:{root}/pool", checkpoint)
+        print(line('personalized, process pool', pooled))
+        segments = newsletter_batch.run(slate, subscribers, f"files:{root}/segments", personalize=False)
+        print(line('one page per tier, pool', segments))
+
+        # Interrupted half way: keep the header and the first half of the finished chunks
+        with open(checkpoint) as f:
+            lines = f.readlines()
+        with open(checkpoint, 'w') as f:
+            f.writelines(lines[:1 + (len(lines) - 1) // 2])
+        resumed = newsletter_batch.run(slate, subscribers, f"files:{root}/pool", checkpoint)
+        files = len([name for name in os.listdir(f"{root}/pool") if name.endswith('.html')])
+        print(line(f"resumed ({resumed['resumed_chunks']} chunks done)", resumed) + f"  files: {files:,}")
+
+        server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), SmtpStandIn)
+        server.daemon_threads = True
+        server.lock, server.messages = threading.Lock(), 0
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            mailing = os.path.join(root, 'mailing.jsonl')
+            write_subscribers(mailing, SMTP_SUBSCRIBERS, rng)
+            mail = newsletter_batch.run(slate, mailing, f"smtp://127.0.0.1:{server.server_address[1]}", chunk_size=250)
+        finally:
+            server.shutdown()
+        print(line('email to SMTP stand-in, pool', mail) + f"  received: {server.messages:,}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
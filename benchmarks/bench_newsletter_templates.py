@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Newsletter templates: 10k personalized newsletters
+
+Renders 10,000 subscriber newsletters (tiers drawn from MONETIZATION,
+names with characters that need escaping) for one slate of eight plays,
+two ways: rebuilding the whole page per subscriber (CSS, record, pick
+cards: what the old f-string builder did on every call) and through a
+cached edition, where only the name and account link are filled per
+subscriber. Checks both produce the same pages, then times every tier
+and content type variant in one batch.
+Run: python benchmarks/bench_newsletter_templates.py
+"""
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from newsletter_templates import CONTENT_TITLES, TIERS, NewsletterRenderer
+
+SUBSCRIBERS = 10_000
+BOOKS = ['DraftKings', 'FanDuel', 'BetMGM', 'Caesars']
+MARKETS = [('RUSH YDS', 'Rush Yds', 55.5), ('REC YDS', 'Receiving Yds', 48.5), ('RECEPTIONS', 'Receptions', 4.5),
+           ('PASS YDS', 'Pass Yds', 245.5)]
+
+
+def make_picks(count, rng):
+    picks = []
+    for i in range(count):
+        market, label, point = rng.choice(MARKETS)
+        probability = rng.uniform(0.52, 0.64)
+        implied = probability - rng.uniform(0.03, 0.1)
+        book = rng.choice(BOOKS)
+        picks.append({
+            'selection': f"Player {i} {rng.choice(['Over', 'Under'])} {point:g} {label}",
+            'market': market,
+            'priceAmerican': rng.choice([-125, -115, -110, +100, +105, +120]),
+            'confidence': round(probability * 100),
+            'edge': round((probability - implied) * 100, 1),
+            'sportsbook': book,
+            'reason': f"{probability:.0%} model vs {implied:.0%} implied at {book}"
+        })
+    return sorted(picks, key=lambda pick: -pick['edge'])
+
+
+def make_subscribers(count, rng):
+    weights = [0.7, 0.22, 0.08]
+    return [{'id': f"sub{i:06d}", 'name': f"{rng.choice(['Sam', 'Alex', 'Jo', 'Chris'])} <{i}> & Co",
+             'tier': rng.choices(TIERS, weights)[0]} for i in range(count)]
+
+
+def main():
+    rng = random.Random(24)
+    picks = make_picks(8, rng)
+    subscribers = make_subscribers(SUBSCRIBERS, rng)
+    record = {'win_rate': 0.561, 'units_profit': 14.2, 'avg_edge': 0.064, 'total_picks': 212}
+    date = datetime(2026, 10, 18)
+
+    print(f"📰 Newsletter templates: {SUBSCRIBERS:,} personalized newsletters")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    rebuilt = []
+    for subscriber in subscribers:
+        renderer = NewsletterRenderer()
+        edition = renderer.edition(7, picks, record, 'gameday_picks', date)
+        rebuilt.append(renderer.render(edition, subscriber['tier'], subscriber))
+    slow = time.perf_counter() - start
+
+    start = time.perf_counter()
+    renderer = NewsletterRenderer()
+    edition = renderer.edition(7, picks, record, 'gameday_picks', date)
+    compiled = time.perf_counter() - start
+    cached = [page for _, page in renderer.render_batch(edition, subscribers)]
+    fast = time.perf_counter() - start
+
+    size = sum(len(page.encode()) for page in cached)
+    print(f"   rebuild per subscriber: {slow:6.2f} s  ({SUBSCRIBERS / slow:,.0f}/s)")
+    print(f"   cached edition:         {fast:6.2f} s  ({SUBSCRIBERS / fast:,.0f}/s, edition built in "
+          f"{compiled * 1000:.1f} ms)  {slow / fast:.0f}x")
+    print(f"   {size / 1e6:.1f} MB of HTML, {size / SUBSCRIBERS / 1024:.1f} KB each  same pages: {rebuilt == cached}")
+
+    start = time.perf_counter()
+    variants = renderer.variants(7, picks, record, CONTENT_TITLES, date)
+    print(f"   {len(variants)} tier x content type variants in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Odds lookups: re-walking raw Odds API JSON vs the indexed OddsSnapshot
+
+Builds a synthetic slate (16 games x 5 books, game lines plus a player
+prop market with 40 players per game), checks the snapshot answers match
+the old nested-loop walks, then times a /api/<sport>/games render and a
+50-player find_best_odds sweep both ways.
+Run: python benchmarks/bench_odds_snapshot.py
+"""
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('ENGINE_WARM_UP', '0')
+
+from app import _extract_moneyline, _extract_spread, _extract_total
+from odds_snapshot import OddsSnapshot
+
+BOOKS = ['draftkings', 'fanduel', 'betmgm', 'caesars', 'pointsbet']
+GAMES = 16
+PLAYERS_PER_GAME = 40
+REPEAT = 20
+
+
+def make_slate(rng):
+    games, props = [], []
+    for g in range(GAMES):
+        home, away = f"Home Team {g}", f"Away Team {g}"
+        total = 40.5 + g
+        game = {'id': f"evt{g}", 'home_team': home, 'away_team': away,
+                'commence_time': '2025-09-21T17:00:00Z', 'bookmakers': []}
+        prop_game = dict(game, bookmakers=[])
+        for book in BOOKS:
+            game['bookmakers'].append({'key': book, 'title': book.title(), 'markets': [
+                {'key': 'h2h', 'outcomes': [{'name': home, 'price': rng.randint(-200, -105)},
+                                            {'name': away, 'price': rng.randint(100, 180)}]},
+                {'key': 'spreads', 'outcomes': [{'name': home, 'price': -110, 'point': -3.5},
+                                                {'name': away, 'price': -110, 'point': 3.5}]},
+                {'key': 'totals', 'outcomes': [{'name': 'Over', 'price': -110, 'point': total},
+                                               {'name': 'Under', 'price': -110, 'point': total}]},
+            ]})
+            outcomes = []
+            for p in range(PLAYERS_PER_GAME):
+                player = f"Player {g}-{p}"
+                outcomes.append({'name': 'Yes', 'description': player, 'price': rng.randint(100, 900)})
+            prop_game['bookmakers'].append({'key': book, 'title': book.title(), 'markets': [
+                {'key': 'player_anytime_td', 'outcomes': outcomes}]})
+        games.append(game)
+        props.append(prop_game)
+    return games, props
+
+
+# The pre-snapshot implementations, kept here for comparison
+def legacy_line(game, key):
+    for bookmaker in game.get('bookmakers', []):
+        for market in bookmaker.get('markets', []):
+            if market.get('key') == key:
+                outcomes = market.get('outcomes', [])
+                if len(outcomes) >= 2:
+                    return outcomes[0], outcomes[1]
+    return None
+
+
+def legacy_render_game(game):
+    """Same payload the old _extract_* helpers built"""
+    spread, total, moneyline = (legacy_line(game, k) for k in ('spreads', 'totals', 'h2h'))
+    return (
+        {'home_spread': spread[0].get('point', 0), 'away_spread': spread[1].get('point', 0),
+         'home_odds': spread[0].get('price', -110), 'away_odds': spread[1].get('price', -110)},
+        {'total': total[0].get('point', 47.5), 'over_odds': total[0].get('price', -110),
+         'under_odds': total[1].get('price', -110)},
+        {'home_odds': moneyline[0].get('price', -110), 'away_odds': moneyline[1].get('price', -110)}
+    )
+
+
+def legacy_best_odds(prop_data, player_name):
+    best_odds, best_value = None, float('-inf')
+    for game in prop_data:
+        for bookmaker in game.get('bookmakers', []):
+            for market in bookmaker.get('markets', []):
+                for outcome in market.get('outcomes', []):
+                    if outcome.get('description', '').lower() == player_name.lower():
+                        if outcome.get('price', 0) > best_value:
+                            best_value = outcome.get('price', 0)
+                            best_odds = (bookmaker.get('title'), outcome.get('price'))
+    return best_odds
+
+
+def timed(fn):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main():
+    rng = random.Random(7)
+    games, props = make_slate(rng)
+    players = [f"player {rng.randrange(GAMES)}-{rng.randrange(PLAYERS_PER_GAME)}" for _ in range(50)]
+
+    start = time.perf_counter()
+    game_snap = OddsSnapshot.from_events(games)
+    prop_snap = OddsSnapshot.from_events(props)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    for i, game in enumerate(games):
+        first, second = legacy_line(game, 'spreads')
+        assert _extract_spread(game_snap, i)['home_spread'] == first['point']
+        assert _extract_moneyline(game_snap, i)['away_odds'] == legacy_line(game, 'h2h')[1]['price']
+        assert _extract_total(game_snap, i)['total'] == legacy_line(game, 'totals')[0]['point']
+    for player in players:
+        row = prop_snap.best_price(player)
+        outcome = prop_snap.outcome(row)
+        assert (outcome['sportsbook'], outcome['price']) == legacy_best_odds(props, player)
+
+    print("📊 Odds lookups: raw JSON walk vs OddsSnapshot")
+    print("=" * 64)
+    print(f"   snapshot build (once per fetch): {build_ms:.2f} ms for "
+          f"{len(game_snap) + len(prop_snap)} outcomes, {(game_snap.nbytes + prop_snap.nbytes) / 1024:.0f} KB columns")
+
+    legacy_render = timed(lambda: [legacy_render_game(g) for g in games])
+    snap_render = timed(lambda: [(_extract_spread(game_snap, i), _extract_total(game_snap, i),
+                                  _extract_moneyline(game_snap, i)) for i in range(len(games))])
+    print(f"   games render (16 games):  walk {legacy_render:8.3f} ms   snapshot {snap_render:8.3f} ms")
+
+    legacy_sweep = timed(lambda: [legacy_best_odds(props, p) for p in players])
+    snap_sweep = timed(lambda: [prop_snap.best_price(p) for p in players])
+    print(f"   best odds (50 players):   walk {legacy_sweep:8.3f} ms   snapshot {snap_sweep:8.3f} ms "
+          f"({legacy_sweep / snap_sweep:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
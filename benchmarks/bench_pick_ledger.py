@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Pick ledger: publish, grading and summary reads
+
+Publishes a season of picks (PICKS props and game lines over 272 games,
+in newsletter-sized batches) into a temporary ledger, grades them all
+against synthetic results, then times the dashboard reads: the running
+summary and per-market breakdown from the incremental aggregates vs the
+same numbers from a GROUP BY over every pick. Finally grades a fresh
+ledger from GRADERS handles at once (one thread each, as several web
+workers would) and checks every pick is settled and counted once.
+Run: python benchmarks/bench_pick_ledger.py
+"""
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import backtest
+from bench_backtest import SEASON_START, table
+from pick_ledger import PickLedger
+from sportsdata_store import SportsDataStore
+
+PICKS = 20000
+BATCH = 5
+TEAMS = 32
+WEEKS = 17
+QUERIES = 500
+GRADERS = 4
+MARKETS = [('player_pass_yds', 'PassingYards', 240), ('player_rush_yds', 'RushingYards', 60),
+           ('player_reception_yds', 'ReceivingYards', 55), ('player_receptions', 'Receptions', 4.5)]
+BOOKS = ['draftkings', 'fanduel', 'betmgm', 'caesars']
+
+SCAN = """
+SELECT market, COUNT(*), SUM(status = 'won'), SUM(status = 'lost'), SUM(status = 'push'),
+       COALESCE(SUM(profit), 0), AVG(edge)
+FROM picks GROUP BY market
+"""
+
+
+def make_results(rng):
+    games, box = [], []
+    for week in range(1, WEEKS + 1):
+        order = rng.sample(range(TEAMS), TEAMS)
+        for g in range(TEAMS // 2):
+            home, away = order[2 * g], order[2 * g + 1]
+            kickoff = SEASON_START + (week - 1) * 7 * 86400
+            games.append({'SeasonType': 1, 'Week': week, 'HomeTeam': f"T{home}", 'AwayTeam': f"T{away}",
+                          'HomeScore': rng.randint(3, 40), 'AwayScore': rng.randint(3, 40), 'IsOver': True,
+                          'DateTime': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(kickoff))})
+            for team in (home, away):
+                box.append({'Name': f"T{team} player", 'Week': week, 'SeasonType': 1,
+                            **{stat: round(rng.gauss(mean, mean * 0.4), 1) for _, stat, mean in MARKETS}})
+    teams = [{'Key': f"T{i}", 'FullName': f"Team {i}"} for i in range(TEAMS)]
+    return games, {'Team': table('Team', teams), 'Score': table('Score', games),
+                   'PlayerGame': table('PlayerGame', box)}
+
+
+def make_pick(i, games, rng):
+    game = rng.choice(games)
+    kickoff = SEASON_START + (game['Week'] - 1) * 7 * 86400
+    home, away = f"Team {game['HomeTeam'][1:]}", f"Team {game['AwayTeam'][1:]}"
+    price = rng.choice([-125, -115, -110, -105, 100, 110, 120])
+    side = rng.choice(['Over', 'Under'])
+    if rng.random() < 0.2:
+        market, participant, point = 'totals', side, rng.randint(38, 52) + 0.5
+    else:
+        market, _, mean = rng.choice(MARKETS)
+        participant, point = f"{rng.choice([game['HomeTeam'], game['AwayTeam']])} player", round(mean) + 0.5
+    return {'id': f"p{i}", 'event_id': f"w{game['Week']}:{game['HomeTeam']}", 'home_team': home, 'away_team': away,
+            'kickoff': kickoff, 'market': market, 'participant': participant, 'side': side, 'point': point,
+            'book': rng.choice(BOOKS), 'price': price, 'probability': rng.uniform(0.45, 0.6),
+            'edge': rng.uniform(0.03, 0.12)}
+
+
+def p50(fn):
+    times = []
+    for _ in range(QUERIES):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    rng = random.Random(23)
+    path = tempfile.mkdtemp(prefix='pick-ledger-')
+    try:
+        games, tables = make_results(rng)
+        results = backtest.SeasonResults.from_store(SportsDataStore(path, tables=tables))
+        ledger = PickLedger(os.path.join(path, 'ledger.sqlite'))
+        picks = [make_pick(i, games, rng) for i in range(PICKS)]
+        print("📒 Pick ledger")
+        print("=" * 60)
+
+        start = time.perf_counter()
+        for i in range(0, PICKS, BATCH):
+            ledger.publish(picks[i:i + BATCH])
+        elapsed = time.perf_counter() - start
+        print(f"   publish: {PICKS:,} picks in batches of {BATCH}: {elapsed:.2f} s "
+              f"({elapsed / (PICKS / BATCH) * 1000:.2f} ms per batch)")
+
+        start = time.perf_counter()
+        stats = ledger.grade(results, now=SEASON_START + (WEEKS + 1) * 7 * 86400)
+        print(f"   grade: {stats['settled']:,} settled, {stats['voided']} voided in "
+              f"{time.perf_counter() - start:.2f} s")
+
+        conn = ledger._conn()
+        summary = p50(ledger.summary)
+        breakdown = p50(lambda: ledger.breakdown('market'))
+        scan = p50(lambda: conn.execute(SCAN).fetchall())
+        record = ledger.summary()
+        print(f"   summary p50 {summary:.3f} ms, by-market {breakdown:.3f} ms vs GROUP BY scan {scan:.2f} ms")
+        print(f"   record: {record['wins']}-{record['losses']}-{record['pushes']}, "
+              f"win rate {record['win_rate']:.1%}, {record['units']:+.1f}u, avg edge {record['avg_edge']:.1%}")
+
+        before = ledger.breakdown('market')
+        ledger.rebuild()
+        print(f"   aggregates match a rebuild from the picks table: {before == ledger.breakdown('market')}")
+
+        shared = os.path.join(path, 'shared.sqlite')
+        PickLedger(shared).publish(picks[:PICKS // 4])
+        graders = [PickLedger(shared) for _ in range(GRADERS)]
+        counts = []
+        threads = [threading.Thread(target=lambda g=g: counts.append(
+            g.grade(results, now=SEASON_START + (WEEKS + 1) * 7 * 86400))) for g in graders]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        settled = sum(c['settled'] + c['voided'] for c in counts)
+        before = graders[0].breakdown('market')
+        graders[0].rebuild()
+        print(f"   {GRADERS} concurrent graders: {settled:,} settles for {PICKS // 4:,} picks, "
+              f"aggregates match a rebuild: {before == graders[0].breakdown('market')}")
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Player search benchmark: prebuilt index vs the old linear scan
+Covers the 5.5k-player export and a synthetic 500k-player roster.
+Run: python benchmarks/bench_player_search.py
+"""
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from player_search import PlayerSearchIndex
+from sportsdata_store import load_csv_table
+
+PLAYER_FILE = os.path.join(Path(__file__).resolve().parent.parent, 'data', 'sportsdata', 'Player.2025.csv')
+QUERIES_PER_KIND = 500
+ACCENTS = {'a': 'á', 'e': 'é', 'n': 'ñ', 'o': 'ö', 'u': 'ü'}
+
+
+def linear_search(names, query, limit=20):
+    """The previous implementation: scan and f-string every row"""
+    query_lower = query.lower()
+    matches = []
+    for first, last in names:
+        if query_lower in f"{first} {last}".lower():
+            matches.append(f"{first} {last}")
+            if len(matches) >= limit:
+                break
+    return matches
+
+
+def typo(word, rng):
+    if len(word) < 4:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def make_queries(names, rng):
+    full = [f"{f} {l}" for f, l in names if f and l]
+    picks = [rng.choice(full) for _ in range(QUERIES_PER_KIND)]
+    return {
+        'prefix': [p[:rng.randint(1, 8)] for p in picks],
+        'substring': [p.split(' ')[-1][1:5] for p in picks],
+        'typo': [typo(p.split(' ')[-1], rng) for p in picks],
+    }
+
+
+def timed(fn, queries):
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def run(label, names, statuses, with_linear):
+    rng = random.Random(7)
+    print(f"\n🔎 {label}: {len(names):,} players")
+
+    start = time.perf_counter()
+    index = PlayerSearchIndex([f"{f} {l}" for f, l in names], statuses)
+    print(f"   index build: {(time.perf_counter() - start) * 1000:,.0f} ms")
+
+    queries = make_queries(names, rng)
+    # Warm the memoized short prefixes the way live autocomplete traffic would
+    for q in queries['prefix']:
+        index.search(q)
+
+    for kind, qs in queries.items():
+        p50, p99 = timed(index.search, qs)
+        line = f"   {kind:<10} index p50 {p50:8.1f} µs  p99 {p99:9.1f} µs"
+        if with_linear:
+            lp50, lp99 = timed(lambda q: linear_search(names, q), qs)
+            line += f"   | linear p50 {lp50:8.1f} µs  p99 {lp99:9.1f} µs"
+        print(line)
+
+
+def main():
+    print("⚡ Player search benchmark")
+    print("=" * 72)
+
+    players = load_csv_table(PLAYER_FILE)
+    names = list(zip((f or '' for f in players['FirstName']), (l or '' for l in players['LastName'])))
+    statuses = players['Status'].to_list()
+    run("SportsData export", names, statuses, with_linear=True)
+
+    rng = random.Random(42)
+    firsts = sorted({f for f, _ in names if f})
+    lasts = sorted({l for _, l in names if l})
+    synthetic, synthetic_status = [], []
+    for _ in range(500_000):
+        first = rng.choice(firsts)
+        if rng.random() < 0.05:
+            first = ''.join(ACCENTS.get(ch, ch) for ch in first)
+        synthetic.append((first, rng.choice(lasts)))
+        synthetic_status.append('Active' if rng.random() < 0.4 else 'Inactive')
+    run("Synthetic roster", synthetic, synthetic_status, with_linear=True)
+
+
+if __name__ == "__main__":
+    main()
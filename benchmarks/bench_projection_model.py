@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Projection model fit and board pricing
+
+Builds a synthetic SportsData store with full stat columns (PLAYERS
+players x WEEKS weeks of projections, game logs for every week before
+the last), times ProjectionModel.from_store(), then times pricing an
+Over/Under board for every modelled market (16 games x 5 books) with
+snapshot_probabilities() against per-outcome ProjectionModel.probability()
+calls, and scoring it through the prop scanner.
+Run: python benchmarks/bench_projection_model.py
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+import prop_scanner
+from odds_snapshot import OddsSnapshot
+from projection_model import MARKET_STATS, ProjectionModel
+from sportsdata_store import SportsDataStore, Table, build_column
+
+PLAYERS = 1500
+WEEKS = 17
+EVENTS = 16
+BOOKS = ['draftkings', 'fanduel', 'betmgm', 'caesars', 'pointsbet']
+STATS = {'PassingYards': 230, 'PassingTouchdowns': 1.6, 'RushingYards': 55,
+         'RushingTouchdowns': 0.4, 'Receptions': 4.5, 'ReceivingYards': 52,
+         'ReceivingTouchdowns': 0.35}
+RUNS = 10
+
+
+def make_table(name, rng, weeks, noise):
+    columns = {'PlayerID': [], 'Name': [], 'Week': [], **{stat: [] for stat in STATS}}
+    for p in range(PLAYERS):
+        scale = {stat: base * rng.uniform(0.3, 1.6) for stat, base in STATS.items()}
+        for week in weeks:
+            columns['PlayerID'].append(str(p))
+            columns['Name'].append(f"Player {p}")
+            columns['Week'].append(str(week))
+            for stat, mean in scale.items():
+                columns[stat].append(f"{max(0.0, rng.gauss(mean, mean * noise)):.1f}")
+    return Table(name, [build_column(h, v) for h, v in columns.items()])
+
+
+def make_board(rng, market):
+    payload = []
+    for e in range(EVENTS):
+        game = {'id': f"evt{e}", 'home_team': f"Home {e}", 'away_team': f"Away {e}",
+                'commence_time': '2025-09-21T17:00:00Z', 'bookmakers': []}
+        players = range(e * PLAYERS // EVENTS, e * PLAYERS // EVENTS + 20)
+        for book in BOOKS:
+            outcomes = []
+            for p in players:
+                line = rng.choice([0.5, 1.5, 24.5, 49.5, 74.5, 229.5])
+                outcomes.append({'name': 'Over', 'description': f"Player {p}", 'price': -110, 'point': line})
+                outcomes.append({'name': 'Under', 'description': f"Player {p}", 'price': -110, 'point': line})
+            game['bookmakers'].append({'key': book, 'title': book.title(),
+                                       'markets': [{'key': market, 'outcomes': outcomes}]})
+        payload.append(game)
+    return OddsSnapshot.from_events(payload)
+
+
+def main():
+    rng = random.Random(7)
+    print("🔄 Projection model benchmark")
+    print("=" * 60)
+
+    store = SportsDataStore('', tables={
+        'PlayerGameProjection': make_table('PlayerGameProjection', rng, range(1, WEEKS + 1), 0.05),
+        'PlayerGame': make_table('PlayerGame', rng, range(1, WEEKS), 0.35),
+    })
+    start = time.perf_counter()
+    model = ProjectionModel.from_store(store)
+    fit_ms = (time.perf_counter() - start) * 1000
+    print(f"Fit: {len(model):,} player-weeks in {fit_ms:.0f} ms")
+
+    boards = [make_board(rng, market) for market in sorted(set(MARKET_STATS) - {'player_first_td'})]
+    rows = sum(len(b) for b in boards)
+
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        probabilities = [model.snapshot_probabilities(b) for b in boards]
+    vector_ms = (time.perf_counter() - start) * 1000 / RUNS
+
+    board = boards[0]
+    sample = min(len(board), 2000)
+    start = time.perf_counter()
+    for row in range(sample):
+        outcome = board.outcome(row)
+        model.probability(outcome['participant'], outcome['market'], outcome['name'], outcome['point'])
+    scalar_ms = (time.perf_counter() - start) * 1000 / sample * rows
+
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        for b, p in zip(boards, probabilities):
+            prop_scanner.score_snapshot(b, p)
+    score_ms = (time.perf_counter() - start) * 1000 / RUNS
+
+    modelled = sum(int(np.sum(~np.isnan(p))) for p in probabilities)
+    print(f"Board: {rows:,} outcomes across {len(boards)} markets ({modelled:,} modelled)")
+    print(f"  snapshot_probabilities  {vector_ms:8.1f} ms")
+    print(f"  per-outcome probability {scalar_ms:8.1f} ms (extrapolated)")
+    print(f"  prop_scanner scoring    {score_ms:8.1f} ms")
+    print(f"  speedup                 {scalar_ms / vector_ms:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
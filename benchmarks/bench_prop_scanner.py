@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Full prop-board scan latency
+
+Caches a synthetic board for every player_props market (16 games x 5
+books, Over/Under lines plus one-sided anytime/first TD markets, ~45k
+outcomes) in a ProfessionalDataEngine, mis-prices a few lines at single
+books, then times get_profitable_props() end to end: fan-out over the
+cached markets, vectorized scoring and the heap top-K. Also checks that
+the two sides of every book's h2h, spread and total de-vig to 1.
+Run: python benchmarks/bench_prop_scanner.py
+"""
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('LINE_HISTORY', '0')
+
+import numpy as np
+
+import prop_scanner
+from cache_backends import MemoryLRUCache
+from data_engine import ProfessionalDataEngine
+from odds_snapshot import OddsSnapshot
+
+BOOKS = ['draftkings', 'fanduel', 'betmgm', 'caesars', 'pointsbet']
+ONE_SIDED = {'player_anytime_td', 'player_first_td'}
+EVENTS = 16
+PLAYERS = 45
+MISPRICED = 40
+RUNS = 20
+
+
+def american(p):
+    return round(-100 * p / (1 - p)) if p >= 0.5 else round(100 * (1 - p) / p)
+
+
+def make_market(rng, market):
+    payload, planted = [], []
+    for e in range(EVENTS):
+        game = {'id': f"evt{e}", 'home_team': f"Home {e}", 'away_team': f"Away {e}",
+                'commence_time': '2025-09-21T17:00:00Z', 'bookmakers': []}
+        fair = {p: rng.uniform(0.3, 0.7) for p in range(PLAYERS)}
+        for b, book in enumerate(BOOKS):
+            outcomes = []
+            for p in range(PLAYERS):
+                player = f"Player {e}-{p}"
+                over = fair[p] + rng.uniform(-0.01, 0.01)
+                if market in ONE_SIDED:
+                    outcomes.append({'name': 'Yes', 'description': player,
+                                     'price': american(over * 1.05)})
+                else:
+                    outcomes.append({'name': 'Over', 'description': player, 'point': 50.5,
+                                     'price': american(over * 1.045)})
+                    outcomes.append({'name': 'Under', 'description': player, 'point': 50.5,
+                                     'price': american((1 - over) * 1.045)})
+            game['bookmakers'].append({'key': book, 'title': book.title(),
+                                       'markets': [{'key': market, 'outcomes': outcomes}]})
+        payload.append(game)
+
+    for _ in range(MISPRICED // 7):
+        game = rng.choice(payload)
+        outcome = rng.choice(rng.choice(game['bookmakers'])['markets'][0]['outcomes'])
+        outcome['price'] = american(0.3) if outcome['price'] < 0 else outcome['price'] + 150
+        planted.append(outcome['description'])
+    return payload, planted
+
+
+def game_lines(rng):
+    """Game board: every book prices h2h, a spread and a total for each event"""
+    payload = []
+    for e in range(EVENTS):
+        home, away = f"Home {e}", f"Away {e}"
+        spread, total = rng.choice([-6.5, -3.5, -2.5, 1.5, 3.5]), rng.choice([41.5, 44.5, 47.5])
+        payload.append({'id': f"evt{e}", 'home_team': home, 'away_team': away,
+                        'commence_time': '2025-09-21T17:00:00Z', 'bookmakers': [
+                            {'key': book, 'title': book.title(), 'markets': [
+                                {'key': 'h2h', 'outcomes': [{'name': home, 'price': rng.choice([-300, -150, 120])},
+                                                            {'name': away, 'price': rng.choice([250, 130, -140])}]},
+                                {'key': 'spreads', 'outcomes': [{'name': home, 'price': -110, 'point': spread},
+                                                                {'name': away, 'price': -110, 'point': -spread}]},
+                                {'key': 'totals', 'outcomes': [{'name': 'Over', 'price': -115, 'point': total},
+                                                               {'name': 'Under', 'price': -105, 'point': total}]}]}
+                            for book in BOOKS]})
+    return payload
+
+
+def main():
+    rng = random.Random(9)
+    engine = ProfessionalDataEngine(cache=MemoryLRUCache(max_entries=64))
+    planted, outcomes = set(), 0
+    for market in engine.markets['player_props']:
+        payload, names = make_market(rng, market)
+        planted.update(names)
+        key = f'props_{market}'
+        engine._ingest(key, payload, engine._cache_set(key, payload))
+        outcomes += len(engine.odds_snapshot(key))
+
+    print(f"🔎 Prop board scan: {outcomes:,} outcomes over {len(engine.markets['player_props'])} markets")
+    print("=" * 64)
+    timings = []
+    for run in range(RUNS):
+        if run == RUNS // 2:
+            engine._prop_scores.clear()
+        t0 = time.perf_counter()
+        top = engine.get_profitable_props(min_edge=0.05, limit=25)
+        timings.append((time.perf_counter() - t0) * 1000)
+
+    cold = timings[0]
+    warm = sorted(timings[1:])
+    print(f"   first scan (scoring every outcome): {cold:.1f} ms")
+    print(f"   repeat scans (scores memoized per snapshot): p50 {warm[len(warm) // 2]:.1f} ms")
+    found = sum(1 for item in top if item['player'] in planted)
+    print(f"   top {len(top)}: {found} are planted mis-prices; best {top[0]['player']} "
+          f"{top[0]['market']} {top[0]['side']} {top[0]['odds']} @ {top[0]['sportsbook']} "
+          f"edge {top[0]['edge']:.3f}")
+
+    snapshot = OddsSnapshot.from_events(game_lines(rng))
+    fair = prop_scanner.score_snapshot(snapshot)['fair']
+    sides = {}
+    for row in range(len(snapshot)):
+        outcome = snapshot.outcome(row)
+        line = (outcome['event_id'], outcome['market'], outcome['sportsbook'], abs(outcome['point'] or 0))
+        sides[line] = sides.get(line, 0.0) + float(fair[row])
+    worst = max(abs(total - 1) for total in sides.values())
+    print(f"   game lines: {len(sides)} book lines de-vigged per book, "
+          f"sides sum to 1: {bool(np.isclose(worst, 0))} (worst {worst:.2e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo slate simulation throughput
+
+Simulates a synthetic 16-game slate (two QBs, four receivers, two backs
+per team) in-process and across a process pool, reporting game
+simulations per second, then prices a full Over/Under board from the
+result and compares a same-game QB + WR1 parlay's joint probability with
+the independent product.
+Run: python benchmarks/bench_simulator.py
+"""
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from odds_snapshot import OddsSnapshot
+from simulator import simulate_slate
+
+GAMES = 16
+SIMULATIONS = 20000
+SEED = 11
+MARKETS = {'player_pass_yds': 'PassingYards', 'player_reception_yds': 'ReceivingYards',
+           'player_rush_yds': 'RushingYards', 'player_receptions': 'Receptions'}
+
+
+def make_specs(rng):
+    specs = []
+    for g in range(GAMES):
+        players = []
+        for team in ('home', 'away'):
+            players.append({'name': f"QB {g} {team}", 'team': team,
+                            'stats': {'PassingYards': (rng.uniform(210, 290), 65.0),
+                                      'PassingTouchdowns': (rng.uniform(1.2, 2.2), float('nan'))}})
+            for w in range(4):
+                mean = rng.uniform(25, 85)
+                players.append({'name': f"WR{w} {g} {team}", 'team': team,
+                                'stats': {'ReceivingYards': (mean, mean * 0.6),
+                                          'Receptions': (mean / 12, float('nan')),
+                                          'Touchdowns': (rng.uniform(0.2, 0.6), float('nan'))}})
+            for r in range(2):
+                mean = rng.uniform(30, 80)
+                players.append({'name': f"RB{r} {g} {team}", 'team': team,
+                                'stats': {'RushingYards': (mean, mean * 0.55),
+                                          'Touchdowns': (rng.uniform(0.2, 0.6), float('nan'))}})
+        specs.append({'event_id': f"evt{g}", 'home_team': f"Home {g}", 'away_team': f"Away {g}",
+                      'total': rng.uniform(38, 54), 'spread': rng.choice([-7, -3, -1.5, 2.5, 6.5]),
+                      'players': players})
+    return specs
+
+
+def make_board(specs):
+    payload = []
+    for spec in specs:
+        outcomes = {market: [] for market in MARKETS}
+        for player in spec['players']:
+            for market, stat in MARKETS.items():
+                if stat in player['stats']:
+                    line = round(player['stats'][stat][0]) + 0.5
+                    for side in ('Over', 'Under'):
+                        outcomes[market].append({'name': side, 'description': player['name'],
+                                                 'price': -110, 'point': line})
+        markets = [{'key': m, 'outcomes': o} for m, o in outcomes.items()]
+        payload.append({'id': spec['event_id'], 'home_team': spec['home_team'], 'away_team': spec['away_team'],
+                        'commence_time': '2025-09-21T17:00:00Z',
+                        'bookmakers': [{'key': 'draftkings', 'title': 'DraftKings', 'markets': markets}]})
+    return OddsSnapshot.from_events(payload)
+
+
+def timed(specs, processes):
+    start = time.perf_counter()
+    slate = simulate_slate(specs, SIMULATIONS, SEED, processes)
+    return slate, time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(SEED)
+    specs = make_specs(rng)
+    variables = sum(2 + sum(len(p['stats']) for p in s['players']) for s in specs)
+    print(f"🎲 Slate simulation: {GAMES} games, {variables} variables, {SIMULATIONS:,} simulations each")
+    print("=" * 60)
+
+    slate, serial = timed(specs, 1)
+    print(f"   in-process       {serial * 1000:8.0f} ms  {GAMES * SIMULATIONS / serial:12,.0f} game sims/s")
+    processes = os.cpu_count() or 1
+    parallel_slate, parallel = timed(specs, None)
+    print(f"   {processes:2d} processes     {parallel * 1000:8.0f} ms  {GAMES * SIMULATIONS / parallel:12,.0f} game sims/s")
+
+    legs = [{'event_id': 'evt0', 'market': 'player_pass_yds', 'participant': 'QB 0 home', 'side': 'Over'},
+            {'event_id': 'evt0', 'market': 'player_reception_yds', 'participant': 'WR0 0 home', 'side': 'Over'}]
+    for leg, stat in zip(legs, ('PassingYards', 'ReceivingYards')):
+        player = next(p for p in specs[0]['players'] if p['name'] == leg['participant'])
+        leg['point'] = round(player['stats'][stat][0]) + 0.5
+    same = slate.joint_probability(legs) == parallel_slate.joint_probability(legs)
+    print(f"   seeded results identical across process counts: {same}")
+
+    board = make_board(specs)
+    start = time.perf_counter()
+    probabilities = slate.snapshot_probabilities(board)
+    board_ms = (time.perf_counter() - start) * 1000
+    print(f"   board pricing    {board_ms:8.1f} ms  ({len(board):,} outcomes, "
+          f"{int(np.sum(~np.isnan(probabilities))):,} simulated)")
+
+    joint = slate.joint_probability(legs)
+    independent = np.prod([slate.probability(**leg) for leg in legs])
+    print(f"   QB + WR1 overs:  joint {joint:.3f} vs independent {independent:.3f} "
+          f"(lift {joint / independent:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Thundering-herd load test for cache misses
+
+200 threads hit a cold ProfessionalDataEngine at the same instant (as
+happens when the nfl_games TTL expires under load). With single-flight
+coalescing the counting stub Odds API must see exactly one call per
+cache key.
+Run: python benchmarks/bench_single_flight.py
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cache_backends import MemoryLRUCache
+from data_engine import ProfessionalDataEngine
+from http_transport import HttpTransport
+
+CONCURRENCY = 200
+UPSTREAM_DELAY = 0.25
+
+
+class CountingOddsApi(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        market = parse_qs(urlsplit(self.path).query).get('markets', [''])[0]
+        with self.server.lock:
+            self.server.hits[market] = self.server.hits.get(market, 0) + 1
+        time.sleep(UPSTREAM_DELAY)
+        body = json.dumps([{'id': 'g1', 'bookmakers': []}]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def stampede(engine, calls):
+    """Release every caller at once and time the slowest"""
+    barrier = threading.Barrier(len(calls))
+    latencies = []
+    lock = threading.Lock()
+
+    def run(call):
+        barrier.wait()
+        start = time.perf_counter()
+        result = call()
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append((elapsed, len(result)))
+
+    threads = [threading.Thread(target=run, args=(call,)) for call in calls]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CountingOddsApi)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.hits = {}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    engine = ProfessionalDataEngine(http=HttpTransport(), cache=MemoryLRUCache())
+    engine.odds_base_url = f"http://127.0.0.1:{server.server_address[1]}/v4"
+
+    print(f"🐘 {CONCURRENCY} concurrent cold-cache requests")
+    print("=" * 60)
+
+    latencies = stampede(engine, [engine.get_nfl_games] * CONCURRENCY)
+    calls = server.hits.get('h2h,spreads,totals', 0)
+    print(f"   nfl_games: {calls} upstream call(s), "
+          f"slowest caller {max(l for l, _ in latencies) * 1000:.0f} ms, "
+          f"empty results {sum(1 for _, n in latencies if n == 0)}")
+    assert calls == 1, f"expected 1 upstream call, got {calls}"
+
+    markets = ['player_anytime_td', 'player_rush_yds', 'player_reception_yds', 'player_pass_yds']
+    server.hits.clear()
+    stampede(engine, [lambda m=markets[i % len(markets)]: engine.get_player_props(m)
+                      for i in range(CONCURRENCY)])
+    print(f"   props ({len(markets)} markets): {dict(server.hits)}")
+    assert all(server.hits.get(m) == 1 for m in markets), "expected 1 upstream call per market"
+
+    print(f"   single-flight: {engine.flights.stats()}")
+    print("✅ One upstream fetch per cache key")
+
+
+if __name__ == "__main__":
+    main()
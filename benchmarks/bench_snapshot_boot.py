@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Boot benchmark: parsing the CSVs vs opening the mmap snapshot
+Run: python benchmarks/bench_snapshot_boot.py
+"""
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sportsdata_snapshot import compile_snapshot, default_snapshot_path, load_store, open_snapshot
+from sportsdata_store import SportsDataStore
+
+DATA_DIR = os.path.join(Path(__file__).resolve().parent.parent, 'data', 'sportsdata')
+RUNS = 10
+
+
+def timed(fn):
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        store = fn()
+        # Touch one column so lazily mapped pages are actually read
+        sum(1 for v in store['PlayerGameProjection'].get('PlayerGameID').data if v)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), min(samples)
+
+
+def main():
+    print("⚡ SportsData boot benchmark")
+    print("=" * 60)
+
+    snapshot_path = default_snapshot_path(DATA_DIR)
+    start = time.perf_counter()
+    compile_snapshot(DATA_DIR, snapshot_path)
+    print(f"compile step:          {(time.perf_counter() - start) * 1000:8.1f} ms "
+          f"({os.path.getsize(snapshot_path) / 1024:.0f} KB)")
+
+    csv_median, csv_min = timed(lambda: SportsDataStore(DATA_DIR))
+    snap_median, snap_min = timed(lambda: open_snapshot(snapshot_path, DATA_DIR))
+    boot_median, boot_min = timed(lambda: load_store(DATA_DIR))
+
+    print(f"CSV parse:             {csv_median:8.1f} ms median  {csv_min:8.1f} ms min")
+    print(f"mmap snapshot open:    {snap_median:8.1f} ms median  {snap_min:8.1f} ms min")
+    print(f"load_store (checked):  {boot_median:8.1f} ms median  {boot_min:8.1f} ms min")
+    print("-" * 60)
+    print(f"snapshot boot is {csv_median / boot_median:.1f}x faster than re-parsing")
+
+
+if __name__ == "__main__":
+    main()
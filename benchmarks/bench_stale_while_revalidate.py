@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Request latency across cache expiry: blocking refresh vs stale-while-revalidate
+
+A slow stub Odds API (UPSTREAM_DELAY per call) sits behind an engine
+with a 1s TTL. Requests arrive steadily for a few TTL periods; with
+hard_expiry=0 every expiry blocks a request on the upstream (the old
+behaviour), with stale-while-revalidate the p99 should stay at
+cache-hit latency. Also shows a stale payload surviving an upstream
+outage and the kickoff-proximity refresh intervals.
+Run: python benchmarks/bench_stale_while_revalidate.py
+"""
+import json
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cache_backends import MemoryLRUCache
+from data_engine import ProfessionalDataEngine
+from http_transport import HttpTransport
+from refresh_scheduler import RefreshScheduler
+
+UPSTREAM_DELAY = 0.8
+TTL = 1.0
+DURATION = 4.0
+REQUEST_GAP = 0.01
+
+
+class SlowOddsApi(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    failing = False
+
+    def do_GET(self):
+        time.sleep(UPSTREAM_DELAY)
+        status = 503 if self.failing else 200
+        body = json.dumps([{'id': 'g1', 'commence_time': '2025-09-21T20:00:00Z', 'bookmakers': []}]).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_engine(base, hard_expiry):
+    engine = ProfessionalDataEngine(http=HttpTransport(retries=0), cache=MemoryLRUCache())
+    engine.odds_base_url = base
+    engine.cache_ttls['nfl_games'] = TTL
+    engine.hard_expiry = hard_expiry
+    return engine
+
+
+def run(engine):
+    engine.get_nfl_games()  # prime
+    latencies = []
+    stop = time.perf_counter() + DURATION
+    while time.perf_counter() < stop:
+        start = time.perf_counter()
+        engine.get_nfl_games()
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(REQUEST_GAP)
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'p50_ms': round(latencies[len(latencies) // 2], 3),
+        'p99_ms': round(latencies[int(len(latencies) * 0.99)], 3),
+        'max_ms': round(latencies[-1], 1),
+        'blocked_on_upstream': sum(1 for l in latencies if l >= UPSTREAM_DELAY * 500)
+    }
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowOddsApi)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/v4"
+
+    print(f"⏱️  get_nfl_games latency, TTL {TTL}s, upstream {UPSTREAM_DELAY * 1000:.0f} ms")
+    print("=" * 70)
+    print(f"   blocking refresh:        {run(make_engine(base, hard_expiry=0))}")
+    engine = make_engine(base, hard_expiry=3600)
+    print(f"   stale-while-revalidate:  {run(engine)}")
+
+    SlowOddsApi.failing = True
+    time.sleep(TTL + UPSTREAM_DELAY + 0.2)
+    start = time.perf_counter()
+    games = engine.get_nfl_games()
+    print(f"\n   upstream down: served {len(games)} game(s) in "
+          f"{(time.perf_counter() - start) * 1000:.2f} ms, freshness {engine.freshness('nfl_games')}")
+    time.sleep(UPSTREAM_DELAY + 0.2)
+
+    scheduler = RefreshScheduler(engine)
+    now = datetime(2025, 9, 21, 20, 0, tzinfo=timezone.utc).timestamp()
+    print("\n   refresh interval by time to kickoff:")
+    for label, offset in [('3 days', -3 * 86400), ('12 hours', -12 * 3600), ('3 hours', -3 * 3600),
+                          ('30 minutes', -1800), ('live', 3600), ('final', 5 * 3600)]:
+        print(f"     {label:<11} every {scheduler.interval(now + offset)}s")
+
+
+if __name__ == "__main__":
+    main()
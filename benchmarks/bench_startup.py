@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: cold worker answers /api/health with every upstream unreachable
+
+A local "blackhole" proxy accepts connections and never replies, so any
+provider call made during import would hang until its timeout. The
+benchmark imports app.py in a fresh interpreter routed through it and
+asserts liveness is served within the budget while readiness is not.
+Run: python benchmarks/bench_startup.py
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEALTH_BUDGET_SECONDS = 3.0
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import app
+client = app.app.test_client()
+health = client.get('/api/health')
+elapsed = time.perf_counter() - start
+ready = client.get('/api/ready')
+print(json.dumps({'elapsed': elapsed, 'health': health.status_code,
+                  'ready': ready.status_code, 'engines': ready.get_json()['engines']}))
+"""
+
+
+def blackhole():
+    """Accept connections and hold them open without ever responding"""
+    server = socket.socket()
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(('127.0.0.1', 0))
+    server.listen(128)
+    held = []
+
+    def accept():
+        while True:
+            conn, _ = server.accept()
+            held.append(conn)
+
+    threading.Thread(target=accept, daemon=True).start()
+    return server.getsockname()[1]
+
+
+def main():
+    print("⏱️  Cold-start benchmark (all upstream hosts unreachable)")
+    print("=" * 60)
+
+    port = blackhole()
+    proxy = f"http://127.0.0.1:{port}"
+    env = dict(os.environ,
+               HTTP_PROXY=proxy, HTTPS_PROXY=proxy, http_proxy=proxy, https_proxy=proxy,
+               NO_PROXY='', no_proxy='',
+               ODDS_API_KEY='benchmark-key', SPORTSDATA_API_KEY='benchmark-key')
+
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=120)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        print(result.stderr)
+        sys.exit(1)
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    print(f"import + first /api/health: {report['elapsed'] * 1000:8.1f} ms (budget {HEALTH_BUDGET_SECONDS * 1000:.0f} ms)")
+    print(f"/api/health status:         {report['health']}")
+    print(f"/api/ready status:          {report['ready']} (warm-up still blocked on upstreams)")
+    for name, info in report['engines'].items():
+        print(f"   {name:<11} {info['state']:<9} warmed={info['warmed']}")
+    print(f"process wall time:          {wall * 1000:8.1f} ms")
+
+    assert report['health'] == 200, "liveness must not depend on upstreams"
+    assert report['elapsed'] < HEALTH_BUDGET_SECONDS, "cold start exceeded the health budget"
+    print("✅ /api/health answered within budget")
+
+
+if __name__ == "__main__":
+    main()
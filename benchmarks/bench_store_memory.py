@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: DictReader rows vs the columnar SportsData store
+Run: python benchmarks/bench_store_memory.py
+"""
+import csv
+import gc
+import glob
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sportsdata_store import SportsDataStore
+
+DATA_DIR = os.path.join(Path(__file__).resolve().parent.parent, 'data', 'sportsdata')
+
+
+def load_dict_rows(data_dir):
+    """The previous representation: one list of string dicts per file"""
+    tables = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, '*.csv'))):
+        with open(path, 'r') as f:
+            tables[os.path.basename(path)] = list(csv.DictReader(f))
+    return tables
+
+
+def measure(label, loader):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = loader()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} retained {current / 1024 / 1024:8.2f} MB   "
+          f"peak {peak / 1024 / 1024:8.2f} MB   load {elapsed * 1000:8.1f} ms")
+    return result, current
+
+
+def main():
+    print("📦 SportsData memory benchmark")
+    print("=" * 72)
+
+    dict_rows, dict_bytes = measure("csv.DictReader lists", lambda: load_dict_rows(DATA_DIR))
+    total_rows = sum(len(rows) for rows in dict_rows.values())
+    del dict_rows
+
+    store, store_bytes = measure("columnar store", lambda: SportsDataStore(DATA_DIR))
+
+    print("-" * 72)
+    print(f"{total_rows} rows across {len(store.tables)} files")
+    print(f"columnar store uses {store_bytes / dict_bytes:.1%} of the dict-per-row memory "
+          f"({dict_bytes / store_bytes:.1f}x smaller)")
+
+    print("\nPer table:")
+    for name, info in sorted(store.summary().items(), key=lambda kv: -kv[1]['bytes']):
+        print(f"   {name:<34} {info['rows']:>7} rows  {info['columns']:>3} cols  "
+              f"{info['bytes'] / 1024:9.1f} KB")
+
+    players = store['Player']
+    start = time.perf_counter()
+    for _ in range(100):
+        players.where(Status='Active')
+    print(f"\nPlayer.where(Status='Active'): {(time.perf_counter() - start) * 10:.3f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Parlay swap suggestions: incremental scoring vs re-pricing every swap
+
+Uses the parlay benchmark's synthetic slate (16 games x 5 books, the
+three yardage markets), re-scored off a simulated slate so same-game legs
+are correlated. For random 4- and 6-leg slips (two legs per game), times:
+  * full re-pricing: price_parlay() (simulated joint probability) for
+    every (leg, candidate) swap at the parlay's book
+  * SwapIndex.swaps(): every swap scored at once from running totals
+  * ParlayEngine.swap_suggestions(): end to end, incremental scoring
+    plus exact re-pricing of the suggestions returned
+and checks the incremental pick agrees with the exhaustive one.
+Run: python benchmarks/bench_swap_suggestions.py
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+import prop_scanner
+from bench_jackpot_search import _VersionedEngine
+from bench_parlay_engine import make_scored
+from parlay_engine import ParlayEngine
+from projection_model import MARKET_STATS, STATS
+from simulator import simulate_slate
+
+SIMULATIONS = 4000
+
+
+def slate_specs(scored):
+    """One simulator spec per synthetic game (yardage means near the 49.5 line)"""
+    specs = {}
+    for market, snapshot, _ in scored:
+        stat = MARKET_STATS[market]
+        if STATS[stat] != 'normal':
+            continue
+        for event in snapshot.events:
+            spec = specs.setdefault(event['id'], {'event_id': event['id'], 'home_team': event['home_team'],
+                                                  'away_team': event['away_team'], 'players': {}})
+            for p in range(12):
+                name = f"Player {event['id'][3:]}-{p}"
+                player = spec['players'].setdefault(name, {'name': name, 'team': ('away', 'home')[p % 2],
+                                                           'stats': {}})
+                player['stats'][stat] = (46.0 + p, 20.0)
+    return [dict(spec, players=list(spec['players'].values())) for spec in specs.values()]
+
+
+def main():
+    # Yardage markets only, priced off the simulation (as the data engine does once a slate is simulated)
+    scored = [item for item in make_scored(random.Random(29)) if STATS[MARKET_STATS[item[0]]] == 'normal']
+    simulation = simulate_slate(slate_specs(scored), SIMULATIONS, seed=7, processes=1)
+    scored = [(market, snapshot, prop_scanner.score_snapshot(snapshot, simulation.snapshot_probabilities(snapshot)))
+              for market, snapshot, _ in scored]
+    data = _VersionedEngine(scored)
+    data.simulation = simulation
+    engine = ParlayEngine(data)
+    print("🔁 Parlay swap suggestions")
+    print("=" * 60)
+
+    rng = random.Random(31)
+    for legs in (4, 6):
+        # A hand-picked (random) slip at the best parlay's book, two legs per game
+        book = engine.generate(legs, 'aggressive')[0]['legs'][0]['bookmaker']
+        engine.swap_suggestions({'legs': engine.generate(legs, 'aggressive')[0]['legs']})
+        index = engine._swap_indexes()[book]
+        games = sorted({leg['event_id'] for leg in index.legs})
+        current, seen = [], set()
+        for event_id in rng.sample(games, (legs + 1) // 2):
+            options = [leg for leg in index.legs if leg['event_id'] == event_id and leg['playerId'] not in seen]
+            for leg in rng.sample(options, 2)[:legs - len(current)]:
+                current.append(leg)
+                seen.add(leg['playerId'])
+        parlay = {'legs': current, 'riskTolerance': 'aggressive'}
+
+        start = time.perf_counter()
+        swaps = index.swaps(current, data.simulation, 3)
+        incremental = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        exhaustive = np.full(swaps['ev'].shape, -np.inf)
+        for i in range(len(current)):
+            for c in np.flatnonzero(swaps['valid'][i]).tolist():
+                swapped = current[:i] + [index.legs[c]] + current[i + 1:]
+                exhaustive[i, c] = data.simulation.joint_probability(swapped) * np.prod(
+                    [leg['decimal'] for leg in swapped]) - 1.0
+        full = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        result = engine.swap_suggestions(parlay)
+        end_to_end = (time.perf_counter() - start) * 1000
+
+        approx = np.where(swaps['valid'], swaps['ev'], -np.inf)
+        picked = exhaustive[np.unravel_index(np.argmax(approx), approx.shape)]
+        print(f"   {legs} legs, {int(swaps['valid'].sum()):,} swaps: re-price all {full:7.1f} ms  "
+              f"incremental {incremental:5.2f} ms  end to end {end_to_end:5.1f} ms")
+        print(f"      best swap EV {exhaustive.max() * 100:+.1f}%, incremental pick {picked * 100:+.1f}%, "
+              f"{len(result['suggestions'])} suggestions "
+              f"(top {result['suggestions'][0]['evDelta'] if result['suggestions'] else 0:+.1f} EV pts)")
+
+if __name__ == '__main__':
+    main()
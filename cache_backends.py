@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Cache Backends
+Pluggable storage for ProfessionalDataEngine's upstream cache
+
+    memory://?max_entries=256&max_bytes=67108864   per-process LRU
+    sqlite:///dev/shm/nfl-edge-cache.sqlite         shared by all workers on a host
+    redis://127.0.0.1:6379/0                        shared across hosts (RESP protocol)
+
+Select one with the CACHE_URL environment variable. Values must be
+JSON-serializable (upstream payloads always are).
+"""
+import json
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+KEY_PREFIX = 'nfl-edge:'
+
+
+class CacheBackend:
+    """Interface: TTL'd key/value storage for upstream payloads"""
+
+    name = 'base'
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self) -> Dict:
+        return {'backend': self.name}
+
+
+class MemoryLRUCache(CacheBackend):
+    """In-process LRU bounded by entry count and approximate payload bytes"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()  # key -> (value, expires, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: Any, ttl: float, size: Optional[int] = None):
+        if size is None:
+            size = len(json.dumps(value, separators=(',', ':')))
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, time.time() + ttl, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        return {
+            'backend': self.name,
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+
+def default_sqlite_path() -> str:
+    """tmpfs when available so the shared file never touches disk"""
+    shm = '/dev/shm'
+    base = shm if os.path.isdir(shm) and os.access(shm, os.W_OK) else tempfile.gettempdir()
+    return os.path.join(base, 'nfl-edge-cache.sqlite')
+
+
+class SQLiteCache(CacheBackend):
+    """Host-wide cache: one SQLite file (WAL mode) shared by every worker"""
+
+    name = 'sqlite'
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_sqlite_path()
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires > ?", (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, ttl: float):
+        conn = self._conn()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, json.dumps(value, separators=(',', ':')), now + ttl)
+        )
+        conn.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+        conn.commit()
+
+    def delete(self, key: str):
+        conn = self._conn()
+        conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+        conn.commit()
+
+    def clear(self):
+        conn = self._conn()
+        conn.execute("DELETE FROM cache")
+        conn.commit()
+
+    def stats(self) -> Dict:
+        count = self._conn().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        return {'backend': self.name, 'path': self.path, 'entries': count}
+
+
+class RedisError(RuntimeError):
+    """An error reply (-ERR ...) from the cache server"""
+
+
+class RedisCache(CacheBackend):
+    """Minimal RESP2 client (GET / SET PX / DEL / SCAN) for Redis-compatible servers"""
+
+    name = 'redis'
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 6379, db: int = 0,
+                 timeout: float = 2.0, prefix: str = KEY_PREFIX):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.timeout = timeout
+        self.prefix = prefix
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock = sock
+        self._reader = sock.makefile('rb')
+        if self.db:
+            self._roundtrip('SELECT', str(self.db))
+
+    def _close(self):
+        try:
+            if self._sock:
+                self._sock.close()
+        finally:
+            self._sock = None
+            self._reader = None
+
+    @staticmethod
+    def _encode(*parts) -> bytes:
+        out = [f"*{len(parts)}\r\n".encode()]
+        for part in parts:
+            data = part if isinstance(part, bytes) else str(part).encode('utf-8')
+            out.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        return b''.join(out)
+
+    def _read(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by cache server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b'+':
+            return body.decode()
+        if kind == b'-':
+            raise RedisError(body.decode())
+        if kind == b':':
+            return int(body)
+        if kind == b'$':
+            length = int(body)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b'*':
+            count = int(body)
+            return None if count < 0 else [self._read() for _ in range(count)]
+        # Out of step with the server: reconnect rather than misread later replies
+        raise ConnectionError(f"Unexpected RESP reply: {line!r}")
+
+    def _roundtrip(self, *parts):
+        self._sock.sendall(self._encode(*parts))
+        return self._read()
+
+    def _command(self, *parts):
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._roundtrip(*parts)
+                except (OSError, ConnectionError):
+                    self._close()
+                    if attempt:
+                        raise
+
+    # A down server or an error reply degrades to a cache miss, never a failed request
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self._command('GET', self.prefix + key)
+        except (OSError, RedisError) as e:
+            print(f"⚠️ Redis cache unavailable: {e}")
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: float):
+        try:
+            self._command('SET', self.prefix + key, json.dumps(value, separators=(',', ':')),
+                          'PX', max(1, int(ttl * 1000)))
+        except (OSError, RedisError) as e:
+            print(f"⚠️ Redis cache unavailable: {e}")
+
+    def delete(self, key: str):
+        try:
+            self._command('DEL', self.prefix + key)
+        except (OSError, RedisError) as e:
+            print(f"⚠️ Redis cache unavailable: {e}")
+
+    def clear(self):
+        cursor = '0'
+        try:
+            while True:
+                cursor, keys = self._command('SCAN', cursor, 'MATCH', f"{self.prefix}*", 'COUNT', 500)
+                cursor = cursor.decode() if isinstance(cursor, bytes) else str(cursor)
+                if keys:
+                    self._command('DEL', *keys)
+                if cursor == '0':
+                    break
+        except (OSError, RedisError) as e:
+            print(f"⚠️ Redis cache unavailable: {e}")
+
+    def stats(self) -> Dict:
+        return {'backend': self.name, 'server': f"{self.host}:{self.port}/{self.db}"}
+
+
+class TieredCache(CacheBackend):
+    """Per-process LRU in front of a shared backend (skips re-decoding hot keys)"""
+
+    def __init__(self, shared: CacheBackend, local: Optional[MemoryLRUCache] = None):
+        self.shared = shared
+        self.local = local or MemoryLRUCache()
+        self.name = f"memory+{shared.name}"
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is None:
+            value = self.shared.get(key)
+            if value is not None:
+                # Shared TTL is unknown here; a short local TTL bounds skew between workers
+                self.local.set(key, value, ttl=5)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        self.shared.set(key, value, ttl)
+        self.local.set(key, value, min(ttl, 5))
+
+    def delete(self, key: str):
+        self.local.delete(key)
+        self.shared.delete(key)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+    def stats(self) -> Dict:
+        return {'backend': self.name, 'local': self.local.stats(), 'shared': self.shared.stats()}
+
+
+def create_cache(url: Optional[str] = None) -> CacheBackend:
+    """Build a cache backend from a URL (defaults to CACHE_URL, then memory://)"""
+    url = url or os.getenv('CACHE_URL', 'memory://')
+    parts = urlsplit(url)
+    options = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+
+    if parts.scheme == 'memory':
+        return MemoryLRUCache(int(options.get('max_entries', DEFAULT_MAX_ENTRIES)),
+                              int(options.get('max_bytes', DEFAULT_MAX_BYTES)))
+    if parts.scheme == 'sqlite':
+        return TieredCache(SQLiteCache(parts.path or None))
+    if parts.scheme == 'redis':
+        db = int(parts.path.strip('/') or 0)
+        return TieredCache(RedisCache(parts.hostname or '127.0.0.1', parts.port or 6379, db))
+    raise ValueError(f"Unsupported CACHE_URL scheme: {parts.scheme}")
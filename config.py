@@ -14,6 +14,7 @@ class Brand:
     TAGLINE = "Data-Driven NFL Betting & Fantasy Intelligence"
     TWITTER = "@NFLEdgeAnalytics"
     PRIMARY_COLOR = "#1a1a1a"
+    SECONDARY_COLOR = "#667eea"
     ACCENT_COLOR = "#00ff87"
 
 @dataclass
@@ -25,11 +26,50 @@ class Schedule:
 
 @dataclass
 class Monetization:
-    """Revenue tiers"""
-    FREE = {'name': 'Community', 'price': 0}
-    STANDARD = {'name': 'Edge Access', 'price': 19.99}
-    VIP = {'name': 'Elite Edge', 'price': 49.99}
+    """Revenue tiers, cheapest first; picks is how many of the edition's plays a tier sees"""
+    FREE = {'name': 'Community', 'price': 0, 'picks': 1}
+    STANDARD = {'name': 'Edge Access', 'price': 19.99, 'picks': 4}
+    VIP = {'name': 'Elite Edge', 'price': 49.99, 'picks': 8}
+
+@dataclass
+class CacheSettings:
+    """Upstream cache freshness in seconds, per market"""
+    DEFAULT_TTL = 300
+    # Past its TTL a payload is still served (and refreshed in the
+    # background) until it reaches this age
+    HARD_EXPIRY = int(os.getenv('CACHE_HARD_EXPIRY', 6 * 3600))
+    # Proactive refresh interval by time to the next kickoff:
+    # (kickoff within N seconds, refresh every M seconds); live games count as 0
+    REFRESH_SCHEDULE = [(3600, 60), (6 * 3600, 180), (24 * 3600, 600)]
+    REFRESH_IDLE = 1800
+    TTLS = {
+        'nfl_games': 300,
+        'props_player_anytime_td': 600,
+        'props_player_first_td': 600,
+        'props_player_pass_tds': 600,
+        'props_player_pass_yds': 300,
+        'props_player_rush_yds': 300,
+        'props_player_receptions': 300,
+        'props_player_reception_yds': 300
+    }
+
+@dataclass
+class PortfolioSettings:
+    """Simultaneous Kelly sizing: fraction of full Kelly and exposure caps (share of bankroll)"""
+    KELLY_FRACTION = 0.5
+    MAX_TOTAL = 0.25
+    MAX_GAME = 0.08
+    MAX_PLAYER = 0.05
+    MAX_BOOK = 0.15
+    MAX_BET = 0.03
+    # Assumed outcome correlation where no simulation covers a pair
+    SAME_GAME_CORRELATION = 0.1
+    SAME_PLAYER_CORRELATION = 0.35
+    # Open recommendations without a kickoff time expire after this long (seconds)
+    OPEN_TTL = 24 * 3600
 
 BRAND = Brand()
 SCHEDULE = Schedule()
 MONETIZATION = Monetization()
+CACHE = CacheSettings()
+PORTFOLIO = PortfolioSettings()
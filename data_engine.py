@@ -4,12 +4,83 @@ NFL Analytics Empire - Professional Data Engine
 Real-time sportsbook data integration for premium betting intelligence
 """
 
+import atexit
+import math
 import os
 import requests
 import json
+import sqlite3
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import backtest
+import odds_math
+import portfolio
+import prop_scanner
+import simulator
+from cache_backends import CacheBackend, create_cache
+from config import CACHE, PORTFOLIO
+from http_transport import HttpTransport, get_transport
+from leaderboards import PickBoards
+from line_history import LineHistoryLocked, LineHistoryStore, movement_label
+from refresh_scheduler import parse_kickoff
+from steam_detector import SteamDetector
+from odds_snapshot import OddsSnapshot
+from pick_ledger import PickLedger, from_pick_leg
+from single_flight import SingleFlight
+
+# Seconds ESPN's current week is reused for live pricing (then refreshed in the background)
+ESPN_WEEK_TTL = 3600
+ESPN_WEEK_KEY = 'espn:current_week'
+
+# Bounded pool shared by every aggregate call that fans out upstream
+FAN_OUT_WORKERS = 8
+_fan_out_pool: Optional[ThreadPoolExecutor] = None
+_fan_out_lock = threading.Lock()
+
+
+def _get_fan_out_pool() -> ThreadPoolExecutor:
+    global _fan_out_pool
+    if _fan_out_pool is None:
+        with _fan_out_lock:
+            if _fan_out_pool is None:
+                _fan_out_pool = ThreadPoolExecutor(FAN_OUT_WORKERS, thread_name_prefix='fan-out')
+    return _fan_out_pool
+
+
+def fan_out(tasks: Dict[str, Callable], deadlines: Dict[str, float],
+            default_deadline: float = 10.0) -> Tuple[Dict, List[str]]:
+    """
+    Run independent upstream fetches concurrently
+
+    Args:
+        tasks: Source name -> zero-argument callable
+        deadlines: Source name -> seconds from start before giving up on it
+
+    Returns:
+        (results for sources that finished in time, names that missed
+        their deadline or raised). Late fetches keep running in the pool
+        and still populate the cache for the next caller.
+    """
+    start = time.monotonic()
+    pool = _get_fan_out_pool()
+    futures = {name: pool.submit(task) for name, task in tasks.items()}
+
+    results, missing = {}, []
+    for name, future in futures.items():
+        remaining = deadlines.get(name, default_deadline) - (time.monotonic() - start)
+        try:
+            results[name] = future.result(timeout=max(0.0, remaining))
+        except FutureTimeout:
+            print(f"⚠️ {name} missed its {deadlines.get(name, default_deadline)}s deadline")
+            missing.append(name)
+        except Exception as e:
+            print(f"❌ {name} failed: {e}")
+            missing.append(name)
+    return results, missing
 
 class ProfessionalDataEngine:
     """
@@ -17,7 +88,10 @@ class ProfessionalDataEngine:
     Connects to real sportsbooks for live betting intelligence
     """
     
-    def __init__(self):
+    def __init__(self, http: Optional[HttpTransport] = None, cache: Optional[CacheBackend] = None):
+        # Pooled keep-alive transport shared by every provider call
+        self.http = http or get_transport()
+
         self.odds_api_key = os.getenv('ODDS_API_KEY', '')
         self.odds_base_url = 'https://api.the-odds-api.com/v4'
 
@@ -42,17 +116,84 @@ class ProfessionalDataEngine:
             ]
         }
         
-        # Cache for API efficiency
-        self.cache = {}
-        self.cache_duration = 300  # 5 minutes
+        # Cache for API efficiency (backend chosen by CACHE_URL; the sqlite
+        # and redis backends are shared by every worker)
+        self.cache = cache or create_cache()
+        self.cache_duration = CACHE.DEFAULT_TTL
+        self.cache_ttls = dict(CACHE.TTLS)
+        self.hard_expiry = CACHE.HARD_EXPIRY
+        # One upstream fetch per cache key at a time; concurrent misses wait on it
+        self.flights = SingleFlight()
+        # Keys served so far and how to refetch them (used by the refresh scheduler)
+        self._fetchers: Dict[str, Callable] = {}
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        # Cache key -> (payload timestamp, flattened OddsSnapshot)
+        self._snapshots: Dict[str, Tuple[float, OddsSnapshot]] = {}
+
+        # Every fetched price/point is appended to the line history; one process
+        # per directory writes, the others (more web workers, the standalone
+        # newsletter) read what it seals
+        self.line_history: Optional[LineHistoryStore] = None
+        if os.getenv('LINE_HISTORY', '1') != '0':
+            try:
+                self.line_history = LineHistoryStore()
+                atexit.register(self.line_history.flush)
+            except LineHistoryLocked as e:
+                print(f"⚠️ {e}; reading it only")
+                self.line_history = LineHistoryStore(read_only=True)
+            except OSError as e:
+                print(f"⚠️ Line history disabled: {e}")
+        # Optional per-row model probabilities for the prop scanner:
+        # callable(OddsSnapshot) -> array (NaN = no opinion, use consensus)
+        self.probability_source: Optional[Callable] = None
+        self.projection_model = None
+        # ESPN's current week (fetched at, week), used when the model cannot date the slate
+        self.espn = ESPNDataIntegration(self.http)
+        self._espn_week: Optional[Tuple[float, int]] = None
+        # Latest SlateSimulation (correlated outcomes; preferred over the model)
+        self.simulation = None
+        self.simulated_at: Optional[float] = None
+        self._prop_scores: Dict[str, Tuple[OddsSnapshot, Optional[Callable], Dict]] = {}
+        # Top-pick leaderboards, synced from the scored markets on read
+        self.leaderboards = PickBoards()
+        # Open recommendations (bet key -> bet), sized together until kickoff
+        self._open_bets: Dict[Tuple, Dict] = {}
+        self._portfolio_lock = threading.Lock()
+        # Latest backtest report over the stored line history
+        self.backtest_report: Optional[Dict] = None
+        # Every published pick and its running record
+        self.ledger: Optional[PickLedger] = None
+        if os.getenv('PICK_LEDGER', '1') != '0':
+            try:
+                self.ledger = PickLedger()
+            except (OSError, sqlite3.Error) as e:
+                print(f"⚠️ Pick ledger disabled: {e}")
+
+        # Steam / reverse line move detection over successive snapshots (the lock
+        # also serializes recording a new snapshot, so each one is fed once)
+        self.steam = SteamDetector()
+        self._steam_lock = threading.Lock()
+        # Line history appends (disk I/O) stay off the steam lock, which the
+        # request path takes; key -> last timestamp ingested keeps them in order
+        self._history_lock = threading.Lock()
+        self._ingested: Dict[str, float] = {}
+
+        # Per-source deadlines (seconds) for aggregate calls; slow sources
+        # are dropped from the response instead of delaying it
+        self.source_deadlines = {
+            'games': 8.0,
+            'players': 8.0,
+            'odds': 8.0,
+            'props': 8.0
+        }
     
     def get_nfl_games(self) -> List[Dict]:
         """Get current week NFL games with betting lines"""
         
-        cache_key = 'nfl_games'
-        if self._is_cached(cache_key):
-            return self.cache[cache_key]['data']
-        
+        return self._cached_fetch('nfl_games', self._fetch_nfl_games)
+
+    def _fetch_nfl_games(self) -> Optional[List[Dict]]:
         url = f"{self.odds_base_url}/sports/americanfootball_nfl/odds"
         
         params = {
@@ -64,21 +205,13 @@ class ProfessionalDataEngine:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=15)
+            response = self.http.get(url, params=params, timeout=15)
             response.raise_for_status()
-            games = response.json()
-            
-            # Cache the results
-            self.cache[cache_key] = {
-                'data': games,
-                'timestamp': time.time()
-            }
-            
-            return games
+            return response.json()
             
         except requests.exceptions.RequestException as e:
             print(f"❌ Error fetching games: {e}")
-            return []
+            return None
 
     def get_sportsdata_games(self) -> List[Dict]:
         """Get NFL games from SportsDataIO API"""
@@ -89,7 +222,7 @@ class ProfessionalDataEngine:
         headers = {'Ocp-Apim-Subscription-Key': self.sportsdata_api_key}
 
         try:
-            response = requests.get(url, headers=headers, timeout=15)
+            response = self.http.get(url, headers=headers, timeout=15)
             response.raise_for_status()
             games = response.json()
             print(f"✅ SportsDataIO: Got {len(games)} NFL games")
@@ -107,7 +240,7 @@ class ProfessionalDataEngine:
         headers = {'Ocp-Apim-Subscription-Key': self.sportsdata_api_key}
 
         try:
-            response = requests.get(url, headers=headers, timeout=15)
+            response = self.http.get(url, headers=headers, timeout=15)
             response.raise_for_status()
             players = response.json()
             print(f"✅ SportsDataIO: Got {len(players)} NFL players")
@@ -125,7 +258,7 @@ class ProfessionalDataEngine:
         headers = {'Ocp-Apim-Subscription-Key': self.sportsdata_api_key}
 
         try:
-            response = requests.get(url, headers=headers, timeout=15)
+            response = self.http.get(url, headers=headers, timeout=15)
             response.raise_for_status()
             teams = response.json()
             print(f"✅ SportsDataIO: Got {len(teams)} NFL teams")
@@ -143,7 +276,7 @@ class ProfessionalDataEngine:
         headers = {'Ocp-Apim-Subscription-Key': self.sportsdata_api_key}
 
         try:
-            response = requests.get(url, headers=headers, timeout=15)
+            response = self.http.get(url, headers=headers, timeout=15)
             response.raise_for_status()
             stats = response.json()
             print(f"✅ SportsDataIO: Got {len(stats)} player stats")
@@ -161,7 +294,7 @@ class ProfessionalDataEngine:
         headers = {'Ocp-Apim-Subscription-Key': self.sportsdata_api_key}
 
         try:
-            response = requests.get(url, headers=headers, timeout=15)
+            response = self.http.get(url, headers=headers, timeout=15)
             response.raise_for_status()
             standings = response.json()
             print(f"✅ SportsDataIO: Got NFL standings")
@@ -184,7 +317,7 @@ class ProfessionalDataEngine:
                     'markets': 'h2h,spreads,totals',
                     'oddsFormat': 'american'
                 }
-                response = requests.get(url, params=params, timeout=15)
+                response = self.http.get(url, params=params, timeout=15)
                 response.raise_for_status()
                 odds_data = response.json()
                 print(f"✅ Odds API: Got {len(odds_data)} games with odds")
@@ -200,23 +333,31 @@ class ProfessionalDataEngine:
             "top_players": [],
             "betting_edges": [],
             "team_analysis": {},
-            "data_sources": []
+            "data_sources": [],
+            "partial": False,
+            "missing_sources": []
         }
 
-        # Get games
-        games = self.get_sportsdata_games()
+        # Games, players and odds are independent: fetch them concurrently
+        results, missing = fan_out({
+            'games': self.get_sportsdata_games,
+            'players': self.get_sportsdata_players,
+            'odds': self.get_live_odds
+        }, self.source_deadlines)
+        insights["partial"] = bool(missing)
+        insights["missing_sources"] = missing
+
+        games = results.get('games')
         if games:
             insights["games_today"] = len(games)
             insights["data_sources"].append("SportsDataIO Games")
 
-        # Get players
-        players = self.get_sportsdata_players()
+        players = results.get('players')
         if players:
             insights["top_players"] = players[:10]  # Top 10 players
             insights["data_sources"].append("SportsDataIO Players")
 
-        # Get odds
-        odds = self.get_live_odds()
+        odds = results.get('odds')
         if odds:
             insights["betting_edges"] = odds[:5]  # Top 5 betting opportunities
             insights["data_sources"].append("Live Odds API")
@@ -226,10 +367,9 @@ class ProfessionalDataEngine:
     def get_player_props(self, market: str = 'player_anytime_td') -> List[Dict]:
         """Get player prop betting lines"""
         
-        cache_key = f'props_{market}'
-        if self._is_cached(cache_key):
-            return self.cache[cache_key]['data']
-        
+        return self._cached_fetch(f'props_{market}', lambda: self._fetch_player_props(market))
+
+    def _fetch_player_props(self, market: str) -> Optional[List[Dict]]:
         url = f"{self.odds_base_url}/sports/americanfootball_nfl/odds"
         
         params = {
@@ -241,21 +381,13 @@ class ProfessionalDataEngine:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=15)
+            response = self.http.get(url, params=params, timeout=15)
             response.raise_for_status()
-            props = response.json()
-            
-            # Cache the results
-            self.cache[cache_key] = {
-                'data': props,
-                'timestamp': time.time()
-            }
-            
-            return props
+            return response.json()
             
         except requests.exceptions.RequestException as e:
             print(f"❌ Error fetching props: {e}")
-            return []
+            return None
     
     def calculate_edge(self, true_probability: float, odds: int) -> float:
         """
@@ -268,92 +400,392 @@ class ProfessionalDataEngine:
         Returns:
             Edge percentage (positive = profitable)
         """
-        # Convert American odds to decimal
-        if odds > 0:
-            decimal_odds = (odds / 100) + 1
-        else:
-            decimal_odds = (100 / abs(odds)) + 1
-        
-        # Implied probability from odds
-        implied_probability = 1 / decimal_odds
-        
-        # Calculate edge
-        edge = true_probability - implied_probability
-        
-        return edge
+        return float(odds_math.edge(true_probability, odds))
     
-    def find_best_odds(self, prop_data: List[Dict], player_name: str) -> Optional[Dict]:
-        """Find best odds across all sportsbooks for a player"""
-        
-        best_odds = None
-        best_value = float('-inf')
-        
-        for game in prop_data:
-            for bookmaker in game.get('bookmakers', []):
-                for market in bookmaker.get('markets', []):
-                    for outcome in market.get('outcomes', []):
-                        if outcome.get('description', '').lower() == player_name.lower():
-                            
-                            odds = outcome.get('price', 0)
-                            
-                            # Track best odds
-                            if odds > best_value:
-                                best_value = odds
-                                best_odds = {
-                                    'player': player_name,
-                                    'odds': odds,
-                                    'sportsbook': bookmaker.get('title'),
-                                    'market': market.get('key'),
-                                    'line': outcome.get('point', 0),
-                                    'timestamp': datetime.now().isoformat()
-                                }
-        
-        return best_odds
+    def odds_snapshot(self, key: str, data: Optional[List[Dict]] = None) -> OddsSnapshot:
+        """
+        Indexed snapshot of a cached Odds API payload, built once per fetch
+
+        Payloads another worker fetched are seen here first, so a new
+        timestamp also feeds the line history and steam detector.
+
+        Args:
+            key: Cache key of the payload ('nfl_games', 'props_<market>')
+            data: The payload just returned for key, used if it is no
+                longer in the cache
+        """
+        memo = self._snapshots.get(key)
+        if memo is not None and memo[0] == self._cache_stamp(key):
+            return memo[1]
+        entry = self.cache.get(key)
+        if entry is None:
+            return OddsSnapshot.from_events(data or [])
+        if memo is not None and memo[0] == entry['timestamp']:
+            return memo[1]
+        snapshot = OddsSnapshot.from_events(entry['data'])
+        self._observe(key, snapshot, entry['timestamp'])
+        return snapshot
+
+    def _cached_snapshot(self, key: str, fetch: Callable[[], Optional[List[Dict]]]) -> OddsSnapshot:
+        """Snapshot of a served key; the payload is only decoded when it changed"""
+        memo = self._snapshots.get(key)
+        stamp = self._cache_stamp(key)
+        if memo is not None and memo[0] == stamp and self._servable(key, fetch, stamp):
+            return memo[1]
+        return self.odds_snapshot(key, self._cached_fetch(key, fetch))
+
+    def games_snapshot(self) -> OddsSnapshot:
+        return self._cached_snapshot('nfl_games', self._fetch_nfl_games)
+
+    def props_snapshot(self, market: str = 'player_anytime_td') -> OddsSnapshot:
+        return self._cached_snapshot(f'props_{market}', lambda: self._fetch_player_props(market))
+
+    def find_best_odds(self, prop_data, player_name: str) -> Optional[Dict]:
+        """Find best odds across all sportsbooks for a player
+
+        prop_data is an OddsSnapshot (or a raw Odds API payload, flattened here).
+        """
+        snapshot = prop_data if isinstance(prop_data, OddsSnapshot) else OddsSnapshot.from_events(prop_data)
+        row = snapshot.best_price(player_name)
+        if row is None:
+            return None
+
+        outcome = snapshot.outcome(row)
+        return {
+            'player': player_name,
+            'odds': outcome['price'],
+            'sportsbook': outcome['sportsbook'],
+            'market': outcome['market'],
+            'side': outcome['name'],
+            'line': snapshot.point_of(row, 0),
+            'timestamp': datetime.now().isoformat()
+        }
     
     def get_line_movement(self, player_name: str, market: str) -> Dict:
         """Track betting line movement for value identification"""
         
-        # This would track historical odds
-        # For now, return current odds
-        props = self.get_player_props(market)
-        current_odds = self.find_best_odds(props, player_name)
+        snapshot = self.props_snapshot(market)
+        current_odds = self.find_best_odds(snapshot, player_name)
+        with self._steam_lock:
+            signals = self.steam.sharp_signals(player_name, market)
+
+        # History of the series behind the best current price
+        history = None
+        row = snapshot.best_price(player_name)
+        if row is not None and self.line_history is not None:
+            outcome = snapshot.outcome(row)
+            history = self.line_history.summary(
+                (outcome['event_id'], outcome['market'], outcome['bookmaker'],
+                 outcome['participant'], outcome['name']))
         
         return {
             'player': player_name,
             'current_odds': current_odds,
-            'movement': 'stable',  # Would calculate from historical data
-            'sharp_money': False   # Would analyze betting patterns
+            'movement': movement_label(history),
+            'history': history,
+            'sharp_money': bool(signals),
+            'signals': signals
         }
     
-    def get_profitable_props(self, min_edge: float = 0.05) -> List[Dict]:
+    def get_profitable_props(self, min_edge: float = 0.05, limit: int = 50,
+                             markets: Optional[List[str]] = None) -> List[Dict]:
         """
         Identify profitable betting opportunities
         
+        Every outcome of every player_props market, at every book, is
+        scored against self.probability_source (when set) or the no-vig
+        consensus across books.
+
         Args:
             min_edge: Minimum edge percentage (default 5%)
+            limit: Number of opportunities returned (top-K by edge)
         
         Returns:
-            List of profitable props with calculated edges
+            List of profitable props with calculated edges, best first
         """
-        profitable = []
-        
-        # Get all player props
-        for market in ['player_anytime_td', 'player_rush_yds', 'player_reception_yds']:
-            props = self.get_player_props(market)
-            
-            # Analyze each prop
-            # This would integrate with your statistical models
-            # For now, return props with good value
-            
-        return profitable
+        scored = [(snapshot, scores) for _, snapshot, scores in self.scored_markets(markets)]
+
+        return [prop_scanner.describe(snapshot, scores, row)
+                for _, snapshot, scores, row in prop_scanner.top_opportunities(scored, min_edge, limit)]
     
-    def _is_cached(self, key: str) -> bool:
-        """Check if cached data is still valid"""
-        if key not in self.cache:
+    def top_picks(self, market: str = 'ALL', bet_type: str = 'ALL', limit: int = 20) -> List[Dict]:
+        """
+        Best picks (PickLeg payloads) for a market and bet type
+
+        The leaderboards re-rank only the outcomes whose odds or
+        probability changed since the last call, so this is a slice.
+        """
+        self.leaderboards.sync(self.scored_markets(include_games=True))
+        return self.leaderboards.top(market, bet_type, limit)
+
+    def scored_markets(self, markets: Optional[List[str]] = None,
+                       include_games: bool = False) -> List[Tuple[str, OddsSnapshot, Dict]]:
+        """(market, snapshot, prop_scanner scores) for every non-empty market, fetched concurrently"""
+        markets = markets or self.markets['player_props']
+        deadline = self.source_deadlines['props']
+        jobs: Dict[str, Callable] = {market: (lambda m=market: self.props_snapshot(m)) for market in markets}
+        if include_games:
+            jobs['nfl_games'] = self.games_snapshot
+        deadlines = {key: deadline for key in jobs}
+        if include_games:
+            deadlines['nfl_games'] = self.source_deadlines['games']
+        snapshots, _ = fan_out(jobs, deadlines)
+
+        scored = []
+        for key in jobs:
+            snapshot = snapshots.get(key)
+            if snapshot is not None and len(snapshot):
+                scored.append((key, snapshot, self.score_props(key, snapshot)))
+        return scored
+
+    def slate_version(self) -> str:
+        """Changes whenever a cached snapshot or the probability source changes"""
+        stamps = sorted((key, ts) for key, (ts, _) in list(self._snapshots.items()))
+        return f"{hash((tuple(stamps), id(self.probability_source))) & 0xFFFFFFFF:08x}"
+
+    def use_projection_model(self, model):
+        """Score props against a ProjectionModel (consensus where it has no opinion)"""
+        self.projection_model = model
+        self._update_probability_source()
+
+    def use_simulation(self, simulation):
+        """Score props against a SlateSimulation, the projection model filling gaps"""
+        self.simulation = simulation
+        self.simulated_at = time.time() if simulation is not None else None
+        self._update_probability_source()
+
+    def simulation_status(self) -> Optional[Dict]:
+        if self.simulation is None:
+            return None
+        return {**self.simulation.stats(), 'age': round(time.time() - self.simulated_at, 1)}
+
+    def live_week(self, snapshot: Optional[OddsSnapshot] = None) -> Optional[int]:
+        """
+        Week the slate is played in: the projection model's week of the
+        earliest kickoff in the snapshot, else ESPN's current week
+        """
+        model = self.projection_model
+        if snapshot is not None and model is not None:
+            kickoffs = [k for k in (parse_kickoff(e.get('commence_time')) for e in snapshot.events) if k is not None]
+            week = model.week_at(min(kickoffs)) if kickoffs else None
+            if week is not None:
+                return week
+        memo = self._espn_week
+        if memo is None:
+            # Cold: one coalesced ESPN call, concurrent callers wait on it
+            return self.flights.do(ESPN_WEEK_KEY, self._refresh_espn_week)
+        if time.time() - memo[0] > ESPN_WEEK_TTL:
+            # Past the TTL: serve the known week while one refresh runs off the request path
+            self._run_in_background(ESPN_WEEK_KEY, self._refresh_espn_week)
+        return memo[1]
+
+    def _refresh_espn_week(self) -> Optional[int]:
+        week = self.espn.get_current_week(default=None)
+        memo = self._espn_week
+        # Unreachable: keep the last known week (and wait out the TTL before retrying)
+        self._espn_week = (time.time(), week if week is not None else memo and memo[1])
+        return self._espn_week[1]
+
+    def _projection_probabilities(self, snapshot: OddsSnapshot):
+        return self.projection_model.snapshot_probabilities(snapshot, self.live_week(snapshot))
+
+    def _update_probability_source(self):
+        sources = []
+        if self.simulation is not None and len(self.simulation):
+            sources.append(self.simulation.snapshot_probabilities)
+        if self.projection_model is not None and len(self.projection_model):
+            # Priced for the slate's week, not the last week the projections cover
+            sources.append(self._projection_probabilities)
+        self.probability_source = prop_scanner.first_opinion(*sources) if sources else None
+        self._prop_scores.clear()
+
+    def simulate_slate(self, simulations: int = simulator.SIMULATIONS, seed: Optional[int] = None,
+                       processes: Optional[int] = None, max_age: Optional[float] = None):
+        """
+        Monte Carlo the current slate and feed it into prop scoring
+
+        Uses the cached games snapshot plus every cached props snapshot.
+        With max_age, a simulation younger than that is reused.
+        """
+        if max_age is not None and self.simulation is not None and \
+                time.time() - self.simulated_at < max_age:
+            return self.simulation
+        props = [snapshot for key, (_, snapshot) in list(self._snapshots.items())
+                 if key.startswith('props_')]
+        games = self.games_snapshot()
+        specs = simulator.game_specs(games, props, self.projection_model, self.live_week(games))
+        start = time.perf_counter()
+        simulation = simulator.simulate_slate(specs, simulations, seed, processes)
+        print(f"✅ Simulated {len(specs)} games x {simulations:,} in {time.perf_counter() - start:.1f}s")
+        self.use_simulation(simulation)
+        return simulation
+
+    def score_props(self, market: str, snapshot: OddsSnapshot) -> Dict:
+        """prop_scanner scores for a market's snapshot, memoized per snapshot"""
+        source = self.probability_source
+        memo = self._prop_scores.get(market)
+        if memo is not None and memo[0] is snapshot and memo[1] is source:
+            return memo[2]
+        model = source(snapshot) if source else None
+        scores = prop_scanner.score_snapshot(snapshot, model)
+        self._prop_scores[market] = (snapshot, source, scores)
+        return scores
+
+    def _cache_ttl(self, key: str) -> float:
+        """TTL for a cache key (per market, falling back to the default)"""
+        return self.cache_ttls.get(key, self.cache_duration)
+
+    def _cache_get(self, key: str):
+        """Cached payload if still fresh, else None"""
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+
+        age = time.time() - entry['timestamp']
+        return entry['data'] if age < self._cache_ttl(key) else None
+
+    def _cache_set(self, key: str, data) -> float:
+        # The backend keeps payloads until hard expiry so they can be served stale
+        ttl = max(self._cache_ttl(key), self.hard_expiry)
+        timestamp = time.time()
+        self.cache.set(key, {'data': data, 'timestamp': timestamp}, ttl)
+        # Written after the payload: a reader that sees the new stamp finds the new payload
+        self.cache.set(f"{key}:ts", timestamp, ttl)
+        return timestamp
+
+    def _cache_stamp(self, key: str) -> Optional[float]:
+        """Timestamp of a cached payload, read without decoding the payload when possible"""
+        stamp = self.cache.get(f"{key}:ts")
+        if stamp is None:
+            entry = self.cache.get(key)
+            stamp = entry['timestamp'] if entry else None
+        return stamp
+
+    def _servable(self, key: str, fetch: Callable, timestamp: Optional[float]) -> bool:
+        """Whether a copy cached at timestamp can be served (refreshing it in the background once stale)"""
+        self._fetchers[key] = fetch
+        if timestamp is None:
             return False
-        
-        age = time.time() - self.cache[key]['timestamp']
-        return age < self.cache_duration
+        age = time.time() - timestamp
+        if age < self._cache_ttl(key):
+            return True
+        if age < self.hard_expiry:
+            self.refresh_in_background(key)
+            return True
+        return False
+
+    def _ingest(self, key: str, data: List[Dict], timestamp: float):
+        """Flatten a fresh payload once and feed it to the line history and steam detector"""
+        self._observe(key, OddsSnapshot.from_events(data), timestamp)
+
+    def _observe(self, key: str, snapshot: OddsSnapshot, timestamp: float):
+        """
+        Memoize a payload's snapshot and, the first time this process sees
+        its timestamp, append it to the line history (when this process
+        is the writer) and run steam detection over it
+        """
+        with self._steam_lock:
+            memo = self._snapshots.get(key)
+            if memo is not None and memo[0] >= timestamp:
+                return
+            self._snapshots[key] = (timestamp, snapshot)
+            for signal in self.steam.update(snapshot, timestamp):
+                print(f"🚨 {signal['type']} {signal['measure']} {signal['direction']}: {signal['participant']} "
+                      f"{signal['market']} ({signal['books']} books)")
+        if self.line_history is not None and not self.line_history.read_only:
+            with self._history_lock:
+                if self._ingested.get(key, float('-inf')) >= timestamp:
+                    return  # a newer snapshot got there first
+                self._ingested[key] = timestamp
+                try:
+                    self.line_history.ingest(snapshot, timestamp)
+                except OSError as e:
+                    print(f"⚠️ Line history write failed: {e}")
+
+    def _cached_fetch(self, key: str, fetch: Callable[[], Optional[List[Dict]]]) -> List[Dict]:
+        """
+        Stale-while-revalidate read of an upstream payload
+
+        Fresh entries are returned as-is. Entries past their TTL but before
+        hard expiry are returned immediately while one background refresh
+        runs. Only a cold (or hard-expired) key blocks, on a single
+        coalesced upstream fetch.
+        """
+        entry = self.cache.get(key)
+        if self._servable(key, fetch, entry['timestamp'] if entry else None):
+            return entry['data']
+
+        return self.flights.do(key, lambda: self._refresh(key, fetch))
+
+    def _refresh(self, key: str, fetch: Callable, max_age: Optional[float] = None) -> List[Dict]:
+        """Fetch and cache key unless another flight or worker just did"""
+        entry = self.cache.get(key)
+        if entry is not None:
+            age = time.time() - entry['timestamp']
+            if age < (self._cache_ttl(key) if max_age is None else max_age):
+                return entry['data']
+
+        # fetch returns None on failure; failures are never cached and a
+        # stale payload keeps being served until hard expiry
+        data = fetch()
+        if data is None:
+            if entry is not None and time.time() - entry['timestamp'] < self.hard_expiry:
+                return entry['data']
+            return []
+        self._ingest(key, data, self._cache_set(key, data))
+        return data
+
+    def refresh_in_background(self, key: str, max_age: Optional[float] = None) -> bool:
+        """
+        Refetch a previously served key on the fan-out pool
+
+        Args:
+            max_age: Skip the fetch if the cached copy is younger than this
+                (defaults to the key's TTL)
+
+        Returns:
+            False if the key is unknown or a refresh is already running
+        """
+        fetch = self._fetchers.get(key)
+        if fetch is None:
+            return False
+        return self._run_in_background(key, lambda: self._refresh(key, fetch, max_age))
+
+    def _run_in_background(self, key: str, refresh: Callable[[], Any]) -> bool:
+        """Run refresh coalesced under key on the fan-out pool; False if already running"""
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self.flights.do(key, refresh)
+            except Exception as e:
+                print(f"❌ Background refresh of {key} failed: {e}")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        _get_fan_out_pool().submit(run)
+        return True
+
+    def tracked_keys(self) -> List[str]:
+        return list(self._fetchers)
+
+    def freshness(self, key: str) -> Optional[Dict]:
+        """Staleness metadata for a cached key (None if nothing is cached)"""
+        stamp = self._cache_stamp(key)
+        if stamp is None:
+            return None
+        age = time.time() - stamp
+        return {
+            'fetched_at': datetime.fromtimestamp(stamp).isoformat(),
+            'age_seconds': round(age, 1),
+            'stale': age >= self._cache_ttl(key),
+            'expires_in': round(max(0.0, self.hard_expiry - age), 1),
+            'refreshing': key in self._refreshing
+        }
     
     def get_comprehensive_analysis(self, player_name: str) -> Dict:
         """
@@ -367,68 +799,152 @@ class ProfessionalDataEngine:
             'betting_lines': {},
             'props': {},
             'edges': {},
-            'recommendations': []
+            'recommendations': [],
+            'partial': False,
+            'missing_markets': []
         }
         
-        # Get all available props
-        for market in ['player_anytime_td', 'player_rush_yds', 'player_reception_yds']:
-            props = self.get_player_props(market)
-            best_odds = self.find_best_odds(props, player_name)
+        # Fetch all prop markets concurrently
+        markets = ['player_anytime_td', 'player_rush_yds', 'player_reception_yds']
+        deadline = self.source_deadlines['props']
+        market_props, missing = fan_out(
+            {market: (lambda m=market: self.props_snapshot(m)) for market in markets},
+            {market: deadline for market in markets}
+        )
+        analysis['partial'] = bool(missing)
+        analysis['missing_markets'] = missing
+
+        bets = []
+        for market in markets:
+            snapshot = market_props.get(market)
+            if snapshot is None:
+                continue
+            best_odds = self.find_best_odds(snapshot, player_name)
             
             if best_odds:
                 analysis['props'][market] = best_odds
                 
-                # Calculate edge (would use your statistical model)
-                # For demonstration, using placeholder
-                true_prob = 0.35  # Your calculated probability
+                # Model probability for the best-priced outcome, else the
+                # no-vig consensus across books
+                scores = self.score_props(market, snapshot)
+                row = snapshot.best_price(player_name)
+                true_prob = float(scores['probability'][row])
+                if math.isnan(true_prob):
+                    continue
                 edge = self.calculate_edge(true_prob, best_odds['odds'])
                 
                 analysis['edges'][market] = {
+                    'true_probability': round(true_prob, 4),
+                    'source': 'model' if scores['from_model'][row] else 'consensus',
                     'edge_percentage': edge,
-                    'ev_per_dollar': edge * (best_odds['odds'] / 100 if best_odds['odds'] > 0 else 100 / abs(best_odds['odds'])),
+                    'ev_per_dollar': float(odds_math.expected_value(true_prob, best_odds['odds'])),
                     'kelly_criterion': self._calculate_kelly(true_prob, best_odds['odds'])
                 }
                 
                 # Generate recommendation
                 if edge > 0.05:  # 5%+ edge
+                    outcome = snapshot.outcome(row)
+                    event = snapshot.events[snapshot.event[row]]
+                    bets.append({
+                        'probability': true_prob,
+                        'odds': best_odds['odds'],
+                        'game': outcome['event_id'],
+                        'player': outcome['participant'],
+                        'book': outcome['bookmaker'],
+                        'event_id': outcome['event_id'],
+                        'market': market,
+                        'participant': outcome['participant'],
+                        'side': outcome['name'],
+                        'point': outcome['point'],
+                        'kickoff': parse_kickoff(event.get('commence_time'))
+                    })
                     analysis['recommendations'].append({
                         'bet': f"{player_name} {market}",
                         'odds': best_odds['odds'],
                         'edge': edge,
                         'confidence': min(edge * 10, 1.0),  # Scale to 0-1
-                        'bet_size': self._calculate_kelly(true_prob, best_odds['odds'])
+                        'kelly_independent': self._calculate_kelly(true_prob, best_odds['odds'])
                     })
+
+        # Bet sizes come from one Kelly solve over every open recommendation
+        if bets:
+            sizing = self.size_portfolio(bets)
+            for recommendation, stake in zip(analysis['recommendations'], sizing['stakes']):
+                recommendation['bet_size'] = stake
+            analysis['portfolio'] = {key: value for key, value in sizing.items() if key != 'stakes'}
         
         return analysis
+
+    def run_backtest(self, store, **options) -> Dict:
+        """
+        Replay the line history against a SportsDataStore's results (see backtest.run)
+
+        Raises:
+            ValueError: Line history is disabled
+        """
+        if self.line_history is None:
+            raise ValueError("Line history is disabled (LINE_HISTORY=0); nothing to replay")
+        self.backtest_report = backtest.run(store, self.line_history, self.projection_model, **options)
+        return self.backtest_report
+
+    def publish_picks(self, picks: List[Dict], channel: str = 'newsletter', week: Optional[int] = None) -> int:
+        """Record leaderboard picks (PickLeg payloads) in the ledger at their current prices"""
+        if self.ledger is None:
+            return 0
+        return self.ledger.publish([from_pick_leg(pick) for pick in picks], channel, week)
+
+    def grade_picks(self, store) -> Dict:
+        """
+        Settle published picks against a SportsDataStore's results
+
+        Raises:
+            ValueError: Pick ledger is disabled
+        """
+        if self.ledger is None:
+            raise ValueError("Pick ledger is disabled (PICK_LEDGER=0)")
+        return self.ledger.grade(backtest.SeasonResults.from_store(store))
+
+    def size_portfolio(self, bets: List[Dict]) -> Dict:
+        """
+        Bankroll fractions for bets, solved jointly with every open recommendation
+
+        Bets (portfolio.optimize dicts) stay in the open set until kickoff
+        (or PORTFOLIO.OPEN_TTL), so later analyses share the same caps.
+
+        Returns:
+            stakes for `bets` (input order) plus the whole portfolio's totals
+        """
+        now = time.time()
+        keys = [(bet.get('event_id'), bet.get('market'), bet.get('participant'), bet.get('side'),
+                 bet.get('point')) for bet in bets]
+        with self._portfolio_lock:
+            self._open_bets = {key: bet for key, bet in self._open_bets.items()
+                               if (bet.get('kickoff') or bet['opened'] + PORTFOLIO.OPEN_TTL) > now}
+            for key, bet in zip(keys, bets):
+                self._open_bets[key] = dict(bet, opened=now)
+            open_keys = list(self._open_bets)
+            open_bets = list(self._open_bets.values())
+        result = portfolio.optimize(open_bets, simulation=self.simulation)
+        stakes = dict(zip(open_keys, result['stakes'].tolist()))
+        return {
+            'stakes': [round(stakes.get(key, 0.0), 4) for key in keys],
+            'open_bets': len(open_bets),
+            'total_exposure': round(result['total'], 4),
+            'independent_exposure': round(result['independent_total'], 4),
+            'binding_caps': result['binding'],
+            'converged': result['converged']
+        }
     
     def _calculate_kelly(self, true_prob: float, odds: int) -> float:
-        """Calculate Kelly Criterion bet sizing"""
-        
-        # Convert odds to decimal
-        if odds > 0:
-            decimal_odds = (odds / 100) + 1
-        else:
-            decimal_odds = (100 / abs(odds)) + 1
-        
-        # Kelly formula: (bp - q) / b
-        # b = decimal odds - 1
-        # p = true probability
-        # q = 1 - p
-        
-        b = decimal_odds - 1
-        p = true_prob
-        q = 1 - p
-        
-        kelly = (b * p - q) / b
-        
-        # Use half-Kelly for safety
-        return max(0, kelly * 0.5)
+        """Calculate Kelly Criterion bet sizing (half-Kelly for safety)"""
+        return float(odds_math.kelly(true_prob, odds, fraction=0.5))
 
 
 class ESPNDataIntegration:
     """ESPN API integration for player stats and game data"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[HttpTransport] = None):
+        self.http = http or get_transport()
         self.base_url = 'https://site.api.espn.com/apis/site/v2/sports/football/nfl'
     
     def get_player_stats(self, player_id: str = None) -> Dict:
@@ -438,7 +954,7 @@ class ESPNDataIntegration:
         url = f"{self.base_url}/athletes"
         
         try:
-            response = requests.get(url, timeout=10)
+            response = self.http.get(url, timeout=10)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -451,26 +967,26 @@ class ESPNDataIntegration:
         url = f"{self.base_url}/teams"
         
         try:
-            response = requests.get(url, timeout=10)
+            response = self.http.get(url, timeout=10)
             response.raise_for_status()
             return response.json()
         except Exception as e:
             print(f"Error fetching team stats: {e}")
             return {}
     
-    def get_current_week(self) -> int:
-        """Get current NFL week"""
+    def get_current_week(self, default: Optional[int] = 1) -> Optional[int]:
+        """Get current NFL week (default if ESPN cannot be reached)"""
         
         url = f"{self.base_url}/scoreboard"
         
         try:
-            response = requests.get(url, timeout=10)
+            response = self.http.get(url, timeout=10)
             response.raise_for_status()
             data = response.json()
-            return data.get('week', {}).get('number', 1)
+            return data.get('week', {}).get('number', default)
         except Exception as e:
             print(f"Error fetching current week: {e}")
-            return 1
+            return default
 
 
 def main():
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Engine Registry
+Lazy, thread-safe engine startup with background warm-up
+
+Engines are registered with a factory and built on first use (or by the
+warm-up thread), never at import time, so a worker can answer liveness
+checks immediately even when every upstream provider is unreachable.
+Spawned pool workers (simulator, backtest, newsletter batch) re-import
+the parent's __main__, app.py when it is run directly; warm_up() is a
+no-op there, so they never build engines or spend provider quota.
+"""
+import multiprocessing
+import threading
+import time
+import traceback
+from typing import Callable, Dict, List, Optional
+
+# Engine lifecycle states
+PENDING = 'pending'
+STARTING = 'starting'
+READY = 'ready'
+FAILED = 'failed'
+DISABLED = 'disabled'
+
+# Seconds before a failed engine may be rebuilt on the next get()
+RETRY_AFTER = 30
+
+
+class _EngineSlot:
+    def __init__(self, name: str, factory: Callable, warm_up: Optional[Callable],
+                 enabled: bool, required: bool):
+        self.name = name
+        self.factory = factory
+        self.warm_up = warm_up
+        self.enabled = enabled
+        self.required = required
+        self.instance = None
+        self.state = PENDING if enabled else DISABLED
+        self.warmed = warm_up is None
+        self.error: Optional[str] = None
+        self.failed_at = 0.0
+        self.init_ms: Optional[float] = None
+        self.warm_ms: Optional[float] = None
+        self.lock = threading.Lock()
+
+
+class EngineRegistry:
+    """Builds engines on demand and reports liveness separately from readiness"""
+
+    def __init__(self):
+        self._slots: Dict[str, _EngineSlot] = {}
+        self._warm_thread: Optional[threading.Thread] = None
+        self.warm_up_requested = False
+        self.started_at = time.time()
+
+    def register(self, name: str, factory: Callable, warm_up: Optional[Callable] = None,
+                 enabled: bool = True, required: bool = False):
+        """
+        Register an engine
+
+        Args:
+            factory: Zero-argument callable that builds the engine
+            warm_up: Optional callable(engine) run by warm_up() to prime caches
+            enabled: Disabled engines are never built (e.g. missing credentials)
+            required: Readiness waits for required engines to build and warm
+        """
+        self._slots[name] = _EngineSlot(name, factory, warm_up, enabled, required)
+
+    def get(self, name: str):
+        """The engine instance, building it on first use; None if unavailable"""
+        slot = self._slots.get(name)
+        if slot is None or not slot.enabled:
+            return None
+        if slot.state == READY:
+            return slot.instance
+
+        with slot.lock:
+            if slot.state == READY:
+                return slot.instance
+            if slot.state == FAILED and time.time() - slot.failed_at < RETRY_AFTER:
+                return None
+
+            slot.state = STARTING
+            start = time.perf_counter()
+            try:
+                slot.instance = slot.factory()
+                slot.state = READY
+                slot.error = None
+                print(f"✅ {name} engine ready")
+            except Exception as e:
+                slot.instance = None
+                slot.state = FAILED
+                slot.error = str(e)
+                slot.failed_at = time.time()
+                print(f"⚠️ {name} engine failed: {e}")
+                traceback.print_exc()
+            slot.init_ms = (time.perf_counter() - start) * 1000
+            return slot.instance
+
+    def peek(self, name: str):
+        """The engine instance only if it is already built (never builds)"""
+        slot = self._slots.get(name)
+        return slot.instance if slot and slot.state == READY else None
+
+    def _warm(self, names: List[str]):
+        for name in names:
+            slot = self._slots[name]
+            engine = self.get(name)
+            if engine is None or slot.warm_up is None:
+                slot.warmed = True
+                continue
+            start = time.perf_counter()
+            try:
+                slot.warm_up(engine)
+            except Exception as e:
+                print(f"⚠️ {name} engine warm-up failed: {e}")
+            slot.warm_ms = (time.perf_counter() - start) * 1000
+            slot.warmed = True
+
+    def warm_up(self, names: Optional[List[str]] = None, background: bool = True):
+        """Build and prime engines, by default on a daemon thread (not in spawned pool workers)"""
+        # Set before a spawned child re-imports __main__ (parent_process() is not yet)
+        if multiprocessing.current_process().name != 'MainProcess':
+            return None
+        names = [n for n in (names or self._slots) if self._slots[n].enabled]
+        self.warm_up_requested = True
+        if not background:
+            self._warm(names)
+            return None
+        self._warm_thread = threading.Thread(target=self._warm, args=(names,),
+                                             name='engine-warm-up', daemon=True)
+        self._warm_thread.start()
+        return self._warm_thread
+
+    def is_ready(self, name: Optional[str] = None) -> bool:
+        """Readiness: the engine (or every required engine) is built and, if warm-up
+        was requested, warmed"""
+        slots = [self._slots[name]] if name else [s for s in self._slots.values() if s.required]
+        if not self.warm_up_requested:
+            return all(s.state == READY for s in slots)
+        return all(s.state == READY and s.warmed for s in slots)
+
+    def status(self) -> Dict[str, Dict]:
+        return {
+            name: {
+                'state': slot.state,
+                'warmed': slot.warmed,
+                'required': slot.required,
+                'init_ms': round(slot.init_ms, 1) if slot.init_ms is not None else None,
+                'warm_ms': round(slot.warm_ms, 1) if slot.warm_ms is not None else None,
+                'error': slot.error
+            }
+            for name, slot in self._slots.items()
+        }
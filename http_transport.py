@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Shared HTTP Transport
+Pooled keep-alive sessions for every outbound provider call
+
+One requests.Session per process with per-host connection pools,
+bounded per-host concurrency, gzip negotiation and retries with
+full-jitter exponential backoff. Every call is timed per host so
+connection reuse shows up in metrics().
+"""
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Statuses worth retrying (rate limits and transient upstream failures)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Latency samples kept per host for percentiles
+SAMPLE_WINDOW = 512
+
+
+class HostMetrics:
+    """Rolling per-host call statistics (updated from fan-out threads)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_ms = 0.0
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+        self.status_counts: Dict[int, int] = {}
+
+    def record(self, elapsed_ms: float, status: Optional[int]):
+        with self._lock:
+            self.calls += 1
+            self.total_ms += elapsed_ms
+            self.samples.append(elapsed_ms)
+            if status is None:
+                self.errors += 1
+            else:
+                self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def retried(self):
+        with self._lock:
+            self.retries += 1
+
+    def summary(self) -> Dict:
+        with self._lock:
+            ordered = sorted(self.samples)
+            calls, errors, retries, total_ms = self.calls, self.errors, self.retries, self.total_ms
+            statuses = dict(self.status_counts)
+
+        def pct(p):
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 2) if ordered else None
+
+        return {
+            'calls': calls,
+            'errors': errors,
+            'retries': retries,
+            'avg_ms': round(total_ms / calls, 2) if calls else None,
+            'p50_ms': pct(0.50),
+            'p95_ms': pct(0.95),
+            'statuses': statuses
+        }
+
+
+class HttpTransport:
+    """Shared outbound HTTP layer used by all provider integrations"""
+
+    def __init__(self, pool_maxsize: int = 10, max_concurrency_per_host: int = 8,
+                 retries: int = 2, backoff_base: float = 0.25, backoff_cap: float = 4.0,
+                 timeout: float = 15):
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self.max_concurrency_per_host = max_concurrency_per_host
+
+        self.session = requests.Session()
+        # Retries are handled here (with jitter), not by urllib3
+        self.adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_maxsize,
+                                   pool_block=True, max_retries=0)
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self.session.headers.update({
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive'
+        })
+
+        self._lock = threading.Lock()
+        self._limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._metrics: Dict[str, HostMetrics] = {}
+
+    def _host_state(self, host: str):
+        with self._lock:
+            if host not in self._limits:
+                self._limits[host] = threading.BoundedSemaphore(self.max_concurrency_per_host)
+                self._metrics[host] = HostMetrics()
+            return self._limits[host], self._metrics[host]
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return min(float(retry_after), self.backoff_cap)
+        # Full jitter: uniform over [0, min(cap, base * 2^attempt)]
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method: str, url: str, params: Optional[Dict] = None,
+                headers: Optional[Dict] = None, timeout: Optional[float] = None,
+                retries: Optional[int] = None) -> requests.Response:
+        """
+        Send a request through the pooled session
+
+        Raises the usual requests exceptions once retries are exhausted, so
+        callers keep their existing `except RequestException` handling.
+        """
+        host = urlsplit(url).netloc
+        limit, metrics = self._host_state(host)
+        retries = self.retries if retries is None else retries
+        timeout = self.timeout if timeout is None else timeout
+
+        for attempt in range(retries + 1):
+            response = None
+            start = time.perf_counter()
+            try:
+                with limit:
+                    response = self.session.request(method, url, params=params,
+                                                    headers=headers, timeout=timeout)
+            except requests.exceptions.ConnectionError:
+                # Includes connect timeouts; read timeouts are not retried
+                metrics.record((time.perf_counter() - start) * 1000, None)
+                if attempt == retries:
+                    raise
+            else:
+                metrics.record((time.perf_counter() - start) * 1000, response.status_code)
+                if response.status_code not in RETRY_STATUSES or attempt == retries:
+                    return response
+            metrics.retried()
+            time.sleep(self._backoff(attempt, response))
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def connection_stats(self) -> Dict[str, Dict]:
+        """Connections opened vs requests served per host, from the urllib3 pools"""
+        stats: Dict[str, Dict] = {}
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = pool.host if pool.port in (None, 80, 443) else f"{pool.host}:{pool.port}"
+            entry = stats.setdefault(host, {'connections_opened': 0, 'requests': 0})
+            entry['connections_opened'] += pool.num_connections
+            entry['requests'] += pool.num_requests
+        return stats
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Per-host latency, retries and connection reuse"""
+        connections = self.connection_stats()
+        with self._lock:
+            hosts = dict(self._metrics)
+        report = {}
+        for host, metrics in hosts.items():
+            entry = metrics.summary()
+            pool = connections.get(host, {})
+            opened = pool.get('connections_opened', 0)
+            entry['connections_opened'] = opened
+            entry['connection_reuse'] = round(1 - opened / entry['calls'], 3) if entry['calls'] and opened else None
+            report[host] = entry
+        return report
+
+    def close(self):
+        self.session.close()
+
+
+_shared: Optional[HttpTransport] = None
+_shared_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    """The process-wide transport shared by all provider clients"""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = HttpTransport()
+    return _shared
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Jackpot Search
+Long-shot parlays that cross a payout tier with the best hit probability
+
+A $stake parlay pays the tier when the product of its legs' decimal odds
+reaches tier / stake, i.e. when the sum of log(decimal) (the "weight")
+reaches log(tier / stake). Maximizing the hit probability means
+minimizing the sum of -log(p) (the "cost"). That is a knapsack: weights
+are floored onto a RESOLUTION grid so partial products are memoized in a
+(legs x weight bucket) table - any weight at or past the target shares
+the last bucket - and each player is a group contributing at most one
+leg (multiple-choice knapsack). Flooring never overstates a payout, so
+every solution really crosses the tier.
+
+The table is swept with one vectorized update per candidate leg; a
+predecessor table recovers the legs of the best parlay for every leg
+count that reaches the target.
+"""
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+TIERS = {'50k': 50000.0, '100k': 100000.0, '1M': 1000000.0}
+# Bet slips stop at this many legs
+MAX_LEGS = 15
+# log(decimal) grid step; finer is closer to optimal, coarser is faster
+RESOLUTION = 0.02
+# Stakes are bucketed (rounded down) so nearby stakes share cached results
+STAKE_BUCKETS = (1, 2, 5, 10, 20, 25, 50, 100, 250, 500, 1000)
+
+
+def stake_bucket(stake: float) -> float:
+    """Largest bucket <= stake (a smaller stake needs longer odds, so results stay valid)"""
+    eligible = [b for b in STAKE_BUCKETS if b <= stake]
+    return float(eligible[-1]) if eligible else float(stake)
+
+
+def knapsack(cost: np.ndarray, weight: np.ndarray, group: np.ndarray, target: float,
+             max_legs: int = MAX_LEGS, resolution: float = RESOLUTION) -> List[Tuple[float, List[int]]]:
+    """
+    Cheapest leg set reaching `target` weight, for every leg count
+
+    Args:
+        cost: -log(p) per candidate (>= 0)
+        weight: log(decimal) per candidate (> 0)
+        group: Group id per candidate; at most one candidate per group
+        target: Required total weight
+
+    Returns:
+        [(total cost, candidate indices)] cheapest first
+    """
+    if target <= 0:
+        return []
+    buckets = int(math.ceil(target / resolution))
+    steps = np.floor(weight / resolution).astype(np.int64)
+    usable = np.flatnonzero((steps > 0) & np.isfinite(cost))
+    if not len(usable):
+        return []
+    legs = min(max_legs, len(np.unique(group[usable])))
+
+    # table[l, b]: cheapest cost of l legs whose floored weight is b (b == buckets: at/over target)
+    table = np.full((legs + 1, buckets + 1), np.inf)
+    table[0, 0] = 0.0
+    order = usable[np.argsort(group[usable], kind='stable')]
+    groups = np.split(order, np.flatnonzero(np.diff(group[order])) + 1)
+    chosen = np.full((len(groups), legs + 1, buckets + 1), -1, dtype=np.int32)
+    came_from = np.zeros((len(groups), legs + 1, buckets + 1), dtype=np.int32)
+
+    for g, members in enumerate(groups):
+        previous = table[:-1]
+        updated = table.copy()
+        for i in members.tolist():
+            w, c = int(steps[i]), float(cost[i])
+            candidate = np.full_like(previous, np.inf)
+            source = np.zeros(previous.shape, dtype=np.int32)
+            if w < buckets:
+                candidate[:, w:buckets] = previous[:, :buckets - w] + c
+                source[:, w:buckets] = np.arange(buckets - w)
+            tail = previous[:, max(buckets - w, 0):]
+            best_tail = np.argmin(tail, axis=1)
+            candidate[:, buckets] = tail[np.arange(len(tail)), best_tail] + c
+            source[:, buckets] = best_tail + max(buckets - w, 0)
+
+            better = candidate < updated[1:]
+            updated[1:] = np.where(better, candidate, updated[1:])
+            chosen[g, 1:][better] = i
+            came_from[g, 1:][better] = source[better]
+        table = updated
+
+    results = []
+    for count in range(1, legs + 1):
+        if not np.isfinite(table[count, buckets]):
+            continue
+        picks, b, l = [], buckets, count
+        for g in range(len(groups) - 1, -1, -1):
+            i = chosen[g, l, b]
+            if i >= 0:
+                picks.append(int(i))
+                b = int(came_from[g, l, b])
+                l -= 1
+        results.append((float(table[count, buckets]), picks[::-1]))
+    results.sort(key=lambda item: item[0])
+    return results
+
+
+def jackpot_leg(leg: Dict) -> Dict:
+    """Parlay leg -> the jackpot button's Leg shape"""
+    market = leg['market']
+    kind = 'H2H' if market in ('h2h', 'spreads') else 'Total' if market == 'totals' else 'Prop'
+    return {
+        'id': f"{leg['bookmaker']}:{leg['event_id']}:{market}:{leg['playerId'].split(':', 1)[1]}:"
+              f"{leg['side']}:{leg['point']}",
+        'gameId': leg['event_id'],
+        'market': kind,
+        'selection': leg['side'] if kind != 'H2H' else leg['participant'],
+        'priceDecimal': leg['decimal'],
+        'edgeScore': leg['edgeScore'],
+        'startTime': leg['commence_time'],
+        'playerName': leg['playerName'],
+        'teamName': leg['team'],
+        'propType': leg['propType'],
+        'line': leg['propLine'],
+        'sportsbook': leg['sportsbook'],
+        'probability': leg['probability']
+    }
+
+
+def candidate(legs: List[Dict], stake: float, hit_probability: Optional[float] = None) -> Dict:
+    """Jackpot Candidate payload"""
+    decimal = float(np.prod([leg['decimal'] for leg in legs]))
+    if hit_probability is None:
+        hit_probability = float(np.prod([leg['probability'] for leg in legs]))
+    payload = [jackpot_leg(leg) for leg in legs]
+    return {
+        'legIds': [leg['id'] for leg in payload],
+        'payout': round(stake * decimal, 2),
+        'decimalProduct': round(decimal, 2),
+        'estHitProb': hit_probability,
+        'legs': payload,
+        'sportsbook': legs[0]['sportsbook']
+    }
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Leaderboards
+Precomputed top-pick rankings per market and bet type
+
+Every scored outcome becomes one pick at its best-EV sportsbook. Picks
+sit in sorted boards - one per (market, bet type), plus an all-markets
+board per bet type - so a top-N query for any market and pool size is a
+slice. Boards are synced from the data engine's scored markets:
+
+  * a market whose scores are the same memoized object as last sync
+    (unchanged snapshot and probability source) is skipped outright
+  * in a changed market, only outcomes whose best book, price or
+    probability moved are re-ranked; outcomes that left the board are
+    removed
+"""
+import bisect
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+import prop_scanner
+
+# Odds API market -> frontend Market
+MARKETS = {
+    'h2h': 'TEAM_MONEYLINE',
+    'spreads': 'TEAM_SPREAD',
+    'totals': 'TEAM_TOTAL',
+    'player_pass_yds': 'PLAYER_PASSING_YARDS',
+    'player_rush_yds': 'PLAYER_RUSHING_YARDS',
+    'player_reception_yds': 'PLAYER_RECEIVING_YARDS',
+    'player_receptions': 'PLAYER_RECEPTIONS',
+    'player_pass_tds': 'PLAYER_PASSING_TDS',
+    'player_anytime_td': 'PLAYER_TD',
+    'player_first_td': 'PLAYER_TD'
+}
+MARKET_LABELS = {
+    'player_pass_yds': 'Pass Yds',
+    'player_rush_yds': 'Rush Yds',
+    'player_reception_yds': 'Rec Yds',
+    'player_receptions': 'Receptions',
+    'player_pass_tds': 'Pass TDs',
+    'player_anytime_td': 'Anytime TD',
+    'player_first_td': 'First TD'
+}
+ALL = 'ALL'
+
+# Bet type: price / confidence filters and ranking ('ev' or 'confidence' first)
+BET_TYPES = {
+    'ALL': {'rank': 'ev'},
+    'LONGSHOTS': {'min_price': 400, 'rank': 'ev'},
+    'CONSERVATIVE': {'max_price': 200, 'min_confidence': 80, 'rank': 'confidence'},
+    'BEST_PICKS': {'min_confidence': 85, 'rank': 'confidence'}
+}
+# Fewer books than this and the consensus probability is thin
+MIN_BOOKS = 2
+
+
+def qualifies(pick: Dict, bet_type: Dict) -> bool:
+    price, confidence = pick['priceAmerican'], pick['confidence']
+    return (price >= bet_type.get('min_price', -np.inf) and price <= bet_type.get('max_price', np.inf)
+            and confidence >= bet_type.get('min_confidence', 0))
+
+
+def rank_key(pick: Dict, bet_type: Dict) -> Tuple:
+    """Ascending sort key, best first (the id breaks ties deterministically)"""
+    if bet_type['rank'] == 'confidence':
+        return (-pick['confidence'], -pick['expectedValue'], pick['id'])
+    return (-pick['expectedValue'], -pick['confidence'], pick['id'])
+
+
+class Leaderboard:
+    """Pick ids kept sorted by rank key; top-N is a slice"""
+
+    def __init__(self):
+        self._order: List[Tuple] = []
+        self._keys: Dict[str, Tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def put(self, pick_id: str, key: Tuple):
+        old = self._keys.get(pick_id)
+        if old == key:
+            return
+        if old is not None:
+            del self._order[bisect.bisect_left(self._order, old)]
+        bisect.insort(self._order, key)
+        self._keys[pick_id] = key
+
+    def discard(self, pick_id: str):
+        old = self._keys.pop(pick_id, None)
+        if old is not None:
+            del self._order[bisect.bisect_left(self._order, old)]
+
+    def top(self, n: int) -> List[str]:
+        return [key[-1] for key in self._order[:n]]
+
+
+def best_rows(snapshot, scores: Dict[str, np.ndarray]) -> np.ndarray:
+    """Best-EV row per outcome (event, market, participant, side, point) across books"""
+    ev = scores['ev']
+    rows = np.flatnonzero(~np.isnan(ev) & ~np.isnan(scores['probability']))
+    if not len(rows):
+        return rows
+    codes = prop_scanner.outcome_codes(snapshot)[rows]
+    order = np.lexsort((-ev[rows], codes))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = codes[order][1:] != codes[order][:-1]
+    return rows[order[first]]
+
+
+def make_pick(snapshot, scores: Dict[str, np.ndarray], row: int) -> Dict:
+    """PickLeg payload for a scored row"""
+    outcome = snapshot.outcome(row)
+    event = snapshot.events[snapshot.event[row]]
+    market, participant, side, point = outcome['market'], outcome['participant'], outcome['name'], outcome['point']
+    if market == 'h2h':
+        selection = f"{participant} ML"
+    elif market == 'spreads':
+        selection = f"{participant} {point:+g}" if point is not None else participant
+    elif market == 'totals':
+        selection = f"{side} {point:g}" if point is not None else side
+    else:
+        label = MARKET_LABELS.get(market, market)
+        selection = f"{participant} {side} {point:g} {label}" if point is not None else f"{participant} {label}"
+
+    probability = float(scores['probability'][row])
+    implied = float(scores['implied'][row])
+    ev = float(scores['ev'][row])
+    books = int(scores['books'][row])
+    source = 'model' if scores['from_model'][row] else 'no-vig consensus'
+    flags = []
+    if ev < 0:
+        flags.append('negative_ev')
+    if books < MIN_BOOKS:
+        flags.append('thin_market')
+    return {
+        'id': pick_id(snapshot, row),
+        'gameId': outcome['event_id'],
+        'market': MARKETS.get(market, market.upper()),
+        'marketKey': market,
+        'selection': selection,
+        'priceAmerican': int(outcome['price']),
+        'confidence': int(round(probability * 100)),
+        'reason': f"{probability:.0%} {source} vs {implied:.0%} implied at {outcome['sportsbook']} "
+                  f"({ev:+.1%} EV, {books} book{'s' if books != 1 else ''})",
+        'riskFlags': flags,
+        'playerName': participant,
+        'side': side,
+        'line': point,
+        'sportsbook': outcome['sportsbook'],
+        'bookmaker': outcome['bookmaker'],
+        'probability': round(probability, 4),
+        'impliedProbability': round(implied, 4),
+        'edge': round((probability - implied) * 100, 1),
+        'expectedValue': round(ev * 100, 1),
+        'books': books,
+        'matchup': f"{event.get('away_team')} @ {event.get('home_team')}",
+        'homeTeam': event.get('home_team'),
+        'awayTeam': event.get('away_team'),
+        'startTime': event.get('commence_time')
+    }
+
+
+def pick_id(snapshot, row: int) -> str:
+    """Stable across snapshots: event, market, participant, side and line"""
+    point = snapshot.point_of(row)
+    return (f"{snapshot.events[snapshot.event[row]]['id']}:{snapshot.markets.values[snapshot.market[row]]}:"
+            f"{snapshot.participants.values[snapshot.participant[row]]}:"
+            f"{snapshot.sides.values[snapshot.side[row]].lower()}:{'' if point is None else f'{point:g}'}")
+
+
+class PickBoards:
+    """Every (market, bet type) leaderboard, synced incrementally from scored markets"""
+
+    def __init__(self):
+        self.boards: Dict[Tuple[str, str], Leaderboard] = {}
+        self.picks: Dict[str, Dict] = {}
+        # pick id -> (bookmaker, price, probability) last ranked
+        self._signatures: Dict[str, Tuple] = {}
+        # scored key -> (scores object last synced, pick ids it produced)
+        self._sources: Dict[str, Tuple[Dict, Set[str]]] = {}
+        self._lock = threading.Lock()
+        self.last_sync: Dict = {}
+
+    def __len__(self) -> int:
+        return len(self.picks)
+
+    def _boards_for(self, pick: Dict):
+        for group in (pick['market'], ALL):
+            for name in BET_TYPES:
+                yield name, self.boards.setdefault((group, name), Leaderboard())
+
+    def _put(self, pick: Dict):
+        self._remove(pick['id'])
+        self.picks[pick['id']] = pick
+        for name, board in self._boards_for(pick):
+            if qualifies(pick, BET_TYPES[name]):
+                board.put(pick['id'], rank_key(pick, BET_TYPES[name]))
+
+    def _remove(self, pick_id: str):
+        pick = self.picks.pop(pick_id, None)
+        if pick is not None:
+            for _, board in self._boards_for(pick):
+                board.discard(pick_id)
+
+    def sync(self, scored: List[Tuple[str, object, Dict]]) -> Dict:
+        """
+        Bring the boards up to date with (key, snapshot, scores) triples
+
+        Returns:
+            Counts of markets skipped and picks updated / removed
+        """
+        stats = {'markets': len(scored), 'skipped': 0, 'updated': 0, 'removed': 0}
+        with self._lock:
+            for key, snapshot, scores in scored:
+                previous = self._sources.get(key)
+                if previous is not None and previous[0] is scores:
+                    stats['skipped'] += 1
+                    continue
+                current = set()
+                books = snapshot.books.values
+                probability = scores['probability']
+                for row in best_rows(snapshot, scores).tolist():
+                    pid = pick_id(snapshot, row)
+                    current.add(pid)
+                    signature = (books[snapshot.book[row]], snapshot.price[row], round(float(probability[row]), 4))
+                    if self._signatures.get(pid) != signature:
+                        self._signatures[pid] = signature
+                        self._put(make_pick(snapshot, scores, row))
+                        stats['updated'] += 1
+                for pid in (previous[1] if previous is not None else set()) - current:
+                    self._signatures.pop(pid, None)
+                    self._remove(pid)
+                    stats['removed'] += 1
+                self._sources[key] = (scores, current)
+            self.last_sync = stats
+        return stats
+
+    def top(self, market: str = ALL, bet_type: str = ALL, n: int = 20) -> List[Dict]:
+        """
+        Best n picks for a frontend Market (or Odds API market key) and bet type
+
+        Raises:
+            ValueError: Unknown bet type
+        """
+        if bet_type not in BET_TYPES:
+            raise ValueError(f"Unknown bet type: {bet_type} (expected one of {list(BET_TYPES)})")
+        group = MARKETS.get(market, market)
+        with self._lock:
+            board: Optional[Leaderboard] = self.boards.get((group, bet_type))
+            return [self.picks[pid] for pid in board.top(n)] if board is not None else []
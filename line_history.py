@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Line History
+Append-only, compressed time series of every price and point ingested
+
+One series per (event, market, bookmaker, participant, side). Ticks are
+recorded only when the price or point changes. The newest ticks of each
+series stay in an in-memory head; full heads are sealed into blocks of
+delta + zigzag varint encoded (timestamp, price, point) triples and
+appended to fixed-size chunk files:
+
+    <dir>/chunk-000001.bin   sealed blocks, rotated at CHUNK_FILE_BYTES
+    <dir>/index.jsonl        one line per block: location + block summary
+    <dir>/events.jsonl       event id, teams and kickoff, for replays
+
+The in-memory index keeps each series' open / current / min / max and its
+block list, so summaries never touch disk and a windowed query decodes
+only the blocks that overlap the window.
+
+Single writer per directory, enforced by an exclusive lock on
+<dir>/writer.lock (a second writer gets LineHistoryLocked); any number of
+read-only readers, which see sealed blocks only and pick up newly sealed
+ones at most every READER_REFRESH seconds. The writer seals its partial
+heads every FLUSH_INTERVAL seconds, so a killed process loses at most
+that much. A block's bytes reach the chunk file before the index line
+that points at them, so a reader never indexes a block it cannot read
+(nothing is fsynced: a power loss can still cut the tail).
+"""
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: the single-writer rule is not enforced
+    fcntl = None
+
+# Ticks per sealed block
+BLOCK_TICKS = 128
+# Chunk files are rotated once they reach this size
+CHUNK_FILE_BYTES = 4 * 1024 * 1024
+# Decoded blocks kept in memory for windowed queries
+BLOCK_CACHE = 256
+# Points are stored in tenths; null points use this code
+POINT_SCALE = 10
+POINT_NULL = -(2 ** 31)
+# Writers seal partial heads this often; read-only stores re-read the index this often
+FLUSH_INTERVAL = int(os.getenv('LINE_HISTORY_FLUSH', 300))
+READER_REFRESH = 5
+
+SeriesKey = Tuple[str, str, str, str, str]
+
+
+class LineHistoryLocked(OSError):
+    """Another process holds the directory's writer lock"""
+
+
+def default_history_dir() -> str:
+    return os.getenv('LINE_HISTORY_DIR') or os.path.join(os.path.dirname(__file__), 'data', 'line_history')
+
+
+def implied(american: int) -> float:
+    """Implied probability of an American price"""
+    if american >= 100:
+        return 100.0 / (american + 100.0)
+    if american <= -100:
+        return -american / (-american + 100.0)
+    return math.nan
+
+
+# Varint codec -------------------------------------------------------------
+
+def _put_varint(out: bytearray, value: int):
+    value = (value << 1) ^ (value >> 63)  # zigzag
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def encode_block(ticks: List[Tuple[int, int, int]]) -> bytes:
+    """Delta + zigzag varint encode (ts, price, point) ticks"""
+    out = bytearray()
+    prev_ts = prev_price = prev_point = 0
+    for ts, price, point in ticks:
+        _put_varint(out, ts - prev_ts)
+        _put_varint(out, price - prev_price)
+        _put_varint(out, point - prev_point)
+        prev_ts, prev_price, prev_point = ts, price, point
+    return bytes(out)
+
+
+def decode_block(data: bytes) -> List[Tuple[int, int, int]]:
+    ticks = []
+    values = []
+    shift = acc = 0
+    for byte in data:
+        acc |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        values.append((acc >> 1) ^ -(acc & 1))
+        shift = acc = 0
+    ts = price = point = 0
+    for i in range(0, len(values) - 2, 3):
+        ts += values[i]
+        price += values[i + 1]
+        point += values[i + 2]
+        ticks.append((ts, price, point))
+    return ticks
+
+
+def _point_code(point) -> int:
+    if point is None or (isinstance(point, float) and math.isnan(point)):
+        return POINT_NULL
+    return int(round(point * POINT_SCALE))
+
+
+def _point_value(code: int) -> Optional[float]:
+    return None if code == POINT_NULL else code / POINT_SCALE
+
+
+class _Block:
+    __slots__ = ('file', 'offset', 'length', 'count', 'first_ts', 'last_ts', 'last')
+
+    def __init__(self, file, offset, length, count, first_ts, last_ts, last):
+        self.file = file
+        self.offset = offset
+        self.length = length
+        self.count = count
+        self.first_ts = first_ts
+        self.last_ts = last_ts
+        self.last = last  # final (ts, price, point) tick
+
+
+class _Series:
+    __slots__ = ('key', 'blocks', 'head', 'open', 'last', 'min_price', 'max_price', 'ticks', 'seen_ts')
+
+    def __init__(self, key: SeriesKey):
+        self.key = key
+        self.blocks: List[_Block] = []
+        self.head: List[Tuple[int, int, int]] = []
+        self.open: Optional[Tuple[int, int, int]] = None
+        self.last: Optional[Tuple[int, int, int]] = None
+        self.min_price: Optional[int] = None
+        self.max_price: Optional[int] = None
+        self.ticks = 0
+        self.seen_ts = 0
+
+    def note(self, tick: Tuple[int, int, int]):
+        if self.open is None:
+            self.open = tick
+            self.min_price = self.max_price = tick[1]
+        else:
+            self.min_price = min(self.min_price, tick[1])
+            self.max_price = max(self.max_price, tick[1])
+        self.last = tick
+        self.ticks += 1
+
+
+class LineHistoryStore:
+    """Odds time series keyed by (event, market, bookmaker, participant, side)"""
+
+    def __init__(self, path: Optional[str] = None, block_ticks: int = BLOCK_TICKS,
+                 chunk_file_bytes: int = CHUNK_FILE_BYTES, read_only: bool = False):
+        self.path = path or default_history_dir()
+        self.block_ticks = block_ticks
+        self.chunk_file_bytes = chunk_file_bytes
+        self.read_only = read_only
+        if not read_only:
+            os.makedirs(self.path, exist_ok=True)
+
+        self._series: Dict[SeriesKey, _Series] = {}
+        # lower-cased participant -> series keys, for player lookups
+        self._by_participant: Dict[str, List[SeriesKey]] = {}
+        self._lock = threading.RLock()
+        self._decoded: OrderedDict = OrderedDict()
+        # chunk number -> open read handle
+        self._readers: Dict[int, object] = {}
+        self._chunk_no = 1
+        self._chunk = None
+        self._index = None
+        self._writer_lock = None
+        # event id -> id, teams and commence_time as last ingested
+        self.events: Dict[str, Dict] = {}
+        self._events_file = None
+        # Bytes of index.jsonl / events.jsonl consumed so far
+        self._offsets = {'index.jsonl': 0, 'events.jsonl': 0}
+        self._flushed_at = self._refreshed_at = time.time()
+        if not read_only:
+            self._lock_writer()
+        self._load_index()
+        self._load_events()
+        if not read_only:
+            self._index = self._append_log('index.jsonl')
+            self._events_file = self._append_log('events.jsonl')
+
+    # Persistence ---------------------------------------------------------
+
+    def _lock_writer(self):
+        if fcntl is None:
+            return
+        handle = open(os.path.join(self.path, 'writer.lock'), 'a')
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            handle.close()
+            raise LineHistoryLocked(f"Line history at {self.path} already has a writer")
+        self._writer_lock = handle
+
+    def _append_log(self, name: str):
+        handle = open(os.path.join(self.path, name), 'a')
+        if handle.tell() > self._offsets[name]:
+            handle.write('\n')  # end a torn line so the next entry starts clean
+        return handle
+
+    def _chunk_path(self, number: int) -> str:
+        return os.path.join(self.path, f"chunk-{number:06d}.bin")
+
+    def _new_lines(self, name: str) -> List[Dict]:
+        """Complete lines appended to a log since the last read (a torn tail waits for its newline)"""
+        path = os.path.join(self.path, name)
+        if not os.path.exists(path) or os.path.getsize(path) <= self._offsets[name]:
+            return []
+        with open(path, 'rb') as f:
+            f.seek(self._offsets[name])
+            data = f.read()
+        end = data.rfind(b'\n') + 1
+        self._offsets[name] += end
+        entries = []
+        for line in data[:end].splitlines():
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue  # torn line left by a crash
+        return entries
+
+    def _load_index(self):
+        for entry in self._new_lines('index.jsonl'):
+            series = self._get_series(tuple(entry['key']))
+            block = _Block(entry['file'], entry['offset'], entry['length'], entry['count'],
+                           entry['first_ts'], entry['last_ts'], tuple(entry['last']))
+            series.blocks.append(block)
+            first, low, high = tuple(entry['first']), entry['min'], entry['max']
+            if series.open is None:
+                series.open, series.min_price, series.max_price = first, low, high
+            series.min_price = min(series.min_price, low)
+            series.max_price = max(series.max_price, high)
+            series.last = block.last
+            series.ticks += block.count
+            series.seen_ts = max(series.seen_ts, block.last_ts)
+            self._chunk_no = max(self._chunk_no, block.file)
+
+    def _load_events(self):
+        for event in self._new_lines('events.jsonl'):
+            self.events[event['id']] = event
+
+    def refresh(self):
+        """Read-only: pick up blocks and events the writer has sealed since the last read"""
+        if not self.read_only:
+            return
+        with self._lock:
+            self._refreshed_at = time.time()
+            self._load_index()
+            self._load_events()
+
+    def _maybe_refresh(self):
+        if self.read_only and time.time() - self._refreshed_at >= READER_REFRESH:
+            self.refresh()
+
+    def _note_event(self, event: Dict):
+        meta = {'id': event['id'], 'home_team': event.get('home_team'), 'away_team': event.get('away_team'),
+                'commence_time': event.get('commence_time')}
+        if self.events.get(meta['id']) != meta:
+            self.events[meta['id']] = meta
+            self._events_file.write(json.dumps(meta, separators=(',', ':')) + '\n')
+
+    def _chunk_file(self):
+        if self._chunk is None:
+            self._chunk = open(self._chunk_path(self._chunk_no), 'ab')
+        if self._chunk.tell() >= self.chunk_file_bytes:
+            self._chunk.close()
+            self._chunk_no += 1
+            self._chunk = open(self._chunk_path(self._chunk_no), 'ab')
+        return self._chunk
+
+    def _seal(self, series: _Series):
+        ticks = series.head
+        if not ticks:
+            return
+        data = encode_block(ticks)
+        chunk = self._chunk_file()
+        offset = chunk.tell()
+        chunk.write(data)
+        # The bytes go out before the index line that points at them
+        chunk.flush()
+        block = _Block(self._chunk_no, offset, len(data), len(ticks), ticks[0][0], ticks[-1][0], ticks[-1])
+        series.blocks.append(block)
+        prices = [t[1] for t in ticks]
+        self._index.write(json.dumps({
+            'key': list(series.key), 'file': block.file, 'offset': offset, 'length': len(data),
+            'count': len(ticks), 'first_ts': block.first_ts, 'last_ts': block.last_ts,
+            'first': list(ticks[0]), 'last': list(block.last), 'min': min(prices), 'max': max(prices)
+        }, separators=(',', ':')) + '\n')
+        series.head = []
+
+    def flush(self):
+        """Seal every partial head so all ticks are on disk"""
+        if self.read_only:
+            return
+        with self._lock:
+            self._flushed_at = time.time()
+            for series in self._series.values():
+                self._seal(series)
+            if self._chunk:
+                self._chunk.flush()
+            for f in (self._index, self._events_file):
+                if f:
+                    f.flush()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._chunk:
+                self._chunk.close()
+                self._chunk = None
+            for f in (self._index, self._events_file, *self._readers.values()):
+                if f:
+                    f.close()
+            self._readers = {}
+            if self._writer_lock:
+                self._writer_lock.close()
+                self._writer_lock = None
+
+    def _read_block(self, block: _Block) -> List[Tuple[int, int, int]]:
+        cache_key = (block.file, block.offset)
+        ticks = self._decoded.get(cache_key)
+        if ticks is None:
+            if block.file == self._chunk_no and self._chunk:
+                self._chunk.flush()
+            reader = self._readers.get(block.file)
+            if reader is None:
+                reader = self._readers[block.file] = open(self._chunk_path(block.file), 'rb')
+            reader.seek(block.offset)
+            data = reader.read(block.length)
+            if len(data) < block.length:
+                return []  # truncated chunk: never decode (or cache) a partial block
+            ticks = decode_block(data)
+            self._decoded[cache_key] = ticks
+            if len(self._decoded) > BLOCK_CACHE:
+                self._decoded.popitem(last=False)
+        else:
+            self._decoded.move_to_end(cache_key)
+        return ticks
+
+    # Writes --------------------------------------------------------------
+
+    def _get_series(self, key: SeriesKey) -> _Series:
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series(key)
+            self._by_participant.setdefault(key[3].lower(), []).append(key)
+        return series
+
+    def record(self, ts: float, event: str, market: str, book: str, participant: str,
+               side: str, price, point=None) -> bool:
+        """Append a tick; returns False if price and point are unchanged"""
+        if self.read_only:
+            raise ValueError(f"Line history at {self.path} is open read-only")
+        if price is None or (isinstance(price, float) and math.isnan(price)):
+            return False
+        tick = (int(ts), int(round(price)), _point_code(point))
+        with self._lock:
+            series = self._get_series((event, market, book, participant, side))
+            series.seen_ts = max(series.seen_ts, tick[0])
+            if series.last is not None and series.last[1:] == tick[1:]:
+                return False
+            if series.last is not None and tick[0] < series.last[0]:
+                return False  # out-of-order tick (older payload)
+            series.head.append(tick)
+            series.note(tick)
+            if len(series.head) >= self.block_ticks:
+                self._seal(series)
+            return True
+
+    def ingest(self, snapshot, ts: Optional[float] = None) -> int:
+        """Record every outcome of an OddsSnapshot; returns ticks appended"""
+        if self.read_only:
+            raise ValueError(f"Line history at {self.path} is open read-only")
+        ts = time.time() if ts is None else ts
+        events, markets, books = snapshot.events, snapshot.markets.values, snapshot.books.values
+        names, sides = snapshot.participant_names, snapshot.sides.values
+        changed = 0
+        with self._lock:
+            for event in events:
+                self._note_event(event)
+        for row in range(len(snapshot)):
+            changed += self.record(
+                ts, events[snapshot.event[row]]['id'], markets[snapshot.market[row]],
+                books[snapshot.book[row]], names[snapshot.participant[row]],
+                sides[snapshot.side[row]], snapshot.price_of(row), snapshot.point_of(row))
+        if time.time() - self._flushed_at >= FLUSH_INTERVAL:
+            self.flush()
+        return changed
+
+    # Queries -------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def keys(self, participant: Optional[str] = None, market: Optional[str] = None) -> List[SeriesKey]:
+        self._maybe_refresh()
+        with self._lock:
+            keys = self._by_participant.get(participant.lower(), []) if participant else list(self._series)
+            return [k for k in keys if market is None or k[1] == market]
+
+    def ticks(self, key: SeriesKey, since: Optional[float] = None) -> List[Tuple[int, float, Optional[float]]]:
+        """(ts, price, point) ticks, oldest first; with since, starts at the value in force at since"""
+        self._maybe_refresh()
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                return []
+            raw = self._raw_ticks(series, since)
+        return [(ts, price, _point_value(point)) for ts, price, point in raw]
+
+    def _raw_ticks(self, series: _Series, since: Optional[float]):
+        blocks = series.blocks
+        start = 0
+        if since is not None:
+            # First block still live at `since`; the one before supplies the opening value
+            start = len(blocks)
+            while start > 0 and blocks[start - 1].last_ts >= since:
+                start -= 1
+        raw = []
+        for block in blocks[start:]:
+            raw.extend(self._read_block(block))
+        raw.extend(series.head)
+        if since is None:
+            return raw
+        before = blocks[start - 1].last if start > 0 else None
+        for i, tick in enumerate(raw):
+            if tick[0] > since:
+                return ([raw[i - 1]] if i else ([before] if before else [])) + raw[i:]
+            before = tick
+        return [before] if before else []
+
+    def summary(self, key: SeriesKey, window: Optional[float] = 3600, now: Optional[float] = None) -> Optional[Dict]:
+        """
+        Open, current, min and max price plus movement over a window
+
+        velocity is the change in implied probability per hour between
+        the price in force at the window start and the current price.
+        """
+        self._maybe_refresh()
+        with self._lock:
+            series = self._series.get(key)
+            if series is None or series.open is None:
+                return None
+            open_tick, last_tick = series.open, series.last
+            result = {
+                'open': open_tick[1],
+                'current': last_tick[1],
+                'min': series.min_price,
+                'max': series.max_price,
+                'open_point': _point_value(open_tick[2]),
+                'current_point': _point_value(last_tick[2]),
+                'first_seen': open_tick[0],
+                'last_change': last_tick[0],
+                'last_seen': series.seen_ts,
+                'ticks': series.ticks
+            }
+            if window:
+                now = now or time.time()
+                since = now - window
+                raw = self._raw_ticks(series, since)
+                start = raw[0] if raw else last_tick
+                span_hours = max(now - max(start[0], since), 1.0) / 3600.0
+                result['window_seconds'] = window
+                result['window_change'] = last_tick[1] - start[1]
+                result['window_ticks'] = max(0, len(raw) - 1)
+                result['velocity'] = round((implied(last_tick[1]) - implied(start[1])) / span_hours, 6)
+        return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            blocks = sum(len(s.blocks) for s in self._series.values())
+            on_disk = sum(b.length for s in self._series.values() for b in s.blocks)
+            ticks = sum(s.ticks for s in self._series.values())
+        return {'series': len(self._series), 'ticks': ticks, 'blocks': blocks,
+                'bytes_on_disk': on_disk, 'chunk_files': self._chunk_no}
+
+
+def movement_label(summary: Optional[Dict], threshold: float = 0.01) -> str:
+    """'shortening' when the implied probability rose, 'drifting' when it fell"""
+    if not summary:
+        return 'stable'
+    change = implied(summary['current']) - implied(summary['open'])
+    if change > threshold:
+        return 'shortening'
+    if change < -threshold:
+        return 'drifting'
+    return 'stable'
@@ -11,365 +11,173 @@ import schedule
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Dict, List, Optional
 import subprocess
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from data_engine import ProfessionalDataEngine, ESPNDataIntegration
-from config import BRAND, SCHEDULE, MONETIZATION
+from config import BRAND, SCHEDULE
+from newsletter_templates import NewsletterRenderer
+import newsletter_batch
 
 class NewsletterAutomationEngine:
     """Professional newsletter automation with real betting data"""
     
-    def __init__(self):
-        self.data_engine = ProfessionalDataEngine()
+    def __init__(self, data_engine: Optional[ProfessionalDataEngine] = None, sportsdata_store=None):
+        # Reuse the app's data engine (and its cache) when one is provided
+        self.data_engine = data_engine or ProfessionalDataEngine()
         self.espn = ESPNDataIntegration()
         self.output_dir = Path.home() / 'Desktop' / 'nfl-analytics-empire' / 'newsletters'
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Performance tracking
-        self.picks_made = 0
-        self.picks_won = 0
-        self.total_units = 0
+        # Templates compiled and brand-filled once; each run renders only the slate
+        self.templates = NewsletterRenderer()
+        
+        # Results for grading published picks (performance lives in the data engine's ledger)
+        self.sportsdata_store = sportsdata_store
+        
+        # Subscriber list (JSONL / CSV) and where their editions go (files:<dir> or smtp://host:port)
+        self.subscribers = os.getenv('NEWSLETTER_SUBSCRIBERS')
+        self.subscriber_sink = os.getenv('NEWSLETTER_SINK')
         
     def generate_professional_newsletter(self, content_type: str = 'weekly') -> str:
         """Generate premium newsletter with real betting data"""
         
         print(f"📰 Generating {content_type} newsletter...")
         
-        # Get current week
-        current_week = self.espn.get_current_week()
-        
-        # Get real betting lines
-        games = self.data_engine.get_nfl_games()
-        props = self.data_engine.get_player_props('player_anytime_td')
-        
-        # Build newsletter content
-        newsletter_html = self._build_premium_html(
-            week=current_week,
-            games=games,
-            props=props,
-            content_type=content_type
-        )
+        slate = self._slate(content_type)
+        current_week, picks, record = slate['week'], slate['picks'], slate['record']
+
+        # Build newsletter content: the public edition plus one page per paid tier
+        edition = self.templates.edition(current_week, picks, record, content_type)
         
         # Save newsletter
         filename = f"{content_type}_newsletter_week_{current_week}_{datetime.now().strftime('%Y%m%d')}.html"
         filepath = self.output_dir / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(newsletter_html)
+        for tier in edition:
+            path = filepath if tier == 'FREE' else filepath.with_name(f"{filepath.stem}_{tier.lower()}.html")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.templates.render(edition, tier))
         
-        print(f"✅ Newsletter saved: {filepath}")
+        print(f"✅ Newsletter saved: {filepath} (+{len(edition) - 1} tier editions)")
         
         # Generate accompanying data file for social media
-        self._generate_social_data(filepath.stem)
+        self._generate_social_data(filepath.stem, record, picks)
+        
+        # Personalized editions for the subscriber list, from the same slate
+        if self.subscribers:
+            self.generate_subscriber_editions(slate=slate)
         
         return str(filepath)
     
-    def _build_premium_html(self, week: int, games: List, props: List, content_type: str) -> str:
-        """Build professional HTML newsletter"""
-        
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta name="description" content="{BRAND.TAGLINE}">
-    <meta property="og:title" content="{BRAND.BRAND_NAME} - Week {week} Analysis">
-    <meta property="og:description" content="Professional NFL betting intelligence and fantasy analysis">
-    <meta property="og:type" content="article">
-    <title>{BRAND.BRAND_NAME} - Week {week} NFL Analysis</title>
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700;800&display=swap');
-        
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-            background: {BRAND.PRIMARY_COLOR};
-            color: #ffffff;
-            line-height: 1.6;
-        }}
-        
-        .container {{
-            max-width: 900px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        
-        .header {{
-            background: linear-gradient(135deg, {BRAND.SECONDARY_COLOR} 0%, {BRAND.ACCENT_COLOR} 100%);
-            padding: 60px 40px;
-            text-align: center;
-            border-radius: 20px;
-            margin-bottom: 40px;
-            box-shadow: 0 20px 60px rgba(0, 255, 135, 0.3);
-        }}
-        
-        .brand-name {{
-            font-size: 3rem;
-            font-weight: 800;
-            margin-bottom: 10px;
-            text-transform: uppercase;
-            letter-spacing: -1px;
-        }}
-        
-        .tagline {{
-            font-size: 1.2rem;
-            opacity: 0.9;
-            font-weight: 600;
-        }}
-        
-        .stats-banner {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin: 40px 0;
-        }}
-        
-        .stat-card {{
-            background: rgba(255, 255, 255, 0.05);
-            border: 2px solid {BRAND.ACCENT_COLOR};
-            border-radius: 15px;
-            padding: 25px;
-            text-align: center;
-        }}
-        
-        .stat-value {{
-            font-size: 2.5rem;
-            font-weight: 800;
-            color: {BRAND.ACCENT_COLOR};
-            margin-bottom: 5px;
-        }}
-        
-        .stat-label {{
-            font-size: 1rem;
-            color: #b0b0b0;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }}
-        
-        .pick-card {{
-            background: linear-gradient(135deg, rgba(102, 126, 234, 0.1) 0%, rgba(0, 255, 135, 0.1) 100%);
-            border: 1px solid rgba(0, 255, 135, 0.3);
-            border-radius: 20px;
-            padding: 30px;
-            margin: 25px 0;
-            position: relative;
-            overflow: hidden;
-        }}
-        
-        .pick-card::before {{
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 5px;
-            height: 100%;
-            background: {BRAND.ACCENT_COLOR};
-        }}
-        
-        .edge-badge {{
-            display: inline-block;
-            background: {BRAND.ACCENT_COLOR};
-            color: {BRAND.PRIMARY_COLOR};
-            padding: 8px 20px;
-            border-radius: 25px;
-            font-weight: 700;
-            font-size: 0.9rem;
-            text-transform: uppercase;
-        }}
-        
-        .confidence-meter {{
-            height: 10px;
-            background: rgba(255, 255, 255, 0.1);
-            border-radius: 5px;
-            overflow: hidden;
-            margin: 15px 0;
-        }}
+    def _slate(self, content_type: str) -> Dict:
+        """Week, picks and season record shared by every edition of one run"""
         
-        .confidence-fill {{
-            height: 100%;
-            background: {BRAND.ACCENT_COLOR};
-            border-radius: 5px;
-            transition: width 0.3s ease;
-        }}
-        
-        .best-bet-card {{
-            background: linear-gradient(135deg, {BRAND.ACCENT_COLOR} 0%, #00cc6a 100%);
-            border-radius: 20px;
-            padding: 40px;
-            text-align: center;
-            margin: 40px 0;
-            box-shadow: 0 20px 60px rgba(0, 255, 135, 0.4);
-        }}
-        
-        .best-bet-title {{
-            font-size: 2rem;
-            font-weight: 800;
-            margin-bottom: 20px;
-            color: {BRAND.PRIMARY_COLOR};
-        }}
-        
-        .subscribe-cta {{
-            background: {BRAND.SECONDARY_COLOR};
-            border-radius: 20px;
-            padding: 40px;
-            text-align: center;
-            margin: 40px 0;
-        }}
-        
-        .cta-button {{
-            display: inline-block;
-            background: {BRAND.ACCENT_COLOR};
-            color: {BRAND.PRIMARY_COLOR};
-            padding: 15px 40px;
-            border-radius: 30px;
-            text-decoration: none;
-            font-weight: 700;
-            font-size: 1.1rem;
-            transition: transform 0.2s;
-        }}
-        
-        .cta-button:hover {{
-            transform: translateY(-2px);
-        }}
-        
-        .footer {{
-            text-align: center;
-            padding: 40px;
-            color: #666;
-            border-top: 1px solid rgba(255, 255, 255, 0.1);
-            margin-top: 60px;
-        }}
-        
-        @media (max-width: 768px) {{
-            .brand-name {{ font-size: 2rem; }}
-            .stats-banner {{ grid-template-columns: 1fr; }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1 class="brand-name">{BRAND.BRAND_NAME}</h1>
-            <p class="tagline">{BRAND.TAGLINE}</p>
-            <p style="margin-top: 20px; font-size: 1.1rem;">Week {week} • {datetime.now().strftime('%B %d, %Y')}</p>
-        </div>
-        
-        <div class="stats-banner">
-            <div class="stat-card">
-                <div class="stat-value">58.7%</div>
-                <div class="stat-label">Season Win Rate</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value">+12.4u</div>
-                <div class="stat-label">Units Profit</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value">8.3%</div>
-                <div class="stat-label">Avg. Edge</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value">134</div>
-                <div class="stat-label">Total Picks</div>
-            </div>
-        </div>
-        
-        <h2 style="font-size: 2.5rem; margin: 40px 0 30px 0; text-align: center;">
-            🔥 TOP PLAYS THIS WEEK
-        </h2>
-        
-        <!-- Best Bet Feature -->
-        <div class="best-bet-card">
-            <div class="best-bet-title">⭐ BEST BET OF THE WEEK</div>
-            <h3 style="font-size: 1.8rem; color: {BRAND.PRIMARY_COLOR}; margin: 15px 0;">
-                Christian McCaffrey OVER 85.5 Rush Yards
-            </h3>
-            <p style="font-size: 1.2rem; color: {BRAND.PRIMARY_COLOR}; margin: 10px 0;">
-                <strong>Edge: 11.2%</strong> | DraftKings -110
-            </p>
-            <div style="background: rgba(26, 26, 26, 0.3); border-radius: 15px; padding: 20px; margin-top: 20px;">
-                <p style="color: {BRAND.PRIMARY_COLOR}; line-height: 1.8;">
-                    McCaffrey averaging 94.3 rush yards per game. Seahawks allowing 142.5 rush yards/game (31st). 
-                    SF projects to control game flow. Historical edge in this matchup: 68% hit rate.
-                </p>
-            </div>
-        </div>
-        
-        <!-- Newsletter Content Placeholder -->
-        <div id="newsletter-content">
-            <!-- Dynamic content will be inserted here -->
-        </div>
-        
-        <!-- Subscription CTA -->
-        <div class="subscribe-cta">
-            <h2 style="font-size: 2rem; margin-bottom: 20px;">Get Daily Premium Picks</h2>
-            <p style="font-size: 1.2rem; margin-bottom: 30px;">
-                Join {BRAND.BRAND_NAME} Elite and get 5-10 daily picks with 8%+ edge
-            </p>
-            <a href="#subscribe" class="cta-button">Subscribe for $19.99/month</a>
-            <p style="margin-top: 20px; font-size: 0.9rem; color: #b0b0b0;">
-                7-day money-back guarantee • Cancel anytime
-            </p>
-        </div>
+        # Get current week
+        current_week = self.espn.get_current_week()
         
-        <div class="footer">
-            <p><strong>{BRAND.BRAND_NAME}</strong></p>
-            <p>Professional NFL Betting Intelligence</p>
-            <p>Follow {BRAND.TWITTER_HANDLE} for daily updates</p>
-            <p style="margin-top: 20px; font-size: 0.8rem;">
-                © {datetime.now().year} {BRAND.BRAND_NAME}. All rights reserved.
-            </p>
-        </div>
-    </div>
+        # Settle what has landed, then publish this edition's picks at current prices
+        self.grade_picks()
+        picks = self.data_engine.top_picks(limit=self.templates.max_picks)
+        self.data_engine.publish_picks(picks, channel=f"newsletter:{content_type}", week=current_week)
+        return {
+            'week': current_week,
+            'picks': picks,
+            'record': self._season_record(),
+            'content_type': content_type,
+            'date': datetime.now().isoformat()
+        }
     
-    <script>
-        // Add interactive elements
-        document.addEventListener('DOMContentLoaded', function() {{
-            // Animate confidence meters
-            document.querySelectorAll('.confidence-fill').forEach(el => {{
-                const width = el.style.width;
-                el.style.width = '0%';
-                setTimeout(() => {{ el.style.width = width; }}, 100);
-            }});
-        }});
-    </script>
-</body>
-</html>
-"""
-        
-        return html
+    def generate_subscriber_editions(self, subscribers=None, content_type: str = 'weekly', sink: Optional[str] = None,
+                                     personalize: bool = True, processes: Optional[int] = None,
+                                     slate: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Render and deliver every subscriber's edition across worker processes
+        
+        Resumes from the run's checkpoint when a previous attempt was
+        interrupted (see newsletter_batch).
+        
+        Args:
+            subscribers: JSONL / CSV path or list of dicts (NEWSLETTER_SUBSCRIBERS by default)
+            sink: files:<directory> or smtp://host:port (NEWSLETTER_SINK, else files under the output directory)
+            personalize: Per-subscriber pages (else one page per tier)
+            slate: Shared slate of this run (computed when omitted)
+        """
+        subscribers = subscribers or self.subscribers
+        if not subscribers:
+            print("⚠️ No subscriber list configured (NEWSLETTER_SUBSCRIBERS)")
+            return None
+        slate = slate or self._slate(content_type)
+        run_id = f"{slate['content_type']}_week_{slate['week']}_{slate['date'][:10].replace('-', '')}"
+        sink = sink or self.subscriber_sink or f"files:{self.output_dir / 'editions' / run_id}"
+        checkpoint = self.output_dir / 'checkpoints' / f"{run_id}.jsonl"
+        print(f"📬 Rendering {run_id} editions to {sink}...")
+        return newsletter_batch.run(slate, subscribers, sink, str(checkpoint), personalize, processes)
     
-    def _generate_social_data(self, newsletter_id: str):
+    def grade_picks(self) -> Optional[Dict]:
+        """Settle published picks whose results have landed"""
+        if self.sportsdata_store is None or self.data_engine.ledger is None:
+            return None
+        try:
+            stats = self.data_engine.grade_picks(self.sportsdata_store)
+            print(f"✅ Graded picks: {stats['settled']} settled, {stats['voided']} voided of {stats['checked']}")
+            return stats
+        except Exception as e:
+            print(f"⚠️ Pick grading failed: {e}")
+            return None
+
+    def _season_record(self) -> Optional[Dict]:
+        """
+        Win rate, units, average edge and pick count
+
+        From the pick ledger once published picks have settled, else from
+        the data engine's latest backtest (None until either exists).
+        """
+        ledger = self.data_engine.ledger
+        summary = ledger.summary() if ledger is not None else None
+        if summary and summary['settled']:
+            return {
+                'win_rate': summary['win_rate'],
+                'total_picks': summary['settled'],
+                'units_profit': summary['units'],
+                'avg_edge': summary['avg_edge'],
+                'source': 'ledger'
+            }
+        report = self.data_engine.backtest_report
+        if not report or not report.get('picks'):
+            return None
+        return {
+            'win_rate': report['win_rate'],
+            'total_picks': report['picks'],
+            'units_profit': report['units'],
+            'avg_edge': report['avg_edge'],
+            'clv': report['clv'],
+            'source': 'backtest'
+        }
+
+    def _generate_social_data(self, newsletter_id: str, record: Optional[Dict] = None,
+                              picks: Optional[List[Dict]] = None):
         """Generate data file for social media posts"""
         
+        picks = picks or []
+        best = picks[0] if picks else None
         data = {
             'newsletter_id': newsletter_id,
             'best_bet': {
-                'player': 'Christian McCaffrey',
-                'prop': 'OVER 85.5 Rush Yards',
-                'odds': -110,
-                'edge': 0.112,
-                'confidence': 0.87
-            },
+                'player': best['playerName'],
+                'prop': best['selection'],
+                'odds': best['priceAmerican'],
+                'edge': round(best['edge'] / 100, 4),
+                'confidence': best['probability']
+            } if best else None,
             'top_picks': [
-                {'player': 'Travis Kelce', 'prop': 'OVER 52.5 Rec Yards', 'edge': 0.089},
-                {'player': 'Tyreek Hill', 'prop': 'Anytime TD', 'edge': 0.095},
-                {'player': 'Josh Allen', 'prop': 'OVER 1.5 Pass TDs', 'edge': 0.078}
+                {'player': pick['playerName'], 'prop': pick['selection'], 'edge': round(pick['edge'] / 100, 4)}
+                for pick in picks[1:]
             ],
-            'stats': {
-                'win_rate': 0.587,
-                'total_picks': 134,
-                'units_profit': 12.4,
-                'avg_edge': 0.083
-            },
+            'stats': record,
             'timestamp': datetime.now().isoformat()
         }
         
@@ -397,16 +205,20 @@ class NewsletterAutomationEngine:
             self.generate_professional_newsletter, content_type='gameday_picks'
         )
         
+        # Settle published picks as results land
+        schedule.every().hour.do(self.grade_picks)
+        
         print("✅ Automation schedule configured")
         print(f"   📅 Tuesday {SCHEDULE.TUESDAY_WAIVER_TIME}: Waiver Wire")
         print(f"   📅 Thursday {SCHEDULE.THURSDAY_PREVIEW_TIME}: Weekly Preview")
         print(f"   📅 Sunday {SCHEDULE.SUNDAY_GAMEDAY_TIME}: Game Day Picks")
+        print(f"   📅 Hourly: Grade published picks")
     
     def run(self):
         """Run the automation system"""
         
         print(f"\n{'='*60}")
-        print(f"🏈 {BRAND.BRAND_NAME} - AUTOMATION SYSTEM")
+        print(f"🏈 {BRAND.NAME} - AUTOMATION SYSTEM")
         print(f"{'='*60}\n")
         
         # Generate initial newsletter
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Newsletter Templates
+Compiled newsletter pages: static fragments once, picks once per edition
+
+Templates use {{ name }} slots (HTML-escaped; {{ name|raw }} for markup),
+so CSS braces need no doubling. A Template is parsed once into literal
+text and slots; partial() fills some slots and merges the literals around
+them into a smaller Template. Rendering is staged, each stage cached by
+the one before:
+
+    NewsletterRenderer   brand, CSS, footer and script filled in once
+    edition()            one page per tier for a slate: header, record,
+                         the tier's picks and its upgrade offer, leaving
+                         only the subscriber slots open
+    render()             a subscriber's name and account link: a join
+                         over a handful of strings
+
+Tiers come from MONETIZATION (cheapest first); each sees the first
+`picks` plays of the edition and is offered the next tier up.
+"""
+import html
+import os
+import re
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import BRAND, MONETIZATION
+
+TIERS = ('FREE', 'STANDARD', 'VIP')
+CONTENT_TITLES = {
+    'weekly': 'NFL Analysis',
+    'weekly_preview': 'Weekly Preview',
+    'waiver_wire': 'Waiver Wire',
+    'gameday_picks': 'Game Day Picks'
+}
+ACCOUNT_URL = os.getenv('NEWSLETTER_ACCOUNT_URL', '#account')
+SUBSCRIBE_URL = os.getenv('NEWSLETTER_SUBSCRIBE_URL', '#subscribe')
+
+SLOT = re.compile(r"\{\{\s*(\w+)(\|raw)?\s*\}\}")
+
+
+def _text(value, raw: bool) -> str:
+    return str(value) if raw else html.escape(str(value))
+
+
+class Template:
+    """Template source parsed once into literals and (name, raw) slots"""
+
+    __slots__ = ('literals', 'slots')
+
+    def __init__(self, source: str = '', literals: Optional[List[str]] = None,
+                 slots: Optional[List[Tuple[str, bool]]] = None):
+        if literals is None:
+            literals, slots, start = [], [], 0
+            for match in SLOT.finditer(source):
+                literals.append(source[start:match.start()])
+                slots.append((match.group(1), bool(match.group(2))))
+                start = match.end()
+            literals.append(source[start:])
+        self.literals = literals
+        self.slots = slots or []
+
+    @property
+    def names(self) -> set:
+        return {name for name, _ in self.slots}
+
+    def render(self, values: Optional[Dict] = None, **extra) -> str:
+        values = dict(values, **extra) if values and extra else values or extra
+        out = [self.literals[0]]
+        for (name, raw), literal in zip(self.slots, self.literals[1:]):
+            if name not in values:
+                raise KeyError(f"Template slot not filled: {name}")
+            out.append(_text(values[name], raw))
+            out.append(literal)
+        return ''.join(out)
+
+    def partial(self, values: Dict) -> 'Template':
+        """Template with the given slots filled and merged into the text around them"""
+        literals, slots = [self.literals[0]], []
+        for (name, raw), literal in zip(self.slots, self.literals[1:]):
+            if name in values:
+                literals[-1] += _text(values[name], raw) + literal
+            else:
+                slots.append((name, raw))
+                literals.append(literal)
+        return Template(literals=literals, slots=slots)
+
+
+STYLE = Template("""
+        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700;800&display=swap');
+
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+
+        body {
+            font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
+            background: {{ primary }};
+            color: #ffffff;
+            line-height: 1.6;
+        }
+
+        .container { max-width: 900px; margin: 0 auto; padding: 20px; }
+
+        .header {
+            background: linear-gradient(135deg, {{ secondary }} 0%, {{ accent }} 100%);
+            padding: 60px 40px;
+            text-align: center;
+            border-radius: 20px;
+            margin-bottom: 40px;
+            box-shadow: 0 20px 60px rgba(0, 255, 135, 0.3);
+        }
+
+        .brand-name {
+            font-size: 3rem;
+            font-weight: 800;
+            margin-bottom: 10px;
+            text-transform: uppercase;
+            letter-spacing: -1px;
+        }
+
+        .tagline { font-size: 1.2rem; opacity: 0.9; font-weight: 600; }
+
+        .greeting { font-size: 1.1rem; color: #b0b0b0; margin-bottom: 20px; }
+
+        .stats-banner {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 20px;
+            margin: 40px 0;
+        }
+
+        .stat-card {
+            background: rgba(255, 255, 255, 0.05);
+            border: 2px solid {{ accent }};
+            border-radius: 15px;
+            padding: 25px;
+            text-align: center;
+        }
+
+        .stat-value { font-size: 2.5rem; font-weight: 800; color: {{ accent }}; margin-bottom: 5px; }
+
+        .stat-label { font-size: 1rem; color: #b0b0b0; text-transform: uppercase; letter-spacing: 1px; }
+
+        .pick-card {
+            background: linear-gradient(135deg, rgba(102, 126, 234, 0.1) 0%, rgba(0, 255, 135, 0.1) 100%);
+            border: 1px solid rgba(0, 255, 135, 0.3);
+            border-radius: 20px;
+            padding: 30px;
+            margin: 25px 0;
+            position: relative;
+            overflow: hidden;
+        }
+
+        .pick-card::before {
+            content: '';
+            position: absolute;
+            top: 0;
+            left: 0;
+            width: 5px;
+            height: 100%;
+            background: {{ accent }};
+        }
+
+        .edge-badge {
+            display: inline-block;
+            background: {{ accent }};
+            color: {{ primary }};
+            padding: 8px 20px;
+            border-radius: 25px;
+            font-weight: 700;
+            font-size: 0.9rem;
+            text-transform: uppercase;
+        }
+
+        .confidence-meter {
+            height: 10px;
+            background: rgba(255, 255, 255, 0.1);
+            border-radius: 5px;
+            overflow: hidden;
+            margin: 15px 0;
+        }
+
+        .confidence-fill { height: 100%; background: {{ accent }}; border-radius: 5px; transition: width 0.3s ease; }
+
+        .best-bet-card {
+            background: linear-gradient(135deg, {{ accent }} 0%, #00cc6a 100%);
+            border-radius: 20px;
+            padding: 40px;
+            text-align: center;
+            margin: 40px 0;
+            box-shadow: 0 20px 60px rgba(0, 255, 135, 0.4);
+            color: {{ primary }};
+        }
+
+        .best-bet-title { font-size: 2rem; font-weight: 800; margin-bottom: 20px; }
+
+        .locked { text-align: center; color: #b0b0b0; font-size: 1.1rem; margin: 30px 0; }
+
+        .subscribe-cta {
+            background: {{ secondary }};
+            border-radius: 20px;
+            padding: 40px;
+            text-align: center;
+            margin: 40px 0;
+        }
+
+        .cta-button {
+            display: inline-block;
+            background: {{ accent }};
+            color: {{ primary }};
+            padding: 15px 40px;
+            border-radius: 30px;
+            text-decoration: none;
+            font-weight: 700;
+            font-size: 1.1rem;
+            transition: transform 0.2s;
+        }
+
+        .cta-button:hover { transform: translateY(-2px); }
+
+        .footer {
+            text-align: center;
+            padding: 40px;
+            color: #666;
+            border-top: 1px solid rgba(255, 255, 255, 0.1);
+            margin-top: 60px;
+        }
+
+        .footer a { color: #b0b0b0; }
+
+        @media (max-width: 768px) {
+            .brand-name { font-size: 2rem; }
+            .stats-banner { grid-template-columns: 1fr; }
+        }
+""")
+
+SCRIPT = """
+    <script>
+        // Animate confidence meters
+        document.addEventListener('DOMContentLoaded', function() {
+            document.querySelectorAll('.confidence-fill').forEach(el => {
+                const width = el.style.width;
+                el.style.width = '0%';
+                setTimeout(() => { el.style.width = width; }, 100);
+            });
+        });
+    </script>"""
+
+PAGE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <meta name="description" content="{{ tagline }}">
+    <meta property="og:title" content="{{ brand }} - Week {{ week }} {{ title }}">
+    <meta property="og:description" content="Professional NFL betting intelligence and fantasy analysis">
+    <meta property="og:type" content="article">
+    <title>{{ brand }} - Week {{ week }} {{ title }}</title>
+    <style>{{ css|raw }}</style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1 class="brand-name">{{ brand }}</h1>
+            <p class="tagline">{{ tagline }}</p>
+            <p style="margin-top: 20px; font-size: 1.1rem;">{{ title }} • Week {{ week }} • {{ date }}</p>
+        </div>
+
+        <p class="greeting">Hi {{ name }}, here is your {{ tier }} edition.</p>
+{{ stats|raw }}
+{{ picks|raw }}
+{{ cta|raw }}
+        <div class="footer">
+            <p><strong>{{ brand }}</strong></p>
+            <p>Professional NFL Betting Intelligence</p>
+            <p>Follow {{ twitter }} for daily updates</p>
+            <p style="margin-top: 20px;"><a href="{{ account_url }}">Manage your subscription</a></p>
+            <p style="margin-top: 20px; font-size: 0.8rem;">
+                © {{ year }} {{ brand }}. All rights reserved. Bet responsibly.
+            </p>
+        </div>
+    </div>
+{{ script|raw }}
+</body>
+</html>
+""")
+
+STAT_CARD = Template("""            <div class="stat-card">
+                <div class="stat-value">{{ value }}</div>
+                <div class="stat-label">{{ label }}</div>
+            </div>
+""")
+
+BEST_BET = Template("""
+        <div class="best-bet-card">
+            <div class="best-bet-title">⭐ BEST BET OF THE WEEK</div>
+            <h3 style="font-size: 1.8rem; margin: 15px 0;">{{ selection }}</h3>
+            <p style="font-size: 1.2rem; margin: 10px 0;">
+                <strong>Edge: {{ edge }}</strong> | {{ sportsbook }} {{ price }}
+            </p>
+            <div style="background: rgba(26, 26, 26, 0.3); border-radius: 15px; padding: 20px; margin-top: 20px;">
+                <p style="line-height: 1.8;">{{ reason }}</p>
+            </div>
+        </div>
+""")
+
+PICK_CARD = Template("""
+        <div class="pick-card">
+            <span class="edge-badge">{{ edge }} edge</span>
+            <h3 style="font-size: 1.5rem; margin: 15px 0 5px 0;">{{ selection }}</h3>
+            <p style="color: #b0b0b0;">{{ market }} • {{ sportsbook }} {{ price }}</p>
+            <div class="confidence-meter"><div class="confidence-fill" style="width: {{ confidence }}%;"></div></div>
+            <p>{{ reason }}</p>
+        </div>
+""")
+
+CTA = Template("""
+        <div class="subscribe-cta">
+            <h2 style="font-size: 2rem; margin-bottom: 20px;">Get {{ picks }} Plays Every Edition</h2>
+            <p style="font-size: 1.2rem; margin-bottom: 30px;">
+                Join {{ brand }} {{ tier }} for every play that clears our edge threshold
+            </p>
+            <a href="{{ url }}" class="cta-button">Subscribe for ${{ price }}/month</a>
+            <p style="margin-top: 20px; font-size: 0.9rem; color: #b0b0b0;">
+                7-day money-back guarantee • Cancel anytime
+            </p>
+        </div>
+""")
+
+
+def tier_settings() -> Dict[str, Dict]:
+    """MONETIZATION tiers by key, cheapest first"""
+    return {tier: getattr(MONETIZATION, tier) for tier in TIERS}
+
+
+def content_title(content_type: str) -> str:
+    return CONTENT_TITLES.get(content_type, content_type.replace('_', ' ').title())
+
+
+def stats_section(record: Optional[Dict]) -> str:
+    """Season record banner (win rate, units, average edge, picks); '—' until there is one"""
+    stats = record or {}
+    cards = [
+        (f"{stats['win_rate']:.1%}" if stats.get('win_rate') is not None else '—', 'Season Win Rate'),
+        (f"{stats['units_profit']:+.1f}u" if stats.get('units_profit') is not None else '—', 'Units Profit'),
+        (f"{stats['avg_edge']:.1%}" if stats.get('avg_edge') is not None else '—', 'Avg. Edge'),
+        (stats.get('total_picks', '—'), 'Total Picks')
+    ]
+    return ('\n        <div class="stats-banner">\n'
+            + ''.join(STAT_CARD.render(value=value, label=label) for value, label in cards)
+            + '        </div>\n')
+
+
+def pick_card(pick: Dict, best: bool = False) -> str:
+    """Best-bet or play card for a leaderboard PickLeg payload"""
+    values = {
+        'selection': pick['selection'],
+        'market': pick.get('market', ''),
+        'edge': f"{pick['edge']:.1f}%" if pick.get('edge') is not None else '—',
+        'sportsbook': pick.get('sportsbook') or pick.get('bookmaker') or '',
+        'price': f"{pick['priceAmerican']:+d}",
+        'confidence': pick.get('confidence', 0),
+        'reason': pick.get('reason', '')
+    }
+    return (BEST_BET if best else PICK_CARD).render(values)
+
+
+class NewsletterRenderer:
+    """Newsletter pages from templates compiled and brand-filled once"""
+
+    def __init__(self, brand=BRAND, tiers: Optional[Dict[str, Dict]] = None):
+        self.brand = brand
+        self.tiers = tiers or tier_settings()
+        self.css = STYLE.render(primary=brand.PRIMARY_COLOR, secondary=brand.SECONDARY_COLOR,
+                                accent=brand.ACCENT_COLOR)
+        self.page = PAGE.partial({'brand': brand.NAME, 'tagline': brand.TAGLINE, 'twitter': brand.TWITTER,
+                                  'css': self.css, 'script': SCRIPT, 'year': datetime.now().year})
+
+    @property
+    def max_picks(self) -> int:
+        """Plays the richest tier sees, so how many an edition needs"""
+        return max(settings['picks'] for settings in self.tiers.values())
+
+    def _cta(self, tier: Optional[str]) -> str:
+        if tier is None:
+            return ''
+        settings = self.tiers[tier]
+        return CTA.render(picks=settings['picks'], brand=self.brand.NAME, tier=settings['name'],
+                          url=SUBSCRIBE_URL, price=f"{settings['price']:.2f}")
+
+    def edition(self, week: int, picks: List[Dict], record: Optional[Dict] = None, content_type: str = 'weekly',
+                date: Optional[datetime] = None) -> Dict[str, Template]:
+        """
+        Page per tier for one slate, open only in the subscriber slots
+
+        Args:
+            picks: PickLeg payloads, best first
+            record: Season record (win_rate, units_profit, avg_edge, total_picks)
+
+        Returns:
+            Tier key -> Template to render() per subscriber
+        """
+        shared = {'week': week, 'title': content_title(content_type), 'stats': stats_section(record),
+                  'date': (date or datetime.now()).strftime('%B %d, %Y')}
+        # Each card is rendered once; tiers take a prefix
+        cards = [pick_card(pick, best=i == 0) for i, pick in enumerate(picks)]
+        order = list(self.tiers)
+        pages = {}
+        for i, tier in enumerate(order):
+            settings = self.tiers[tier]
+            upgrade = order[i + 1] if i + 1 < len(order) else None
+            shown = cards[:settings['picks']]
+            if shown:
+                section = ('\n        <h2 style="font-size: 2.5rem; margin: 40px 0 30px 0; text-align: center;">'
+                           '🔥 TOP PLAYS THIS WEEK</h2>\n' + ''.join(shown))
+            else:
+                section = ('\n        <p class="locked">No plays clear our edge threshold yet. '
+                           'Check back before kickoff.</p>\n')
+            hidden = len(cards) - len(shown)
+            if hidden and upgrade:
+                plays = f"{hidden} more play{'s' if hidden != 1 else ''}"
+                section += (f'\n        <p class="locked">🔒 {plays} this week for '
+                            f'{html.escape(self.tiers[upgrade]["name"])} members</p>\n')
+            pages[tier] = self.page.partial(dict(shared, tier=settings['name'], picks=section,
+                                                 cta=self._cta(upgrade)))
+        return pages
+
+    def render(self, edition: Dict[str, Template], tier: str = 'FREE', subscriber: Optional[Dict] = None) -> str:
+        """One tier's page for a subscriber (name, id); anonymous without one"""
+        subscriber = subscriber or {}
+        account = f"{ACCOUNT_URL}?subscriber={subscriber['id']}" if subscriber.get('id') else SUBSCRIBE_URL
+        return edition[tier].render(name=subscriber.get('name') or 'there', account_url=account)
+
+    def render_batch(self, edition: Dict[str, Template], subscribers: Iterable[Dict]) -> Iterator[Tuple[Dict, str]]:
+        """(subscriber, page) for each subscriber, at the subscriber's tier (FREE when unset)"""
+        for subscriber in subscribers:
+            yield subscriber, self.render(edition, subscriber.get('tier') or 'FREE', subscriber)
+
+    def variants(self, week: int, picks: List[Dict], record: Optional[Dict] = None,
+                 content_types: Iterable[str] = tuple(CONTENT_TITLES),
+                 date: Optional[datetime] = None) -> Dict[Tuple[str, str], str]:
+        """Anonymous page of every tier for each content type: (content_type, tier) -> HTML"""
+        pages = {}
+        for content_type in content_types:
+            edition = self.edition(week, picks, record, content_type, date)
+            for tier in edition:
+                pages[(content_type, tier)] = self.render(edition, tier)
+        return pages
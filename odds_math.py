@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Odds Math
+Vectorized pricing math over whole slates of outcomes
+
+Every function takes numpy arrays (or anything array-like, scalars
+included) of American prices and model probabilities and works
+elementwise. De-vig methods take a `groups` array assigning each outcome
+to its market (all sides of one bookmaker's line share a group id), so a
+full slate of markets with different outcome counts is processed in one
+pass. Prices strictly between -100 and +100 are invalid and give NaN.
+"""
+from typing import Dict
+
+import numpy as np
+
+DEVIG_METHODS = ('multiplicative', 'additive', 'shin', 'power')
+# Iteration caps for the Newton solvers
+SHIN_ITERATIONS = 20
+POWER_ITERATIONS = 30
+# Solvers stop once every market sums to 1 within this
+TOLERANCE = 1e-12
+
+
+def american_to_decimal(american) -> np.ndarray:
+    """American odds -> decimal odds (stake included)"""
+    a = np.asarray(american, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        decimal = np.where(a > 0, a / 100.0 + 1.0, 100.0 / np.abs(a) + 1.0)
+    return np.where(np.abs(a) >= 100, decimal, np.nan)
+
+
+def decimal_to_american(decimal) -> np.ndarray:
+    d = np.asarray(decimal, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        american = np.where(d >= 2.0, (d - 1.0) * 100.0, -100.0 / (d - 1.0))
+    return np.where(d > 1.0, american, np.nan)
+
+
+def implied_probability(american) -> np.ndarray:
+    """Bookmaker implied probability (vig included)"""
+    return 1.0 / american_to_decimal(american)
+
+
+def group_index(groups, size: int):
+    """Dense 0..k-1 group codes, group count and outcomes per group"""
+    if groups is None:
+        codes = np.zeros(size, dtype=np.intp)
+    else:
+        groups = np.asarray(groups).reshape(-1)
+        if groups.dtype.kind in 'iu' and np.all(groups[1:] >= groups[:-1]):
+            # Sorted ids (the usual slate layout): runs are groups, no sort needed
+            codes = np.concatenate(([0], np.cumsum(groups[1:] != groups[:-1]))) if size else groups
+        else:
+            _, codes = np.unique(groups, return_inverse=True)
+            codes = codes.reshape(-1)
+    count = int(codes.max()) + 1 if size else 0
+    return codes, count, np.bincount(codes, minlength=count)
+
+
+def _group_sum(values: np.ndarray, codes: np.ndarray, count: int) -> np.ndarray:
+    return np.bincount(codes, weights=values, minlength=count)
+
+
+def overround(implied, groups=None) -> np.ndarray:
+    """Booksum - 1 per outcome's market (the vig)"""
+    p = np.atleast_1d(np.asarray(implied, dtype=np.float64))
+    codes, count, _ = group_index(groups, p.size)
+    return (_group_sum(p, codes, count) - 1.0)[codes]
+
+
+def devig(implied, groups=None, method: str = 'multiplicative') -> np.ndarray:
+    """
+    Vig-free probabilities for every outcome
+
+    Args:
+        implied: Implied probabilities (from implied_probability)
+        groups: Market id per outcome; None treats the input as one market
+        method: 'multiplicative' (proportional), 'additive' (equal margin
+            per outcome), 'shin' (insider-trading model) or 'power'
+            (p ** k with k chosen so each market sums to 1)
+    """
+    p = np.atleast_1d(np.asarray(implied, dtype=np.float64))
+    codes, count, sizes = group_index(groups, p.size)
+    booksum = _group_sum(p, codes, count)
+
+    if method == 'multiplicative':
+        return p / booksum[codes]
+
+    if method == 'additive':
+        return p - ((booksum - 1.0) / sizes)[codes]
+
+    if method == 'power':
+        # Newton on f(k) = sum(p ** k) - 1 per market, from k = 1
+        k = np.ones(count)
+        log_p = np.log(p)
+        for _ in range(POWER_ITERATIONS):
+            powered = p ** k[codes]
+            f = _group_sum(powered, codes, count) - 1.0
+            if np.nanmax(np.abs(f), initial=0.0) < TOLERANCE:
+                break
+            df = _group_sum(powered * log_p, codes, count)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                step = np.where(df != 0, f / df, 0.0)
+            k = np.clip(k - step, 1e-6, None)
+        return p ** k[codes]
+
+    if method == 'shin':
+        # Newton on the insider fraction z per market so each market sums to 1:
+        # fair_i(z) = (sqrt(z^2 + 4(1 - z) * p_i^2 / booksum) - z) / (2(1 - z))
+        share = p ** 2 / booksum[codes]
+        z = np.zeros(count)
+        for _ in range(SHIN_ITERATIONS):
+            zc = z[codes]
+            root = np.sqrt(zc ** 2 + 4.0 * (1.0 - zc) * share)
+            den = 2.0 * (1.0 - zc)
+            fair = (root - zc) / den
+            f = _group_sum(fair, codes, count) - 1.0
+            if np.nanmax(np.abs(f), initial=0.0) < TOLERANCE:
+                return fair
+            with np.errstate(divide='ignore', invalid='ignore'):
+                dfair = (((zc - 2.0 * share) / root - 1.0) * den + 2.0 * (root - zc)) / den ** 2
+                df = _group_sum(dfair, codes, count)
+                step = np.where(df != 0, f / df, 0.0)
+            z = np.clip(z - step, 0.0, 0.999)
+        zc = z[codes]
+        return (np.sqrt(zc ** 2 + 4.0 * (1.0 - zc) * share) - zc) / (2.0 * (1.0 - zc))
+
+    raise ValueError(f"Unknown de-vig method: {method} (expected one of {DEVIG_METHODS})")
+
+
+def edge(probability, american) -> np.ndarray:
+    """Model probability minus implied probability (positive = value)"""
+    return np.asarray(probability, dtype=np.float64) - implied_probability(american)
+
+
+def expected_value(probability, american) -> np.ndarray:
+    """Expected profit per $1 staked"""
+    return np.asarray(probability, dtype=np.float64) * american_to_decimal(american) - 1.0
+
+
+def kelly(probability, american, fraction: float = 0.5) -> np.ndarray:
+    """Fractional Kelly stake as a share of bankroll (never negative)"""
+    p = np.asarray(probability, dtype=np.float64)
+    b = american_to_decimal(american) - 1.0
+    full = (b * p - (1.0 - p)) / b
+    return np.maximum(0.0, full * fraction)
+
+
+def analyze(american, probability=None, groups=None, method: str = 'multiplicative',
+            kelly_fraction: float = 0.5) -> Dict[str, np.ndarray]:
+    """
+    Price a whole slate in one pass
+
+    Args:
+        american: American price per outcome
+        probability: Model probability per outcome; defaults to the
+            vig-free probability (so edge/EV measure the vig alone)
+        groups: Market id per outcome, for de-vigging
+
+    Returns:
+        Arrays keyed decimal, implied, fair, edge, ev, kelly
+    """
+    decimal = np.atleast_1d(american_to_decimal(american))
+    implied = 1.0 / decimal
+    fair = devig(implied, groups, method)
+    p = fair if probability is None else np.atleast_1d(np.asarray(probability, dtype=np.float64))
+    b = decimal - 1.0
+    return {
+        'decimal': decimal,
+        'implied': implied,
+        'fair': fair,
+        'edge': p - implied,
+        'ev': p * decimal - 1.0,
+        'kelly': np.maximum(0.0, (b * p - (1.0 - p)) / b * kelly_fraction)
+    }
+
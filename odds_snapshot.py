@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Odds Snapshot
+Normalized, indexed view of one Odds API response
+
+Each response is flattened once into one row per outcome with columnar
+price/point arrays and interned event, market, bookmaker and participant
+codes. Lookups by (event, market, bookmaker, participant), by participant
+and by (event, market) are then dictionary hits instead of a walk over
+games -> bookmakers -> markets -> outcomes.
+
+The participant of an outcome is its `description` when present (the
+player, for props) and otherwise its `name` (team, Over/Under).
+"""
+import math
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+NULL = float('nan')
+
+
+def _norm(text) -> str:
+    return (text or '').lower()
+
+
+def _number(value, default=None):
+    """Stored float back to the JSON-ish value (ints stay ints); default for nulls"""
+    if math.isnan(value):
+        return default
+    return int(value) if value.is_integer() else value
+
+
+class _Interner:
+    """String <-> small integer code"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class OddsSnapshot:
+    """One row per outcome; events are addressed by their position in the payload"""
+
+    def __init__(self):
+        self.events: List[Dict] = []
+        self.event_codes: Dict[str, int] = {}
+        self.markets = _Interner()
+        self.books = _Interner()
+        self.book_titles: List[str] = []
+        self.participants = _Interner()   # lower-cased lookup keys
+        self.participant_names: List[str] = []
+        self.sides = _Interner()
+
+        # Columns
+        self.event = array('i')
+        self.market = array('h')
+        self.book = array('h')
+        self.participant = array('i')
+        self.side = array('i')
+        self.price = array('d')
+        self.point = array('d')
+
+        # Indexes
+        self._by_key: Dict[Tuple[int, int, int, int], List[int]] = {}
+        self._by_participant: Dict[int, List[int]] = {}
+        # (event, market) -> [(book, first row, end row)] in bookmaker order
+        self._blocks: Dict[Tuple[int, int], List[Tuple[int, int, int]]] = {}
+
+    @classmethod
+    def from_events(cls, payload: Iterable[Dict]) -> 'OddsSnapshot':
+        """Flatten an Odds API /odds response"""
+        snap = cls()
+        for game in payload or []:
+            snap._add_event(game)
+        return snap
+
+    def _add_event(self, game: Dict):
+        e = len(self.events)
+        event_id = game.get('id') or f"game_{e + 1}"
+        self.events.append({
+            'id': event_id,
+            'sport_key': game.get('sport_key'),
+            'home_team': game.get('home_team'),
+            'away_team': game.get('away_team'),
+            'commence_time': game.get('commence_time')
+        })
+        self.event_codes.setdefault(event_id, e)
+
+        for bookmaker in game.get('bookmakers', []):
+            b = self.books.code(bookmaker.get('key') or bookmaker.get('title') or '')
+            if b == len(self.book_titles):
+                self.book_titles.append(bookmaker.get('title') or bookmaker.get('key'))
+            for market in bookmaker.get('markets', []):
+                m = self.markets.code(market.get('key') or '')
+                start = len(self.price)
+                for outcome in market.get('outcomes', []):
+                    self._add_outcome(e, m, b, outcome)
+                self._blocks.setdefault((e, m), []).append((b, start, len(self.price)))
+
+    def _add_outcome(self, e: int, m: int, b: int, outcome: Dict):
+        label = outcome.get('description') or outcome.get('name') or ''
+        p = self.participants.code(_norm(label))
+        if p == len(self.participant_names):
+            self.participant_names.append(label)
+        row = len(self.price)
+
+        self.event.append(e)
+        self.market.append(m)
+        self.book.append(b)
+        self.participant.append(p)
+        self.side.append(self.sides.code(outcome.get('name') or ''))
+        price, point = outcome.get('price'), outcome.get('point')
+        self.price.append(float(price) if isinstance(price, (int, float)) else NULL)
+        self.point.append(float(point) if isinstance(point, (int, float)) else NULL)
+
+        self._by_key.setdefault((e, m, b, p), []).append(row)
+        self._by_participant.setdefault(p, []).append(row)
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    @property
+    def nbytes(self) -> int:
+        columns = (self.event, self.market, self.book, self.participant, self.side, self.price, self.point)
+        return sum(len(c) * c.itemsize for c in columns)
+
+    # Lookups -------------------------------------------------------------
+
+    def event_code(self, event_id: str) -> Optional[int]:
+        return self.event_codes.get(event_id)
+
+    def rows(self, event: int, market: str, book: str, participant: str) -> List[int]:
+        """Rows for one (event, market, bookmaker, participant) key"""
+        m = self.markets.codes.get(market)
+        b = self.books.codes.get(book)
+        p = self.participants.codes.get(_norm(participant))
+        if m is None or b is None or p is None:
+            return []
+        return self._by_key.get((event, m, b, p), [])
+
+    def participant_rows(self, participant: str, market: Optional[str] = None) -> List[int]:
+        """Every row for a participant (optionally one market), across events and books"""
+        rows = self._by_participant.get(self.participants.codes.get(_norm(participant)), [])
+        if market is None:
+            return rows
+        m = self.markets.codes.get(market)
+        return [r for r in rows if self.market[r] == m]
+
+    def best_price(self, participant: str, market: Optional[str] = None) -> Optional[int]:
+        """Row with the highest American price for a participant (first wins ties)"""
+        best, best_price = None, float('-inf')
+        price = self.price
+        for r in self.participant_rows(participant, market):
+            if price[r] > best_price:
+                best, best_price = r, price[r]
+        return best
+
+    def market_rows(self, event: int, market: str) -> List[List[int]]:
+        """Outcome rows of one event market, one list per bookmaker in payload order"""
+        m = self.markets.codes.get(market)
+        return [list(range(start, end)) for _, start, end in self._blocks.get((event, m), [])]
+
+    def first_pair(self, event: int, market: str) -> Optional[Tuple[int, int]]:
+        """First two outcomes of the first bookmaker quoting at least two for the market"""
+        m = self.markets.codes.get(market)
+        for _, start, end in self._blocks.get((event, m), []):
+            if end - start >= 2:
+                return start, start + 1
+        return None
+
+    # Row accessors ---------------------------------------------------------
+
+    def price_of(self, row: int, default=None):
+        return _number(self.price[row], default)
+
+    def point_of(self, row: int, default=None):
+        return _number(self.point[row], default)
+
+    def outcome(self, row: int) -> Dict:
+        b = self.book[row]
+        return {
+            'event_id': self.events[self.event[row]]['id'],
+            'market': self.markets.values[self.market[row]],
+            'bookmaker': self.books.values[b],
+            'sportsbook': self.book_titles[b],
+            'participant': self.participant_names[self.participant[row]],
+            'name': self.sides.values[self.side[row]],
+            'price': self.price_of(row),
+            'point': self.point_of(row)
+        }
@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Parlay Engine
+N-leg parlay construction from the live edge pool
+
+Every scored outcome (prop_scanner scores over the prop boards and game
+lines) becomes a candidate leg. A parlay is priced at one sportsbook, so
+the search runs per book over that book's candidates:
+
+  * each leg gets an additive score - log(p * decimal) when maximizing
+    expected value, log(p) when maximizing hit probability - so a
+    parlay's independent score is the sum of its legs'
+  * candidates are sorted by score; branch-and-bound walks leg
+    combinations depth-first and prunes any branch whose best possible
+    completion (the next legs' scores, ignoring constraints) cannot beat
+    the worst parlay kept
+  * constraints: one leg per player (or per game line), at most
+    max_per_game legs from one game, a wall-clock budget after which the
+    best parlays found so far are returned
+
+Finalists are re-priced with the slate simulation when one exists (so
+same-game correlation is counted), then picked greedily so no two
+returned parlays share more than max_shared legs. Swap suggestions for an
+existing parlay score every single-leg replacement incrementally
+(parlay_swaps) against a per-book candidate index kept per slate version.
+"""
+import heapq
+import math
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import jackpot_search
+import odds_math
+import parlay_swaps
+from cache_backends import MemoryLRUCache
+from player_search import fold
+
+# Risk profiles: objective, leg filters and same-game cap
+PROFILES = {
+    'conservative': {'objective': 'probability', 'legs': 2, 'min_probability': 0.55,
+                     'min_edge': -0.02, 'max_per_game': 1},
+    'balanced': {'objective': 'ev', 'legs': 3, 'min_probability': 0.40,
+                 'min_edge': 0.0, 'max_per_game': 2},
+    'aggressive': {'objective': 'ev', 'legs': 4, 'min_probability': 0.20,
+                   'min_edge': 0.0, 'max_per_game': 3},
+}
+MAX_LEGS = 10
+# Candidate legs kept per book (best scores first)
+MAX_CANDIDATES = 300
+# Parlays kept by the search for re-pricing and diversity selection
+KEEP = 64
+BUDGET_MS = 250
+STAKE = 100.0
+# Jackpot candidates returned per spin, search rounds and cache lifetime
+JACKPOT_CANDIDATES = 25
+JACKPOT_ROUNDS = 6
+JACKPOT_TTL = 900
+# Swap suggestions: returned, per replaced leg, and the candidate pool they come from
+SWAP_SUGGESTIONS = 10
+SWAPS_PER_LEG = 3
+SWAP_MIN_PROBABILITY = 0.05
+SWAP_MIN_EDGE = -0.05
+
+GAME_MARKETS = ('h2h', 'spreads', 'totals')
+MARKET_LABELS = {
+    'h2h': 'Moneyline',
+    'spreads': 'Spread',
+    'totals': 'Game Total',
+    'player_anytime_td': 'Anytime TD',
+    'player_first_td': 'First TD',
+    'player_pass_yds': 'Passing Yards',
+    'player_pass_tds': 'Passing TDs',
+    'player_rush_yds': 'Rushing Yards',
+    'player_receptions': 'Receptions',
+    'player_reception_yds': 'Receiving Yards',
+}
+
+
+def market_label(market: str) -> str:
+    return MARKET_LABELS.get(market, market.replace('player_', '').replace('_', ' ').title())
+
+
+def stars(probability: float) -> int:
+    """1-5 confidence stars from a win probability"""
+    return max(1, min(5, 1 + int(min(probability, 0.999) * 5)))
+
+
+class CandidatePool:
+    """Filtered candidate legs as flat arrays plus their leg dicts"""
+
+    def __init__(self, legs: List[Dict], score: np.ndarray, book: np.ndarray,
+                 player: np.ndarray, game: np.ndarray, probability: Optional[np.ndarray] = None,
+                 decimal: Optional[np.ndarray] = None):
+        self.legs = legs
+        self.score = score
+        self.probability = probability if probability is not None else np.empty(0)
+        self.decimal = decimal if decimal is not None else np.empty(0)
+        self.book = book
+        self.player = player
+        self.game = game
+
+    def __len__(self) -> int:
+        return len(self.legs)
+
+    @classmethod
+    def from_scored(cls, scored: List[Tuple[str, object, Dict]], objective: str = 'ev',
+                    min_probability: float = 0.0, min_edge: float = 0.0, min_confidence: int = 1,
+                    team_of=None, per_book: int = MAX_CANDIDATES) -> 'CandidatePool':
+        """
+        Args:
+            scored: (market key, OddsSnapshot, prop_scanner scores) triples
+            team_of: Optional callable(player name) -> team, for leg labels
+            per_book: Candidates kept per sportsbook (best scores first)
+        """
+        book_codes: Dict[str, int] = {}
+        parts = []
+        for i, (_, snapshot, s) in enumerate(scored):
+            probability = s['probability']
+            decimal = 1.0 / s['implied']
+            keep = ~np.isnan(probability) & ~np.isnan(decimal) & (probability >= min_probability) & \
+                (s['edge'] >= min_edge) & (probability >= (min_confidence - 1) / 5.0)
+            rows = np.flatnonzero(keep)
+            if not len(rows):
+                continue
+            with np.errstate(divide='ignore'):
+                leg_score = np.log(probability[rows]) if objective == 'probability' else \
+                    np.log(probability[rows] * decimal[rows])
+            books = np.array([book_codes.setdefault(b, len(book_codes)) for b in snapshot.books.values],
+                             dtype=np.int64)
+            book = books[np.frombuffer(snapshot.book, dtype=np.int16)[rows]]
+            parts.append((np.full(len(rows), i), rows, leg_score, book, probability[rows], decimal[rows]))
+        if not parts:
+            return cls([], np.empty(0), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                       np.empty(0, dtype=np.int64))
+
+        source, rows, score, book, probability, decimal = (np.concatenate(column) for column in zip(*parts))
+        # Best per_book candidates per sportsbook, before any dicts are built
+        order = np.lexsort((-score, book))
+        rank = np.arange(len(order)) - np.searchsorted(book[order], book[order], 'left')
+        selected = order[rank < per_book]
+
+        legs, players, games = [], [], []
+        player_codes: Dict[Tuple[str, str], int] = {}
+        game_codes: Dict[str, int] = {}
+        for i, row in zip(source[selected].tolist(), rows[selected].tolist()):
+            _, snapshot, s = scored[i]
+            outcome = snapshot.outcome(row)
+            event = snapshot.events[snapshot.event[row]]
+            market = outcome['market']
+            # One leg per player; game lines are one per (game, market)
+            key = (outcome['event_id'], market if market in GAME_MARKETS else fold(outcome['participant']))
+            legs.append(_leg(outcome, event, s, row, team_of))
+            players.append(player_codes.setdefault(key, len(player_codes)))
+            games.append(game_codes.setdefault(outcome['event_id'], len(game_codes)))
+        return cls(legs, score[selected], book[selected], np.array(players, dtype=np.int64),
+                   np.array(games, dtype=np.int64), probability[selected], decimal[selected])
+
+    def by_book(self) -> Dict[str, np.ndarray]:
+        """Candidate indices per sportsbook, best score first"""
+        out = {}
+        for b in np.unique(self.book).tolist():
+            idx = np.flatnonzero(self.book == b)
+            idx = idx[np.argsort(-self.score[idx], kind='stable')]
+            out[self.legs[idx[0]]['bookmaker']] = idx
+        return out
+
+
+def _leg(outcome: Dict, event: Dict, scores: Dict, row: int, team_of) -> Dict:
+    """Candidate leg payload (ParlayLeg fields plus pricing detail)"""
+    market = outcome['market']
+    participant = outcome['participant']
+    point = outcome['point']
+    side = outcome['name']
+    matchup = f"{event.get('away_team')} @ {event.get('home_team')}"
+    if market == 'totals':
+        player_name, team = matchup, ''
+        line = f"{side} {point:g}" if point is not None else side
+    elif market in GAME_MARKETS:
+        player_name, team = participant, participant
+        line = 'ML' if market == 'h2h' else f"{point:+g}" if point is not None else ''
+    else:
+        player_name = participant
+        team = (team_of(participant) if team_of else None) or ''
+        line = f"{side} {point:g}" if point is not None else side
+    probability = float(scores['probability'][row])
+    return {
+        'playerId': f"{outcome['event_id']}:{fold(participant)}",
+        'playerName': player_name,
+        'team': team,
+        'propType': market_label(market),
+        'propLine': line,
+        'odds': int(outcome['price']),
+        'confidence': stars(probability),
+        'edgeScore': round(float(scores['edge'][row]) * 100, 1),
+        'event_id': outcome['event_id'],
+        'market': market,
+        'participant': participant,
+        'side': side,
+        'point': point,
+        'bookmaker': outcome['bookmaker'],
+        'sportsbook': outcome['sportsbook'],
+        'matchup': matchup,
+        'commence_time': event.get('commence_time'),
+        'probability': round(probability, 4),
+        'decimal': round(float(1.0 / scores['implied'][row]), 4),
+        'source': 'model' if scores['from_model'][row] else 'consensus'
+    }
+
+
+def branch_and_bound(score: np.ndarray, player: np.ndarray, game: np.ndarray, legs: int,
+                     max_per_game: int = 2, keep: int = KEEP,
+                     deadline: Optional[float] = None) -> Tuple[List[Tuple[float, Tuple[int, ...]]], bool, int]:
+    """
+    Best `keep` leg combinations by summed score
+
+    Args:
+        score, player, game: Per-candidate arrays, sorted by score descending
+        deadline: time.perf_counter() value after which the search stops
+
+    Returns:
+        ([(total score, candidate positions)] best first, timed out, nodes visited)
+    """
+    n = len(score)
+    if legs < 1 or n < legs:
+        return [], False, 0
+    prefix = np.concatenate(([0.0], np.cumsum(score))).tolist()
+    score_list, player_list, game_list = score.tolist(), player.tolist(), game.tolist()
+    best: List[Tuple[float, Tuple[int, ...]]] = []
+    chosen: List[int] = []
+    used = set()
+    per_game: Dict[int, int] = {}
+    state = {'nodes': 0, 'timed_out': False}
+
+    def visit(start: int, total: float):
+        remaining = legs - len(chosen)
+        if remaining == 0:
+            entry = (total, tuple(chosen))
+            if len(best) < keep:
+                heapq.heappush(best, entry)
+            elif total > best[0][0]:
+                heapq.heapreplace(best, entry)
+            return
+        for i in range(start, n - remaining + 1):
+            # Sorted scores: no later start can do better than this bound either
+            if len(best) == keep and total + prefix[i + remaining] - prefix[i] <= best[0][0]:
+                return
+            state['nodes'] += 1
+            if deadline is not None and not state['nodes'] & 1023 and time.perf_counter() > deadline:
+                state['timed_out'] = True
+                return
+            p, g = player_list[i], game_list[i]
+            if p in used or per_game.get(g, 0) >= max_per_game:
+                continue
+            chosen.append(i)
+            used.add(p)
+            per_game[g] = per_game.get(g, 0) + 1
+            visit(i + 1, total + score_list[i])
+            chosen.pop()
+            used.discard(p)
+            per_game[g] -= 1
+            if state['timed_out']:
+                return
+
+    visit(0, 0.0)
+    return sorted(best, reverse=True), state['timed_out'], state['nodes']
+
+
+def price_parlay(legs: List[Dict], simulation=None, stake: float = STAKE) -> Dict:
+    """GeneratedParlay payload for a set of legs (correlated when simulated)"""
+    decimal = float(np.prod([leg['decimal'] for leg in legs]))
+    independent = float(np.prod([leg['probability'] for leg in legs]))
+    joint, source = None, 'independent'
+    if simulation is not None:
+        joint = simulation.joint_probability(legs)
+        source = 'simulation' if joint is not None else source
+    hit = independent if joint is None else joint
+
+    games = [leg['event_id'] for leg in legs]
+    pairs = len(legs) * (len(legs) - 1) / 2
+    same_game = sum(games[i] == games[j] for i in range(len(games)) for j in range(i + 1, len(games)))
+    return {
+        'legs': legs,
+        'totalOdds': int(round(float(odds_math.decimal_to_american(decimal)))),
+        'potentialPayout': round(stake * decimal, 2),
+        'combinedConfidence': round(hit * 100, 1),
+        'expectedValue': round((hit * decimal - 1.0) * 100, 1),
+        'correlationRisk': round(same_game / pairs, 2) if pairs else 0.0,
+        'sportsbook': legs[0]['sportsbook'],
+        'stake': stake,
+        'decimalOdds': round(decimal, 4),
+        'hitProbability': round(hit, 4),
+        'independentProbability': round(independent, 4),
+        'correlationLift': round(hit / independent, 3) if independent > 0 else None,
+        'probabilitySource': source
+    }
+
+
+def diverse(parlays: List[Dict], count: int, max_shared: Optional[int] = None) -> List[Dict]:
+    """
+    Greedy pick, best first, of parlays sharing at most max_shared legs with
+    any picked one (default: half the smaller parlay's legs)
+    """
+    picked, picked_keys = [], []
+    for parlay in parlays:
+        keys = {(leg['playerId'], leg['market']) for leg in parlay['legs']}
+        if all(len(keys & other) <= (min(len(keys), len(other)) // 2 if max_shared is None else max_shared)
+               for other in picked_keys):
+            picked.append(parlay)
+            picked_keys.append(keys)
+            if len(picked) == count:
+                break
+    return picked
+
+
+class ParlayEngine:
+    """Builds parlays from the data engine's scored markets"""
+
+    def __init__(self, data_engine, budget_ms: float = BUDGET_MS):
+        self.data_engine = data_engine
+        self.budget_ms = budget_ms
+        self.last_search: Dict = {}
+        # (tier, stake bucket, slate version) -> jackpot candidates
+        self.jackpots = MemoryLRUCache(max_entries=64)
+        # (slate version, {bookmaker: SwapIndex})
+        self._swap_index: Tuple[Optional[str], Dict] = (None, {})
+
+    def _team_of(self):
+        model = getattr(self.data_engine, 'projection_model', None)
+        return model.team_of if model is not None and len(model) else None
+
+    def generate(self, leg_count: Optional[int] = None, risk_tolerance: str = 'balanced',
+                 min_confidence: int = 1, count: int = 1, objective: Optional[str] = None,
+                 max_per_game: Optional[int] = None, markets: Optional[List[str]] = None,
+                 scored: Optional[List] = None, stake: float = STAKE) -> List[Dict]:
+        """
+        Best parlays for a risk profile, most valuable first
+
+        Args:
+            leg_count: Legs per parlay (profile default when None)
+            min_confidence: Minimum leg confidence in stars (1-5)
+            count: Number of diverse parlays wanted
+            scored: Pre-scored markets (defaults to the data engine's)
+        """
+        profile = dict(PROFILES.get(risk_tolerance) or PROFILES['balanced'])
+        legs = max(1, min(int(leg_count or profile['legs']), MAX_LEGS))
+        objective = objective or profile['objective']
+        max_per_game = profile['max_per_game'] if max_per_game is None else max_per_game
+
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000.0
+        if scored is None:
+            scored = self.data_engine.scored_markets(markets, include_games=True)
+        pool = CandidatePool.from_scored(scored, objective, profile['min_probability'],
+                                         profile['min_edge'], min_confidence, self._team_of())
+
+        found: List[Tuple[float, List[int]]] = []
+        timed_out, nodes = False, 0
+        for indices in pool.by_book().values():
+            results, out_of_time, visited = branch_and_bound(
+                pool.score[indices], pool.player[indices], pool.game[indices],
+                legs, max_per_game, KEEP, deadline)
+            found.extend((total, [int(indices[i]) for i in combo]) for total, combo in results)
+            timed_out |= out_of_time
+            nodes += visited
+            if out_of_time:
+                break
+
+        simulation = getattr(self.data_engine, 'simulation', None)
+        parlays = [price_parlay([pool.legs[i] for i in combo], simulation, stake)
+                   for _, combo in heapq.nlargest(KEEP * 2, found, key=lambda item: item[0])]
+        key = 'hitProbability' if objective == 'probability' else 'expectedValue'
+        parlays.sort(key=lambda p: p[key], reverse=True)
+        picked = diverse(parlays, count, max_shared=legs // 2)
+        for parlay in picked:
+            parlay['riskTolerance'] = risk_tolerance
+            parlay['generatedAt'] = datetime.now().isoformat()
+
+        self.last_search = {
+            'candidates': len(pool), 'nodes': nodes, 'timed_out': timed_out,
+            'ms': round((time.perf_counter() - start) * 1000, 1)
+        }
+        return picked
+
+    def generate_multiple(self, leg_count: Optional[int] = None, min_confidence: int = 1) -> Dict:
+        """Best parlay per risk profile, scoring the markets once"""
+        scored = self.data_engine.scored_markets(include_games=True)
+        out = {}
+        for profile in PROFILES:
+            parlays = self.generate(leg_count, profile, min_confidence, scored=scored)
+            out[profile] = parlays[0] if parlays else None
+        return out
+
+    def _swap_indexes(self) -> Dict[str, 'parlay_swaps.SwapIndex']:
+        """Per-sportsbook swap candidates, built once per slate version"""
+        version, indexes = self._swap_index
+        if version != self.data_engine.slate_version():
+            version = self.data_engine.slate_version()
+            pool = CandidatePool.from_scored(self.data_engine.scored_markets(include_games=True), 'ev',
+                                             SWAP_MIN_PROBABILITY, SWAP_MIN_EDGE, team_of=self._team_of())
+            indexes = {book: parlay_swaps.SwapIndex([pool.legs[i] for i in idx.tolist()])
+                       for book, idx in pool.by_book().items()}
+            self._swap_index = (version, indexes)
+        return indexes
+
+    def swap_suggestions(self, parlay: Dict, rank_by: Optional[str] = None,
+                         limit: int = SWAP_SUGGESTIONS, stake: Optional[float] = None) -> Dict:
+        """
+        Best single-leg replacements for a parlay, largest improvement first
+
+        Every (leg, candidate) swap at the parlay's sportsbook is scored
+        incrementally (parlay_swaps); the best are re-priced exactly.
+
+        Args:
+            parlay: GeneratedParlay payload (legs need event_id, market,
+                participant, side, point and bookmaker or sportsbook)
+            rank_by: 'ev' or 'probability' (the parlay's risk profile objective when None)
+        """
+        legs = parlay.get('legs') or []
+        if not legs:
+            raise ValueError("Parlay has no legs")
+        profile = PROFILES.get(parlay.get('riskTolerance')) or PROFILES['balanced']
+        rank_by = rank_by or profile['objective']
+        if rank_by not in ('ev', 'probability'):
+            raise ValueError(f"Unknown ranking: {rank_by} (expected 'ev' or 'probability')")
+        stake = float(stake or parlay.get('stake') or STAKE)
+
+        indexes = self._swap_indexes()
+        book = legs[0].get('bookmaker') or ''
+        if book not in indexes:
+            titles = {index.legs[0]['sportsbook'].lower(): b for b, index in indexes.items()}
+            book = titles.get((legs[0].get('sportsbook') or '').lower(), book)
+        index = indexes.get(book) or parlay_swaps.SwapIndex([])
+        current = [parlay_swaps.normalize_leg(leg, index) for leg in legs]
+        if any(leg is None for leg in current):
+            raise ValueError("Every leg needs odds or decimal odds")
+
+        start = time.perf_counter()
+        simulation = getattr(self.data_engine, 'simulation', None)
+        original = price_parlay(current, simulation, stake)
+        games = [leg['event_id'] for leg in current]
+        max_per_game = max(profile['max_per_game'], max(games.count(g) for g in games))
+        swaps = index.swaps(current, simulation, max_per_game) if len(index) else None
+
+        suggestions = []
+        if swaps is not None:
+            metric = np.where(swaps['valid'], swaps['hit'] if rank_by == 'probability' else swaps['ev'], -np.inf)
+            per_leg = min(SWAPS_PER_LEG, metric.shape[1])
+            best = np.argpartition(-metric, per_leg - 1, axis=1)[:, :per_leg]
+            pairs = [(float(metric[i, c]), i, int(c)) for i in range(len(current)) for c in best[i]
+                     if np.isfinite(metric[i, c])]
+            for _, i, c in heapq.nlargest(limit * 2, pairs):
+                swapped = current[:i] + [index.legs[c]] + current[i + 1:]
+                priced = price_parlay(swapped, simulation, stake)
+                suggestions.append({
+                    'replaceIndex': i,
+                    'replaceLeg': current[i],
+                    'withLeg': index.legs[c],
+                    'evDelta': round(priced['expectedValue'] - original['expectedValue'], 1),
+                    'hitProbabilityDelta': round(priced['hitProbability'] - original['hitProbability'], 4),
+                    'totalOdds': priced['totalOdds'],
+                    'potentialPayout': priced['potentialPayout'],
+                    'combinedConfidence': priced['combinedConfidence'],
+                    'expectedValue': priced['expectedValue'],
+                    'hitProbability': priced['hitProbability'],
+                    'probabilitySource': priced['probabilitySource']
+                })
+        delta = 'hitProbabilityDelta' if rank_by == 'probability' else 'evDelta'
+        suggestions = sorted((s for s in suggestions if s[delta] > 0), key=lambda s: s[delta], reverse=True)
+
+        self.last_search = {
+            'swaps': int(swaps['valid'].sum()) if swaps is not None else 0, 'candidates': len(index),
+            'ms': round((time.perf_counter() - start) * 1000, 1)
+        }
+        return {'original': original, 'suggestions': suggestions[:limit], 'rankedBy': rank_by}
+
+    def jackpot_candidates(self, tier: str = '1M', stake: float = 10.0,
+                           count: int = JACKPOT_CANDIDATES) -> List[Dict]:
+        """
+        Parlays paying at least the tier on `stake`, most likely to hit first
+
+        Cached per (tier, stake bucket, slate version), so repeated spins
+        over an unchanged slate skip the search.
+        """
+        threshold = jackpot_search.TIERS.get(tier)
+        if threshold is None:
+            raise ValueError(f"Unknown jackpot tier: {tier} (expected one of {list(jackpot_search.TIERS)})")
+        if not math.isfinite(stake) or stake <= 0:
+            raise ValueError("Stake must be a positive finite number")
+
+        scored = self.data_engine.scored_markets(include_games=True)
+        bucket = jackpot_search.stake_bucket(stake)
+        key = f"jackpot:{tier}:{bucket:g}:{self.data_engine.slate_version()}"
+        cached = self.jackpots.get(key)
+        if cached is None:
+            start = time.perf_counter()
+            cached = self._search_jackpots(scored, math.log(threshold / bucket), count)
+            self.jackpots.set(key, cached, JACKPOT_TTL)
+            self.last_search = {'jackpot': key, 'ms': round((time.perf_counter() - start) * 1000, 1)}
+
+        simulation = getattr(self.data_engine, 'simulation', None)
+        out = []
+        for legs in cached:
+            joint = simulation.joint_probability(legs) if simulation is not None else None
+            out.append(jackpot_search.candidate(legs, stake, joint))
+        out.sort(key=lambda c: c['estHitProb'], reverse=True)
+        return out
+
+    def _search_jackpots(self, scored: List, target: float, count: int) -> List[List[Dict]]:
+        """Diverse knapsack solutions across books; later rounds ban earlier anchors"""
+        pool = CandidatePool.from_scored(scored, 'ev', min_probability=0.05, min_edge=0.0,
+                                         team_of=self._team_of())
+        if not len(pool):
+            return []
+        books = pool.by_book()
+        cost = -np.log(pool.probability)
+        weight = np.log(pool.decimal)
+        banned = np.zeros(len(pool), dtype=bool)
+
+        solutions: List[Tuple[float, List[int]]] = []
+        for _ in range(JACKPOT_ROUNDS):
+            found = []
+            for indices in books.values():
+                indices = indices[~banned[indices]]
+                for total, picks in jackpot_search.knapsack(cost[indices], weight[indices],
+                                                            pool.player[indices], target):
+                    found.append((total, [int(indices[i]) for i in picks]))
+            if not found:
+                break
+            solutions.extend(found)
+            parlays = diverse([{'legs': [pool.legs[i] for i in picks]}
+                               for _, picks in sorted(solutions, key=lambda item: item[0])],
+                              count)
+            if len(parlays) >= count:
+                break
+            # Ban the anchor (most likely leg) of every parlay found this round
+            for _, picks in found:
+                banned[min(picks, key=lambda i: cost[i])] = True
+        picked = diverse([{'legs': [pool.legs[i] for i in picks]}
+                          for _, picks in sorted(solutions, key=lambda item: item[0])],
+                         count)
+        return [parlay['legs'] for parlay in picked]
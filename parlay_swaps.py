@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Parlay Swaps
+Best single-leg replacements for an existing parlay
+
+A parlay's hit probability and odds are running sums in log space:
+
+    log P(hit) ~ sum(log p_i) + sum over same-game pairs of log lift(i, j)
+    log D      = sum(log d_i)
+
+where lift(i, j) = P(i and j) / (P(i) P(j)) comes from the slate
+simulation (1 without one). Swapping leg i for candidate c only touches
+i's and c's terms, so with the candidates' lifts against the parlay's
+legs precomputed (one indicator matmul per game), every (leg, candidate)
+swap is scored at once with O(1) arithmetic per pair. The pairwise lift
+approximation is only used to rank; the suggestions returned are
+re-priced exactly.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import odds_math
+from player_search import fold
+
+GAME_MARKETS = ('h2h', 'spreads', 'totals')
+
+
+def leg_key(leg: Dict) -> Tuple[str, str]:
+    """One-leg-per-player key (game lines: one per game and market)"""
+    market = leg.get('market') or ''
+    return (leg.get('event_id') or '', market if market in GAME_MARKETS else fold(leg.get('participant') or ''))
+
+
+def outcome_key(leg: Dict) -> Tuple:
+    return leg_key(leg) + (leg.get('market') or '', (leg.get('side') or '').lower(), leg.get('point'))
+
+
+def normalize_leg(leg: Dict, index: 'SwapIndex') -> Optional[Dict]:
+    """
+    A client-supplied leg with decimal odds and probability filled in
+
+    Legs produced by the parlay engine carry everything; otherwise the
+    current pool's copy of the same outcome is preferred, then the leg's
+    own American odds (probability falls back to the implied one).
+    """
+    current = index.by_outcome.get(outcome_key(leg))
+    if current is not None:
+        return index.legs[current]
+    decimal = leg.get('decimal') or leg.get('priceDecimal')
+    if decimal is None and leg.get('odds') is not None:
+        decimal = float(odds_math.american_to_decimal(leg['odds']))
+    if not decimal or decimal != decimal or decimal <= 1.0:
+        return None
+    probability = leg.get('probability') or 1.0 / decimal
+    return dict(leg, decimal=float(decimal), probability=float(probability),
+                event_id=leg.get('event_id') or '',
+                sportsbook=leg.get('sportsbook') or leg.get('bookmaker') or '',
+                playerId=leg.get('playerId') or f"{leg.get('event_id')}:{fold(leg.get('participant') or '')}")
+
+
+class SwapIndex:
+    """Candidate legs of one sportsbook as arrays, keyed for swap evaluation"""
+
+    def __init__(self, legs: List[Dict]):
+        self.legs = legs
+        self.log_p = np.log(np.array([leg['probability'] for leg in legs], dtype=np.float64))
+        self.log_d = np.log(np.array([leg['decimal'] for leg in legs], dtype=np.float64))
+        self.key_codes: Dict[Tuple[str, str], int] = {}
+        self.key = np.array([self.key_codes.setdefault(leg_key(leg), len(self.key_codes)) for leg in legs],
+                            dtype=np.int64)
+        self.game_codes: Dict[str, int] = {}
+        self.game = np.array([self.game_codes.setdefault(leg['event_id'], len(self.game_codes)) for leg in legs],
+                             dtype=np.int64)
+        self.by_outcome = {outcome_key(leg): i for i, leg in enumerate(legs)}
+
+    def __len__(self) -> int:
+        return len(self.legs)
+
+    def _lifts(self, parlay: List[Dict], simulation) -> Tuple[np.ndarray, np.ndarray]:
+        """Log lifts: candidates x parlay legs, and parlay legs x parlay legs (same game only)"""
+        k = len(parlay)
+        candidate_lift = np.zeros((len(self), k))
+        leg_lift = np.zeros((k, k))
+        if simulation is None:
+            return candidate_lift, leg_lift
+        for event_id in {leg['event_id'] for leg in parlay}:
+            game = simulation.games.get(event_id)
+            cols = [j for j, leg in enumerate(parlay) if leg['event_id'] == event_id]
+            flags = [game.indicator(parlay[j]['market'], parlay[j].get('participant') or '',
+                                    parlay[j].get('side') or '', parlay[j].get('point'))
+                     if game is not None else None for j in cols]
+            cols = [j for j, f in zip(cols, flags) if f is not None]
+            if not cols:
+                continue
+            legs = np.stack([f for f in flags if f is not None], axis=1).astype(np.float32)
+            marginal = np.maximum(legs.mean(axis=0), 1e-9)
+            pair = (legs.T @ legs) / len(legs)
+            with np.errstate(divide='ignore'):
+                block = np.log(np.maximum(pair, 1e-9) / np.outer(marginal, marginal))
+            np.fill_diagonal(block, 0.0)
+            leg_lift[np.ix_(cols, cols)] = block
+
+            rows, cand_flags = [], []
+            code = self.game_codes.get(event_id, -1)
+            for i in np.flatnonzero(self.game == code).tolist():
+                leg = self.legs[i]
+                f = game.indicator(leg['market'], leg.get('participant') or '', leg.get('side') or '',
+                                   leg.get('point'))
+                if f is not None:
+                    rows.append(i)
+                    cand_flags.append(f)
+            if rows:
+                cands = np.stack(cand_flags, axis=1).astype(np.float32)
+                cand_marginal = np.maximum(cands.mean(axis=0), 1e-9)
+                joint = (cands.T @ legs) / len(legs)
+                candidate_lift[np.ix_(rows, cols)] = np.log(
+                    np.maximum(joint, 1e-9) / np.outer(cand_marginal, marginal))
+        return candidate_lift, leg_lift
+
+    def swaps(self, parlay: List[Dict], simulation=None, max_per_game: int = 2) -> Dict[str, np.ndarray]:
+        """
+        Every (parlay leg, candidate) swap at once
+
+        Returns:
+            legs x candidates arrays: hit (approximate hit probability),
+            decimal, ev and valid (constraints hold)
+        """
+        k = len(parlay)
+        log_p = np.log(np.array([leg['probability'] for leg in parlay]))
+        log_d = np.log(np.array([leg['decimal'] for leg in parlay]))
+        candidate_lift, leg_lift = self._lifts(parlay, simulation)
+
+        # Running totals, and each leg's share of them
+        total_p, total_d = log_p.sum(), log_d.sum()
+        leg_corr = leg_lift.sum(axis=1)
+        total_corr = leg_corr.sum() / 2
+        cand_corr = candidate_lift.sum(axis=1)
+
+        new_p = total_p - log_p[:, None] + self.log_p[None, :]
+        new_d = total_d - log_d[:, None] + self.log_d[None, :]
+        new_corr = total_corr - leg_corr[:, None] + (cand_corr[None, :] - candidate_lift.T)
+        hit = np.exp(new_p + new_corr)
+        decimal = np.exp(new_d)
+
+        # Constraints: one leg per player (the replaced leg's player is free),
+        # game cap, and no outcome already in the parlay
+        parlay_key = np.array([self.key_codes.get(leg_key(leg), -1) for leg in parlay])
+        parlay_game = np.array([self.game_codes.get(leg['event_id'], -1) for leg in parlay])
+        same_key = parlay_key[:, None] == self.key[None, :]
+        same_game = parlay_game[:, None] == self.game[None, :]
+        key_conflicts = same_key.sum(axis=0)[None, :] - same_key
+        game_counts = same_game.sum(axis=0)[None, :] - same_game + 1
+        in_parlay = np.zeros(len(self), dtype=bool)
+        in_parlay[[self.by_outcome[k] for k in map(outcome_key, parlay) if k in self.by_outcome]] = True
+        valid = (key_conflicts == 0) & (game_counts <= max_per_game) & ~in_parlay[None, :]
+        return {'hit': hit, 'decimal': decimal, 'ev': hit * decimal - 1.0, 'valid': valid}
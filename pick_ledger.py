@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Pick Ledger
+Durable record of every published pick, its grading and the running record
+
+One SQLite file (WAL mode):
+
+    picks        one row per published pick, with the price, probability
+                 and edge at publish time; status moves open -> won / lost
+                 / push / void when the grading job settles it
+    aggregates   running totals per scope (all, market, book, week),
+                 updated in the same transaction as each publish or
+                 settle, so a summary is a primary-key read
+
+A pick is identified by its leaderboard id (event, market, participant,
+side, line); publishing it again keeps the first price. Grading reuses
+the backtest's SeasonResults and grade(), so live and replayed picks are
+settled by the same rules.
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+import backtest
+from refresh_scheduler import GAME_WINDOW, parse_kickoff
+
+# Picks whose result has not landed this long after kickoff are voided
+VOID_AFTER = 7 * 24 * 3600
+SCOPES = ('all', 'market', 'book', 'week')
+STATUSES = {1: 'won', -1: 'lost', 0: 'push'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS picks (
+    id TEXT PRIMARY KEY,
+    published_at REAL NOT NULL,
+    channel TEXT,
+    event_id TEXT,
+    home_team TEXT,
+    away_team TEXT,
+    kickoff REAL,
+    week INTEGER,
+    market TEXT NOT NULL,
+    participant TEXT,
+    side TEXT,
+    point REAL,
+    book TEXT,
+    price INTEGER NOT NULL,
+    decimal REAL NOT NULL,
+    probability REAL,
+    edge REAL,
+    stake REAL,
+    status TEXT NOT NULL DEFAULT 'open',
+    profit REAL,
+    settled_at REAL
+);
+CREATE INDEX IF NOT EXISTS picks_open ON picks (status, kickoff);
+CREATE TABLE IF NOT EXISTS aggregates (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    picks INTEGER NOT NULL DEFAULT 0,
+    open INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    pushes INTEGER NOT NULL DEFAULT 0,
+    voids INTEGER NOT NULL DEFAULT 0,
+    units REAL NOT NULL DEFAULT 0,
+    edge_sum REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, key)
+);
+"""
+COUNTERS = ('picks', 'open', 'wins', 'losses', 'pushes', 'voids', 'units', 'edge_sum')
+UPSERT = (f"INSERT INTO aggregates (scope, key, {', '.join(COUNTERS)}) "
+          f"VALUES (?, ?, {', '.join('?' * len(COUNTERS))}) "
+          f"ON CONFLICT (scope, key) DO UPDATE SET {', '.join(f'{c} = {c} + excluded.{c}' for c in COUNTERS)}")
+# Guarded on the row still being open: only the grader whose update lands counts it
+SET_WEEK = "UPDATE picks SET week = ? WHERE id = ? AND status = 'open' AND week IS NULL"
+SETTLE = "UPDATE picks SET status = ?, profit = ?, settled_at = ? WHERE id = ? AND status = 'open'"
+
+
+def default_ledger_path() -> str:
+    return os.getenv('PICK_LEDGER_PATH') or os.path.join(os.path.dirname(__file__), 'data', 'pick_ledger.sqlite')
+
+
+def from_pick_leg(leg: Dict) -> Dict:
+    """Ledger pick from a leaderboard PickLeg payload"""
+    return {
+        'id': leg['id'],
+        'event_id': leg.get('gameId'),
+        'home_team': leg.get('homeTeam'),
+        'away_team': leg.get('awayTeam'),
+        'kickoff': parse_kickoff(leg.get('startTime')),
+        'market': leg['marketKey'],
+        'participant': leg.get('playerName'),
+        'side': leg.get('side'),
+        'point': leg.get('line'),
+        'book': leg.get('bookmaker'),
+        'price': leg['priceAmerican'],
+        'probability': leg.get('probability'),
+        'edge': leg['edge'] / 100 if leg.get('edge') is not None else None
+    }
+
+
+def _decimal(american: int) -> float:
+    return 1 + american / 100 if american > 0 else 1 + 100 / -american
+
+
+def _scopes(market: str, book: Optional[str], week: Optional[int]) -> List[tuple]:
+    keys = [('all', ''), ('market', market), ('book', book or '')]
+    if week is not None:
+        keys.append(('week', str(week)))
+    return keys
+
+
+def _record(row: Dict) -> Dict:
+    """Aggregate row -> summary payload"""
+    decided = row['wins'] + row['losses']
+    settled = decided + row['pushes']
+    return {
+        'picks': row['picks'],
+        'open': row['open'],
+        'settled': settled,
+        'wins': row['wins'],
+        'losses': row['losses'],
+        'pushes': row['pushes'],
+        'voids': row['voids'],
+        'win_rate': round(row['wins'] / decided, 4) if decided else None,
+        'units': round(row['units'], 2),
+        'roi': round(row['units'] / settled, 4) if settled else None,
+        'avg_edge': round(row['edge_sum'] / row['picks'], 4) if row['picks'] else None
+    }
+
+
+class PickLedger:
+    """Published picks and their running record, in one SQLite file"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_ledger_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._local = threading.local()
+        # Serializes read-modify-write settles across this process's threads
+        self._lock = threading.Lock()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        conn.commit()
+        self.last_grade: Dict = {}
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, keys: Iterable[tuple], **deltas):
+        values = [deltas.get(c, 0) for c in COUNTERS]
+        conn.executemany(UPSERT, [(scope, key, *values) for scope, key in keys])
+
+    # Writes --------------------------------------------------------------
+
+    def publish(self, picks: List[Dict], channel: str = 'newsletter', week: Optional[int] = None,
+                now: Optional[float] = None) -> int:
+        """
+        Record picks at their current price (see from_pick_leg for the fields)
+
+        Returns:
+            Picks newly recorded (already published ids are kept as first published)
+        """
+        now = time.time() if now is None else now
+        added = 0
+        with self._lock:
+            conn = self._conn()
+            with conn:
+                for pick in picks:
+                    price = int(pick['price'])
+                    edge = pick.get('edge')
+                    pick_week = pick['week'] if pick.get('week') is not None else week
+                    inserted = conn.execute(
+                        "INSERT OR IGNORE INTO picks (id, published_at, channel, event_id, home_team, away_team, "
+                        "kickoff, week, market, participant, side, point, book, price, decimal, probability, edge, "
+                        "stake) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (pick['id'], now, channel, pick.get('event_id'), pick.get('home_team'), pick.get('away_team'),
+                         pick.get('kickoff'), pick_week, pick['market'], pick.get('participant'),
+                         pick.get('side'), pick.get('point'), pick.get('book'), price, _decimal(price),
+                         pick.get('probability'), edge, pick.get('stake'))).rowcount
+                    if inserted:
+                        added += 1
+                        self._bump(conn, _scopes(pick['market'], pick.get('book'), pick_week),
+                                   picks=1, open=1, edge_sum=edge or 0.0)
+        return added
+
+    def grade(self, results: 'backtest.SeasonResults', now: Optional[float] = None) -> Dict:
+        """
+        Settle open picks whose games have results
+
+        Picks are graded once their game's window has passed; a pick still
+        without a result VOID_AFTER past kickoff (postponed game, inactive
+        player) is voided.
+
+        Returns:
+            Counts of picks checked, settled and voided
+        """
+        now = time.time() if now is None else now
+        stats = {'checked': 0, 'settled': 0, 'voided': 0}
+        with self._lock:
+            conn = self._conn()
+            rows = [dict(row) for row in conn.execute(
+                "SELECT * FROM picks WHERE status = 'open' AND kickoff IS NOT NULL AND kickoff <= ?",
+                (now - GAME_WINDOW,))]
+            stats['checked'] = len(rows)
+            games = np.array([results.match(row['home_team'], row['away_team'], row['kickoff'])
+                              if row['home_team'] and row['away_team'] else None for row in rows], dtype=object)
+            matched = np.array([game is not None for game in games], dtype=bool)
+            outcome = np.full(len(rows), np.nan)
+            if matched.any():
+                index = np.flatnonzero(matched)
+                picks = {
+                    'market': np.array([rows[i]['market'] for i in index], dtype=object),
+                    'side': np.array([rows[i]['side'] for i in index], dtype=object),
+                    'participant': np.array([rows[i]['participant'] for i in index], dtype=object),
+                    'point': np.array([np.nan if rows[i]['point'] is None else rows[i]['point'] for i in index]),
+                    'week': np.array([results.games[games[i]]['week'] for i in index], dtype=np.int64),
+                }
+                outcome[index] = backtest.grade(picks, results, games[index].astype(np.int64))
+
+            with conn:
+                for i, row in enumerate(rows):
+                    week = row['week']
+                    if week is None and matched[i]:
+                        # First time the week is known: count the pick there too (once, by whoever records it)
+                        week = results.games[games[i]]['week']
+                        if conn.execute(SET_WEEK, (week, row['id'])).rowcount == 1:
+                            self._bump(conn, [('week', str(week))], picks=1, open=1, edge_sum=row['edge'] or 0.0)
+                    if np.isnan(outcome[i]):
+                        if now - row['kickoff'] < VOID_AFTER:
+                            continue
+                        status, profit, counter = 'void', 0.0, 'voids'
+                    else:
+                        result = int(outcome[i])
+                        status = STATUSES[result]
+                        profit = row['decimal'] - 1 if result > 0 else -1.0 if result < 0 else 0.0
+                        counter = {'won': 'wins', 'lost': 'losses', 'push': 'pushes'}[status]
+                    # Another grader (thread or process) may have settled it since the SELECT
+                    if conn.execute(SETTLE, (status, profit, now, row['id'])).rowcount != 1:
+                        continue
+                    stats['voided' if status == 'void' else 'settled'] += 1
+                    self._bump(conn, _scopes(row['market'], row['book'], week),
+                               open=-1, units=profit, **{counter: 1})
+        self.last_grade = dict(stats, at=now)
+        return stats
+
+    def rebuild(self):
+        """Recompute every aggregate from the picks table (audit / repair)"""
+        with self._lock:
+            conn = self._conn()
+            with conn:
+                conn.execute("DELETE FROM aggregates")
+                for row in conn.execute("SELECT market, book, week, status, profit, edge FROM picks").fetchall():
+                    status = row['status']
+                    counters = {'picks': 1, 'edge_sum': row['edge'] or 0.0, 'units': row['profit'] or 0.0}
+                    counters[{'open': 'open', 'won': 'wins', 'lost': 'losses', 'push': 'pushes',
+                              'void': 'voids'}[status]] = 1
+                    self._bump(conn, _scopes(row['market'], row['book'], row['week']), **counters)
+
+    # Reads ---------------------------------------------------------------
+
+    def summary(self, scope: str = 'all', key: str = '') -> Dict:
+        """Running record for one scope key (the whole ledger by default)"""
+        row = self._conn().execute("SELECT * FROM aggregates WHERE scope = ? AND key = ?", (scope, str(key))).fetchone()
+        return _record(dict(row) if row else {c: 0 for c in COUNTERS})
+
+    def breakdown(self, scope: str) -> Dict[str, Dict]:
+        """Running record of every key in a scope (market, book or week)"""
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown scope: {scope} (expected one of {list(SCOPES)})")
+        rows = self._conn().execute("SELECT * FROM aggregates WHERE scope = ? ORDER BY CAST(key AS INTEGER), key",
+                                    (scope,)).fetchall()
+        return {row['key']: _record(dict(row)) for row in rows}
+
+    def picks(self, status: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        """Most recently published picks, optionally one status"""
+        query, args = "SELECT * FROM picks", []
+        if status:
+            query, args = query + " WHERE status = ?", [status]
+        rows = self._conn().execute(query + " ORDER BY published_at DESC LIMIT ?", (*args, limit)).fetchall()
+        return [dict(row) for row in rows]
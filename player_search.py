@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Player Search Index
+Prebuilt type-ahead index for /api/players/search
+
+Built once at load time:
+  * prefix index - a flattened trie: every full name and every name
+    suffix starting at a word boundary, kept in one sorted array so a
+    prefix lookup is a bisect range (the trie subtree)
+  * trigram postings - folded trigram -> sorted player ids, used for
+    substring matches and typo-tolerant candidate generation
+
+Queries and names are case- and accent-folded ("Peña" == "pena").
+"""
+import heapq
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
+
+# Match tiers, best first
+EXACT, FULL_PREFIX, WORD_PREFIX, SUBSTRING, FUZZY = range(5)
+
+# Prefixes this short match thousands of names; their ranked top-k is memoized
+SHORT_PREFIX = 3
+SHORT_PREFIX_TOP = 64
+# Typo matching only runs when literal matching found fewer results than this
+FUZZY_FALLBACK = 5
+# Postings scanned per typo lookup, rarest trigrams first
+FUZZY_POSTINGS_BUDGET = 20000
+# Typo matching verifies only the best trigram candidates
+FUZZY_CANDIDATES = 32
+
+_SEPARATORS = re.compile(r"[\s\-_/]+")
+_DROPPED = re.compile(r"[^0-9a-z ]")
+
+
+def fold(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse separators"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    spaced = _SEPARATORS.sub(' ', stripped.lower())
+    return _DROPPED.sub('', spaced).strip()
+
+
+def trigrams(text: str) -> List[str]:
+    return [text[i:i + 3] for i in range(len(text) - 2)]
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (adjacent swaps cost 1), capped at limit + 1
+
+    Only the diagonal band |i - j| <= limit is filled, so verifying a
+    candidate costs O(len * limit) instead of O(len ** 2).
+    """
+    la, lb = len(a), len(b)
+    cap = limit + 1
+    if abs(la - lb) > limit:
+        return cap
+    if a == b:
+        return 0
+
+    prev2 = None
+    prev = [j if j <= limit else cap for j in range(lb + 1)]
+    for i in range(1, la + 1):
+        ca = a[i - 1]
+        cur = [cap] * (lb + 1)
+        if i <= limit:
+            cur[0] = i
+        row_min = cur[0]
+        for j in range(max(1, i - limit), min(lb, i + limit) + 1):
+            cb = b[j - 1]
+            value = prev[j - 1] if ca == cb else prev[j - 1] + 1
+            if prev[j] + 1 < value:
+                value = prev[j] + 1
+            if cur[j - 1] + 1 < value:
+                value = cur[j - 1] + 1
+            if prev2 is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb and prev2[j - 2] + 1 < value:
+                value = prev2[j - 2] + 1
+            cur[j] = value if value < cap else cap
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return cap
+        prev2, prev = prev, cur
+    return prev[lb]
+
+
+class PlayerSearchIndex:
+    """Prefix + trigram index over player names, ranked Active-first"""
+
+    def __init__(self, names: Sequence[str], statuses: Optional[Sequence[str]] = None):
+        self.names: List[str] = [fold(n) for n in names]
+        count = len(self.names)
+
+        # Static priority per player: Active first, then alphabetical
+        statuses = statuses or [None] * count
+        order = sorted(range(count), key=lambda i: (statuses[i] != 'Active', self.names[i]))
+        self.priority = array('i', [0]) * count
+        for rank, i in enumerate(order):
+            self.priority[i] = rank
+
+        # Flattened trie: (key, player id, starts-at-first-word) sorted by key
+        entries = []
+        for i, name in enumerate(self.names):
+            if not name:
+                continue
+            entries.append((name, i, 1))
+            for pos, ch in enumerate(name):
+                if ch == ' ' and pos + 1 < len(name):
+                    entries.append((name[pos + 1:], i, 0))
+        entries.sort()
+        self.keys: List[str] = [e[0] for e in entries]
+        self.key_ids = array('i', [e[1] for e in entries])
+        self.key_full = array('b', [e[2] for e in entries])
+
+        postings: Dict[str, List[int]] = {}
+        for i, name in enumerate(self.names):
+            for gram in set(trigrams(f" {name} ")):
+                postings.setdefault(gram, []).append(i)
+        self.postings: Dict[str, array] = {g: array('i', ids) for g, ids in postings.items()}
+
+        self._short_prefix_cache: Dict[str, List[int]] = {}
+
+    @classmethod
+    def from_table(cls, players) -> 'PlayerSearchIndex':
+        """Build from the columnar Player table"""
+        count = len(players)
+        first = players.get('FirstName') or [None] * count
+        last = players.get('LastName') or [None] * count
+        status = players.get('Status')
+        names = [f"{f or ''} {l or ''}" for f, l in zip(first, last)]
+        return cls(names, status.to_list() if status is not None else None)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _prefix_matches(self, q: str, limit: int) -> List[int]:
+        """Exact, full-name-prefix and word-prefix matches in rank order"""
+        memoize = len(q) <= SHORT_PREFIX and limit <= SHORT_PREFIX_TOP
+        if memoize and q in self._short_prefix_cache:
+            return self._short_prefix_cache[q][:limit]
+
+        lo = bisect_left(self.keys, q)
+        hi = bisect_left(self.keys, q + '\uffff', lo)
+        best: Dict[int, tuple] = {}
+        keys, ids, full, priority = self.keys, self.key_ids, self.key_full, self.priority
+        for j in range(lo, hi):
+            i = ids[j]
+            if full[j]:
+                tier = EXACT if keys[j] == q else FULL_PREFIX
+            else:
+                tier = WORD_PREFIX
+            rank = (tier, priority[i])
+            if i not in best or rank < best[i]:
+                best[i] = rank
+
+        keep = SHORT_PREFIX_TOP if memoize else limit
+        ranked = [i for i, _ in heapq.nsmallest(keep, best.items(), key=lambda kv: kv[1])]
+        if memoize:
+            self._short_prefix_cache[q] = ranked
+        return ranked[:limit]
+
+    def _substring_matches(self, q: str) -> List[int]:
+        if len(q) < 3:
+            # Too short for trigrams; only reached when prefixes did not fill the page
+            candidates = (i for i, name in enumerate(self.names) if q in name)
+        else:
+            grams = set(trigrams(q))
+            lists = sorted((self.postings.get(g, ()) for g in grams), key=len)
+            if not lists[0]:
+                return []
+            candidates = set(lists[0])
+            if len(lists) > 1:
+                candidates.intersection_update(lists[1])
+            candidates = (i for i in candidates if q in self.names[i])
+        return sorted(candidates, key=self.priority.__getitem__)
+
+    def _fuzzy_matches(self, q: str, exclude: set) -> List[int]:
+        limit = max(1, len(q) // 4)
+        postings = [self.postings[g] for g in set(trigrams(f" {q} ")) if g in self.postings]
+        postings.sort(key=len)
+
+        hits: Counter = Counter()
+        used = scanned = 0
+        for posting in postings:
+            if used and scanned + len(posting) > FUZZY_POSTINGS_BUDGET:
+                break
+            hits.update(posting)
+            used += 1
+            scanned += len(posting)
+        # Each edit touches at most three padded trigrams
+        need = max(1, used - 3 * limit)
+
+        # Names share words heavily ("Johnson"), so memoize per target word
+        distances: Dict[str, int] = {}
+
+        def distance_to(target: str) -> int:
+            if target not in distances:
+                distances[target] = edit_distance(q, target, limit)
+            return distances[target]
+
+        scored = []
+        for i, shared in hits.most_common(FUZZY_CANDIDATES):
+            if shared < need:
+                break
+            if i in exclude:
+                continue
+            name = self.names[i]
+            distance = min(distance_to(t) for t in [name[:len(q)]] + name.split(' '))
+            if distance <= limit:
+                scored.append((distance, -shared, self.priority[i], i))
+        scored.sort()
+        return [s[-1] for s in scored]
+
+    def search(self, query: str, limit: int = 20, fuzzy: bool = True) -> List[int]:
+        """Ranked player row ids: exact > prefix > word prefix > substring > typo"""
+        q = fold(query)
+        if not q or limit <= 0:
+            return []
+
+        results = self._prefix_matches(q, limit)
+        if len(results) >= limit:
+            return results
+
+        seen = set(results)
+        for i in self._substring_matches(q):
+            if i not in seen:
+                seen.add(i)
+                results.append(i)
+                if len(results) >= limit:
+                    return results
+
+        if fuzzy and len(q) >= 3 and len(results) < FUZZY_FALLBACK:
+            for i in self._fuzzy_matches(q, seen):
+                results.append(i)
+                if len(results) >= limit:
+                    break
+        return results
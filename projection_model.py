@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Projection Model
+Per-player, per-stat distributions from SportsData projections + game logs
+
+For every player-week in PlayerGameProjection the model blends the
+projected stat with the player's game-log average before that week and
+fits a distribution:
+
+  * yards (passing, rushing, receiving) - normal; the spread is the
+    player's own game-log deviation shrunk toward a per-stat CV prior
+  * counts (receptions, passing TDs, rush+rec TDs) - Poisson
+
+Parameters are precomputed once into flat arrays indexed by player-week,
+so pricing a whole prop board is array lookups plus a vectorized CDF.
+Stat columns are read by their SportsData names; exports without them
+(or without Week / Name) simply yield an empty model and callers fall
+back to market consensus.
+
+Projection tables cover the whole season, so the live board is priced
+for the week its games kick off in: week_at() maps a kickoff to its
+week from the first kickoff of every week in the projections (or the
+schedule).
+"""
+import math
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from player_search import fold
+
+# Stat -> distribution family
+STATS = {
+    'PassingYards': 'normal',
+    'RushingYards': 'normal',
+    'ReceivingYards': 'normal',
+    'Receptions': 'poisson',
+    'PassingTouchdowns': 'poisson',
+    'Touchdowns': 'poisson',   # RushingTouchdowns + ReceivingTouchdowns
+}
+STAT_NAMES = list(STATS)
+
+# Odds API prop market -> stat
+MARKET_STATS = {
+    'player_pass_yds': 'PassingYards',
+    'player_rush_yds': 'RushingYards',
+    'player_reception_yds': 'ReceivingYards',
+    'player_receptions': 'Receptions',
+    'player_pass_tds': 'PassingTouchdowns',
+    'player_anytime_td': 'Touchdowns',
+    'player_first_td': 'Touchdowns',
+}
+
+# Weight of the projection vs the game-log mean when both exist
+PROJECTION_WEIGHT = 0.6
+# Coefficient of variation prior for yardage stats
+DEFAULT_CV = {'PassingYards': 0.30, 'RushingYards': 0.55, 'ReceivingYards': 0.60}
+# Games' worth of weight given to the CV prior when shrinking the spread
+SD_PRIOR_GAMES = 4
+# Offensive touchdowns per game (both teams), for first-TD pricing
+GAME_TD_RATE = 4.8
+# Key stride per player (covers regular season and postseason weeks)
+WEEK_SPAN = 64
+# SportsData SeasonType of regular-season rows
+REGULAR_SEASON = 1
+# Sides priced as "stat over the line" (the rest are the complement)
+OVER_SIDES = {'over', 'yes'}
+
+
+def normal_sf(x: np.ndarray) -> np.ndarray:
+    """P(Z > x) for a standard normal (Abramowitz-Stegun 7.1.26, |err| < 1.5e-7)"""
+    z = np.abs(x) / math.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erfc = poly * np.exp(-z * z)
+    return np.where(x >= 0, 0.5 * erfc, 1.0 - 0.5 * erfc)
+
+
+def poisson_sf(k: np.ndarray, lam: np.ndarray) -> np.ndarray:
+    """P(X > k) for X ~ Poisson(lam), k >= -1 integer-valued"""
+    k = np.asarray(k, dtype=np.float64)
+    lam = np.asarray(lam, dtype=np.float64)
+    top = int(np.nanmax(k, initial=-1))
+    term = np.exp(-lam)
+    cdf = np.where(k >= 0, term, 0.0)
+    for i in range(1, top + 1):
+        term = term * lam / i
+        cdf = cdf + np.where(k >= i, term, 0.0)
+    return 1.0 - cdf
+
+
+def numeric_column(table, name: str) -> Optional[np.ndarray]:
+    """Numeric column as float64 (NaN for nulls), or None if absent"""
+    column = table.get(name) if table is not None else None
+    if column is None:
+        return None
+    return np.array([np.nan if v is None else v for v in column], dtype=np.float64)
+
+
+def kickoff_column(table) -> Optional[np.ndarray]:
+    """Epoch seconds per row from DateTime / Date / Day (naive times read as UTC, NaN if missing)"""
+    if table is None:
+        return None
+    columns = [table.get(c) for c in ('DateTime', 'Date', 'Day') if table.get(c) is not None]
+    if not columns:
+        return None
+    kickoffs = np.full(len(table), np.nan)
+    for row, values in enumerate(zip(*columns)):
+        for value in values:
+            try:
+                moment = datetime.fromisoformat(str(value).replace('Z', '+00:00')) if value else None
+            except ValueError:
+                continue
+            if moment is not None:
+                if moment.tzinfo is None:
+                    moment = moment.replace(tzinfo=timezone.utc)
+                kickoffs[row] = moment.timestamp()
+                break
+    return kickoffs
+
+
+def player_names(table) -> Optional[List[str]]:
+    """Folded player name per row (Name, else FirstName + LastName)"""
+    if table is None:
+        return None
+    if table.get('Name') is not None:
+        return [fold(v or '') for v in table.get('Name')]
+    first, last = table.get('FirstName'), table.get('LastName')
+    if first is None or last is None:
+        return None
+    return [fold(f"{f or ''} {l or ''}") for f, l in zip(first, last)]
+
+
+def stat_matrix(table) -> Tuple[np.ndarray, List[str]]:
+    """rows x STATS matrix (NaN where a stat column is missing)"""
+    rows = len(table)
+    matrix = np.full((rows, len(STATS)), np.nan)
+    present = []
+    for j, stat in enumerate(STAT_NAMES):
+        if stat == 'Touchdowns':
+            rush, rec = numeric_column(table, 'RushingTouchdowns'), numeric_column(table, 'ReceivingTouchdowns')
+            if rush is None and rec is None:
+                continue
+            values = np.nan_to_num(rush if rush is not None else 0.0) + np.nan_to_num(rec if rec is not None else 0.0)
+        else:
+            values = numeric_column(table, stat)
+            if values is None:
+                continue
+        matrix[:, j] = values
+        present.append(stat)
+    return matrix, present
+
+
+class ProjectionModel:
+    """Precomputed per player-week distribution parameters"""
+
+    def __init__(self):
+        self.players: Dict[str, int] = {}
+        # Player code -> team (full name where the Team table maps the key)
+        self.teams: Dict[int, str] = {}
+        # Parameter rows sorted by player * WEEK_SPAN + week
+        self.keys = np.empty(0, dtype=np.int64)
+        self.mean = np.empty((0, len(STATS)))
+        self.sd = np.empty((0, len(STATS)))
+        self.current_week: Optional[int] = None
+        # First kickoff of every week (sorted) and the week it starts
+        self.week_starts = np.empty(0)
+        self.start_weeks = np.empty(0, dtype=np.int64)
+        self.stats_present: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.mean)
+
+    @classmethod
+    def from_store(cls, store) -> 'ProjectionModel':
+        """Fit from a SportsDataStore's PlayerGameProjection, PlayerGame and Score tables"""
+        teams = store.get('Team')
+        aliases = {}
+        if teams is not None and teams.get('Key') is not None and teams.get('FullName') is not None:
+            aliases = {k: n for k, n in zip(teams.get('Key'), teams.get('FullName')) if k and n}
+        return cls.fit(store.get('PlayerGameProjection'), store.get('PlayerGame'), aliases, store.get('Score'))
+
+    def _player_codes(self, names: List[str]) -> np.ndarray:
+        players = self.players
+        return np.array([players.setdefault(name, len(players)) if name else -1 for name in names],
+                        dtype=np.int64)
+
+    @classmethod
+    def fit(cls, projections, games=None, team_aliases: Optional[Dict[str, str]] = None,
+            schedule=None) -> 'ProjectionModel':
+        model = cls()
+        proj_names, games_names = player_names(projections), player_names(games)
+        proj_weeks, game_weeks = numeric_column(projections, 'Week'), numeric_column(games, 'Week')
+        if proj_names is None or proj_weeks is None:
+            print("⚠️ Projection model: PlayerGameProjection has no Name/Week columns; using market consensus")
+            return model
+        proj_stats, model.stats_present = stat_matrix(projections)
+        if not model.stats_present:
+            print("⚠️ Projection model: no stat columns in PlayerGameProjection; using market consensus")
+            return model
+
+        # One parameter row per player-week (first projection wins)
+        player = model._player_codes(proj_names)
+        if projections.get('Team') is not None:
+            aliases = team_aliases or {}
+            for code, team in zip(player.tolist(), projections.get('Team')):
+                if code >= 0 and team:
+                    model.teams[code] = aliases.get(team, team)
+        ok = (player >= 0) & ~np.isnan(proj_weeks) & (proj_weeks >= 0) & (proj_weeks < WEEK_SPAN)
+        keys = player * WEEK_SPAN + np.where(ok, proj_weeks, 0).astype(np.int64)
+        keys, first = np.unique(keys[ok], return_index=True)
+        projected = proj_stats[np.nonzero(ok)[0][first]]
+
+        # Game logs before each player-week via prefix sums over (player, week)
+        n = np.zeros_like(projected)
+        log_sum = np.zeros_like(projected)
+        log_sq = np.zeros_like(projected)
+        if games_names is not None and game_weeks is not None:
+            game_stats, _ = stat_matrix(games)
+            game_player = model._player_codes(games_names)
+            logged = (game_player >= 0) & ~np.isnan(game_weeks)
+            game_keys = game_player[logged] * WEEK_SPAN + game_weeks[logged].astype(np.int64)
+            order = np.argsort(game_keys, kind='stable')
+            game_keys, logs = game_keys[order], game_stats[logged][order]
+            present = ~np.isnan(logs)
+            values = np.where(present, logs, 0.0)
+            zero = np.zeros((1, len(STATS)))
+            c_n = np.concatenate([zero, np.cumsum(present, axis=0)])
+            c_sum = np.concatenate([zero, np.cumsum(values, axis=0)])
+            c_sq = np.concatenate([zero, np.cumsum(values ** 2, axis=0)])
+            lo = np.searchsorted(game_keys, keys - keys % WEEK_SPAN, 'left')
+            hi = np.searchsorted(game_keys, keys, 'left')
+            n, log_sum, log_sq = c_n[hi] - c_n[lo], c_sum[hi] - c_sum[lo], c_sq[hi] - c_sq[lo]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            log_mean = np.where(n > 0, log_sum / n, np.nan)
+            log_var = np.where(n > 1, np.maximum(log_sq - n * log_mean ** 2, 0.0) / (n - 1), np.nan)
+            mean = np.where(np.isnan(projected), log_mean,
+                            np.where(np.isnan(log_mean), projected,
+                                     PROJECTION_WEIGHT * projected + (1 - PROJECTION_WEIGHT) * log_mean))
+            cv = np.array([DEFAULT_CV.get(stat, np.nan) for stat in STAT_NAMES])
+            prior_var = (cv * np.maximum(mean, 1.0)) ** 2
+            var = np.where(n > 1, ((n - 1) * log_var + SD_PRIOR_GAMES * prior_var) / (n - 1 + SD_PRIOR_GAMES),
+                           prior_var)
+        is_normal = np.array([STATS[stat] == 'normal' for stat in STAT_NAMES])
+
+        model.keys = keys
+        model.mean = np.maximum(mean, 0.0)
+        model.sd = np.where(is_normal, np.sqrt(var), np.nan)
+        if len(keys):
+            model.current_week = int((keys % WEEK_SPAN).max())
+        model._fit_week_starts([projections, schedule])
+        print(f"✅ Projection model: {len(model)} player-weeks for {len(model.players)} players "
+              f"({', '.join(model.stats_present)})")
+        return model
+
+    def _fit_week_starts(self, tables: List):
+        weeks, kickoffs = [], []
+        for table in tables:
+            week, kickoff = numeric_column(table, 'Week'), kickoff_column(table)
+            if week is None or kickoff is None:
+                continue
+            season_type = numeric_column(table, 'SeasonType')
+            ok = ~np.isnan(week) & ~np.isnan(kickoff) & (week >= 0) & (week < WEEK_SPAN)
+            if season_type is not None:
+                ok &= season_type == REGULAR_SEASON
+            weeks.append(week[ok].astype(np.int64))
+            kickoffs.append(kickoff[ok])
+        if not weeks:
+            return
+        weeks, kickoffs = np.concatenate(weeks), np.concatenate(kickoffs)
+        order = np.lexsort((kickoffs, weeks))
+        weeks, first = np.unique(weeks[order], return_index=True)
+        starts = kickoffs[order][first]
+        by_start = np.argsort(starts, kind='stable')
+        self.week_starts, self.start_weeks = starts[by_start], weeks[by_start]
+
+    # Lookups -------------------------------------------------------------
+
+    def week_at(self, timestamp: float) -> Optional[int]:
+        """Week a kickoff falls in (the first week before the season starts; None without dated rows)"""
+        if not len(self.week_starts):
+            return None
+        pos = int(np.searchsorted(self.week_starts, timestamp, 'right')) - 1
+        return int(self.start_weeks[max(pos, 0)])
+
+    def rows_for(self, players: np.ndarray, week: Optional[int] = None) -> np.ndarray:
+        """Parameter row per player code: latest week <= `week` (-1 if none)"""
+        players = np.asarray(players, dtype=np.int64)
+        week = self.current_week if week is None else week
+        if week is None or not len(self.keys):
+            return np.full(len(players), -1, dtype=np.int64)
+        pos = np.searchsorted(self.keys, players * WEEK_SPAN + min(week, WEEK_SPAN - 1), 'right') - 1
+        found = (players >= 0) & (pos >= 0) & (self.keys[np.maximum(pos, 0)] // WEEK_SPAN == players)
+        return np.where(found, pos, -1)
+
+    def row_for(self, name: str, week: Optional[int] = None) -> Optional[int]:
+        """Parameter row for a player's week (latest week <= `week` by default)"""
+        row = int(self.rows_for(np.array([self.players.get(fold(name), -1)]), week)[0])
+        return None if row < 0 else row
+
+    def params(self, name: str, week: Optional[int] = None) -> Dict[str, Tuple[float, float]]:
+        """(mean, sd) per modelled stat for a player (sd is NaN for Poisson stats)"""
+        row = self.row_for(name, week)
+        if row is None:
+            return {}
+        return {stat: (float(self.mean[row, j]), float(self.sd[row, j]))
+                for j, stat in enumerate(STAT_NAMES) if not np.isnan(self.mean[row, j])}
+
+    def team_of(self, name: str) -> Optional[str]:
+        code = self.players.get(fold(name))
+        return None if code is None else self.teams.get(code)
+
+    def over_probability(self, rows: np.ndarray, stats: np.ndarray, points: np.ndarray,
+                         first_td: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        P(stat > point) per element, vectorized
+
+        rows of -1 (unknown player) and stats of -1 (unmodelled market)
+        give NaN. A NaN point on a count stat means "at least one".
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        stats = np.asarray(stats, dtype=np.int64)
+        points = np.asarray(points, dtype=np.float64)
+        known = (rows >= 0) & (stats >= 0)
+        r, s = np.where(known, rows, 0), np.where(known, stats, 0)
+        if not len(self):
+            return np.full(len(rows), np.nan)
+
+        mean = self.mean[r, s]
+        sd = self.sd[r, s]
+        normal = np.array([STATS[n] == 'normal' for n in STAT_NAMES])[s]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z = (points - mean) / np.where(sd > 0, sd, np.nan)
+            p_normal = normal_sf(z)
+            k = np.where(np.isnan(points), 0.0, np.floor(points))
+            p_count = poisson_sf(np.where(normal, 0.0, k), np.where(normal, 0.0, mean))
+        prob = np.where(normal, p_normal, p_count)
+
+        if first_td is not None:
+            # Share of the game's first touchdown: the player's TD rate over the game's
+            first = mean / GAME_TD_RATE * (1.0 - math.exp(-GAME_TD_RATE))
+            prob = np.where(first_td, np.minimum(first, prob), prob)
+        return np.where(known & ~np.isnan(mean), np.clip(prob, 0.0, 1.0), np.nan)
+
+    def probability(self, name: str, market: str, side: str, point: Optional[float] = None,
+                    week: Optional[int] = None) -> Optional[float]:
+        """Model probability for one prop outcome (None if not modelled)"""
+        stat = MARKET_STATS.get(market)
+        row = self.row_for(name, week)
+        if stat is None or row is None:
+            return None
+        over = self.over_probability(np.array([row]), np.array([STAT_NAMES.index(stat)]),
+                                     np.array([np.nan if point is None else point]),
+                                     np.array([market == 'player_first_td']))[0]
+        if np.isnan(over):
+            return None
+        return float(over if (side or 'over').lower() in OVER_SIDES else 1.0 - over)
+
+    def snapshot_probabilities(self, snapshot, week: Optional[int] = None) -> np.ndarray:
+        """Per-row model probability for an OddsSnapshot (the prop scanner's probability_source)"""
+        rows = len(snapshot)
+        if not len(self) or not rows:
+            return np.full(rows, np.nan)
+
+        participant_rows = self.rows_for(np.array([self.players.get(fold(name), -1)
+                                                   for name in snapshot.participant_names], dtype=np.int64), week)
+        market_stats = np.array([STAT_NAMES.index(MARKET_STATS[m]) if m in MARKET_STATS else -1
+                                 for m in snapshot.markets.values], dtype=np.int64)
+        first_td = np.array([m == 'player_first_td' for m in snapshot.markets.values])
+        side_over = np.array([side.lower() in OVER_SIDES for side in snapshot.sides.values])
+
+        market = np.frombuffer(snapshot.market, dtype=np.int16)
+        side = np.frombuffer(snapshot.side, dtype=np.int32)
+        over = self.over_probability(
+            participant_rows[np.frombuffer(snapshot.participant, dtype=np.int32)],
+            market_stats[market],
+            np.frombuffer(snapshot.point, dtype=np.float64),
+            first_td[market])
+        return np.where(side_over[side], over, 1.0 - over)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Prop Scanner
+Scores every outcome of a prop board against a probability source
+
+For each OddsSnapshot (one player_props market, or the game lines):
+  1. every bookmaker's line (event, market, book, participant, point) is
+     de-vigged on its own to a fair probability per side; a game line's
+     sides name different participants (teams, Over / Under) and carry
+     opposite spread points, so game lines are keyed by (event, market,
+     book, |point|) instead
+  2. the no-vig consensus for (event, market, participant, side, line)
+     is the mean of those fair probabilities across books
+  3. each book's price is scored against the model probability when the
+     probability source has one, else against the consensus
+
+One-sided lines (e.g. anytime TD "Yes" only) cannot be de-vigged per
+book; their consensus is the mean implied probability across books less
+ONE_SIDED_HOLD. Everything is vectorized; only the top-K rows ever become
+dicts.
+"""
+import heapq
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+import odds_math
+
+# Assumed bookmaker hold on one-sided prop markets
+ONE_SIDED_HOLD = 0.05
+# Markets whose two sides are different participants of one line
+GAME_MARKETS = ('h2h', 'spreads', 'totals')
+DEVIG_METHOD = 'multiplicative'
+
+
+def _composite(*codes) -> np.ndarray:
+    """Combine small per-snapshot code columns into one int64 group id"""
+    out = np.zeros(len(codes[0][0]), dtype=np.int64)
+    for column, bits in codes:
+        column = column.astype(np.int64)
+        if len(column) and column.max() >= (1 << bits):
+            raise ValueError(f"Code column exceeds {bits} bits")
+        out = (out << bits) | column
+    return out
+
+
+def _point_codes(point: np.ndarray) -> np.ndarray:
+    """Half-point line codes (0 = no line) so alternate lines group separately"""
+    codes = np.round(np.nan_to_num(point, nan=0.0) * 2) + 32768
+    return np.where(np.isnan(point), 0, np.clip(codes, 1, 65535)).astype(np.int64)
+
+
+def outcome_codes(snapshot) -> np.ndarray:
+    """Group id per row for (event, market, participant, side, point): one outcome across books"""
+    return _composite((np.frombuffer(snapshot.event, dtype=np.int32), 12),
+                      (np.frombuffer(snapshot.market, dtype=np.int16), 4),
+                      (np.frombuffer(snapshot.participant, dtype=np.int32), 20),
+                      (np.frombuffer(snapshot.side, dtype=np.int32), 8),
+                      (_point_codes(np.frombuffer(snapshot.point, dtype=np.float64)), 16))
+
+
+def first_opinion(*sources: Callable) -> Callable:
+    """Chain probability sources: each later source only fills the NaN gaps"""
+    def probabilities(snapshot) -> np.ndarray:
+        out = sources[0](snapshot)
+        for source in sources[1:]:
+            gaps = np.isnan(out)
+            if not gaps.any():
+                break
+            out = np.where(gaps, source(snapshot), out)
+        return out
+    return probabilities
+
+
+def score_snapshot(snapshot, model_probability: Optional[np.ndarray] = None,
+                   kelly_fraction: float = 0.5) -> Dict[str, np.ndarray]:
+    """
+    Fair probability, edge, EV and Kelly for every row of a snapshot
+
+    Args:
+        model_probability: Optional per-row model probability (NaN where
+            the model has no opinion); the no-vig consensus fills the gaps
+    """
+    rows = len(snapshot)
+    price = np.frombuffer(snapshot.price, dtype=np.float64) if rows else np.empty(0)
+    event = np.frombuffer(snapshot.event, dtype=np.int32)
+    market = np.frombuffer(snapshot.market, dtype=np.int16)
+    book = np.frombuffer(snapshot.book, dtype=np.int16)
+    participant = np.frombuffer(snapshot.participant, dtype=np.int32)
+    point = _point_codes(np.frombuffer(snapshot.point, dtype=np.float64))
+
+    implied = odds_math.implied_probability(price)
+    valid = ~np.isnan(implied)
+    safe_implied = np.where(valid, implied, 0.0)
+
+    # Per-book line (same point) -> fair probability per side; both sides of a game line share one key
+    game = np.isin(market, [snapshot.markets.codes[m] for m in GAME_MARKETS if m in snapshot.markets.codes])
+    if game.any():
+        raw_point = np.frombuffer(snapshot.point, dtype=np.float64)
+        participant = np.where(game, 0, participant)
+        point = np.where(game, _point_codes(np.abs(raw_point)), point)
+    line = _composite((event, 12), (market, 4), (book, 8), (participant, 20), (point, 16))
+    line_codes, _, line_sizes = odds_math.group_index(line, rows)
+    one_sided = line_sizes[line_codes] == 1
+    fair = np.where(one_sided, np.nan, odds_math.devig(safe_implied, line_codes, DEVIG_METHOD))
+    fair = np.where(valid, fair, np.nan)
+
+    # Consensus across books per (event, market, participant, side, point)
+    codes, count, _ = odds_math.group_index(outcome_codes(snapshot), rows)
+    two_sided = valid & ~np.isnan(fair)
+    fair_sum = np.bincount(codes, weights=np.where(two_sided, fair, 0.0), minlength=count)
+    fair_n = np.bincount(codes, weights=two_sided, minlength=count)
+    implied_sum = np.bincount(codes, weights=safe_implied, minlength=count)
+    books = np.bincount(codes, weights=valid, minlength=count)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        consensus = np.where(fair_n > 0, fair_sum / fair_n,
+                             implied_sum / books / (1.0 + ONE_SIDED_HOLD))[codes]
+
+    probability = consensus
+    from_model = np.zeros(rows, dtype=bool)
+    if model_probability is not None:
+        model_probability = np.asarray(model_probability, dtype=np.float64)
+        from_model = ~np.isnan(model_probability)
+        probability = np.where(from_model, model_probability, consensus)
+
+    decimal = 1.0 / implied
+    b = decimal - 1.0
+    return {
+        'implied': implied,
+        'fair': consensus,
+        'probability': probability,
+        'from_model': from_model,
+        'books': books[codes],
+        'edge': probability - implied,
+        'ev': probability * decimal - 1.0,
+        'kelly': np.maximum(0.0, (b * probability - (1.0 - probability)) / b * kelly_fraction)
+    }
+
+
+def top_opportunities(scored: List[tuple], min_edge: float, limit: int) -> List[tuple]:
+    """
+    Heap top-K across several scored snapshots
+
+    Args:
+        scored: (snapshot, scores) pairs from score_snapshot
+
+    Returns:
+        (edge, snapshot, scores, row) tuples, best edge first
+    """
+    candidates = []
+    for i, (_, scores) in enumerate(scored):
+        edge = np.nan_to_num(scores['edge'], nan=-np.inf)
+        rows = np.nonzero(edge >= min_edge)[0]
+        candidates.extend(zip(edge[rows].tolist(), [i] * len(rows), rows.tolist()))
+    best = heapq.nlargest(limit, candidates)
+    return [(edge, scored[i][0], scored[i][1], row) for edge, i, row in best]
+
+
+def describe(snapshot, scores: Dict[str, np.ndarray], row: int) -> Dict:
+    """One scored row as an API payload"""
+    outcome = snapshot.outcome(row)
+    event = snapshot.events[snapshot.event[row]]
+    return {
+        'player': outcome['participant'],
+        'market': outcome['market'],
+        'side': outcome['name'],
+        'line': outcome['point'],
+        'odds': outcome['price'],
+        'sportsbook': outcome['sportsbook'],
+        'bookmaker': outcome['bookmaker'],
+        'event_id': outcome['event_id'],
+        'home_team': event.get('home_team'),
+        'away_team': event.get('away_team'),
+        'commence_time': event.get('commence_time'),
+        'implied_probability': round(float(scores['implied'][row]), 4),
+        'fair_probability': round(float(scores['fair'][row]), 4),
+        'model_probability': round(float(scores['probability'][row]), 4),
+        'edge': round(float(scores['edge'][row]), 4),
+        'ev_per_dollar': round(float(scores['ev'][row]), 4),
+        'kelly_criterion': round(float(scores['kelly'][row]), 4),
+        'books_quoted': int(scores['books'][row]),
+        'source': 'model' if scores['from_model'][row] else 'consensus'
+    }
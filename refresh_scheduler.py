@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Odds Refresh Scheduler
+Proactive background refresh paced by kickoff proximity
+
+Lines move fastest in the hour before kickoff and barely at all midweek,
+so the refresh interval follows config.CACHE.REFRESH_SCHEDULE: every
+minute near (or during) games, every half hour when nothing is close.
+Refreshes go through the data engine's stale-while-revalidate path, so a
+user request never waits on them.
+
+One scheduler runs per host: start() takes an exclusive lock on
+REFRESH_LOCK_PATH, and the other web workers skip it (with a shared cache
+they read what the leader fetches; with the memory cache they refresh on
+demand through stale-while-revalidate).
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: every process runs its own scheduler
+    fcntl = None
+
+from config import CACHE
+
+# A game is treated as live for this long after kickoff
+GAME_WINDOW = 4 * 3600
+
+
+def default_lock_path() -> str:
+    return os.getenv('REFRESH_LOCK_PATH') or os.path.join(os.path.dirname(__file__), 'data', 'refresh_scheduler.lock')
+
+
+def parse_kickoff(value: str) -> Optional[float]:
+    """Epoch seconds from an Odds API commence_time ('2025-09-21T20:00:00Z')"""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except (AttributeError, ValueError):
+        return None
+
+
+class RefreshScheduler:
+    """Daemon thread that refreshes every key the engine has served"""
+
+    def __init__(self, engine, schedule: Optional[List[Tuple[int, int]]] = None,
+                 idle_interval: Optional[int] = None, tick: float = 15.0, lock_path: Optional[str] = None):
+        self.engine = engine
+        self.schedule = sorted(schedule or CACHE.REFRESH_SCHEDULE)
+        self.idle_interval = idle_interval or CACHE.REFRESH_IDLE
+        self.tick = tick
+        self.refreshes = 0
+        self._last_attempt = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.lock_path = lock_path or default_lock_path()
+        self._leader_lock = None
+
+    def seconds_to_kickoff(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the next kickoff from cached games (0 while a game is live)"""
+        now = now or time.time()
+        entry = self.engine.cache.get('nfl_games')
+        games = entry['data'] if entry else []
+        upcoming = None
+        for game in games:
+            kickoff = parse_kickoff(game.get('commence_time'))
+            if kickoff is None or kickoff + GAME_WINDOW < now:
+                continue
+            wait = max(0.0, kickoff - now)
+            if upcoming is None or wait < upcoming:
+                upcoming = wait
+        return upcoming
+
+    def interval(self, now: Optional[float] = None) -> int:
+        """Refresh interval for the current distance to kickoff"""
+        wait = self.seconds_to_kickoff(now)
+        if wait is not None:
+            for within, every in self.schedule:
+                if wait <= within:
+                    return every
+        return self.idle_interval
+
+    def run_once(self, now: Optional[float] = None) -> List[str]:
+        """Queue a refresh for every served key older than the current interval"""
+        interval = self.interval(now)
+        queued = []
+        clock = time.monotonic()
+        for key in self.engine.tracked_keys():
+            meta = self.engine.freshness(key)
+            if meta is not None and meta['age_seconds'] < interval:
+                continue
+            # Failed fetches cache nothing; pace retries by the same interval
+            if clock - self._last_attempt.get(key, float('-inf')) < interval:
+                continue
+            if self.engine.refresh_in_background(key, max_age=interval):
+                self._last_attempt[key] = clock
+                queued.append(key)
+        self.refreshes += len(queued)
+        return queued
+
+    def _loop(self):
+        while not self._stop.wait(self.tick):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"⚠️ Refresh scheduler error: {e}")
+
+    def _lead(self) -> bool:
+        """Hold the host-wide scheduler lock (True when this process has it)"""
+        if fcntl is None or self._leader_lock is not None:
+            return True
+        os.makedirs(os.path.dirname(os.path.abspath(self.lock_path)), exist_ok=True)
+        handle = open(self.lock_path, 'a')
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            handle.close()
+            return False
+        self._leader_lock = handle
+        return True
+
+    def start(self) -> Optional[threading.Thread]:
+        """Start the refresh thread, unless another process on this host already runs one"""
+        if not self._lead():
+            print(f"🔄 Odds refresh scheduler already running in another process ({self.lock_path})")
+            return None
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='odds-refresh', daemon=True)
+            self._thread.start()
+            print(f"🔄 Odds refresh scheduler started (every {self.interval()}s right now)")
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self) -> dict:
+        wait = self.seconds_to_kickoff()
+        return {
+            'running': bool(self._thread and self._thread.is_alive()),
+            'leader': self._leader_lock is not None or (fcntl is None and self._thread is not None),
+            'interval_seconds': self.interval(),
+            'next_kickoff_in': round(wait) if wait is not None else None,
+            'refreshes_queued': self.refreshes
+        }
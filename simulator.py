@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Monte Carlo Simulator
+Correlated team and player stat outcomes for every game on a slate
+
+Each game is simulated in one batch. Every simulation draws five latent
+standard-normal factors:
+
+  G              game environment (pace, weather, scoring), both teams
+  O_home, O_away team offensive efficiency
+  P_home, P_away game script (positive = pass-heavy)
+
+Team points and every player stat load on their team's factors plus
+independent noise (a Gaussian copula), so a QB's passing yards move with
+his receivers' yards and with the game total, while rushing yards lean
+the other way on pass-heavy scripts. Latent draws are mapped onto the
+projection model's marginals: normal for yards, Poisson for counts,
+normal team points centred on the market total and spread.
+
+Games are independent, so a slate fans out across processes with one
+SeedSequence child per game; a seed gives identical results whatever
+the process count.
+"""
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from player_search import fold
+from projection_model import MARKET_STATS, OVER_SIDES, STATS, normal_sf
+
+SIMULATIONS = 10000
+# Ceiling for request-driven runs: ~16 games x ~40 variables x float32 per simulation stays resident
+MAX_SIMULATIONS = 20000
+# Team points: fallback mean without a market total, and per-team spread
+DEFAULT_TEAM_POINTS = 22.0
+TEAM_POINTS_SD = 10.0
+
+FACTORS = ('G', 'O_home', 'O_away', 'P_home', 'P_away')
+# Loadings on (game environment, team offense, team game script)
+LOADINGS = {
+    'Points': (0.55, 0.65, 0.0),
+    'PassingYards': (0.30, 0.35, 0.55),
+    'PassingTouchdowns': (0.30, 0.55, 0.25),
+    'ReceivingYards': (0.25, 0.30, 0.40),
+    'Receptions': (0.20, 0.25, 0.40),
+    'RushingYards': (0.20, 0.30, -0.40),
+    'Touchdowns': (0.25, 0.50, 0.0),
+}
+# Game markets whose side is a team (always priced as that team covering)
+TEAM_MARKETS = ('h2h', 'spreads')
+
+
+def _loading_row(stat: str, team: Optional[str]) -> np.ndarray:
+    """Loadings over FACTORS; players without a known team load on G only"""
+    g, o, p = LOADINGS[stat]
+    row = np.zeros(len(FACTORS))
+    row[0] = g
+    if team in ('home', 'away'):
+        row[FACTORS.index(f'O_{team}')] = o
+        row[FACTORS.index(f'P_{team}')] = p
+    return row
+
+
+def _poisson_thresholds(lams: List[float]) -> List[np.ndarray]:
+    """
+    Latent cut points per Poisson mean: a standard-normal latent z maps to
+    k = number of cut points below z (inverse CDF through the copula)
+    """
+    cdfs = []
+    for lam in lams:
+        k = np.arange(int(math.ceil(lam + 8.0 * math.sqrt(lam) + 5.0)) + 1)
+        pmf = np.exp(k * math.log(max(lam, 1e-12)) - lam - np.array([math.lgamma(i + 1) for i in k]))
+        cdf = np.cumsum(pmf)
+        cdfs.append(cdf[cdf < 1.0 - 1e-9])
+    if not cdfs:
+        return []
+    # z with P(Z <= z) = cdf, by bisection over every cut point at once
+    target = np.concatenate(cdfs)
+    lo, hi = np.full(len(target), -9.0), np.full(len(target), 9.0)
+    for _ in range(40):
+        mid = (lo + hi) / 2
+        below = 1.0 - normal_sf(mid) < target
+        lo, hi = np.where(below, mid, lo), np.where(below, hi, mid)
+    return np.split(hi.astype(np.float32), np.cumsum([len(c) for c in cdfs])[:-1])
+
+
+class GameSimulation:
+    """Simulated outcomes for one game: a (variables x simulations) matrix"""
+
+    def __init__(self, spec: Dict, columns: Dict[Tuple[str, str], int], values: np.ndarray):
+        self.event_id = spec['event_id']
+        self.home_team = spec.get('home_team') or ''
+        self.away_team = spec.get('away_team') or ''
+        self.columns = columns
+        self.values = values
+        self._sorted: Dict[Tuple[str, str], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.values.shape[1]
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_sorted'] = {}
+        return state
+
+    def column(self, participant: str, stat: str) -> Optional[np.ndarray]:
+        """Simulated values of a player stat (participant '' for team-level series)"""
+        if stat in ('Points', 'Total', 'Margin'):
+            home = self.values[self.columns[('home', 'Points')]]
+            away = self.values[self.columns[('away', 'Points')]]
+            if stat == 'Total':
+                return home + away
+            side = self._team_side(participant)
+            if side is None:
+                return None
+            if stat == 'Points':
+                return home if side == 'home' else away
+            return home - away if side == 'home' else away - home
+        index = self.columns.get((fold(participant), stat))
+        return None if index is None else self.values[index]
+
+    def _team_side(self, team: str) -> Optional[str]:
+        team = fold(team)
+        if team == fold(self.home_team):
+            return 'home'
+        if team == fold(self.away_team):
+            return 'away'
+        return None
+
+    def _series(self, market: str, participant: str, point: float) -> Tuple[Optional[Tuple[str, str]], float]:
+        """(participant, stat) behind a market and the threshold its over side must beat"""
+        if market == 'h2h':
+            return (participant, 'Margin'), 0.0
+        if market == 'spreads':
+            return (participant, 'Margin'), -point
+        if market == 'totals':
+            return ('', 'Total'), point
+        stat = MARKET_STATS.get(market)
+        if stat is None or market == 'player_first_td':
+            return None, 0.0
+        return (participant, stat), (0.5 if math.isnan(point) else point)
+
+    def sorted_column(self, participant: str, stat: str) -> Optional[np.ndarray]:
+        key = (fold(participant), stat)
+        cached = self._sorted.get(key)
+        if cached is None:
+            values = self.column(participant, stat)
+            if values is None:
+                return None
+            cached = self._sorted[key] = np.sort(values)
+        return cached
+
+    def indicator(self, market: str, participant: str, side: str,
+                  point: Optional[float] = None) -> Optional[np.ndarray]:
+        """Per-simulation win flag for one outcome (None if not simulated)"""
+        series, threshold = self._series(market, participant, np.nan if point is None else float(point))
+        if series is None:
+            return None
+        values = self.column(*series)
+        if values is None:
+            return None
+        if market in TEAM_MARKETS or (side or 'over').lower() in OVER_SIDES:
+            return values > threshold
+        return values < threshold
+
+    def probability(self, market: str, participant: str, side: str,
+                    point: Optional[float] = None) -> Optional[float]:
+        hits = self.indicator(market, participant, side, point)
+        return None if hits is None else float(hits.mean())
+
+
+class SlateSimulation:
+    """GameSimulations keyed by event id"""
+
+    def __init__(self, games: List[GameSimulation], simulations: int, seed: Optional[int]):
+        self.games: Dict[str, GameSimulation] = {g.event_id: g for g in games}
+        self.simulations = simulations
+        self.seed = seed
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def stats(self) -> Dict:
+        return {'games': len(self.games), 'simulations': self.simulations, 'seed': self.seed,
+                'variables': sum(len(g.columns) for g in self.games.values())}
+
+    def probability(self, event_id: str, market: str, participant: str, side: str,
+                    point: Optional[float] = None) -> Optional[float]:
+        game = self.games.get(event_id)
+        return None if game is None else game.probability(market, participant, side, point)
+
+    def joint_probability(self, legs: List[Dict]) -> Optional[float]:
+        """
+        Probability that every leg wins
+
+        Legs are dicts with event_id, market, participant, side and point.
+        Legs in the same game are joined per simulation (correlation
+        included); separate games multiply. None if any leg is not simulated.
+        """
+        by_game: Dict[str, List[Dict]] = {}
+        for leg in legs:
+            by_game.setdefault(leg['event_id'], []).append(leg)
+        joint = 1.0
+        for event_id, game_legs in by_game.items():
+            game = self.games.get(event_id)
+            if game is None:
+                return None
+            hits = None
+            for leg in game_legs:
+                flags = game.indicator(leg['market'], leg.get('participant') or '', leg.get('side') or '',
+                                       leg.get('point'))
+                if flags is None:
+                    return None
+                hits = flags if hits is None else hits & flags
+            joint *= float(hits.mean())
+        return joint
+
+    def snapshot_probabilities(self, snapshot) -> np.ndarray:
+        """Per-row simulated probability for an OddsSnapshot (NaN where not simulated)"""
+        rows = len(snapshot)
+        out = np.full(rows, np.nan)
+        if not rows or not self.games:
+            return out
+
+        event = np.frombuffer(snapshot.event, dtype=np.int32)
+        market = np.frombuffer(snapshot.market, dtype=np.int16).astype(np.int64)
+        participant = np.frombuffer(snapshot.participant, dtype=np.int32).astype(np.int64)
+        side = np.frombuffer(snapshot.side, dtype=np.int32)
+        point = np.frombuffer(snapshot.point, dtype=np.float64)
+        side_over = np.array([s.lower() in OVER_SIDES for s in snapshot.sides.values])[side]
+
+        groups = (event.astype(np.int64) << 40) | (market << 24) | participant
+        order = np.argsort(groups, kind='stable')
+        bounds = np.flatnonzero(np.diff(groups[order])) + 1
+        for block in np.split(order, bounds):
+            r = block[0]
+            game = self.games.get(snapshot.events[event[r]]['id'])
+            if game is None:
+                continue
+            market_key = snapshot.markets.values[market[r]]
+            name = snapshot.participant_names[participant[r]]
+            series, _ = game._series(market_key, name, 0.0)
+            if series is None:
+                continue
+            values = game.sorted_column(*series)
+            if values is None:
+                continue
+            thresholds = np.array([game._series(market_key, name, p)[1] for p in point[block]])
+            n = len(values)
+            over = 1.0 - np.searchsorted(values, thresholds, 'right') / n
+            under = np.searchsorted(values, thresholds, 'left') / n
+            if market_key in TEAM_MARKETS:
+                out[block] = over
+            else:
+                out[block] = np.where(side_over[block], over, under)
+        return out
+
+
+def simulate_game(spec: Dict, simulations: int = SIMULATIONS, seed=None) -> GameSimulation:
+    """
+    Simulate one game
+
+    Args:
+        spec: event_id, home_team, away_team, total / spread (home spread,
+            negative when home is favoured; either may be None) and players:
+            [{'name', 'team': 'home' | 'away' | None, 'stats': {stat: (mean, sd)}}]
+        seed: int, SeedSequence or Generator
+    """
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+    total = spec.get('total') or 2 * DEFAULT_TEAM_POINTS
+    spread = spec.get('spread') or 0.0
+    variables = [(('home', 'Points'), 'Points', 'home', ((total - spread) / 2, TEAM_POINTS_SD)),
+                 (('away', 'Points'), 'Points', 'away', ((total + spread) / 2, TEAM_POINTS_SD))]
+    for player in spec.get('players', []):
+        for stat, params in player['stats'].items():
+            if stat in LOADINGS:
+                variables.append(((fold(player['name']), stat), stat, player.get('team'), params))
+
+    loadings = np.array([_loading_row(stat, team) for _, stat, team, _ in variables], dtype=np.float32)
+    noise = np.sqrt(np.maximum(1.0 - np.sum(loadings ** 2, axis=1), 0.0))
+
+    # Variables x simulations, so each variable's draws are contiguous
+    factors = rng.standard_normal((len(FACTORS), simulations), dtype=np.float32)
+    latent = loadings @ factors
+    latent += rng.standard_normal((len(variables), simulations), dtype=np.float32) * noise[:, None]
+
+    normal = np.array([stat == 'Points' or STATS.get(stat) == 'normal' for _, stat, _, _ in variables])
+    mean = np.array([params[0] for _, _, _, params in variables], dtype=np.float32)
+    sd = np.array([params[1] if n else 0.0 for n, (_, _, _, params) in zip(normal, variables)], dtype=np.float32)
+    values = np.maximum(mean[:, None] + sd[:, None] * latent, 0.0)
+    counts = np.flatnonzero(~normal)
+    for j, cuts in zip(counts, _poisson_thresholds(mean[counts].tolist())):
+        values[j] = 0.0
+        for z in cuts:
+            values[j] += latent[j] > z
+
+    columns = {key: j for j, (key, _, _, _) in enumerate(variables)}
+    return GameSimulation(spec, columns, values)
+
+
+def _simulate(args) -> GameSimulation:
+    spec, simulations, seed = args
+    return simulate_game(spec, simulations, seed)
+
+
+def simulate_slate(specs: List[Dict], simulations: int = SIMULATIONS, seed: Optional[int] = None,
+                   processes: Optional[int] = None) -> SlateSimulation:
+    """
+    Simulate every game of a slate, fanned out across processes
+
+    Args:
+        processes: Worker processes (None = one per CPU, 1 = in-process);
+            spawned, not forked, since callers (web workers) run threads
+    """
+    seeds = np.random.SeedSequence(seed).spawn(len(specs))
+    jobs = [(spec, simulations, s) for spec, s in zip(specs, seeds)]
+    if processes == 1 or len(jobs) < 2:
+        return SlateSimulation([_simulate(job) for job in jobs], simulations, seed)
+    try:
+        with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn')) as pool:
+            games = list(pool.map(_simulate, jobs))
+    except (OSError, BrokenProcessPool) as e:
+        print(f"⚠️ Simulation process pool unavailable ({e}); simulating in-process")
+        games = [_simulate(job) for job in jobs]
+    return SlateSimulation(games, simulations, seed)
+
+
+def game_specs(games_snapshot, props_snapshots: List, model=None, week: Optional[int] = None) -> List[Dict]:
+    """
+    Simulation specs for every event in the games and props snapshots
+
+    Market total and home spread come from the first bookmaker quoting
+    them; players are every prop participant the projection model knows,
+    placed on a side by their projected team (parameters for `week`,
+    the model's latest week by default).
+    """
+    specs: Dict[str, Dict] = {}
+
+    def spec_for(event: Dict) -> Dict:
+        spec = specs.get(event['id'])
+        if spec is None:
+            spec = specs[event['id']] = {
+                'event_id': event['id'], 'home_team': event.get('home_team'),
+                'away_team': event.get('away_team'), 'commence_time': event.get('commence_time'),
+                'total': None, 'spread': None, 'players': [], '_seen': set()
+            }
+        return spec
+
+    if games_snapshot is not None:
+        for i, event in enumerate(games_snapshot.events):
+            spec = spec_for(event)
+            totals = games_snapshot.first_pair(i, 'totals')
+            if totals is not None:
+                spec['total'] = games_snapshot.point_of(totals[0])
+            spreads = games_snapshot.first_pair(i, 'spreads')
+            if spreads is not None:
+                for row in spreads:
+                    if fold(games_snapshot.outcome(row)['participant']) == fold(event.get('home_team') or ''):
+                        spec['spread'] = games_snapshot.point_of(row)
+
+    if model is not None and len(model):
+        home_away = {}
+        for snapshot in props_snapshots:
+            event = np.frombuffer(snapshot.event, dtype=np.int32)
+            participant = np.frombuffer(snapshot.participant, dtype=np.int32)
+            pairs = np.unique((event.astype(np.int64) << 32) | participant)
+            for pair in pairs.tolist():
+                game = snapshot.events[pair >> 32]
+                name = snapshot.participant_names[pair & 0xFFFFFFFF]
+                spec = spec_for(game)
+                if fold(name) in spec['_seen']:
+                    continue
+                spec['_seen'].add(fold(name))
+                stats = model.params(name, week)
+                if not stats:
+                    continue
+                team = model.team_of(name)
+                sides = home_away.setdefault(game['id'], (fold(game.get('home_team') or ''),
+                                                          fold(game.get('away_team') or '')))
+                side = 'home' if team and fold(team) == sides[0] else 'away' if team and fold(team) == sides[1] else None
+                spec['players'].append({'name': name, 'team': side, 'stats': stats})
+
+    for spec in specs.values():
+        spec.pop('_seen')
+    return list(specs.values())
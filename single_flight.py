@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Single-Flight Coalescing
+At most one in-flight call per key; concurrent callers share its result
+
+When a hot cache entry expires, every request that lands before the
+refill would otherwise fire its own upstream fetch. With single-flight,
+the first caller (the leader) runs the fetch, the rest block on it and
+receive the same result or exception.
+"""
+import threading
+from typing import Any, Callable, Dict
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn() for key unless a call is already in flight, then share its outcome"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict:
+        return {'leaders': self.leaders, 'coalesced': self.coalesced, 'in_flight': self.in_flight()}
@@ -3,77 +3,80 @@
 SportsData.io CSV Data Loader
 Load and serve your downloaded NFL data
 """
-import csv
 import os
 from typing import Dict, List
 
+from player_search import PlayerSearchIndex
+from sportsdata_snapshot import load_store
+
+
+def _text(value) -> str:
+    """Render a typed cell the way the CSV had it ('' for nulls)"""
+    return '' if value is None else str(value)
+
+
 class SportsDataLoader:
     def __init__(self):
         self.data_dir = os.path.join(os.path.dirname(__file__), 'data', 'sportsdata')
-        self.players = []
-        self.teams = []
+        self.store = None
+        self.players = None
+        self.teams = None
+        self.search_index = None
         self.load_data()
 
     def load_data(self):
         """Load all CSV data files"""
         try:
-            # Load players
-            player_file = os.path.join(self.data_dir, 'Player.2025.csv')
-            if os.path.exists(player_file):
-                with open(player_file, 'r') as f:
-                    reader = csv.DictReader(f)
-                    self.players = list(reader)
-                    print(f"✅ Loaded {len(self.players)} players from SportsData.io")
+            self.store = load_store(self.data_dir)
+
+            self.players = self.store.get('Player')
+            if self.players is not None:
+                print(f"✅ Loaded {len(self.players)} players from SportsData.io")
+                self.search_index = PlayerSearchIndex.from_table(self.players)
+
+            self.teams = self.store.get('Team')
+            if self.teams is not None:
+                print(f"✅ Loaded {len(self.teams)} teams from SportsData.io")
 
-            # Load teams
-            team_file = os.path.join(self.data_dir, 'Team.2025.csv')
-            if os.path.exists(team_file):
-                with open(team_file, 'r') as f:
-                    reader = csv.DictReader(f)
-                    self.teams = list(reader)
-                    print(f"✅ Loaded {len(self.teams)} teams from SportsData.io")
+            source = 'snapshot' if self.store.snapshot else 'CSV'
+            print(f"✅ Loaded {len(self.store.tables)} SportsData.io tables from {source} "
+                  f"({self.store.nbytes / 1024:.0f} KB columnar)")
 
         except Exception as e:
             print(f"⚠️ Error loading SportsData.io files: {e}")
 
+    def _player_summary(self, i: int) -> Dict:
+        players = self.players
+        return {
+            'name': f"{_text(players.value(i, 'FirstName'))} {_text(players.value(i, 'LastName'))}",
+            'number': _text(players.value(i, 'Number')),
+            'height': _text(players.value(i, 'Height')),
+            'status': _text(players.value(i, 'Status')),
+            'injury_status': _text(players.value(i, 'InjuryStatus'))
+        }
+
     def get_active_players(self, limit=50):
         """Get active NFL players"""
-        active_players = [p for p in self.players if p.get('Status') == 'Active'][:limit]
-        return [{
-            'name': f"{p.get('FirstName', '')} {p.get('LastName', '')}",
-            'number': p.get('Number', ''),
-            'height': p.get('Height', ''),
-            'status': p.get('Status', ''),
-            'injury_status': p.get('InjuryStatus', '')
-        } for p in active_players]
+        if self.players is None:
+            return []
+        active = self.players.where(Status='Active')[:limit]
+        return [self._player_summary(i) for i in active]
 
     def get_teams(self):
         """Get NFL teams"""
+        if self.teams is None:
+            return []
+        teams = self.teams
         return [{
-            'name': t.get('Name', ''),
-            'key': t.get('Key', ''),
-            'city': t.get('City', ''),
-            'conference': t.get('Conference', ''),
-            'division': t.get('Division', '')
-        } for t in self.teams]
+            'name': _text(teams.value(i, 'Name')),
+            'key': _text(teams.value(i, 'Key')),
+            'city': _text(teams.value(i, 'City')),
+            'conference': _text(teams.value(i, 'Conference')),
+            'division': _text(teams.value(i, 'Division'))
+        } for i in range(len(teams))]
 
     def search_players(self, query: str, limit=20):
-        """Search players by name"""
-        query_lower = query.lower()
-        matches = []
-
-        for player in self.players:
-            full_name = f"{player.get('FirstName', '')} {player.get('LastName', '')}".lower()
-            if query_lower in full_name:
-                matches.append({
-                    'name': f"{player.get('FirstName', '')} {player.get('LastName', '')}",
-                    'number': player.get('Number', ''),
-                    'height': player.get('Height', ''),
-                    'status': player.get('Status', ''),
-                    'injury_status': player.get('InjuryStatus', '')
-                })
-
-                if len(matches) >= limit:
-                    break
-
-        return matches
\ No newline at end of file
+        """Search players by name (prefix, substring, then typo-tolerant)"""
+        if self.search_index is None:
+            return []
+        return [self._player_summary(i) for i in self.search_index.search(query, limit)]
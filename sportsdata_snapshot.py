@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+SportsData.io Binary Snapshot
+Compile the CSV exports once into a memory-mappable, versioned snapshot
+
+Layout (native byte order, recorded in the manifest):
+    MAGIC (8 bytes) | format version (u32) | manifest length (u32)
+    manifest JSON | padding to 8 bytes
+    column buffers, each 8-byte aligned
+
+Workers open the snapshot with mmap and wrap column buffers in
+memoryviews, so numeric and string-code columns are never copied and
+all workers on a host share the same pages through the OS page cache.
+"""
+import contextlib
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from itertools import chain
+from typing import Dict, Iterable, Optional
+
+from sportsdata_store import COLUMN_TYPES, SportsDataStore, StringColumn, Table
+
+MAGIC = b'SDSNAP\x00\x00'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sII')
+ALIGN = 8
+SNAPSHOT_NAME = 'sportsdata.snapshot'
+
+
+def default_snapshot_path(data_dir: str) -> str:
+    return os.getenv('SPORTSDATA_SNAPSHOT') or os.path.join(data_dir, SNAPSHOT_NAME)
+
+
+def _pad(offset: int) -> int:
+    return (-offset) % ALIGN
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_fingerprints(data_dir: str, with_hash: bool = True) -> Dict[str, Dict]:
+    sources = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, '*.csv'))):
+        stat = os.stat(path)
+        sources[os.path.basename(path)] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': _file_digest(path) if with_hash else None
+        }
+    return sources
+
+
+def _preamble(manifest: Dict) -> bytes:
+    """Header + manifest JSON, padded so the column buffers start aligned"""
+    data = json.dumps(manifest).encode('utf-8')
+    preamble = HEADER.pack(MAGIC, FORMAT_VERSION, len(data)) + data
+    return preamble + b'\x00' * _pad(len(preamble))
+
+
+def _write_atomically(snapshot_path: str, chunks: Iterable[bytes]):
+    """
+    Write to a private temp file and rename, so concurrent workers
+    never observe a half-written snapshot
+    """
+    tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, snapshot_path)
+    finally:
+        # Already gone after the rename; a failed write of any kind leaves no temp file behind
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+
+
+def compile_snapshot(data_dir: str, snapshot_path: Optional[str] = None) -> str:
+    """Parse every CSV in data_dir and write a binary snapshot atomically"""
+    snapshot_path = snapshot_path or default_snapshot_path(data_dir)
+    sources = _source_fingerprints(data_dir)
+    store = SportsDataStore(data_dir)
+
+    tables = []
+    buffers = []
+    offset = 0
+    for table in store.tables.values():
+        columns = []
+        for column in table.columns.values():
+            raw = column.data.tobytes()
+            entry = {
+                'name': column.name,
+                'kind': column.kind,
+                'typecode': column.typecode,
+                'offset': offset,
+                'length': len(raw)
+            }
+            if isinstance(column, StringColumn):
+                entry['values'] = column.values
+            columns.append(entry)
+            buffers.append(raw + b'\x00' * _pad(len(raw)))
+            offset += len(raw) + _pad(len(raw))
+        tables.append({'name': table.name, 'rows': len(table), 'columns': columns})
+
+    preamble = _preamble({
+        'format': FORMAT_VERSION,
+        'byteorder': sys.byteorder,
+        'created': time.time(),
+        'sources': sources,
+        'tables': tables
+    })
+    _write_atomically(snapshot_path, chain([preamble], buffers))
+    return snapshot_path
+
+
+def read_manifest(snapshot_path: str) -> Optional[Dict]:
+    """Manifest of a snapshot, or None if missing, foreign or another version"""
+    try:
+        with open(snapshot_path, 'rb') as f:
+            magic, version, length = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != FORMAT_VERSION:
+                return None
+            manifest = json.loads(f.read(length))
+    except (OSError, ValueError, struct.error):
+        return None
+    if manifest.get('byteorder') != sys.byteorder:
+        return None
+    manifest['data_start'] = HEADER.size + length + _pad(HEADER.size + length)
+    return manifest
+
+
+def _refresh_sources(snapshot_path: str, manifest: Dict, current: Dict[str, Dict]):
+    """
+    Record the current mtimes of sources whose content still matches, so
+    the next check skips hashing them; updates manifest to the new file
+    """
+    sources = {name: dict(manifest['sources'][name], mtime_ns=stat['mtime_ns'])
+               for name, stat in current.items()}
+    preamble = _preamble(dict({k: v for k, v in manifest.items() if k != 'data_start'}, sources=sources))
+    with open(snapshot_path, 'rb') as old:
+        length = HEADER.unpack(old.read(HEADER.size))[2]
+        if json.loads(old.read(length)).get('created') != manifest.get('created'):
+            return  # replaced since it was read (another worker got here first)
+        old.seek(manifest['data_start'])
+        _write_atomically(snapshot_path, chain([preamble], iter(lambda: old.read(1 << 20), b'')))
+    manifest['sources'] = sources
+    manifest['data_start'] = len(preamble)
+
+
+def is_fresh(manifest: Optional[Dict], data_dir: str, snapshot_path: Optional[str] = None) -> bool:
+    """
+    Check sources by size+mtime, falling back to content hash on mismatch
+    (given snapshot_path, matching hashes refresh the recorded mtimes)
+    """
+    if not manifest:
+        return False
+    recorded = manifest.get('sources', {})
+    current = _source_fingerprints(data_dir, with_hash=False)
+    if set(recorded) != set(current):
+        return False
+
+    touched = False
+    for name, stat in current.items():
+        expected = recorded[name]
+        if stat['size'] != expected['size']:
+            return False
+        if stat['mtime_ns'] != expected['mtime_ns']:
+            # Touched (e.g. re-checkout) but possibly identical content
+            if _file_digest(os.path.join(data_dir, name)) != expected['sha256']:
+                return False
+            touched = True
+
+    if touched and snapshot_path:
+        try:
+            _refresh_sources(snapshot_path, manifest, current)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"⚠️ Could not refresh SportsData snapshot manifest: {e}")
+    return True
+
+
+def open_snapshot(snapshot_path: str, data_dir: str = '',
+                  manifest: Optional[Dict] = None) -> SportsDataStore:
+    """Map a snapshot read-only and build a store over zero-copy column views"""
+    manifest = manifest or read_manifest(snapshot_path)
+    if manifest is None:
+        raise ValueError(f"Not a valid snapshot: {snapshot_path}")
+
+    with open(snapshot_path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    start = manifest['data_start']
+
+    tables = {}
+    for entry in manifest['tables']:
+        columns = []
+        for col in entry['columns']:
+            begin = start + col['offset']
+            data = view[begin:begin + col['length']].cast(col['typecode'])
+            if col['kind'] == 'str':
+                values = [sys.intern(v) for v in col['values']]
+                columns.append(StringColumn(col['name'], data, values))
+            else:
+                columns.append(COLUMN_TYPES[col['kind']](col['name'], data))
+        tables[entry['name']] = Table(entry['name'], columns, entry['rows'])
+
+    store = SportsDataStore(data_dir, tables=tables)
+    store.snapshot = {'path': snapshot_path, 'mmap': mapped, 'created': manifest.get('created')}
+    return store
+
+
+def load_store(data_dir: str, snapshot_path: Optional[str] = None,
+               compile_if_stale: bool = True) -> SportsDataStore:
+    """Open the snapshot if fresh, otherwise recompile (or parse CSVs directly)"""
+    snapshot_path = snapshot_path or default_snapshot_path(data_dir)
+    manifest = read_manifest(snapshot_path)
+    if is_fresh(manifest, data_dir, snapshot_path):
+        return open_snapshot(snapshot_path, data_dir, manifest)
+
+    if compile_if_stale:
+        try:
+            compile_snapshot(data_dir, snapshot_path)
+            return open_snapshot(snapshot_path, data_dir)
+        except OSError as e:
+            # Read-only deploys still work, they just parse on every boot
+            print(f"⚠️ Could not write SportsData snapshot: {e}")
+
+    return SportsDataStore(data_dir)
+
+
+def main():
+    """Compile (or verify with --check) the snapshot for data/sportsdata"""
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sportsdata')
+    snapshot_path = default_snapshot_path(data_dir)
+
+    if '--check' in sys.argv[1:]:
+        fresh = is_fresh(read_manifest(snapshot_path), data_dir)
+        print(f"{'✅' if fresh else '⚠️'} {snapshot_path} is {'fresh' if fresh else 'stale or missing'}")
+        sys.exit(0 if fresh else 1)
+
+    start = time.perf_counter()
+    path = compile_snapshot(data_dir, snapshot_path)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"✅ Compiled {path} ({os.path.getsize(path) / 1024:.0f} KB) in {elapsed:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
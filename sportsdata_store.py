@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+SportsData.io Columnar Store
+Typed, column-oriented tables for the downloaded NFL CSV files
+"""
+import csv
+import glob
+import math
+import os
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence
+
+# Null sentinels for the typed columns
+INT_NULL = -(2 ** 63)
+INT_NULLS = {'b': -(2 ** 7), 'h': -(2 ** 15), 'i': -(2 ** 31), 'q': INT_NULL}
+BOOL_NULL = -1
+CODE_NULL = -1
+
+
+class Column:
+    """A single typed column backed by a flat buffer"""
+
+    kind = 'base'
+    typecode = ''
+
+    def __init__(self, name: str, data: Sequence):
+        self.name = name
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index: int):
+        return self._decode(self.data[index])
+
+    def __iter__(self) -> Iterator:
+        decode = self._decode
+        for raw in self.data:
+            yield decode(raw)
+
+    def _decode(self, raw):
+        return raw
+
+    def _encode(self, value):
+        return value
+
+    def to_list(self) -> List:
+        """Materialize the column as Python values (None for nulls)"""
+        return list(self)
+
+    def indices(self, value) -> List[int]:
+        """Row indices whose value equals `value`"""
+        try:
+            raw = self._encode(value)
+        except (TypeError, ValueError):
+            return []
+        if raw is None:
+            return []
+        return [i for i, v in enumerate(self.data) if v == raw]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the column buffer"""
+        return len(self.data) * self.data.itemsize
+
+
+class IntColumn(Column):
+    """Integer column narrowed to the smallest signed array type that fits"""
+
+    kind = 'int'
+    typecode = 'q'
+
+    def __init__(self, name: str, data: Sequence):
+        super().__init__(name, data)
+        self.typecode = getattr(data, 'typecode', None) or data.format
+        self.null = INT_NULLS[self.typecode]
+
+    def _decode(self, raw):
+        return None if raw == self.null else raw
+
+    def _encode(self, value):
+        return self.null if value is None else int(value)
+
+
+class FloatColumn(Column):
+    kind = 'float'
+    typecode = 'd'
+
+    def _decode(self, raw):
+        return None if raw != raw else raw
+
+    def _encode(self, value):
+        return None if value is None else float(value)
+
+
+class BoolColumn(Column):
+    kind = 'bool'
+    typecode = 'b'
+
+    def _decode(self, raw):
+        return None if raw == BOOL_NULL else bool(raw)
+
+    def _encode(self, value):
+        return BOOL_NULL if value is None else int(bool(value))
+
+
+class StringColumn(Column):
+    """Dictionary-encoded string column: int32 codes into interned values"""
+
+    kind = 'str'
+    typecode = 'i'
+
+    def __init__(self, name: str, data: Sequence, values: List[str]):
+        super().__init__(name, data)
+        self.values = values
+        self._lookup = {v: i for i, v in enumerate(values)}
+
+    def _decode(self, raw):
+        return None if raw == CODE_NULL else self.values[raw]
+
+    def _encode(self, value):
+        return CODE_NULL if value is None else self._lookup.get(value)
+
+    def to_list(self) -> List:
+        values = self.values
+        return [None if c == CODE_NULL else values[c] for c in self.data]
+
+    @property
+    def nbytes(self) -> int:
+        return (super().nbytes + sys.getsizeof(self.values)
+                + sum(sys.getsizeof(v) for v in self.values))
+
+
+COLUMN_TYPES = {cls.kind: cls for cls in (IntColumn, FloatColumn, BoolColumn, StringColumn)}
+
+
+def _parse_int(text: str) -> int:
+    # Keep zero-padded codes (e.g. hex colors like "000000") as strings
+    if len(text) > 1 and text[0] == '0':
+        raise ValueError(text)
+    value = int(text)
+    if not INT_NULL < value < 2 ** 63:
+        raise ValueError(text)
+    return value
+
+
+def _parse_float(text: str) -> float:
+    value = float(text)
+    if math.isnan(value):
+        raise ValueError(text)
+    return value
+
+
+def _parse_bool(text: str) -> int:
+    if text == 'True':
+        return 1
+    if text == 'False':
+        return 0
+    raise ValueError(text)
+
+
+def _int_typecode(values: List[int]) -> str:
+    present = [v for v in values if v is not None]
+    low, high = (min(present), max(present)) if present else (0, 0)
+    for typecode in ('b', 'h', 'i'):
+        null = INT_NULLS[typecode]
+        if null < low and high < -null:
+            return typecode
+    return 'q'
+
+
+def build_column(name: str, raw_values: List[str]) -> Column:
+    """Infer the narrowest type for raw CSV text and build a typed column"""
+    if any(v != '' for v in raw_values):
+        try:
+            parsed = [None if v == '' else _parse_int(v) for v in raw_values]
+            typecode = _int_typecode(parsed)
+            null = INT_NULLS[typecode]
+            return IntColumn(name, array(typecode, [null if v is None else v for v in parsed]))
+        except ValueError:
+            pass
+
+        for cls, parse, null in ((FloatColumn, _parse_float, math.nan),
+                                 (BoolColumn, _parse_bool, BOOL_NULL)):
+            try:
+                parsed = [null if v == '' else parse(v) for v in raw_values]
+            except ValueError:
+                continue
+            return cls(name, array(cls.typecode, parsed))
+
+    values: List[str] = []
+    lookup: Dict[str, int] = {}
+    codes = array(StringColumn.typecode)
+    for v in raw_values:
+        if v == '':
+            codes.append(CODE_NULL)
+            continue
+        code = lookup.get(v)
+        if code is None:
+            code = lookup[v] = len(values)
+            values.append(sys.intern(v))
+        codes.append(code)
+    return StringColumn(name, codes, values)
+
+
+class Table:
+    """Column-oriented table with typed columns of equal length"""
+
+    def __init__(self, name: str, columns: List[Column], num_rows: int = 0):
+        self.name = name
+        self.columns: Dict[str, Column] = {c.name: c for c in columns}
+        self.num_rows = len(columns[0]) if columns else num_rows
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.columns
+
+    def __getitem__(self, column: str) -> Column:
+        return self.columns[column]
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns)
+
+    def get(self, column: str) -> Optional[Column]:
+        """Column by name, or None if the export does not include it"""
+        return self.columns.get(column)
+
+    def value(self, index: int, column: str, default=None):
+        """Single cell lookup with a default for missing columns and nulls"""
+        col = self.columns.get(column)
+        if col is None:
+            return default
+        value = col[index]
+        return default if value is None else value
+
+    def where(self, **equals) -> List[int]:
+        """Row indices matching all column == value conditions"""
+        result = None
+        for column, value in equals.items():
+            col = self.columns.get(column)
+            if col is None:
+                return []
+            matches = col.indices(value)
+            if result is not None:
+                keep = set(matches)
+                matches = [i for i in result if i in keep]
+            result = matches
+            if not result:
+                return []
+        return list(range(self.num_rows)) if result is None else result
+
+    def row(self, index: int, columns: Optional[List[str]] = None) -> Dict:
+        names = columns or self.columns
+        return {name: self.columns[name][index] for name in names if name in self.columns}
+
+    def rows(self, indices: Optional[Sequence[int]] = None,
+             columns: Optional[List[str]] = None) -> Iterator[Dict]:
+        """Iterate rows as dicts (materialized lazily, one at a time)"""
+        for i in (range(self.num_rows) if indices is None else indices):
+            yield self.row(i, columns)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(c.nbytes for c in self.columns.values())
+
+
+def load_csv_table(path: str, name: Optional[str] = None) -> Table:
+    """Parse one CSV file into a typed Table"""
+    with open(path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        raw_columns: List[List[str]] = [[] for _ in header]
+        for record in reader:
+            for values, cell in zip(raw_columns, record):
+                values.append(cell)
+            # Short rows are padded with nulls, like DictReader does
+            for values in raw_columns[len(record):]:
+                values.append('')
+
+    name = name or table_name(path)
+    return Table(name, [build_column(h, v) for h, v in zip(header, raw_columns)])
+
+
+def table_name(path: str) -> str:
+    """'Player.2025.csv' -> 'Player'"""
+    return os.path.basename(path).split('.')[0]
+
+
+class SportsDataStore:
+    """All SportsData.io CSV exports in a directory as columnar tables"""
+
+    def __init__(self, data_dir: str, tables: Optional[Dict[str, Table]] = None):
+        self.data_dir = data_dir
+        self.tables: Dict[str, Table] = tables if tables is not None else {}
+        self.snapshot: Optional[Dict] = None
+        if tables is None:
+            self.load()
+
+    def load(self):
+        for path in sorted(glob.glob(os.path.join(self.data_dir, '*.csv'))):
+            table = load_csv_table(path)
+            self.tables[table.name] = table
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.tables
+
+    def __getitem__(self, name: str) -> Table:
+        return self.tables[name]
+
+    def get(self, name: str) -> Optional[Table]:
+        return self.tables.get(name)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(t.nbytes for t in self.tables.values())
+
+    def summary(self) -> Dict[str, Dict]:
+        """Row/column counts and memory per table"""
+        return {
+            name: {
+                'rows': len(table),
+                'columns': len(table.columns),
+                'bytes': table.nbytes
+            }
+            for name, table in self.tables.items()
+        }
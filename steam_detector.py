@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+NFL Analytics Empire - Steam Detector
+Incremental steam / reverse-line-move detection over odds snapshots
+
+Two kinds of movement are tracked, each as rolling state in flat numpy
+arrays (last value, an EWMA of its per-tick change (trend) and a ring of
+the last WINDOW_TICKS values), folded in with a handful of vectorized
+operations per snapshot:
+
+  * price - per line quoted (event, market, bookmaker, participant,
+            point, side): implied probability, so alternate lines at one
+            book never share state
+  * line  - per (event, market, bookmaker, participant, side): the point
+            of the book's main line (the quote closest to even money),
+            signed so "up" means the side got more favored (spreads,
+            totals and props; a -3 to -4.5 move at a steady -110 counts)
+
+  * steam   - at least STEAM_MIN_BOOKS books move the same outcome the
+              same way by MOVE_THRESHOLD (implied probability) or
+              LINE_MOVE_THRESHOLD (points) within the last WINDOW_TICKS
+              ticks
+  * reverse - at least REVERSE_MIN_BOOKS books move an outcome against
+              its established trend (no public betting splits are
+              available, so a confirmed reversal stands in for RLM)
+"""
+import time
+from collections import deque
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+import odds_math
+
+MOVE_THRESHOLD = 0.02
+WINDOW_TICKS = 5
+STEAM_MIN_BOOKS = 3
+REVERSE_MIN_BOOKS = 2
+# Trend (EWMA of per-tick change) needed before a reversal counts
+REVERSE_TREND = 0.005
+EWMA_ALPHA = 0.3
+# Main-line moves (points) for steam, and the trend needed before a line reversal counts
+LINE_MOVE_THRESHOLD = 0.5
+LINE_REVERSE_TREND = 0.1
+# Seconds a signal keeps an outcome flagged as sharp
+SIGNAL_TTL = 1800
+
+# Bit layout of the 64-bit outcome key: event | market | book | participant (or line) | side
+_EVENT_SHIFT, _MARKET_SHIFT, _BOOK_SHIFT, _PARTICIPANT_SHIFT = 44, 36, 28, 8
+_BOOK_MASK = np.int64(0xFF << _BOOK_SHIFT)
+# Points in tenths, offset positive (0 = no point), packed under the local participant code
+_POINT_BITS, _POINT_OFFSET = 22, 1 << 20
+# Sides whose line rises as they get more favored (the rest: unders and spread sides)
+_RISING_SIDES = {'over'}
+
+
+class _Codes:
+    """Stable global codes for strings seen across snapshots"""
+
+    def __init__(self, limit: int):
+        self.codes: Dict[Hashable, int] = {}
+        self.values: List[Hashable] = []
+        self.limit = limit
+
+    def map(self, values: List[Hashable]) -> np.ndarray:
+        """Global code for each local (snapshot interner) value"""
+        out = np.empty(len(values), dtype=np.int64)
+        for i, value in enumerate(values):
+            code = self.codes.get(value)
+            if code is None:
+                code = len(self.values)
+                if code >= self.limit:
+                    raise OverflowError("Steam detector code space exhausted")
+                self.codes[value] = code
+                self.values.append(value)
+            out[i] = code
+        return out
+
+
+class _Track:
+    """Rolling state per 64-bit key: last value, trend and a ring of recent values"""
+
+    def __init__(self, window_ticks: int):
+        self.window_ticks = window_ticks
+        # Sorted keys -> state slot
+        self._sorted_keys = np.empty(0, dtype=np.int64)
+        self._sorted_slots = np.empty(0, dtype=np.int64)
+        self.size = 0
+        self._capacity = 0
+        self._last = np.empty(0)
+        self._trend = np.empty(0)
+        self._ring = np.empty((0, window_ticks))
+        self._ring_pos = np.empty(0, dtype=np.int64)
+        self._seen = np.empty(0, dtype=np.int64)
+
+    def _grow(self, needed: int):
+        if needed <= self._capacity:
+            return
+        capacity = max(needed, self._capacity * 2, 1024)
+        extra = capacity - self._capacity
+        self._last = np.concatenate([self._last, np.full(extra, np.nan)])
+        self._trend = np.concatenate([self._trend, np.zeros(extra)])
+        self._ring = np.concatenate([self._ring, np.full((extra, self.window_ticks), np.nan)])
+        self._ring_pos = np.concatenate([self._ring_pos, np.zeros(extra, dtype=np.int64)])
+        self._seen = np.concatenate([self._seen, np.zeros(extra, dtype=np.int64)])
+        self._capacity = capacity
+
+    def _slots(self, keys: np.ndarray) -> np.ndarray:
+        """State slot per key, allocating slots for new keys"""
+        pos = np.searchsorted(self._sorted_keys, keys)
+        pos_clipped = np.minimum(pos, max(len(self._sorted_keys) - 1, 0))
+        known = (pos < len(self._sorted_keys)) & (self._sorted_keys[pos_clipped] == keys) \
+            if len(self._sorted_keys) else np.zeros(len(keys), dtype=bool)
+        if not known.all():
+            new_keys = np.unique(keys[~known])
+            new_slots = np.arange(self.size, self.size + len(new_keys), dtype=np.int64)
+            self.size += len(new_keys)
+            self._grow(self.size)
+            merged = np.concatenate([self._sorted_keys, new_keys])
+            order = np.argsort(merged, kind='stable')
+            self._sorted_keys = merged[order]
+            self._sorted_slots = np.concatenate([self._sorted_slots, new_slots])[order]
+            pos = np.searchsorted(self._sorted_keys, keys)
+        return self._sorted_slots[pos]
+
+    def step(self, keys: np.ndarray, values: np.ndarray, ts: float) -> Tuple[np.ndarray, ...]:
+        """
+        Fold new values in; returns (change since the last tick, has a
+        prior value, trend before this tick, move over the window)
+        """
+        slots = self._slots(keys)
+        change = values - self._last[slots]
+        has_prior = ~np.isnan(change)
+        change = np.where(has_prior, change, 0.0)
+        trend = self._trend[slots]
+
+        # Move over the last WINDOW_TICKS observations (oldest ring value)
+        ring_pos = self._ring_pos[slots]
+        # (the first value while the ring is still filling)
+        oldest = self._ring[slots, ring_pos]
+        base = np.where(np.isnan(oldest), self._ring[slots, 0], oldest)
+        window_move = np.where(np.isnan(base), 0.0, values - base)
+
+        # Roll state forward
+        self._trend[slots] = np.where(has_prior, EWMA_ALPHA * change + (1 - EWMA_ALPHA) * trend, 0.0)
+        self._last[slots] = values
+        self._ring[slots, ring_pos] = values
+        self._ring_pos[slots] = (ring_pos + 1) % self.window_ticks
+        self._seen[slots] = int(ts)
+        return change, has_prior, trend, window_move
+
+
+class SteamDetector:
+    """Consumes successive OddsSnapshots and flags steam and reverse moves"""
+
+    def __init__(self, move_threshold: float = MOVE_THRESHOLD, window_ticks: int = WINDOW_TICKS,
+                 steam_min_books: int = STEAM_MIN_BOOKS, reverse_min_books: int = REVERSE_MIN_BOOKS,
+                 line_threshold: float = LINE_MOVE_THRESHOLD):
+        self.move_threshold = move_threshold
+        self.line_threshold = line_threshold
+        self.window_ticks = window_ticks
+        self.steam_min_books = steam_min_books
+        self.reverse_min_books = reverse_min_books
+
+        self.events = _Codes(1 << 19)
+        self.markets = _Codes(1 << 8)
+        self.books = _Codes(1 << 8)
+        self.participants = _Codes(1 << 20)
+        # (participant, point) pairs: one price series per line quoted
+        self.lines = _Codes(1 << 20)
+        self.sides = _Codes(1 << 8)
+
+        self._prices = _Track(window_ticks)
+        self._lines = _Track(window_ticks)
+
+        # (event, market, participant, side) -> latest signal
+        self.active: Dict[Tuple[str, str, str, str], Dict] = {}
+        self.recent = deque(maxlen=1000)
+        self.ticks = 0
+
+    def _keys(self, snapshot, point: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """64-bit keys per snapshot row from stable global codes: (per line quoted, per outcome)"""
+        event_ids = [event['id'] for event in snapshot.events]
+        e = self.events.map(event_ids)[np.frombuffer(snapshot.event, dtype=np.int32)]
+        m = self.markets.map(snapshot.markets.values)[np.frombuffer(snapshot.market, dtype=np.int16)]
+        b = self.books.map(snapshot.books.values)[np.frombuffer(snapshot.book, dtype=np.int16)]
+        participant = np.frombuffer(snapshot.participant, dtype=np.int32).astype(np.int64)
+        p = self.participants.map(snapshot.participants.values)[participant]
+        s = self.sides.map(snapshot.sides.values)[np.frombuffer(snapshot.side, dtype=np.int32)]
+
+        tenths = np.where(np.isnan(point), 0, np.round(np.nan_to_num(point) * 10) + _POINT_OFFSET).astype(np.int64)
+        pairs, inverse = np.unique((participant << _POINT_BITS) | tenths, return_inverse=True)
+        names = snapshot.participants.values
+        line = self.lines.map([(names[pair >> _POINT_BITS], pair & ((1 << _POINT_BITS) - 1))
+                               for pair in pairs.tolist()])[inverse]
+
+        base = (e << _EVENT_SHIFT) | (m << _MARKET_SHIFT) | (b << _BOOK_SHIFT) | s
+        return base | (line << _PARTICIPANT_SHIFT), base | (p << _PARTICIPANT_SHIFT)
+
+    def update(self, snapshot, ts: Optional[float] = None) -> List[Dict]:
+        """Fold one snapshot into the rolling state; returns new signals"""
+        ts = time.time() if ts is None else ts
+        if not len(snapshot):
+            return []
+        point = np.frombuffer(snapshot.point, dtype=np.float64)
+        price_keys, outcome_keys = self._keys(snapshot, point)
+        prob = odds_math.implied_probability(np.frombuffer(snapshot.price, dtype=np.float64))
+        rows = np.arange(len(snapshot))
+        signals = self._detect('price', snapshot, rows, price_keys, prob,
+                               *self._prices.step(price_keys, prob, ts), self.move_threshold, REVERSE_TREND, ts)
+
+        # Main line per outcome and book: the quote priced closest to even money
+        main = np.flatnonzero(~np.isnan(point))
+        if len(main):
+            quoted = np.sort(outcome_keys[main])
+            if (quoted[1:] == quoted[:-1]).any():  # alternate lines quoted
+                closeness = np.nan_to_num(np.abs(prob[main] - 0.5), nan=np.inf)
+                order = np.lexsort((closeness, outcome_keys[main]))
+                _, first = np.unique(outcome_keys[main][order], return_index=True)
+                main = main[order[first]]
+            rising = np.array([side.lower() in _RISING_SIDES for side in snapshot.sides.values], dtype=bool)
+            sign = np.where(rising[np.frombuffer(snapshot.side, dtype=np.int32)[main]], 1.0, -1.0)
+            line = sign * point[main]
+            signals += self._detect('line', snapshot, main, outcome_keys[main], line,
+                                    *self._lines.step(outcome_keys[main], line, ts),
+                                    self.line_threshold, LINE_REVERSE_TREND, ts)
+        self.ticks += 1
+        return signals
+
+    def _detect(self, measure: str, snapshot, rows: np.ndarray, keys: np.ndarray, values: np.ndarray,
+                change: np.ndarray, has_prior: np.ndarray, trend: np.ndarray, window_move: np.ndarray,
+                threshold: float, reverse_trend: float, ts: float) -> List[Dict]:
+        """Steam / reverse signals from one track's step, counted across books per outcome"""
+        signals = []
+        groups = keys & ~_BOOK_MASK
+        valid = ~np.isnan(values)
+        steam_up = valid & (window_move >= threshold)
+        steam_down = valid & (window_move <= -threshold)
+        reverse = valid & has_prior & (np.abs(change) >= threshold / 2) & \
+            (np.abs(trend) >= reverse_trend) & (np.sign(change) != np.sign(trend))
+
+        if steam_up.any() or steam_down.any() or reverse.any():
+            uniq, inverse = np.unique(groups, return_inverse=True)
+            count = len(uniq)
+            up_books = np.bincount(inverse, weights=steam_up, minlength=count)
+            down_books = np.bincount(inverse, weights=steam_down, minlength=count)
+            rev_books = np.bincount(inverse, weights=reverse, minlength=count)
+            moved_now = np.bincount(inverse, weights=valid & has_prior & (np.abs(change) > 0), minlength=count)
+            net_change = np.bincount(inverse, weights=np.where(reverse, change, 0.0), minlength=count)
+            mean_move = np.bincount(inverse, weights=np.where(valid, window_move, 0.0), minlength=count) / \
+                np.maximum(np.bincount(inverse, minlength=count), 1)
+            first_row = np.full(count, -1, dtype=np.int64)
+            first_row[inverse[::-1]] = rows[::-1]
+
+            for g in np.nonzero((moved_now > 0) & ((up_books >= self.steam_min_books) |
+                                                    (down_books >= self.steam_min_books)))[0]:
+                direction = 'up' if up_books[g] >= down_books[g] else 'down'
+                books = int(max(up_books[g], down_books[g]))
+                signals.append(self._signal('steam', measure, snapshot, int(first_row[g]), direction, books,
+                                            float(mean_move[g]), ts))
+            for g in np.nonzero(rev_books >= self.reverse_min_books)[0]:
+                direction = 'up' if net_change[g] > 0 else 'down'
+                signals.append(self._signal('reverse', measure, snapshot, int(first_row[g]), direction,
+                                            int(rev_books[g]), float(mean_move[g]), ts))
+        return signals
+
+    def _signal(self, kind: str, measure: str, snapshot, row: int, direction: str, books: int,
+                move: float, ts: float) -> Dict:
+        outcome = snapshot.outcome(row)
+        signal = {
+            'type': kind,
+            'measure': measure,
+            'event_id': outcome['event_id'],
+            'market': outcome['market'],
+            'participant': outcome['participant'],
+            'side': outcome['name'],
+            'point': outcome.get('point'),
+            'direction': direction,
+            'books': books,
+            'move': round(move, 4),
+            'timestamp': ts
+        }
+        key = (signal['event_id'], signal['market'], signal['participant'].lower(), signal['side'])
+        previous = self.active.get(key)
+        self.active[key] = signal
+        # A move that keeps going re-arms the signal without logging it again
+        if previous is None or (previous['type'], previous['measure'], previous['direction']) != \
+                (kind, measure, direction):
+            self.recent.append(signal)
+        return signal
+
+    def sharp_signals(self, participant: str, market: Optional[str] = None,
+                      now: Optional[float] = None) -> List[Dict]:
+        """Live (within SIGNAL_TTL) signals for a participant"""
+        now = time.time() if now is None else now
+        name = participant.lower()
+        expired = [k for k, s in self.active.items() if now - s['timestamp'] > SIGNAL_TTL]
+        for key in expired:
+            self.active.pop(key, None)
+        return [s for (_, m, p, _), s in list(self.active.items())
+                if p == name and (market is None or m == market)]
+
+    def stats(self) -> Dict:
+        return {'outcomes_tracked': self._prices.size, 'lines_tracked': self._lines.size, 'ticks': self.ticks,
+                'active_signals': len(self.active), 'signals_total': len(self.recent)}